@@ -0,0 +1,39 @@
+"""Add annotation span and project query indexes
+
+Revision ID: 3f2a9c1d7b44
+Revises:
+Create Date: 2026-10-16 09:00:00
+"""
+
+from alembic import op
+
+
+revision = "3f2a9c1d7b44"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns)
+INDEXES = [
+    ("idx_annotation_text_span", "annotations", ["text_id", "start_char", "end_char"]),
+    ("idx_annotation_annotator_created", "annotations", ["annotator_id", "created_at"]),
+    ("idx_annotation_label", "annotations", ["label_id"]),
+    ("idx_annotation_created_at", "annotations", ["created_at"]),
+    ("idx_annotation_updated_at", "annotations", ["updated_at"]),
+    ("idx_text_project_created", "texts", ["project_id", "created_at"]),
+    ("idx_label_project_name", "labels", ["project_id", "name"]),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on Postgres
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
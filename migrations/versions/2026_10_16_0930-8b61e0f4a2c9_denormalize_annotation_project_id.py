@@ -0,0 +1,120 @@
+"""Denormalize annotation project_id and add annotation counters
+
+Revision ID: 8b61e0f4a2c9
+Revises: 3f2a9c1d7b44
+Create Date: 2026-10-16 09:30:00
+"""
+
+import calendar
+from collections import Counter
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "8b61e0f4a2c9"
+down_revision = "3f2a9c1d7b44"
+branch_labels = None
+depends_on = None
+
+
+# (scope, scope column, dimension, key expression) for per-member counter rows
+MEMBER_COUNTERS = [
+    ("project", "project_id", "annotations", "0"),
+    ("project", "project_id", "annotator", "annotator_id"),
+    ("project", "project_id", "label", "label_id"),
+    ("project", "project_id", "text", "text_id"),
+    ("text", "text_id", "annotations", "0"),
+    ("text", "text_id", "annotator", "annotator_id"),
+    ("text", "text_id", "label", "label_id"),
+]
+
+# (scope, distinct dimension, member dimension)
+DISTINCT_COUNTERS = [
+    ("project", "annotators", "annotator"),
+    ("project", "texts", "text"),
+    ("text", "annotators", "annotator"),
+]
+
+
+def upgrade():
+    # Denormalized project_id, backfilled from the owning text
+    with op.batch_alter_table("annotations") as batch_op:
+        batch_op.add_column(sa.Column("project_id", sa.Integer(), nullable=True))
+
+    op.execute(
+        "UPDATE annotations SET project_id = "
+        "(SELECT texts.project_id FROM texts WHERE texts.id = annotations.text_id)"
+    )
+
+    with op.batch_alter_table("annotations") as batch_op:
+        batch_op.alter_column("project_id", existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key("fk_annotations_project_id", "projects", ["project_id"], ["id"])
+        batch_op.create_index("idx_annotation_project_created", ["project_id", "created_at"])
+
+    op.create_table(
+        "annotation_counters",
+        sa.Column("scope", sa.String(20), primary_key=True),
+        sa.Column("scope_id", sa.Integer(), primary_key=True),
+        sa.Column("dimension", sa.String(20), primary_key=True),
+        sa.Column("key", sa.Integer(), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+    )
+
+    # Backfill counters from the existing rows
+    for scope, scope_column, dimension, key in MEMBER_COUNTERS:
+        op.execute(
+            "INSERT INTO annotation_counters (scope, scope_id, dimension, key, value) "
+            f"SELECT '{scope}', {scope_column}, '{dimension}', {key}, COUNT(*) "
+            f"FROM annotations GROUP BY {scope_column}"
+            + (f", {key}" if key != "0" else "")
+        )
+
+    for scope, scope_column in (("project", "project_id"), ("text", "text_id")):
+        op.execute(
+            "INSERT INTO annotation_counters (scope, scope_id, dimension, key, value) "
+            f"SELECT '{scope}', {scope_column}, 'length', 0, SUM(end_char - start_char) "
+            f"FROM annotations GROUP BY {scope_column}"
+        )
+
+    # Hour buckets are only read for the last day, so older ones are not backfilled
+    connection = op.get_bind()
+    buckets = Counter()
+    for project_id, text_id, created_at in connection.execute(
+        sa.text("SELECT project_id, text_id, created_at FROM annotations WHERE created_at >= :since"),
+        {"since": datetime.utcnow() - timedelta(hours=25)}
+    ):
+        if isinstance(created_at, str):  # SQLite returns text for raw selects
+            created_at = datetime.fromisoformat(created_at)
+        hour = calendar.timegm(created_at.timetuple()) // 3600
+        buckets[("project", project_id, hour)] += 1
+        buckets[("text", text_id, hour)] += 1
+    if buckets:
+        connection.execute(
+            sa.text(
+                "INSERT INTO annotation_counters (scope, scope_id, dimension, key, value) "
+                "VALUES (:scope, :scope_id, 'created_hour', :key, :value)"
+            ),
+            [
+                {"scope": scope, "scope_id": scope_id, "key": hour, "value": value}
+                for (scope, scope_id, hour), value in buckets.items()
+            ]
+        )
+
+    for scope, distinct_dimension, member_dimension in DISTINCT_COUNTERS:
+        op.execute(
+            "INSERT INTO annotation_counters (scope, scope_id, dimension, key, value) "
+            f"SELECT scope, scope_id, '{distinct_dimension}', 0, COUNT(*) FROM annotation_counters "
+            f"WHERE scope = '{scope}' AND dimension = '{member_dimension}' AND value > 0 "
+            "GROUP BY scope, scope_id"
+        )
+
+
+def downgrade():
+    op.drop_table("annotation_counters")
+
+    with op.batch_alter_table("annotations") as batch_op:
+        batch_op.drop_index("idx_annotation_project_created")
+        batch_op.drop_constraint("fk_annotations_project_id", type_="foreignkey")
+        batch_op.drop_column("project_id")
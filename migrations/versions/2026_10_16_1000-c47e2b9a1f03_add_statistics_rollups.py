@@ -0,0 +1,29 @@
+"""Add statistics rollups for admin dashboards
+
+Revision ID: c47e2b9a1f03
+Revises: 8b61e0f4a2c9
+Create Date: 2026-10-16 10:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c47e2b9a1f03"
+down_revision = "8b61e0f4a2c9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Filled by the background refresh job or the first dashboard request
+    op.create_table(
+        "statistics_rollups",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("statistics_rollups")
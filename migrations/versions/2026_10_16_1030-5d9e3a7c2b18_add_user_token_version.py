@@ -0,0 +1,28 @@
+"""Add user token_version for principal caching and token revocation
+
+Revision ID: 5d9e3a7c2b18
+Revises: c47e2b9a1f03
+Create Date: 2026-10-16 10:30:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "5d9e3a7c2b18"
+down_revision = "c47e2b9a1f03"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing tokens carry no version claim and are read as version 0
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(
+            sa.Column("token_version", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
@@ -0,0 +1,35 @@
+"""Add agreement result cache
+
+Revision ID: a93d5f1c6e27
+Revises: 5d9e3a7c2b18
+Create Date: 2026-10-16 11:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "a93d5f1c6e27"
+down_revision = "5d9e3a7c2b18"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Starts empty; entries are written on the first calculation per scope
+    op.create_table(
+        "agreement_result_cache",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("scope", sa.String(length=20), nullable=False),
+        sa.Column("scope_id", sa.Integer(), nullable=False),
+        sa.Column("parameters_key", sa.String(length=64), nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("statistics", sa.JSON(), nullable=True),
+        sa.Column("results", sa.JSON(), nullable=True),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("scope", "scope_id", "parameters_key", name="uq_agreement_result_cache_scope"),
+    )
+
+
+def downgrade():
+    op.drop_table("agreement_result_cache")
@@ -0,0 +1,126 @@
+"""
+Conflict Detection Benchmark Script
+
+Benchmarks candidate pair enumeration for conflict detection as text
+density grows from 10 to 100k spans per text:
+- Previous sorted nested loop with a fixed 100-char gap
+- Span overlap index sweep (overlapping + proximity pairs)
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from src.core.span_index import SpanIndex
+from src.core.conflict_detection import QUALITY_PROXIMITY_CHARS
+
+
+DEFAULT_DENSITIES = [10, 100, 1000, 10000, 100000]
+
+
+def generate_spans(n_spans: int, text_length: int, max_span_length: int,
+                   seed: int = 42) -> List[SimpleNamespace]:
+    """Generate random spans over a text of the given length."""
+    rng = random.Random(seed)
+    spans = []
+    for span_id in range(1, n_spans + 1):
+        start = rng.randrange(0, text_length)
+        spans.append(SimpleNamespace(
+            id=span_id,
+            start_char=start,
+            end_char=start + rng.randrange(1, max_span_length)
+        ))
+    return spans
+
+
+def legacy_candidate_pairs(spans: List[SimpleNamespace]) -> int:
+    """Count the pairs visited by the previous nested-loop detection."""
+    ordered = sorted(spans, key=lambda s: s.start_char)
+    visited = 0
+    for i, ann_a in enumerate(ordered):
+        for ann_b in ordered[i + 1:]:
+            if ann_b.start_char > ann_a.end_char + 100:
+                break
+            visited += 1
+    return visited
+
+
+def index_candidate_pairs(spans: List[SimpleNamespace]) -> int:
+    """Count the pairs reported by the span overlap index."""
+    return sum(1 for _ in SpanIndex(spans).candidate_pairs(QUALITY_PROXIMITY_CHARS))
+
+
+class ConflictDetectionBenchmark:
+    """Scaling benchmark for conflict candidate enumeration"""
+
+    def __init__(self, densities: List[int], text_length: int,
+                 max_span_length: int, legacy_limit: int):
+        self.densities = densities
+        self.text_length = text_length
+        self.max_span_length = max_span_length
+        self.legacy_limit = legacy_limit
+        self.results: Dict[str, Any] = {}
+
+    def run(self) -> Dict[str, Any]:
+        for n_spans in self.densities:
+            spans = generate_spans(n_spans, self.text_length, self.max_span_length)
+            result: Dict[str, Any] = {"spans": n_spans}
+
+            start_time = time.perf_counter()
+            result["index_pairs"] = index_candidate_pairs(spans)
+            result["index_time_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+
+            if n_spans <= self.legacy_limit:
+                start_time = time.perf_counter()
+                result["legacy_pairs_visited"] = legacy_candidate_pairs(spans)
+                result["legacy_time_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+                if result["index_time_ms"] > 0:
+                    result["speedup"] = round(result["legacy_time_ms"] / result["index_time_ms"], 2)
+
+            self.results[f"spans_{n_spans}"] = result
+        return self.results
+
+    def print_results(self):
+        print("\n" + "=" * 80)
+        print("CONFLICT DETECTION BENCHMARK RESULTS")
+        print(f"text length: {self.text_length} chars, max span length: {self.max_span_length}")
+        print("=" * 80)
+        print(f"{'spans':>10} {'index pairs':>14} {'index ms':>12} {'legacy visited':>16} {'legacy ms':>12}")
+        for result in self.results.values():
+            print(
+                f"{result['spans']:>10} {result['index_pairs']:>14} {result['index_time_ms']:>12} "
+                f"{result.get('legacy_pairs_visited', '-'):>16} {result.get('legacy_time_ms', '-'):>12}"
+            )
+        print("=" * 80)
+
+
+def main():
+    """Run conflict detection benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--densities", type=int, nargs="+", default=DEFAULT_DENSITIES)
+    parser.add_argument("--text-length", type=int, default=100000)
+    parser.add_argument("--max-span-length", type=int, default=200)
+    parser.add_argument("--legacy-limit", type=int, default=10000,
+                        help="Largest density to run the legacy nested loop on")
+    parser.add_argument("--output", help="Optional JSON results file")
+    args = parser.parse_args()
+
+    benchmark = ConflictDetectionBenchmark(
+        args.densities, args.text_length, args.max_span_length, args.legacy_limit
+    )
+    results = benchmark.run()
+    benchmark.print_results()
+
+    if args.output:
+        results["timestamp"] = datetime.now().isoformat()
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Detailed results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+API Load Test Script
+
+Drives the hot read endpoints of a running API server with concurrent
+clients and reports requests/sec and latency percentiles:
+- GET /api/annotations/
+- GET /api/texts/
+- GET /api/projects/
+
+Run it once against a build on the sync Session endpoints and once against
+the AsyncSession build, then compare the saved JSON results with --compare.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import httpx
+
+
+DEFAULT_ENDPOINTS = ["/api/annotations/?limit=50", "/api/texts/?limit=50", "/api/projects/?limit=50"]
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    """Obtain a bearer token for the load test user."""
+    response = await client.post("/api/auth/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_client(client: httpx.AsyncClient, path: str, deadline: float,
+                     latencies: List[float], failures: List[int]):
+    """Issue requests back to back until the deadline."""
+    while time.perf_counter() < deadline:
+        start_time = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code != 200:
+                failures.append(response.status_code)
+                continue
+        except httpx.HTTPError:
+            failures.append(0)
+            continue
+        latencies.append(time.perf_counter() - start_time)
+
+
+class ApiLoadTest:
+    """Concurrent load test for read endpoints"""
+
+    def __init__(self, base_url: str, endpoints: List[str], concurrency: int,
+                 duration: float, username: str, password: str):
+        self.base_url = base_url
+        self.endpoints = endpoints
+        self.concurrency = concurrency
+        self.duration = duration
+        self.username = username
+        self.password = password
+        self.results: Dict[str, Any] = {}
+
+    async def run(self) -> Dict[str, Any]:
+        limits = httpx.Limits(max_connections=self.concurrency)
+        async with httpx.AsyncClient(base_url=self.base_url, limits=limits, timeout=30) as client:
+            token = await login(client, self.username, self.password)
+            client.headers["Authorization"] = f"Bearer {token}"
+
+            for path in self.endpoints:
+                latencies: List[float] = []
+                failures: List[int] = []
+                deadline = time.perf_counter() + self.duration
+                await asyncio.gather(*(
+                    run_client(client, path, deadline, latencies, failures)
+                    for _ in range(self.concurrency)
+                ))
+                self.results[path] = self.summarize(latencies, failures)
+        return self.results
+
+    def summarize(self, latencies: List[float], failures: List[int]) -> Dict[str, Any]:
+        latencies.sort()
+        if not latencies:
+            return {"requests": 0, "failures": len(failures), "requests_per_second": 0}
+        return {
+            "requests": len(latencies),
+            "failures": len(failures),
+            "requests_per_second": round(len(latencies) / self.duration, 1),
+            "p50_ms": round(statistics.median(latencies) * 1000, 2),
+            "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+            "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2)
+        }
+
+    def print_results(self):
+        print("\n" + "=" * 80)
+        print("API LOAD TEST RESULTS")
+        print(f"{self.base_url}, concurrency: {self.concurrency}, duration: {self.duration}s per endpoint")
+        print("=" * 80)
+        print(f"{'endpoint':<32} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'fail':>6}")
+        for path, result in self.results.items():
+            print(
+                f"{path:<32} {result['requests_per_second']:>10} {result.get('p50_ms', '-'):>10} "
+                f"{result.get('p95_ms', '-'):>10} {result.get('p99_ms', '-'):>10} {result['failures']:>6}"
+            )
+        print("=" * 80)
+
+
+def compare(before_path: str, after_path: str):
+    """Print the requests/sec change between two saved runs."""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    print(f"{'endpoint':<32} {'before req/s':>14} {'after req/s':>14} {'speedup':>10}")
+    for path, result in after.items():
+        if path not in before or not isinstance(result, dict):
+            continue
+        before_rps = before[path]["requests_per_second"]
+        after_rps = result["requests_per_second"]
+        speedup = round(after_rps / before_rps, 2) if before_rps else "-"
+        print(f"{path:<32} {before_rps:>14} {after_rps:>14} {speedup:>10}")
+
+
+def main():
+    """Run the API load test"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--endpoints", nargs="+", default=DEFAULT_ENDPOINTS)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per endpoint")
+    parser.add_argument("--username", default="loadtest")
+    parser.add_argument("--password", default="LoadTest123!")
+    parser.add_argument("--output", help="Optional JSON results file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="Compare two saved result files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    load_test = ApiLoadTest(
+        args.base_url, args.endpoints, args.concurrency, args.duration, args.username, args.password
+    )
+    results = asyncio.run(load_test.run())
+    load_test.print_results()
+
+    if args.output:
+        results["timestamp"] = datetime.now().isoformat()
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Detailed results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Pagination Benchmark Script
+
+Pages through a large texts table with offset and keyset pagination:
+- Keyset: walks every page and reports first, median and last page latency
+- Offset: samples pages at increasing depths, since a full walk is quadratic
+
+Keyset page latency should stay flat with depth; offset latency grows with
+the number of rows skipped.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from src.core.database import Base
+from src.models.project import Project
+from src.models.text import Text
+from src.models.user import User
+from src.utils.pagination import KeysetPaginator
+
+
+INSERT_BATCH = 50000
+
+
+class PaginationBenchmark:
+    """Offset vs keyset page latency over a large table"""
+
+    def __init__(self, database_url: str, n_rows: int, page_size: int):
+        self.engine = create_engine(database_url)
+        self.session = sessionmaker(bind=self.engine)()
+        self.n_rows = n_rows
+        self.page_size = page_size
+        self.results: Dict[str, Any] = {}
+
+    def seed(self):
+        """Create the schema and bulk insert n_rows texts into one project."""
+        Base.metadata.create_all(bind=self.engine)
+        if self.session.scalar(select(Text.id).limit(1)) is not None:
+            return
+
+        owner = User(username="benchmark", email="benchmark@example.com", hashed_password="x")
+        self.session.add(owner)
+        self.session.flush()
+        project = Project(name="Pagination benchmark", owner_id=owner.id)
+        self.session.add(project)
+        self.session.commit()
+
+        start = datetime(2026, 1, 1)
+        for offset in range(0, self.n_rows, INSERT_BATCH):
+            rows = [
+                {
+                    "title": f"Text {i}",
+                    "content": f"Benchmark text {i}",
+                    "project_id": project.id,
+                    "created_at": start + timedelta(seconds=i)
+                }
+                for i in range(offset, min(offset + INSERT_BATCH, self.n_rows))
+            ]
+            self.session.execute(insert(Text), rows)
+            self.session.commit()
+
+    def base_query(self):
+        return select(Text.id, Text.title, Text.created_at)
+
+    def timed(self, statement) -> Tuple[float, List[Any]]:
+        start_time = time.perf_counter()
+        rows = self.session.execute(statement).all()
+        return time.perf_counter() - start_time, rows
+
+    def run_keyset(self) -> Dict[str, Any]:
+        paginator = KeysetPaginator(Text.id)
+        latencies, cursor, seen = [], None, 0
+        while True:
+            elapsed, rows = self.timed(paginator.apply(self.base_query(), cursor, self.page_size))
+            page, cursor = paginator.page(rows, self.page_size)
+            latencies.append(elapsed)
+            seen += len(page)
+            if cursor is None:
+                break
+
+        return {
+            "pages": len(latencies),
+            "rows": seen,
+            "total_s": round(sum(latencies), 3),
+            "first_page_ms": round(latencies[0] * 1000, 3),
+            "median_page_ms": round(statistics.median(latencies) * 1000, 3),
+            "last_page_ms": round(latencies[-1] * 1000, 3)
+        }
+
+    def run_offset(self) -> Dict[str, Any]:
+        total_pages = max(1, -(-self.n_rows // self.page_size))
+        depths = sorted({1, 10, 100, 1000, 10000, total_pages} & set(range(1, total_pages + 1)))
+        paginator = KeysetPaginator(Text.id)
+
+        samples = {}
+        for page_number in depths:
+            statement = paginator.apply(
+                self.base_query().offset((page_number - 1) * self.page_size), None, self.page_size
+            )
+            elapsed, _ = self.timed(statement)
+            samples[str(page_number)] = round(elapsed * 1000, 3)
+        return {"page_ms": samples}
+
+    def run(self) -> Dict[str, Any]:
+        self.seed()
+        self.results["keyset"] = self.run_keyset()
+        self.results["offset"] = self.run_offset()
+        return self.results
+
+    def print_results(self):
+        keyset = self.results["keyset"]
+        print("\n" + "=" * 80)
+        print("PAGINATION BENCHMARK RESULTS")
+        print(f"rows: {self.n_rows}, page size: {self.page_size}")
+        print("=" * 80)
+        print(f"keyset: {keyset['pages']} pages in {keyset['total_s']}s")
+        print(f"  first {keyset['first_page_ms']} ms, median {keyset['median_page_ms']} ms, "
+              f"last {keyset['last_page_ms']} ms")
+        print("offset:")
+        for page_number, latency in self.results["offset"]["page_ms"].items():
+            print(f"  page {page_number:>8}: {latency} ms")
+        print("=" * 80)
+
+
+def main():
+    """Run pagination benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default="sqlite:///pagination_benchmark.db")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--output", help="Optional JSON results file")
+    args = parser.parse_args()
+
+    benchmark = PaginationBenchmark(args.database_url, args.rows, args.page_size)
+    results = benchmark.run()
+    benchmark.print_results()
+
+    if args.output:
+        results["timestamp"] = datetime.now().isoformat()
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Detailed results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
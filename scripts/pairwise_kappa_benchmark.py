@@ -0,0 +1,110 @@
+"""
+Pairwise Kappa Benchmark Script
+
+Benchmarks all-pairs Cohen's Kappa as the team grows:
+- Previous loop calling AgreementMetrics.cohen_kappa once per pair
+- Batched engine counting every confusion matrix in one bincount pass
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.utils.agreement_metrics import AgreementMetrics
+
+
+DEFAULT_TEAM_SIZES = [2, 5, 10, 30]
+
+
+def generate_annotations(n_annotators: int, n_items: int, n_categories: int,
+                         seed: int = 42) -> Dict[str, List[str]]:
+    """Annotators copying a shared truth with 20% random labels."""
+    rng = np.random.default_rng(seed)
+    categories = np.array([f"label_{c}" for c in range(n_categories)])
+    truth = rng.integers(0, n_categories, n_items)
+    annotations = {}
+    for a in range(n_annotators):
+        noisy = rng.random(n_items) < 0.2
+        labels = np.where(noisy, rng.integers(0, n_categories, n_items), truth)
+        annotations[f"annotator_{a}"] = categories[labels].tolist()
+    return annotations
+
+
+def legacy_pairwise(metrics: AgreementMetrics, annotations: Dict[str, List[str]]) -> int:
+    names = list(annotations)
+    n_pairs = 0
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            metrics.cohen_kappa(annotations[names[i]], annotations[names[j]])
+            n_pairs += 1
+    return n_pairs
+
+
+class PairwiseKappaBenchmark:
+    """Scaling benchmark for all-pairs Cohen's Kappa"""
+
+    def __init__(self, team_sizes: List[int], n_items: int, n_categories: int):
+        self.team_sizes = team_sizes
+        self.n_items = n_items
+        self.n_categories = n_categories
+        self.metrics = AgreementMetrics()
+        self.results: Dict[str, Any] = {}
+
+    def run(self) -> Dict[str, Any]:
+        for n_annotators in self.team_sizes:
+            annotations = generate_annotations(n_annotators, self.n_items, self.n_categories)
+            result: Dict[str, Any] = {"annotators": n_annotators}
+
+            start_time = time.perf_counter()
+            result["pairs"] = legacy_pairwise(self.metrics, annotations)
+            result["legacy_time_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+
+            start_time = time.perf_counter()
+            self.metrics.pairwise_cohen_kappa(annotations)
+            result["batched_time_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+            if result["batched_time_ms"] > 0:
+                result["speedup"] = round(result["legacy_time_ms"] / result["batched_time_ms"], 2)
+
+            self.results[f"annotators_{n_annotators}"] = result
+        return self.results
+
+    def print_results(self):
+        print("\n" + "=" * 80)
+        print("PAIRWISE KAPPA BENCHMARK RESULTS")
+        print(f"items: {self.n_items}, categories: {self.n_categories}")
+        print("=" * 80)
+        print(f"{'annotators':>10} {'pairs':>8} {'legacy ms':>12} {'batched ms':>12} {'speedup':>10}")
+        for result in self.results.values():
+            print(
+                f"{result['annotators']:>10} {result['pairs']:>8} {result['legacy_time_ms']:>12} "
+                f"{result['batched_time_ms']:>12} {result.get('speedup', '-'):>10}"
+            )
+        print("=" * 80)
+
+
+def main():
+    """Run pairwise kappa benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--team-sizes", type=int, nargs="+", default=DEFAULT_TEAM_SIZES)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--categories", type=int, default=8)
+    parser.add_argument("--output", help="Optional JSON results file")
+    args = parser.parse_args()
+
+    benchmark = PairwiseKappaBenchmark(args.team_sizes, args.items, args.categories)
+    results = benchmark.run()
+    benchmark.print_results()
+
+    if args.output:
+        results["timestamp"] = datetime.now().isoformat()
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Detailed results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
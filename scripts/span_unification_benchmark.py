@@ -0,0 +1,156 @@
+"""
+Span Unification Benchmark Script
+
+Benchmarks span_overlap item extraction as the project grows to 1M spans:
+- Previous all-pairs greedy clustering over the whole project
+- Sweep-line unification per text, producing the item x annotator matrix
+
+Spans are spread over texts of fixed length with a few annotators marking
+roughly the same mentions, so the number of items grows linearly with the
+number of spans.
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.utils.span_unification import unify_span_arrays
+
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+
+def generate_spans(n_spans: int, n_annotators: int, spans_per_text: int,
+                   text_length: int, seed: int = 42) -> Dict[str, np.ndarray]:
+    """Generate jittered copies of shared mentions, one per annotator."""
+    rng = np.random.default_rng(seed)
+    n_mentions = max(1, n_spans // n_annotators)
+    mention_text = np.arange(n_mentions) // max(1, spans_per_text // n_annotators)
+    mention_start = rng.integers(0, text_length, n_mentions)
+    mention_length = rng.integers(1, 30, n_mentions)
+
+    mention = np.arange(n_spans) % n_mentions
+    jitter = rng.integers(-2, 3, n_spans)
+    starts = np.maximum(mention_start[mention] + jitter, 0)
+    return {
+        "text_ids": mention_text[mention],
+        "starts": starts,
+        "ends": starts + np.maximum(mention_length[mention] + rng.integers(-2, 3, n_spans), 1),
+        "annotators": np.arange(n_spans) // n_mentions % n_annotators,
+        "labels": rng.integers(0, 5, n_spans)
+    }
+
+
+def legacy_unify(spans: Dict[str, np.ndarray], overlap_threshold: float) -> int:
+    """Previous clustering: every span against every later span in the project."""
+    all_spans = [
+        {"text_id": t, "start": s, "end": e, "annotator": a, "label": l}
+        for t, s, e, a, l in zip(*(spans[key].tolist() for key in
+                                   ("text_ids", "starts", "ends", "annotators", "labels")))
+    ]
+    all_spans.sort(key=lambda x: (x["text_id"], x["start"]))
+
+    n_items, processed = 0, set()
+    for i, span1 in enumerate(all_spans):
+        if i in processed:
+            continue
+        processed.add(i)
+        for j in range(i + 1, len(all_spans)):
+            if j in processed or span1["text_id"] != all_spans[j]["text_id"]:
+                continue
+            span2 = all_spans[j]
+            intersection = min(span1["end"], span2["end"]) - max(span1["start"], span2["start"])
+            if intersection <= 0:
+                continue
+            union = (span1["end"] - span1["start"]) + (span2["end"] - span2["start"]) - intersection
+            if intersection / union >= overlap_threshold:
+                processed.add(j)
+        n_items += 1
+    return n_items
+
+
+class SpanUnificationBenchmark:
+    """Scaling benchmark for span_overlap item extraction"""
+
+    def __init__(self, sizes: List[int], n_annotators: int, spans_per_text: int,
+                 text_length: int, overlap_threshold: float, legacy_limit: int):
+        self.sizes = sizes
+        self.n_annotators = n_annotators
+        self.spans_per_text = spans_per_text
+        self.text_length = text_length
+        self.overlap_threshold = overlap_threshold
+        self.legacy_limit = legacy_limit
+        self.results: Dict[str, Any] = {}
+
+    def run(self) -> Dict[str, Any]:
+        for n_spans in self.sizes:
+            spans = generate_spans(n_spans, self.n_annotators, self.spans_per_text, self.text_length)
+            result: Dict[str, Any] = {"spans": n_spans}
+
+            start_time = time.perf_counter()
+            codes, _ = unify_span_arrays(
+                spans["text_ids"], spans["starts"], spans["ends"],
+                spans["annotators"], spans["labels"], self.n_annotators,
+                self.overlap_threshold
+            )
+            result["sweep_time_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+            result["items"] = codes.shape[0]
+
+            if n_spans <= self.legacy_limit:
+                start_time = time.perf_counter()
+                result["legacy_items"] = legacy_unify(spans, self.overlap_threshold)
+                result["legacy_time_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+                if result["sweep_time_ms"] > 0:
+                    result["speedup"] = round(result["legacy_time_ms"] / result["sweep_time_ms"], 2)
+
+            self.results[f"spans_{n_spans}"] = result
+        return self.results
+
+    def print_results(self):
+        print("\n" + "=" * 80)
+        print("SPAN UNIFICATION BENCHMARK RESULTS")
+        print(f"annotators: {self.n_annotators}, spans per text: {self.spans_per_text}, "
+              f"threshold: {self.overlap_threshold}")
+        print("=" * 80)
+        print(f"{'spans':>10} {'items':>10} {'sweep ms':>12} {'legacy ms':>12} {'speedup':>10}")
+        for result in self.results.values():
+            print(
+                f"{result['spans']:>10} {result['items']:>10} {result['sweep_time_ms']:>12} "
+                f"{result.get('legacy_time_ms', '-'):>12} {result.get('speedup', '-'):>10}"
+            )
+        print("=" * 80)
+
+
+def main():
+    """Run span unification benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--annotators", type=int, default=3)
+    parser.add_argument("--spans-per-text", type=int, default=300)
+    parser.add_argument("--text-length", type=int, default=5000)
+    parser.add_argument("--overlap-threshold", type=float, default=0.5)
+    parser.add_argument("--legacy-limit", type=int, default=10000,
+                        help="Largest project size to run the previous clustering on")
+    parser.add_argument("--output", help="Optional JSON results file")
+    args = parser.parse_args()
+
+    benchmark = SpanUnificationBenchmark(
+        args.sizes, args.annotators, args.spans_per_text, args.text_length,
+        args.overlap_threshold, args.legacy_limit
+    )
+    results = benchmark.run()
+    benchmark.print_results()
+
+    if args.output:
+        results["timestamp"] = datetime.now().isoformat()
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Detailed results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
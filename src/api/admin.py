@@ -15,16 +15,23 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, desc, asc, or_, and_, text
 
-from src.core.database import get_db
+from src.core.database import SessionLocal, get_db
 from src.middleware.admin_middleware import require_admin, require_super_admin, AuditLogger
 from src.models.user import User
 from src.models.project import Project
 from src.models.text import Text
 from src.models.annotation import Annotation
+from src.models.annotation_counter import (
+    AnnotationCounter, get_annotation_counters, get_project_annotation_counts
+)
 from src.models.label import Label
+from src.models.serialization import ADMIN_PROJECT_RESPONSE
 from src.models.audit_log import AuditLog, SystemLog, SecurityEvent
 from src.core.config import settings
+from src.services.cache_manager import get_cache_manager
+from src.services.statistics_service import StatisticsService
 from src.utils.logger import get_logger
+from src.utils.pagination import KeysetPaginator
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -98,6 +105,7 @@ class SystemStats(BaseModel):
 async def list_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; replaces skip"),
     search: Optional[str] = Query(None, description="Search by username, email, or full name"),
     role: Optional[str] = Query(None, description="Filter by role"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
@@ -107,7 +115,12 @@ async def list_users(
     db: Session = Depends(get_db),
     current_admin: User = Depends(require_admin)
 ):
-    """List users with advanced filtering, search, and pagination."""
+    """
+    List users with advanced filtering, search, and pagination.
+    
+    Passing a cursor switches to keyset pagination, which skips the total
+    count and costs the same for every page.
+    """
     
     query = db.query(User)
     
@@ -131,18 +144,16 @@ async def list_users(
     if is_admin is not None:
         query = query.filter(User.is_admin == is_admin)
     
-    # Apply sorting
-    sort_column = getattr(User, sort_by)
-    if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
-    else:
-        query = query.order_by(asc(sort_column))
+    # Apply sorting, with id as tie-breaker so pages are stable
+    paginator = KeysetPaginator(User.id, getattr(User, sort_by), descending=sort_order == "desc")
     
-    # Get total count before pagination
-    total = query.count()
+    # Get total count before pagination; keyset pages skip it
+    total = None if cursor else query.count()
     
-    # Apply pagination
-    users = query.offset(skip).limit(limit).all()
+    # Apply pagination: keyset when a cursor is given, offset otherwise
+    if not cursor:
+        query = query.offset(skip)
+    users, next_cursor = paginator.page(paginator.apply(query, cursor, limit).all(), limit)
     
     # Log the action
     AuditLogger.log_admin_action(
@@ -151,7 +162,7 @@ async def list_users(
         target_type="user",
         details={
             "filters": {"search": search, "role": role, "is_active": is_active, "is_admin": is_admin},
-            "pagination": {"skip": skip, "limit": limit},
+            "pagination": {"skip": skip, "limit": limit, "cursor": bool(cursor)},
             "results_count": len(users)
         },
         db=db
@@ -163,7 +174,8 @@ async def list_users(
             "total": total,
             "skip": skip,
             "limit": limit,
-            "pages": (total + limit - 1) // limit
+            "pages": (total + limit - 1) // limit if total is not None else None,
+            "next_cursor": next_cursor
         }
     }
 
@@ -322,10 +334,17 @@ async def update_user(
     for field, value in update_data.items():
         setattr(user, field, value)
     
+    # Deactivation revokes outstanding tokens
+    if original_values["is_active"] and user.is_active is False:
+        user.token_version = (user.token_version or 0) + 1
+    
     user.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(user)
     
+    # Drop the cached principal so role and status changes apply immediately
+    await get_cache_manager().invalidate_user(user.id)
+    
     # Log the action
     AuditLogger.log_admin_action(
         admin_user=current_admin,
@@ -382,6 +401,7 @@ async def delete_user(
     # Delete user and cascade delete associated data
     db.delete(user)
     db.commit()
+    await get_cache_manager().invalidate_user(user_id)
     
     # Log the action
     AuditLogger.log_admin_action(
@@ -431,6 +451,7 @@ async def bulk_user_operations(
                 user.is_active = True
             elif operation.operation == "deactivate":
                 user.is_active = False
+                user.token_version = (user.token_version or 0) + 1
             elif operation.operation == "verify":
                 user.is_verified = True
             elif operation.operation == "unverify":
@@ -463,6 +484,11 @@ async def bulk_user_operations(
     
     db.commit()
     
+    # Drop cached principals so the changes apply immediately
+    cache_manager = get_cache_manager()
+    for user_id in operation.user_ids:
+        await cache_manager.invalidate_user(user_id)
+    
     # Log the action
     AuditLogger.log_admin_action(
         admin_user=current_admin,
@@ -488,6 +514,7 @@ async def bulk_user_operations(
 async def list_projects(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; replaces skip"),
     search: Optional[str] = Query(None, description="Search by project name or description"),
     owner_id: Optional[int] = Query(None, description="Filter by owner ID"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
@@ -497,13 +524,14 @@ async def list_projects(
     db: Session = Depends(get_db),
     current_admin: User = Depends(require_admin)
 ):
-    """List projects with advanced filtering and statistics."""
+    """
+    List projects with advanced filtering and statistics.
     
-    query = db.query(Project).options(
-        joinedload(Project.owner),
-        joinedload(Project.texts),
-        joinedload(Project.labels)
-    )
+    Passing a cursor switches to keyset pagination, which skips the total
+    count and costs the same for every page.
+    """
+    
+    query = ADMIN_PROJECT_RESPONSE.apply(db.query(Project))
     
     # Apply filters
     if search:
@@ -524,28 +552,24 @@ async def list_projects(
     if is_public is not None:
         query = query.filter(Project.is_public == is_public)
     
-    # Apply sorting
-    sort_column = getattr(Project, sort_by)
-    if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
-    else:
-        query = query.order_by(asc(sort_column))
+    # Apply sorting, with id as tie-breaker so pages are stable
+    paginator = KeysetPaginator(Project.id, getattr(Project, sort_by), descending=sort_order == "desc")
     
-    # Get total count before pagination
-    total = query.count()
+    # Get total count before pagination; keyset pages skip it
+    total = None if cursor else query.count()
     
-    # Apply pagination
-    projects = query.offset(skip).limit(limit).all()
+    # Apply pagination: keyset when a cursor is given, offset otherwise
+    if not cursor:
+        query = query.offset(skip)
+    projects, next_cursor = paginator.page(paginator.apply(query, cursor, limit).all(), limit)
     
     # Enhance project data with statistics
+    annotation_counts = get_project_annotation_counts(db, [project.id for project in projects])
     project_data = []
     for project in projects:
-        project_dict = project.to_dict()
+        project_dict = ADMIN_PROJECT_RESPONSE.serialize(project)
         project_dict["owner_username"] = project.owner.username if project.owner else None
-        
-        # Get annotation statistics
-        annotation_count = db.query(Annotation).join(Text).filter(Text.project_id == project.id).count()
-        project_dict["annotation_count"] = annotation_count
+        project_dict["annotation_count"] = annotation_counts[project.id]
         
         project_data.append(project_dict)
     
@@ -567,7 +591,8 @@ async def list_projects(
             "total": total,
             "skip": skip,
             "limit": limit,
-            "pages": (total + limit - 1) // limit
+            "pages": (total + limit - 1) // limit if total is not None else None,
+            "next_cursor": next_cursor
         }
     }
 
@@ -597,18 +622,18 @@ async def get_project_details(
     label_count = len(project.labels)
     
     # Get annotation statistics
-    annotation_stats = db.query(
-        func.count(Annotation.id).label('total_annotations'),
-        func.count(func.distinct(Annotation.annotator_id)).label('unique_annotators')
-    ).join(Text).filter(Text.project_id == project_id).first()
+    counters = get_annotation_counters(db, "project", project_id)
     
-    # Get annotator activity
+    # Get annotator activity from the per-annotator counter rows
     annotator_activity = db.query(
         User.username,
-        func.count(Annotation.id).label('annotation_count')
-    ).join(Annotation).join(Text).filter(
-        Text.project_id == project_id
-    ).group_by(User.username).all()
+        AnnotationCounter.value
+    ).join(AnnotationCounter, AnnotationCounter.key == User.id).filter(
+        AnnotationCounter.scope == "project",
+        AnnotationCounter.scope_id == project_id,
+        AnnotationCounter.dimension == "annotator",
+        AnnotationCounter.value > 0
+    ).all()
     
     project_data = project.to_dict()
     project_data.update({
@@ -616,8 +641,8 @@ async def get_project_details(
         "statistics": {
             "text_count": text_count,
             "label_count": label_count,
-            "total_annotations": annotation_stats.total_annotations or 0,
-            "unique_annotators": annotation_stats.unique_annotators or 0,
+            "total_annotations": counters["annotation_count"],
+            "unique_annotators": counters["annotator_count"],
             "annotator_activity": [
                 {"username": username, "annotation_count": count}
                 for username, count in annotator_activity
@@ -673,6 +698,13 @@ async def update_project(
     db.commit()
     db.refresh(project)
     
+    # Cached principals hold owned and public project ids
+    if project.owner_id != original_values["owner_id"] or project.is_public != original_values["is_public"]:
+        await get_cache_manager().invalidate_project_access(
+            original_values["owner_id"], project.owner_id,
+            public_changed=project.is_public != original_values["is_public"]
+        )
+    
     # Log the action
     AuditLogger.log_admin_action(
         admin_user=current_admin,
@@ -709,7 +741,7 @@ async def delete_project(
     
     # Check for associated data
     text_count = len(project.texts)
-    annotation_count = db.query(Annotation).join(Text).filter(Text.project_id == project_id).count()
+    annotation_count = get_annotation_counters(db, "project", project_id)["annotation_count"]
     
     if (text_count > 0 or annotation_count > 0) and not force:
         raise HTTPException(
@@ -718,10 +750,13 @@ async def delete_project(
         )
     
     project_name = project.name
+    owner_id = project.owner_id
+    was_public = project.is_public
     
     # Delete project and cascade delete associated data
     db.delete(project)
     db.commit()
+    await get_cache_manager().invalidate_project_access(owner_id, public_changed=was_public)
     
     # Log the action
     AuditLogger.log_admin_action(
@@ -744,50 +779,26 @@ async def delete_project(
 # SYSTEM STATISTICS AND ANALYTICS
 # ============================================================================
 
+def log_admin_action_in_background(**kwargs):
+    """Write an admin audit entry on its own session after the response is sent."""
+    db = SessionLocal()
+    try:
+        AuditLogger.log_admin_action(db=db, **kwargs)
+    finally:
+        db.close()
+
+
 @router.get("/statistics/overview", dependencies=[Depends(require_admin)])
 async def get_system_overview(
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_admin: User = Depends(require_admin)
 ):
     """Get comprehensive system statistics and overview."""
     
-    # Basic counts
-    total_users = db.query(User).count()
-    active_users = db.query(User).filter(User.is_active == True).count()
-    total_projects = db.query(Project).count()
-    active_projects = db.query(Project).filter(Project.is_active == True).count()
-    total_texts = db.query(Text).count()
-    total_annotations = db.query(Annotation).count()
-    total_labels = db.query(Label).count()
-    
-    # Recent activity (last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    
-    new_users_30d = db.query(User).filter(User.created_at >= thirty_days_ago).count()
-    new_projects_30d = db.query(Project).filter(Project.created_at >= thirty_days_ago).count()
-    new_annotations_30d = db.query(Annotation).filter(Annotation.created_at >= thirty_days_ago).count()
-    
-    # User activity
-    users_with_recent_login = db.query(User).filter(
-        User.last_login >= thirty_days_ago,
-        User.last_login.isnot(None)
-    ).count()
-    
-    # Top active users
-    top_annotators = db.query(
-        User.username,
-        func.count(Annotation.id).label('annotation_count')
-    ).join(Annotation).group_by(User.username).order_by(
-        desc('annotation_count')
-    ).limit(10).all()
-    
-    # Project activity
-    most_active_projects = db.query(
-        Project.name,
-        func.count(Annotation.id).label('annotation_count')
-    ).join(Text).join(Annotation).group_by(Project.name).order_by(
-        desc('annotation_count')
-    ).limit(10).all()
+    # Aggregates come from the periodically refreshed rollup
+    statistics = StatisticsService(db).get()
+    recent = statistics["recent"]
     
     # System resource usage (basic)
     import psutil
@@ -795,38 +806,24 @@ async def get_system_overview(
     memory_info = psutil.virtual_memory()
     
     # Log the action
-    AuditLogger.log_admin_action(
+    background_tasks.add_task(
+        log_admin_action_in_background,
         admin_user=current_admin,
         action="VIEW_SYSTEM_OVERVIEW",
         target_type="system",
-        details={},
-        db=db
+        details={}
     )
     
     return {
-        "overview": {
-            "total_users": total_users,
-            "active_users": active_users,
-            "total_projects": total_projects,
-            "active_projects": active_projects,
-            "total_texts": total_texts,
-            "total_annotations": total_annotations,
-            "total_labels": total_labels
-        },
+        "overview": statistics["overview"],
         "recent_activity": {
-            "new_users_30d": new_users_30d,
-            "new_projects_30d": new_projects_30d,
-            "new_annotations_30d": new_annotations_30d,
-            "users_with_recent_login": users_with_recent_login
+            "new_users_30d": recent["new_users_30d"],
+            "new_projects_30d": recent["new_projects_30d"],
+            "new_annotations_30d": recent["new_annotations_30d"],
+            "users_with_recent_login": recent["users_with_recent_login"]
         },
-        "top_annotators": [
-            {"username": username, "annotation_count": count}
-            for username, count in top_annotators
-        ],
-        "most_active_projects": [
-            {"project_name": name, "annotation_count": count}
-            for name, count in most_active_projects
-        ],
+        "top_annotators": statistics["top_annotators"],
+        "most_active_projects": statistics["most_active_projects"],
         "system_resources": {
             "disk_usage": {
                 "total": disk_usage.total,
@@ -840,12 +837,14 @@ async def get_system_overview(
                 "available": memory_info.available,
                 "percent": memory_info.percent
             }
-        }
+        },
+        "computed_at": statistics["computed_at"]
     }
 
 
 @router.get("/statistics/timeline", dependencies=[Depends(require_admin)])
 async def get_system_timeline(
+    background_tasks: BackgroundTasks,
     days: int = Query(30, ge=1, le=365),
     db: Session = Depends(get_db),
     current_admin: User = Depends(require_admin)
@@ -853,54 +852,24 @@ async def get_system_timeline(
     """Get timeline statistics for the specified number of days."""
     
     start_date = datetime.utcnow() - timedelta(days=days)
+    first_day = str(start_date.date())
     
-    # Daily user registrations
-    daily_users = db.query(
-        func.date(User.created_at).label('date'),
-        func.count(User.id).label('count')
-    ).filter(User.created_at >= start_date).group_by(
-        func.date(User.created_at)
-    ).order_by('date').all()
-    
-    # Daily project creation
-    daily_projects = db.query(
-        func.date(Project.created_at).label('date'),
-        func.count(Project.id).label('count')
-    ).filter(Project.created_at >= start_date).group_by(
-        func.date(Project.created_at)
-    ).order_by('date').all()
-    
-    # Daily annotation activity
-    daily_annotations = db.query(
-        func.date(Annotation.created_at).label('date'),
-        func.count(Annotation.id).label('count')
-    ).filter(Annotation.created_at >= start_date).group_by(
-        func.date(Annotation.created_at)
-    ).order_by('date').all()
+    # The rollup holds the longest timeline; slice it to the requested window
+    timeline = StatisticsService(db).get()["timeline"]
     
     # Log the action
-    AuditLogger.log_admin_action(
+    background_tasks.add_task(
+        log_admin_action_in_background,
         admin_user=current_admin,
         action="VIEW_SYSTEM_TIMELINE",
         target_type="system",
-        details={"days": days},
-        db=db
+        details={"days": days}
     )
     
     return {
         "timeline": {
-            "daily_users": [
-                {"date": str(date), "count": count}
-                for date, count in daily_users
-            ],
-            "daily_projects": [
-                {"date": str(date), "count": count}
-                for date, count in daily_projects
-            ],
-            "daily_annotations": [
-                {"date": str(date), "count": count}
-                for date, count in daily_annotations
-            ]
+            series: [point for point in points if point["date"] >= first_day]
+            for series, points in timeline.items()
         },
         "period": {
             "start_date": start_date.isoformat(),
@@ -1457,41 +1426,29 @@ async def get_dashboard_summary(
 ):
     """Get summary data for admin dashboard."""
     
-    # Quick stats for dashboard cards
-    today = datetime.utcnow().date()
-    week_ago = datetime.utcnow() - timedelta(days=7)
+    # Quick stats for dashboard cards, served from the statistics rollup
+    statistics = StatisticsService(db).get()
+    overview = statistics["overview"]
+    recent = statistics["recent"]
     
     stats = {
         "totals": {
-            "users": db.query(User).count(),
-            "active_users": db.query(User).filter(User.is_active == True).count(),
-            "projects": db.query(Project).count(),
-            "active_projects": db.query(Project).filter(Project.is_active == True).count(),
-            "annotations": db.query(Annotation).count(),
-            "texts": db.query(Text).count()
+            "users": overview["total_users"],
+            "active_users": overview["active_users"],
+            "projects": overview["total_projects"],
+            "active_projects": overview["active_projects"],
+            "annotations": overview["total_annotations"],
+            "texts": overview["total_texts"]
         },
         "recent": {
-            "new_users_today": db.query(User).filter(func.date(User.created_at) == today).count(),
-            "new_projects_week": db.query(Project).filter(Project.created_at >= week_ago).count(),
-            "new_annotations_week": db.query(Annotation).filter(Annotation.created_at >= week_ago).count(),
-            "recent_logins": db.query(User).filter(
-                User.last_login >= week_ago,
-                User.last_login.isnot(None)
-            ).count()
+            "new_users_today": recent["new_users_today"],
+            "new_projects_week": recent["new_projects_week"],
+            "new_annotations_week": recent["new_annotations_week"],
+            "recent_logins": recent["recent_logins"]
         },
-        "alerts": {
-            "inactive_users": db.query(User).filter(User.is_active == False).count(),
-            "unresolved_security_events": db.query(SecurityEvent).filter(SecurityEvent.resolved == False).count()
-        }
-    }
-    
-    # Recent activity
-    recent_users = db.query(User).order_by(desc(User.created_at)).limit(5).all()
-    recent_projects = db.query(Project).options(joinedload(Project.owner)).order_by(desc(Project.created_at)).limit(5).all()
-    
-    stats["recent_activity"] = {
-        "users": [{"id": u.id, "username": u.username, "created_at": u.created_at.isoformat()} for u in recent_users],
-        "projects": [{"id": p.id, "name": p.name, "owner": p.owner.username if p.owner else None, "created_at": p.created_at.isoformat()} for p in recent_projects]
+        "alerts": statistics["alerts"],
+        "recent_activity": statistics["recent_activity"],
+        "computed_at": statistics["computed_at"]
     }
     
     return stats
\ No newline at end of file
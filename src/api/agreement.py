@@ -17,6 +17,7 @@ import logging
 from collections import defaultdict
 
 from ..utils.agreement_metrics import AgreementMetrics, AgreementAnalysis, calculate_agreement_metrics
+from ..utils.span_unification import unify_spans
 from ..models.agreement import (
     AgreementStudy, CohenKappaResult, FleissKappaResult, 
     KrippendorffAlphaResult, StudyRecommendation, AnnotatorPerformance,
@@ -494,7 +495,171 @@ def get_annotator_performance():
 
 
 @agreement_bp.route('/projects/<int:project_id>/summary', methods=['GET'])
-def get_project_agreement_summary(project_id: int):\n    \"\"\"\n    Get a summary of agreement statistics for a project.\n    \"\"\"\n    try:\n        if not db_session:\n            return jsonify({'error': 'Database not configured'}), 500\n        \n        from ..services.agreement_service import AgreementService\n        agreement_service = AgreementService(db_session)\n        \n        summary = agreement_service.get_project_agreement_summary(project_id)\n        \n        return jsonify({\n            'success': True,\n            'project_summary': summary\n        }), 200\n        \n    except ValueError as e:\n        return jsonify({'error': str(e)}), 404\n    except Exception as e:\n        logger.error(f\"Error retrieving project agreement summary: {str(e)}\")\n        return jsonify({'error': 'Internal server error'}), 500\n\n\n@agreement_bp.route('/projects/<int:project_id>/enable', methods=['POST'])\ndef enable_project_agreement_tracking(project_id: int):\n    \"\"\"\n    Enable inter-annotator agreement tracking for a project.\n    \"\"\"\n    try:\n        if not db_session:\n            return jsonify({'error': 'Database not configured'}), 500\n        \n        project = db_session.query(Project).filter_by(id=project_id).first()\n        if not project:\n            return jsonify({'error': 'Project not found'}), 404\n        \n        project.inter_annotator_agreement = True\n        db_session.commit()\n        \n        return jsonify({\n            'success': True,\n            'message': f'Agreement tracking enabled for project {project.name}',\n            'project_id': project_id\n        }), 200\n        \n    except Exception as e:\n        logger.error(f\"Error enabling project agreement tracking: {str(e)}\")\n        db_session.rollback()\n        return jsonify({'error': 'Internal server error'}), 500\n\n\n@agreement_bp.route('/projects/<int:project_id>/disable', methods=['POST'])\ndef disable_project_agreement_tracking(project_id: int):\n    \"\"\"\n    Disable inter-annotator agreement tracking for a project.\n    \"\"\"\n    try:\n        if not db_session:\n            return jsonify({'error': 'Database not configured'}), 500\n        \n        project = db_session.query(Project).filter_by(id=project_id).first()\n        if not project:\n            return jsonify({'error': 'Project not found'}), 404\n        \n        project.inter_annotator_agreement = False\n        db_session.commit()\n        \n        return jsonify({\n            'success': True,\n            'message': f'Agreement tracking disabled for project {project.name}',\n            'project_id': project_id\n        }), 200\n        \n    except Exception as e:\n        logger.error(f\"Error disabling project agreement tracking: {str(e)}\")\n        db_session.rollback()\n        return jsonify({'error': 'Internal server error'}), 500\n\n\n@agreement_bp.route('/annotators/<annotator_name>/performance', methods=['GET'])\ndef get_annotator_individual_performance(annotator_name: str):\n    \"\"\"\n    Get performance statistics for a specific annotator.\n    \"\"\"\n    try:\n        if not db_session:\n            return jsonify({'error': 'Database not configured'}), 500\n        \n        performance = db_session.query(AnnotatorPerformance).filter_by(\n            annotator_name=annotator_name\n        ).first()\n        \n        if not performance:\n            return jsonify({'error': 'Annotator performance data not found'}), 404\n        \n        return jsonify({\n            'success': True,\n            'annotator_performance': performance.to_dict()\n        }), 200\n        \n    except Exception as e:\n        logger.error(f\"Error retrieving annotator performance: {str(e)}\")\n        return jsonify({'error': 'Internal server error'}), 500\n\n\n@agreement_bp.route('/reports/dashboard', methods=['GET'])\ndef get_agreement_dashboard():\n    \"\"\"\n    Get dashboard data for agreement overview.\n    \"\"\"\n    try:\n        if not db_session:\n            return jsonify({'error': 'Database not configured'}), 500\n        \n        # Get recent studies\n        recent_studies = db_session.query(AgreementStudy).order_by(\n            AgreementStudy.created_at.desc()\n        ).limit(5).all()\n        \n        # Get top performing annotators\n        top_annotators = db_session.query(AnnotatorPerformance).filter(\n            AnnotatorPerformance.average_kappa_score.isnot(None)\n        ).order_by(\n            AnnotatorPerformance.average_kappa_score.desc()\n        ).limit(5).all()\n        \n        # Get overall statistics\n        total_studies = db_session.query(AgreementStudy).count()\n        total_annotators = db_session.query(AnnotatorPerformance).count()\n        \n        # Calculate average agreement scores\n        avg_cohen_kappa = db_session.query(\n            db_session.query(CohenKappaResult.kappa_value).subquery().c.kappa_value\n        ).scalar()\n        \n        avg_fleiss_kappa = db_session.query(\n            db_session.query(FleissKappaResult.kappa_value).subquery().c.kappa_value\n        ).scalar()\n        \n        dashboard_data = {\n            'recent_studies': [study.to_dict() for study in recent_studies],\n            'top_annotators': [annotator.to_dict() for annotator in top_annotators],\n            'statistics': {\n                'total_studies': total_studies,\n                'total_annotators': total_annotators,\n                'average_cohen_kappa': avg_cohen_kappa,\n                'average_fleiss_kappa': avg_fleiss_kappa\n            },\n            'generated_at': datetime.now().isoformat()\n        }\n        \n        return jsonify({\n            'success': True,\n            'dashboard': dashboard_data\n        }), 200\n        \n    except Exception as e:\n        logger.error(f\"Error generating agreement dashboard: {str(e)}\")\n        return jsonify({'error': 'Internal server error'}), 500\n\n\n@agreement_bp.route('/metrics/guidelines', methods=['GET'])\ndef get_interpretation_guidelines():"}
+def get_project_agreement_summary(project_id: int):
+    """
+    Get a summary of agreement statistics for a project.
+    """
+    try:
+        if not db_session:
+            return jsonify({'error': 'Database not configured'}), 500
+        
+        from ..services.agreement_service import AgreementService
+        agreement_service = AgreementService(db_session)
+        
+        summary = agreement_service.get_project_agreement_summary(project_id)
+        
+        return jsonify({
+            'success': True,
+            'project_summary': summary
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        logger.error(f"Error retrieving project agreement summary: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@agreement_bp.route('/projects/<int:project_id>/enable', methods=['POST'])
+def enable_project_agreement_tracking(project_id: int):
+    """
+    Enable inter-annotator agreement tracking for a project.
+    """
+    try:
+        if not db_session:
+            return jsonify({'error': 'Database not configured'}), 500
+        
+        project = db_session.query(Project).filter_by(id=project_id).first()
+        if not project:
+            return jsonify({'error': 'Project not found'}), 404
+        
+        project.inter_annotator_agreement = True
+        db_session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Agreement tracking enabled for project {project.name}',
+            'project_id': project_id
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error enabling project agreement tracking: {str(e)}")
+        db_session.rollback()
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@agreement_bp.route('/projects/<int:project_id>/disable', methods=['POST'])
+def disable_project_agreement_tracking(project_id: int):
+    """
+    Disable inter-annotator agreement tracking for a project.
+    """
+    try:
+        if not db_session:
+            return jsonify({'error': 'Database not configured'}), 500
+        
+        project = db_session.query(Project).filter_by(id=project_id).first()
+        if not project:
+            return jsonify({'error': 'Project not found'}), 404
+        
+        project.inter_annotator_agreement = False
+        db_session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Agreement tracking disabled for project {project.name}',
+            'project_id': project_id
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error disabling project agreement tracking: {str(e)}")
+        db_session.rollback()
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@agreement_bp.route('/annotators/<annotator_name>/performance', methods=['GET'])
+def get_annotator_individual_performance(annotator_name: str):
+    """
+    Get performance statistics for a specific annotator.
+    """
+    try:
+        if not db_session:
+            return jsonify({'error': 'Database not configured'}), 500
+        
+        performance = db_session.query(AnnotatorPerformance).filter_by(
+            annotator_name=annotator_name
+        ).first()
+        
+        if not performance:
+            return jsonify({'error': 'Annotator performance data not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'annotator_performance': performance.to_dict()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error retrieving annotator performance: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@agreement_bp.route('/reports/dashboard', methods=['GET'])
+def get_agreement_dashboard():
+    """
+    Get dashboard data for agreement overview.
+    """
+    try:
+        if not db_session:
+            return jsonify({'error': 'Database not configured'}), 500
+        
+        # Get recent studies
+        recent_studies = db_session.query(AgreementStudy).order_by(
+            AgreementStudy.created_at.desc()
+        ).limit(5).all()
+        
+        # Get top performing annotators
+        top_annotators = db_session.query(AnnotatorPerformance).filter(
+            AnnotatorPerformance.average_kappa_score.isnot(None)
+        ).order_by(
+            AnnotatorPerformance.average_kappa_score.desc()
+        ).limit(5).all()
+        
+        # Get overall statistics
+        total_studies = db_session.query(AgreementStudy).count()
+        total_annotators = db_session.query(AnnotatorPerformance).count()
+        
+        # Calculate average agreement scores
+        avg_cohen_kappa = db_session.query(
+            db_session.query(CohenKappaResult.kappa_value).subquery().c.kappa_value
+        ).scalar()
+        
+        avg_fleiss_kappa = db_session.query(
+            db_session.query(FleissKappaResult.kappa_value).subquery().c.kappa_value
+        ).scalar()
+        
+        dashboard_data = {
+            'recent_studies': [study.to_dict() for study in recent_studies],
+            'top_annotators': [annotator.to_dict() for annotator in top_annotators],
+            'statistics': {
+                'total_studies': total_studies,
+                'total_annotators': total_annotators,
+                'average_cohen_kappa': avg_cohen_kappa,
+                'average_fleiss_kappa': avg_fleiss_kappa
+            },
+            'generated_at': datetime.now().isoformat()
+        }
+        
+        return jsonify({
+            'success': True,
+            'dashboard': dashboard_data
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error generating agreement dashboard: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@agreement_bp.route('/metrics/guidelines', methods=['GET'])
+def get_interpretation_guidelines():
     """Get guidelines for interpreting agreement metric values."""
     guidelines = {
         'cohen_kappa': {
@@ -860,65 +1025,12 @@ def convert_span_annotations_to_sequences(annotator_annotations: Dict[str, Dict[
     """
     Convert span-based annotations to agreement analysis sequences.
     
-    For span overlap agreement, we create unified annotation items across all texts
-    and determine agreement based on span overlap.
+    For span overlap agreement, spans of each text are unified into items
+    by overlap ratio (see utils.span_unification); items of all texts are
+    concatenated into one sequence per annotator.
     """
     try:
-        # Collect all unique annotation spans across all annotators
-        all_spans = []
-        
-        for annotator_name, text_annotations in annotator_annotations.items():
-            for text_id, annotations in text_annotations.items():
-                for ann in annotations:
-                    all_spans.append({
-                        'text_id': text_id,
-                        'start': ann['start'],
-                        'end': ann['end'],
-                        'label': ann['label'],
-                        'annotator': annotator_name
-                    })
-        
-        # Sort spans by text_id and start position
-        all_spans.sort(key=lambda x: (x['text_id'], x['start']))
-        
-        # Create unified annotation items by merging overlapping spans
-        unified_items = []
-        processed_spans = set()
-        
-        for i, span1 in enumerate(all_spans):
-            if i in processed_spans:
-                continue
-                
-            # Find all spans that overlap with this one
-            overlapping_spans = [span1]
-            processed_spans.add(i)
-            
-            for j, span2 in enumerate(all_spans[i+1:], i+1):
-                if j in processed_spans:
-                    continue
-                    
-                if (span1['text_id'] == span2['text_id'] and 
-                    calculate_overlap_ratio(span1, span2) >= overlap_threshold):
-                    overlapping_spans.append(span2)
-                    processed_spans.add(j)
-            
-            # Create unified item from overlapping spans
-            item_annotations = {}
-            for span in overlapping_spans:
-                item_annotations[span['annotator']] = span['label']
-            
-            unified_items.append(item_annotations)
-        
-        # Convert to annotator sequences
-        annotator_names = list(annotator_annotations.keys())
-        result = {name: [] for name in annotator_names}
-        
-        for item in unified_items:
-            for annotator_name in annotator_names:
-                # Use label if annotator annotated this item, otherwise None
-                result[annotator_name].append(item.get(annotator_name, None))
-        
-        return result
+        return unify_spans(annotator_annotations, overlap_threshold).to_sequences()
         
     except Exception as e:
         logger.error(f"Error converting span annotations: {str(e)}")
@@ -5,23 +5,51 @@ Text annotation management endpoints for creating and managing annotations.
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Response
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, select
 import logging
 
-from src.core.database import get_db
-from src.core.security import get_current_user
+from src.core.config import settings
+from src.core.conflict_detection import ConflictMonitor
+from src.core.database import SessionLocal, get_db, get_async_db
+from src.core.security import get_current_user, has_project_access
 from src.models.user import User
 from src.models.annotation import Annotation
 from src.models.text import Text
+from src.models.project import Project
 from src.models.label import Label
-from src.services.agreement_service import AgreementService
+from src.models.serialization import ANNOTATION_RESPONSE
+from src.services.agreement_queue import get_agreement_queue
+from src.utils.pagination import KeysetPaginator, NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
 
+def _detect_annotation_conflicts(annotation_id: int):
+    """Check a saved annotation for conflicts; runs after the response on its own session."""
+    db = SessionLocal()
+    try:
+        ConflictMonitor(db).monitor_annotation_changes(annotation_id)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Failed to run conflict detection: {str(e)}")
+    finally:
+        db.close()
+
+
+def _dismiss_annotation_conflicts(annotation_id: int, text_id: int):
+    """Drop a deleted annotation's conflicts; runs after the response on its own session."""
+    db = SessionLocal()
+    try:
+        ConflictMonitor(db).handle_annotation_deleted(annotation_id, text_id)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Failed to update conflicts after deletion: {str(e)}")
+    finally:
+        db.close()
+
+
 # Pydantic models
 class AnnotationCreate(BaseModel):
     text_id: int
@@ -49,6 +77,7 @@ class AnnotationResponse(BaseModel):
     created_at: Optional[str]
     updated_at: Optional[str]
     text_id: int
+    project_id: Optional[int] = None
     annotator_id: int
     label_id: int
     label_name: Optional[str]
@@ -74,6 +103,7 @@ class AnnotationValidation(BaseModel):
 @router.post("/", response_model=AnnotationResponse, status_code=status.HTTP_201_CREATED)
 async def create_annotation(
     annotation_data: AnnotationCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -87,7 +117,7 @@ async def create_annotation(
             detail="Text not found"
         )
     
-    if text.project.owner_id != current_user.id and not text.project.is_public:
+    if not has_project_access(db, current_user, text.project_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this text"
@@ -125,6 +155,7 @@ async def create_annotation(
     # Create annotation
     annotation = Annotation(
         text_id=annotation_data.text_id,
+        project_id=text.project_id,
         label_id=annotation_data.label_id,
         annotator_id=current_user.id,
         start_char=annotation_data.start_char,
@@ -145,69 +176,89 @@ async def create_annotation(
     db.commit()
     db.refresh(annotation)
     
-    # Trigger agreement calculation if enabled
+    # Queue agreement recalculation; bursts of saves on a text are coalesced
     try:
-        agreement_service = AgreementService(db)
-        agreement_service.trigger_agreement_calculation(annotation.id)
+        get_agreement_queue().mark_text_dirty(annotation.text_id)
     except Exception as e:
-        # Don't fail annotation creation if agreement calculation fails
+        # Don't fail annotation creation if agreement calculation cannot be queued
         logger = logging.getLogger(__name__)
-        logger.warning(f"Failed to trigger agreement calculation: {str(e)}")
+        logger.warning(f"Failed to queue agreement calculation: {str(e)}")
+    
+    # Check the new annotation against its neighbouring spans once the response is sent
+    if settings.CONFLICT_DETECTION_ON_SAVE:
+        background_tasks.add_task(_detect_annotation_conflicts, annotation.id)
     
     return AnnotationResponse(**annotation.to_dict())
 
 
 @router.get("/", response_model=List[AnnotationResponse])
 async def list_annotations(
+    response: Response,
     text_id: Optional[int] = Query(None),
     project_id: Optional[int] = Query(None),
     label_id: Optional[int] = Query(None),
     annotator_id: Optional[int] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List annotations with filters."""
+    """
+    List annotations with filters.
+    
+    Pages are ordered by id. The X-Next-Cursor response header holds the
+    cursor for the following page while more rows exist.
+    """
     
-    query = db.query(Annotation).join(Text).join(Text.project)
+    query = ANNOTATION_RESPONSE.apply(
+        select(Annotation).join(Project, Project.id == Annotation.project_id)
+    )
     
     # Access control: only annotations from accessible projects
-    query = query.filter(
+    query = query.where(
         or_(
-            Text.project.has(owner_id=current_user.id),
-            Text.project.has(is_public=True)
+            Project.owner_id == current_user.id,
+            Project.is_public == True
         )
     )
     
     # Apply filters
     if text_id:
-        query = query.filter(Annotation.text_id == text_id)
+        query = query.where(Annotation.text_id == text_id)
     
     if project_id:
-        query = query.filter(Text.project_id == project_id)
+        query = query.where(Annotation.project_id == project_id)
     
     if label_id:
-        query = query.filter(Annotation.label_id == label_id)
+        query = query.where(Annotation.label_id == label_id)
     
     if annotator_id:
-        query = query.filter(Annotation.annotator_id == annotator_id)
-    
-    # Apply pagination
-    annotations = query.offset(skip).limit(limit).all()
-    
-    return [AnnotationResponse(**annotation.to_dict()) for annotation in annotations]
+        query = query.where(Annotation.annotator_id == annotator_id)
+    
+    # Apply pagination: keyset when a cursor is given, offset otherwise
+    paginator = KeysetPaginator(Annotation.id)
+    if not cursor:
+        query = query.offset(skip)
+    rows = (await db.scalars(paginator.apply(query, cursor, limit))).all()
+    annotations, next_cursor = paginator.page(rows, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    return [AnnotationResponse(**data) for data in ANNOTATION_RESPONSE.serialize_all(annotations)]
 
 
 @router.get("/{annotation_id}", response_model=AnnotationResponse)
 async def get_annotation(
     annotation_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific annotation by ID."""
     
-    annotation = db.query(Annotation).filter(Annotation.id == annotation_id).first()
+    annotation = await db.scalar(
+        ANNOTATION_RESPONSE.apply(select(Annotation).where(Annotation.id == annotation_id))
+    )
     
     if not annotation:
         raise HTTPException(
@@ -216,20 +267,20 @@ async def get_annotation(
         )
     
     # Check project access
-    if (annotation.text.project.owner_id != current_user.id and 
-        not annotation.text.project.is_public):
+    if not await db.run_sync(has_project_access, current_user, annotation.project_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this annotation"
         )
     
-    return AnnotationResponse(**annotation.to_dict())
+    return AnnotationResponse(**ANNOTATION_RESPONSE.serialize(annotation))
 
 
 @router.put("/{annotation_id}", response_model=AnnotationResponse)
 async def update_annotation(
     annotation_id: int,
     annotation_update: AnnotationUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -245,7 +296,7 @@ async def update_annotation(
     
     # Check if user can modify (annotator or project owner)
     if (annotation.annotator_id != current_user.id and 
-        annotation.text.project.owner_id != current_user.id):
+        not has_project_access(db, current_user, annotation.project_id, owner_only=True)):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only the annotator or project owner can update this annotation"
@@ -257,7 +308,7 @@ async def update_annotation(
     # Validate label if being updated
     if "label_id" in update_data:
         label = db.query(Label).filter(Label.id == update_data["label_id"]).first()
-        if not label or label.project_id != annotation.text.project_id:
+        if not label or label.project_id != annotation.project_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid label for this project"
@@ -282,15 +333,20 @@ async def update_annotation(
     db.commit()
     db.refresh(annotation)
     
-    # Trigger agreement calculation if enabled and annotation content changed
+    # Queue agreement recalculation if annotation content changed
     if any(field in update_data for field in ['label_id', 'start_char', 'end_char']):
         try:
-            agreement_service = AgreementService(db)
-            agreement_service.trigger_agreement_calculation(annotation.id)
+            get_agreement_queue().mark_text_dirty(annotation.text_id)
         except Exception as e:
-            # Don't fail annotation update if agreement calculation fails
+            # Don't fail annotation update if agreement calculation cannot be queued
             logger = logging.getLogger(__name__)
-            logger.warning(f"Failed to trigger agreement calculation: {str(e)}")
+            logger.warning(f"Failed to queue agreement calculation: {str(e)}")
+    
+    # Re-check conflicts around the annotation if its span or label changed
+    if settings.CONFLICT_DETECTION_ON_SAVE and any(
+        field in update_data for field in ['label_id', 'start_char', 'end_char']
+    ):
+        background_tasks.add_task(_detect_annotation_conflicts, annotation.id)
     
     return AnnotationResponse(**annotation.to_dict())
 
@@ -313,7 +369,7 @@ async def validate_annotation(
         )
     
     # Only project owner can validate
-    if annotation.text.project.owner_id != current_user.id:
+    if not has_project_access(db, current_user, annotation.project_id, owner_only=True):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only project owner can validate annotations"
@@ -331,6 +387,7 @@ async def validate_annotation(
 @router.delete("/{annotation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_annotation(
     annotation_id: int,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -346,7 +403,7 @@ async def delete_annotation(
     
     # Check if user can delete (annotator or project owner)
     if (annotation.annotator_id != current_user.id and 
-        annotation.text.project.owner_id != current_user.id):
+        not has_project_access(db, current_user, annotation.project_id, owner_only=True)):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only the annotator or project owner can delete this annotation"
@@ -356,7 +413,19 @@ async def delete_annotation(
     if annotation.label:
         annotation.label.usage_count = max(0, annotation.label.usage_count - 1)
     
+    text_id = annotation.text_id
     db.delete(annotation)
     db.commit()
+
+    # Queue agreement recalculation for the text the annotation left
+    try:
+        get_agreement_queue().mark_text_dirty(text_id)
+    except Exception as e:
+        logger = logging.getLogger(__name__)
+        logger.warning(f"Failed to queue agreement calculation: {str(e)}")
+
+    # Drop the annotation from the conflict index and dismiss its open conflicts
+    if settings.CONFLICT_DETECTION_ON_SAVE:
+        background_tasks.add_task(_dismiss_annotation_conflicts, annotation_id, text_id)
     
     return None
\ No newline at end of file
@@ -123,7 +123,7 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, 
+        data={"sub": user.username, "ver": user.token_version or 0}, 
         expires_delta=access_token_expires
     )
     
@@ -136,9 +136,14 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_profile(current_user: User = Depends(get_current_user)):
+async def get_current_user_profile(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """Get current user profile."""
-    return UserResponse(**current_user.to_dict())
+    # The cached principal only carries auth fields; load the full profile
+    user = db.get(User, current_user.id)
+    return UserResponse(**user.to_dict())
 
 
 @router.put("/me", response_model=UserResponse)
@@ -149,19 +154,21 @@ async def update_user_profile(
 ):
     """Update current user profile."""
     
+    user = db.get(User, current_user.id)
+    
     # Update fields if provided
     if user_update.full_name is not None:
-        current_user.full_name = user_update.full_name
+        user.full_name = user_update.full_name
     if user_update.institution is not None:
-        current_user.institution = user_update.institution
+        user.institution = user_update.institution
     if user_update.bio is not None:
-        current_user.bio = user_update.bio
+        user.bio = user_update.bio
     
-    current_user.updated_at = datetime.utcnow()
+    user.updated_at = datetime.utcnow()
     db.commit()
-    db.refresh(current_user)
+    db.refresh(user)
     
-    return UserResponse(**current_user.to_dict())
+    return UserResponse(**user.to_dict())
 
 
 @router.post("/logout")
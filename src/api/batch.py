@@ -6,7 +6,7 @@ including creation, updates, validation, export, and user management operations.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Dict, Any, Optional, Union
 from pydantic import BaseModel, validator
 from uuid import uuid4
@@ -25,6 +25,7 @@ from src.models.label import Label
 from src.models.user import User
 from src.models.project import Project
 from src.models.text import Text
+from src.utils.advanced_exporters import ColumnarExporter
 from src.utils.batch_processor import BatchProcessor
 from src.utils.progress_tracker import ProgressTracker
 from src.utils.validation_engine import ValidationEngine
@@ -64,7 +65,7 @@ class BatchValidationRequest(BaseModel):
 class BatchExportRequest(BaseModel):
     """Model for batch export request"""
     project_id: int
-    export_format: str = "json"  # json, csv, coco, yolo
+    export_format: str = "json"  # json, csv, coco, yolo, parquet, arrow
     include_metadata: bool = True
     filter_criteria: Optional[Dict[str, Any]] = None
     
@@ -215,8 +216,6 @@ async def process_batch_annotation_creation(
         from src.core.database import engine
         session_factory = sessionmaker(bind=engine)
         db = session_factory()
-    
-    try:
         
         try:
             batch_op = db.query(BatchOperation).filter(BatchOperation.id == operation_id).first()
@@ -226,7 +225,7 @@ async def process_batch_annotation_creation(
                 batch_op.processed_items = result.success_count
                 batch_op.failed_items = result.failure_count
                 batch_op.result_data = {
-                    "created_annotations": [item.id for item in result.processed_items if hasattr(item, 'id')],
+                    "created_annotations": [getattr(item, 'id', item) for item in result.processed_items],
                     "errors": result.errors,
                     "execution_time": result.execution_time,
                     "performance_metrics": result.metadata
@@ -423,8 +422,8 @@ async def delete_batch_annotations(
 @router.post("/text/import", response_model=Dict[str, Any])
 async def import_bulk_text(
     request: BatchTextImport,
-    file: UploadFile = File(...),
     background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -654,8 +653,6 @@ async def process_bulk_text_import(
         from src.core.database import engine
         session_factory = sessionmaker(bind=engine)
         db = session_factory()
-    
-    try:
         
         try:
             batch_op = db.query(BatchOperation).filter(BatchOperation.id == operation_id).first()
@@ -904,50 +901,85 @@ async def process_batch_export(
         if request.filter_criteria:
             query = apply_export_filters(query, request.filter_criteria)
         
-        annotations = query.all()
-        batch_op.total_items = len(annotations)
-        db.commit()
-        
-        progress_tracker.initialize_operation(
-            operation_id,
-            len(annotations),
-            "Exporting data"
-        )
-        
-        # Export data based on format
-        export_data = await export_annotations_by_format(
-            annotations,
-            request.export_format,
-            request.include_metadata,
-            operation_id
-        )
-        
-        # Save export file
-        export_filename = f"export_{operation_id}.{request.export_format}"
-        export_path = f"exports/{export_filename}"
-        
-        with open(export_path, 'w') as f:
-            if request.export_format == 'json':
-                json.dump(export_data, f, indent=2)
-            elif request.export_format == 'csv':
-                writer = csv.DictWriter(f, fieldnames=export_data[0].keys())
-                writer.writeheader()
-                writer.writerows(export_data)
+        if request.export_format in ColumnarExporter.FORMATS:
+            # Columnar formats are written straight from a server-side cursor
+            record_count = query.count()
+            batch_op.total_items = record_count
+            db.commit()
+            
+            progress_tracker.initialize_operation(
+                operation_id,
+                record_count,
+                "Exporting data"
+            )
+            
+            extension = ColumnarExporter.FORMATS[request.export_format]["extension"]
+            export_filename = f"export_{operation_id}.{extension}"
+            export_path = f"exports/{export_filename}"
+            
+            query = query.options(
+                joinedload(Annotation.text).joinedload(Text.project),
+                joinedload(Annotation.label),
+                joinedload(Annotation.annotator)
+            ).order_by(Annotation.id)
+            
+            record_count = ColumnarExporter().write(
+                query.yield_per(1000),
+                export_path,
+                format_type=request.export_format,
+                include_metadata=request.include_metadata,
+                progress_callback=lambda written: progress_tracker.update_progress(
+                    operation_id,
+                    written,
+                    f"Exported {written}/{batch_op.total_items} records"
+                )
+            )
+        else:
+            annotations = query.all()
+            record_count = len(annotations)
+            batch_op.total_items = record_count
+            db.commit()
+            
+            progress_tracker.initialize_operation(
+                operation_id,
+                record_count,
+                "Exporting data"
+            )
+            
+            # Export data based on format
+            export_data = await export_annotations_by_format(
+                annotations,
+                request.export_format,
+                request.include_metadata,
+                operation_id
+            )
+            
+            # Save export file
+            export_filename = f"export_{operation_id}.{request.export_format}"
+            export_path = f"exports/{export_filename}"
+            
+            with open(export_path, 'w') as f:
+                if request.export_format == 'json':
+                    json.dump(export_data, f, indent=2)
+                elif request.export_format == 'csv':
+                    writer = csv.DictWriter(f, fieldnames=export_data[0].keys())
+                    writer.writeheader()
+                    writer.writerows(export_data)
         
         # Update operation status
         batch_op.status = "completed"
         batch_op.completed_at = datetime.utcnow()
-        batch_op.processed_items = len(annotations)
+        batch_op.processed_items = record_count
         batch_op.result_data = {
             "export_file": export_filename,
             "export_path": export_path,
-            "record_count": len(annotations)
+            "record_count": record_count
         }
         db.commit()
         
         progress_tracker.complete_operation(
             operation_id,
-            f"Exported {len(annotations)} records"
+            f"Exported {record_count} records"
         )
         
     except Exception as e:
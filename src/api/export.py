@@ -8,32 +8,51 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query as ORMQuery, contains_eager, joinedload
 import io
 import json
+from functools import partial
 import csv
 import pandas as pd
 from datetime import datetime
 
-from src.core.database import get_db
+from src.core.database import get_db, SessionLocal
 from src.core.security import get_current_user
 from src.core.config import settings
 from src.models.user import User
 from src.models.project import Project
 from src.models.annotation import Annotation
+from src.models.text import Text
+from src.utils.advanced_exporters import ColumnarExporter
 from src.utils.export_utils import (
-    export_annotations_to_json,
-    export_annotations_to_csv,
     export_annotations_to_xlsx,
-    export_annotations_to_xml
+    stream_annotations_to_json,
+    stream_annotations_to_csv,
+    stream_annotations_to_xml
 )
 
 router = APIRouter()
 
+# Rows fetched per round trip when streaming exports from a server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+columnar_exporter = ColumnarExporter()
+
+# Formats written incrementally as rows arrive: format -> (writer, media type)
+STREAMING_EXPORTERS = {
+    "json": (stream_annotations_to_json, "application/json"),
+    "csv": (stream_annotations_to_csv, "text/csv"),
+    "xml": (stream_annotations_to_xml, "application/xml"),
+    **{
+        format_type: (partial(columnar_exporter.stream, format_type=format_type), info["media_type"])
+        for format_type, info in ColumnarExporter.FORMATS.items()
+    }
+}
+
 
 # Pydantic models
 class ExportRequest(BaseModel):
-    format: str  # json, csv, xlsx, xml
+    format: str  # json, csv, xlsx, xml, parquet, arrow
     project_id: Optional[int] = None
     text_id: Optional[int] = None
     label_id: Optional[int] = None
@@ -66,21 +85,20 @@ async def export_annotations(
             detail=f"Unsupported format. Supported formats: {settings.EXPORT_FORMATS}"
         )
     
-    # Build query with access control
-    query = db.query(Annotation).join(Annotation.text).join(Annotation.text.has(project=True))
-    
     # Access control: only annotations from accessible projects
-    accessible_projects = db.query(Project).filter(
-        (Project.owner_id == current_user.id) | (Project.is_public == True)
-    ).all()
-    
-    project_ids = [p.id for p in accessible_projects]
+    project_ids = [
+        project_id for project_id, in db.query(Project.id).filter(
+            (Project.owner_id == current_user.id) | (Project.is_public == True)
+        )
+    ]
     if not project_ids:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No accessible projects found"
         )
     
+    query = db.query(Annotation).join(Annotation.text)
+    
     # Apply filters
     if export_request.project_id:
         if export_request.project_id not in project_ids:
@@ -88,9 +106,9 @@ async def export_annotations(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied to this project"
             )
-        query = query.filter(Annotation.text.has(project_id=export_request.project_id))
+        query = query.filter(Annotation.project_id == export_request.project_id)
     else:
-        query = query.filter(Annotation.text.has(project_id__in=project_ids))
+        query = query.filter(Annotation.project_id.in_(project_ids))
     
     if export_request.text_id:
         query = query.filter(Annotation.text_id == export_request.text_id)
@@ -104,56 +122,53 @@ async def export_annotations(
     if export_request.validated_only:
         query = query.filter(Annotation.is_validated == "approved")
     
-    # Get annotations
-    annotations = query.all()
-    
-    if not annotations:
+    # Check for matching rows without loading them
+    if not db.query(query.exists()).scalar():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No annotations found matching the criteria"
         )
     
+    # Load text, project, label and annotator in the same statement
+    query = query.options(
+        contains_eager(Annotation.text)
+        .load_only(Text.id, Text.title, Text.project_id)
+        .joinedload(Text.project),
+        joinedload(Annotation.label),
+        joinedload(Annotation.annotator)
+    ).order_by(Annotation.id)
+    
     # Generate export
     export_id = f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{current_user.id}"
     
     try:
-        if export_request.format == "json":
-            content = export_annotations_to_json(
-                annotations, 
-                include_metadata=export_request.include_metadata,
-                include_context=export_request.include_context
-            )
-            media_type = "application/json"
-            filename = f"{export_id}.json"
-            
-        elif export_request.format == "csv":
-            content = export_annotations_to_csv(
-                annotations,
-                include_metadata=export_request.include_metadata,
-                include_context=export_request.include_context
-            )
-            media_type = "text/csv"
-            filename = f"{export_id}.csv"
-            
-        elif export_request.format == "xlsx":
-            content = export_annotations_to_xlsx(
-                annotations,
-                include_metadata=export_request.include_metadata,
-                include_context=export_request.include_context
+        if export_request.format in STREAMING_EXPORTERS:
+            writer, media_type = STREAMING_EXPORTERS[export_request.format]
+            extension = ColumnarExporter.FORMATS.get(export_request.format, {}).get(
+                "extension", export_request.format
             )
-            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            filename = f"{export_id}.xlsx"
+            filename = f"{export_id}.{extension}"
             
-        elif export_request.format == "xml":
-            content = export_annotations_to_xml(
-                annotations,
-                include_metadata=export_request.include_metadata,
-                include_context=export_request.include_context
+            # Chunks are emitted as rows arrive, so no Content-Length is known
+            return StreamingResponse(
+                writer(
+                    iter_export_annotations(query),
+                    include_metadata=export_request.include_metadata,
+                    include_context=export_request.include_context
+                ),
+                media_type=media_type,
+                headers={"Content-Disposition": f"attachment; filename={filename}"}
             )
-            media_type = "application/xml"
-            filename = f"{export_id}.xml"
         
-        # Return file as streaming response
+        # XLSX is a zip container that can only be written once complete
+        content = export_annotations_to_xlsx(
+            iter_export_annotations(query),
+            include_metadata=export_request.include_metadata,
+            include_context=export_request.include_context
+        )
+        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        filename = f"{export_id}.xlsx"
+        
         return StreamingResponse(
             io.BytesIO(content),
             media_type=media_type,
@@ -170,6 +185,28 @@ async def export_annotations(
         )
 
 
+def iter_export_annotations(query: ORMQuery, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Iterate an export query through a server-side cursor.
+    
+    The query runs on its own session so the stream does not depend on the
+    request session outliving the response. Rows are fetched batch_size at a
+    time and released once the writers have serialized them.
+    
+    Args:
+        query: Annotation query with eager-loading options applied
+        batch_size: Rows fetched per round trip
+    
+    Yields:
+        Annotation objects in query order
+    """
+    db = SessionLocal()
+    try:
+        yield from query.with_session(db).yield_per(batch_size)
+    finally:
+        db.close()
+
+
 @router.get("/project/{project_id}/summary")
 async def export_project_summary(
     project_id: int,
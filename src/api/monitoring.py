@@ -23,6 +23,7 @@ from ..utils.monitoring import (
     AlertThreshold
 )
 from ..models.user import User
+from ..services.agreement_queue import get_agreement_queue
 
 
 # Pydantic models for API responses
@@ -320,6 +321,20 @@ async def get_system_metrics(
         raise HTTPException(status_code=500, detail="Failed to retrieve system metrics")
 
 
+@router.get("/agreement-queue")
+async def get_agreement_queue_status():
+    """
+    Get the state of the background agreement recalculation queue.
+    
+    Returns queue depth, in-flight jobs, lag from first mark to recalculation
+    and throughput counters.
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **get_agreement_queue().stats()
+    }
+
+
 @router.get("/alerts/active")
 async def get_active_alerts():
     """Get all currently active alerts."""
@@ -5,15 +5,19 @@ Project management endpoints for creating and managing annotation projects.
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 
-from src.core.database import get_db
+from src.core.database import get_db, get_async_db
 from src.core.security import get_current_user
 from src.models.user import User
 from src.models.project import Project
+from src.models.serialization import PROJECT_RESPONSE
+from src.services.cache_manager import get_cache_manager
+from src.utils.pagination import KeysetPaginator, NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
@@ -80,28 +84,38 @@ async def create_project(
     db.commit()
     db.refresh(project)
     
+    # Cached principals hold owned and public project ids
+    await get_cache_manager().invalidate_project_access(current_user.id, public_changed=project.is_public)
+    
     return ProjectResponse(**project.to_dict())
 
 
 @router.get("/", response_model=List[ProjectResponse])
 async def list_projects(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
     search: Optional[str] = Query(None),
     owner_only: bool = Query(False),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List projects with pagination and search."""
+    """
+    List projects with pagination and search.
+    
+    Pages are ordered by id. The X-Next-Cursor response header holds the
+    cursor for the following page while more rows exist.
+    """
     
-    query = db.query(Project)
+    query = PROJECT_RESPONSE.apply(select(Project))
     
     # Filter by owner if requested
     if owner_only:
-        query = query.filter(Project.owner_id == current_user.id)
+        query = query.where(Project.owner_id == current_user.id)
     else:
         # Show user's projects and public projects
-        query = query.filter(
+        query = query.where(
             or_(
                 Project.owner_id == current_user.id,
                 Project.is_public == True
@@ -111,28 +125,36 @@ async def list_projects(
     # Search filter
     if search:
         search_filter = f"%{search}%"
-        query = query.filter(
+        query = query.where(
             or_(
                 Project.name.ilike(search_filter),
                 Project.description.ilike(search_filter)
             )
         )
     
-    # Apply pagination
-    projects = query.offset(skip).limit(limit).all()
+    # Apply pagination: keyset when a cursor is given, offset otherwise
+    paginator = KeysetPaginator(Project.id)
+    if not cursor:
+        query = query.offset(skip)
+    rows = (await db.scalars(paginator.apply(query, cursor, limit))).all()
+    projects, next_cursor = paginator.page(rows, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
-    return [ProjectResponse(**project.to_dict()) for project in projects]
+    return [ProjectResponse(**data) for data in PROJECT_RESPONSE.serialize_all(projects)]
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific project by ID."""
     
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.scalar(
+        PROJECT_RESPONSE.apply(select(Project).where(Project.id == project_id))
+    )
     
     if not project:
         raise HTTPException(
@@ -147,7 +169,7 @@ async def get_project(
             detail="Access denied to this project"
         )
     
-    return ProjectResponse(**project.to_dict())
+    return ProjectResponse(**PROJECT_RESPONSE.serialize(project))
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
@@ -174,6 +196,8 @@ async def update_project(
             detail="Only project owner can update the project"
         )
     
+    was_public = project.is_public
+    
     # Update fields
     update_data = project_update.dict(exclude_unset=True)
     for field, value in update_data.items():
@@ -182,6 +206,9 @@ async def update_project(
     db.commit()
     db.refresh(project)
     
+    if project.is_public != was_public:
+        await get_cache_manager().invalidate_project_access(public_changed=True)
+    
     return ProjectResponse(**project.to_dict())
 
 
@@ -208,7 +235,10 @@ async def delete_project(
             detail="Only project owner can delete the project"
         )
     
+    was_public = project.is_public
+    
     db.delete(project)
     db.commit()
+    await get_cache_manager().invalidate_project_access(current_user.id, public_changed=was_public)
     
     return None
\ No newline at end of file
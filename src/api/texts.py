@@ -5,20 +5,23 @@ Text document management endpoints for upload and text processing.
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, UploadFile, File
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 import os
 import aiofiles
 
-from src.core.database import get_db
-from src.core.security import get_current_user
+from src.core.database import get_db, get_async_db
+from src.core.security import get_current_user, has_project_access
 from src.core.config import settings
 from src.models.user import User
 from src.models.project import Project
 from src.models.text import Text
 from src.utils.text_processor import process_uploaded_file
+from src.models.serialization import TEXT_DETAIL, TEXT_SUMMARY
+from src.utils.pagination import KeysetPaginator, NEXT_CURSOR_HEADER
 
 router = APIRouter()
 
@@ -179,74 +182,89 @@ async def upload_text_file(
 
 @router.get("/", response_model=List[TextResponse])
 async def list_texts(
+    response: Response,
     project_id: Optional[int] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
     search: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List texts with pagination and search."""
+    """
+    List texts with pagination and search.
+    
+    Pages are ordered by id. The X-Next-Cursor response header holds the
+    cursor for the following page while more rows exist.
+    """
     
-    query = db.query(Text)
+    query = TEXT_SUMMARY.apply(select(Text))
     
     # Filter by project if specified
     if project_id:
-        # Verify project access
-        project = db.query(Project).filter(Project.id == project_id).first()
-        if not project:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Project not found"
-            )
-        
-        if project.owner_id != current_user.id and not project.is_public:
+        # Verify project access; the project is only loaded when the cached
+        # principal does not grant it
+        if not await db.run_sync(has_project_access, current_user, project_id):
+            if not await db.get(Project, project_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Project not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied to this project"
             )
         
-        query = query.filter(Text.project_id == project_id)
+        query = query.where(Text.project_id == project_id)
     else:
         # Show texts from accessible projects only
-        accessible_projects = db.query(Project).filter(
-            or_(
-                Project.owner_id == current_user.id,
-                Project.is_public == True
+        project_ids = (await db.scalars(
+            select(Project.id).where(
+                or_(
+                    Project.owner_id == current_user.id,
+                    Project.is_public == True
+                )
             )
-        ).all()
+        )).all()
         
-        project_ids = [p.id for p in accessible_projects]
         if project_ids:
-            query = query.filter(Text.project_id.in_(project_ids))
+            query = query.where(Text.project_id.in_(project_ids))
         else:
             return []  # No accessible projects
     
     # Search filter
     if search:
         search_filter = f"%{search}%"
-        query = query.filter(
+        query = query.where(
             or_(
                 Text.title.ilike(search_filter),
                 Text.content.ilike(search_filter)
             )
         )
     
-    # Apply pagination
-    texts = query.offset(skip).limit(limit).all()
+    # Apply pagination: keyset when a cursor is given, offset otherwise
+    paginator = KeysetPaginator(Text.id)
+    if not cursor:
+        query = query.offset(skip)
+    rows = (await db.scalars(paginator.apply(query, cursor, limit))).all()
+    texts, next_cursor = paginator.page(rows, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
-    return [TextResponse(**text.to_dict(include_content=False)) for text in texts]
+    return [TextResponse(**data) for data in TEXT_SUMMARY.serialize_all(texts)]
 
 
 @router.get("/{text_id}", response_model=TextResponse)
 async def get_text(
     text_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific text by ID."""
     
-    text = db.query(Text).filter(Text.id == text_id).first()
+    text = await db.scalar(
+        TEXT_DETAIL.apply(select(Text).where(Text.id == text_id))
+    )
     
     if not text:
         raise HTTPException(
@@ -255,13 +273,13 @@ async def get_text(
         )
     
     # Check project access
-    if text.project.owner_id != current_user.id and not text.project.is_public:
+    if not await db.run_sync(has_project_access, current_user, text.project_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this text"
         )
     
-    return TextResponse(**text.to_dict())
+    return TextResponse(**TEXT_DETAIL.serialize(text))
 
 
 @router.put("/{text_id}", response_model=TextResponse)
@@ -282,7 +300,7 @@ async def update_text(
         )
     
     # Check project ownership
-    if text.project.owner_id != current_user.id:
+    if not has_project_access(db, current_user, text.project_id, owner_only=True):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only project owner can update texts"
@@ -320,7 +338,7 @@ async def delete_text(
         )
     
     # Check project ownership
-    if text.project.owner_id != current_user.id:
+    if not has_project_access(db, current_user, text.project_id, owner_only=True):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only project owner can delete texts"
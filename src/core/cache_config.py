@@ -57,6 +57,7 @@ class CacheConfig:
     
     # Connection pooling
     max_connections: int = 50
+    pool_timeout: float = 5.0  # seconds to wait for a free pooled connection
     connection_pool_kwargs: Dict[str, Any] = None
     
     # Timeout settings
@@ -74,6 +75,10 @@ class CacheConfig:
     default_ttl: int = 3600  # 1 hour
     max_ttl: int = 86400     # 24 hours
     compression_threshold: int = 1024  # bytes
+    serializer_codec: str = "orjson"  # orjson, msgpack or pickle
+    compression: str = "zlib"  # none, zlib, zstd or lz4
+    compression_dictionary_path: Optional[str] = None  # trained zstd dictionary
+    batch_size: int = 500  # keys per MGET / pipeline flush
     
     # Performance
     decode_responses: bool = True
@@ -177,6 +182,7 @@ class CacheConfigManager:
         
         # Connection pooling
         config.max_connections = int(os.getenv("REDIS_MAX_CONNECTIONS", config.max_connections))
+        config.pool_timeout = float(os.getenv("REDIS_POOL_TIMEOUT", config.pool_timeout))
         
         # Timeouts
         config.socket_timeout = float(os.getenv("REDIS_SOCKET_TIMEOUT", config.socket_timeout))
@@ -188,6 +194,10 @@ class CacheConfigManager:
         
         # Performance
         config.compression_threshold = int(os.getenv("REDIS_COMPRESSION_THRESHOLD", config.compression_threshold))
+        config.serializer_codec = os.getenv("REDIS_SERIALIZER_CODEC", config.serializer_codec)
+        config.compression = os.getenv("REDIS_COMPRESSION", config.compression)
+        config.compression_dictionary_path = os.getenv("REDIS_COMPRESSION_DICTIONARY")
+        config.batch_size = int(os.getenv("REDIS_BATCH_SIZE", config.batch_size))
         
         # Mode configuration
         mode_str = os.getenv("REDIS_MODE", "standalone").lower()
@@ -15,16 +15,37 @@ import pickle
 import zlib
 import time
 import hashlib
-from typing import Any, Optional, Dict, List, Union, Callable, TypeVar, Generic
+from enum import IntEnum
+from typing import Any, Optional, Dict, List, Tuple, Union, Callable, TypeVar, Generic, Iterable
 from datetime import datetime, timedelta
 from functools import wraps
 from contextlib import asynccontextmanager
 
-import redis
-from redis.sentinel import Sentinel
-from redis.cluster import RedisCluster
+import redis.asyncio as redis
+from redis.asyncio.sentinel import Sentinel
+from redis.asyncio.cluster import RedisCluster, ClusterNode
 from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
 from .cache_config import CacheConfig, CacheStrategy, CacheMode, CacheMetrics, load_cache_config
 from ..utils.logger import get_logger
 
@@ -43,56 +64,199 @@ class CacheConnectionError(Exception):
     pass
 
 
+class Codec(IntEnum):
+    """Payload encodings, stored in bits 3-5 of the header byte"""
+    JSON = 1
+    MSGPACK = 2
+    PICKLE = 3
+
+
+class Compression(IntEnum):
+    """Payload compressors, stored in bits 0-2 of the header byte"""
+    NONE = 0
+    ZLIB = 1
+    ZSTD = 2
+    LZ4 = 3
+
+
 class Serializer:
-    """Handles serialization/deserialization with compression"""
+    """
+    Encodes cache values behind a one-byte header.
+    
+    The header holds the format version (top two bits), the codec and the
+    compressor, so decoding never has to guess. Plain dict/list/scalar DTOs
+    use orjson or msgpack; anything those cannot represent exactly (ORM
+    objects, datetimes, non-string JSON keys) falls back to pickle.
+    """
+    
+    FORMAT_VERSION = 2
+    
+    def __init__(
+        self,
+        codec: str = "orjson",
+        compression: str = "zlib",
+        dictionary: Optional[bytes] = None
+    ):
+        self.codec = self._resolve_codec(codec)
+        self.compression = self._resolve_compression(compression)
+        self._zstd_dict = zstd.ZstdCompressionDict(dictionary) if dictionary and zstd else None
+        self._compressors = {}
+        self._decompressors = {}
+    
+    @classmethod
+    def from_config(cls, config: CacheConfig) -> "Serializer":
+        """Build a serializer from cache configuration"""
+        dictionary = None
+        if config.compression_dictionary_path:
+            with open(config.compression_dictionary_path, "rb") as f:
+                dictionary = f.read()
+        return cls(config.serializer_codec, config.compression, dictionary)
     
     @staticmethod
-    def serialize(data: Any, compress_threshold: int = 1024) -> bytes:
+    def train_dictionary(samples: List[Any], size: int = 16384, codec: str = "orjson") -> bytes:
+        """
+        Train a zstd dictionary from representative cache values.
+        
+        Args:
+            samples: Values as they would be passed to serialize
+            size: Dictionary size in bytes
+            codec: Codec the samples will be encoded with
+        
+        Returns:
+            Dictionary bytes, suitable for compression_dictionary_path
+        """
+        if zstd is None:
+            raise SerializationError("zstandard is not installed")
+        serializer = Serializer(codec=codec, compression="none")
+        encoded = [serializer._encode(sample)[1] for sample in samples]
+        return zstd.train_dictionary(size, encoded).as_bytes()
+    
+    def serialize(self, data: Any, compress_threshold: int = 1024) -> bytes:
         """Serialize data with optional compression"""
         try:
-            if isinstance(data, (str, int, float, bool)):
-                # Simple types - use JSON for readability
-                serialized = json.dumps(data).encode('utf-8')
-            else:
-                # Complex types - use pickle
-                serialized = pickle.dumps(data)
+            codec, payload = self._encode(data)
+            compression = Compression.NONE
             
-            # Compress if data is large enough
-            if len(serialized) > compress_threshold:
-                compressed = zlib.compress(serialized)
-                # Only use compression if it actually reduces size
-                if len(compressed) < len(serialized):
-                    return b'compressed:' + compressed
+            # Compress if data is large enough and it actually reduces size
+            if self.compression != Compression.NONE and len(payload) > compress_threshold:
+                compressed = self._compress(payload)
+                if len(compressed) < len(payload):
+                    payload, compression = compressed, self.compression
             
-            return b'raw:' + serialized
+            header = (self.FORMAT_VERSION << 6) | (codec << 3) | compression
+            return bytes((header,)) + payload
             
+        except SerializationError:
+            raise
         except Exception as e:
             raise SerializationError(f"Failed to serialize data: {str(e)}")
     
-    @staticmethod
-    def deserialize(data: bytes) -> Any:
-        """Deserialize data with automatic decompression"""
+    def deserialize(self, data: bytes) -> Any:
+        """Deserialize data according to its header byte"""
         try:
-            if data.startswith(b'compressed:'):
-                # Decompress first
-                compressed_data = data[11:]  # Remove 'compressed:' prefix
-                decompressed = zlib.decompress(compressed_data)
-                data = b'raw:' + decompressed
-            
-            if data.startswith(b'raw:'):
-                serialized_data = data[4:]  # Remove 'raw:' prefix
-                try:
-                    # Try JSON first (for simple types)
-                    return json.loads(serialized_data.decode('utf-8'))
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    # Fall back to pickle
-                    return pickle.loads(serialized_data)
+            if not data:
+                raise ValueError("empty payload")
+            
+            header = data[0]
+            if header >> 6 != self.FORMAT_VERSION:
+                return self._deserialize_legacy(data)
+            
+            codec = Codec((header >> 3) & 0b111)
+            payload = self._decompress(Compression(header & 0b111), data[1:])
             
-            # Fallback - assume raw pickle data (backward compatibility)
-            return pickle.loads(data)
+            if codec == Codec.JSON:
+                return orjson.loads(payload)
+            if codec == Codec.MSGPACK:
+                return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+            return pickle.loads(payload)
             
         except Exception as e:
             raise SerializationError(f"Failed to deserialize data: {str(e)}")
+    
+    def _encode(self, data: Any) -> Tuple[Codec, bytes]:
+        """Encode with the configured codec, falling back to pickle"""
+        try:
+            if self.codec == Codec.JSON:
+                # Passthrough options make orjson reject what it would change on round trip
+                return Codec.JSON, orjson.dumps(
+                    data,
+                    option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                    | orjson.OPT_PASSTHROUGH_SUBCLASS
+                )
+            if self.codec == Codec.MSGPACK:
+                return Codec.MSGPACK, msgpack.packb(data, use_bin_type=True)
+        except (TypeError, ValueError, OverflowError):
+            pass
+        return Codec.PICKLE, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def _compress(self, payload: bytes) -> bytes:
+        if self.compression == Compression.ZSTD:
+            compressor = self._compressors.get(Compression.ZSTD)
+            if compressor is None:
+                compressor = zstd.ZstdCompressor(level=3, dict_data=self._zstd_dict)
+                self._compressors[Compression.ZSTD] = compressor
+            return compressor.compress(payload)
+        if self.compression == Compression.LZ4:
+            return lz4_frame.compress(payload)
+        return zlib.compress(payload)
+    
+    def _decompress(self, compression: Compression, payload: bytes) -> bytes:
+        if compression == Compression.NONE:
+            return payload
+        if compression == Compression.ZSTD:
+            decompressor = self._decompressors.get(Compression.ZSTD)
+            if decompressor is None:
+                decompressor = zstd.ZstdDecompressor(dict_data=self._zstd_dict)
+                self._decompressors[Compression.ZSTD] = decompressor
+            return decompressor.decompress(payload)
+        if compression == Compression.LZ4:
+            return lz4_frame.decompress(payload)
+        return zlib.decompress(payload)
+    
+    @staticmethod
+    def _deserialize_legacy(data: bytes) -> Any:
+        """Read entries written with the old b'raw:'/b'compressed:' prefixes"""
+        if data.startswith(b'compressed:'):
+            data = b'raw:' + zlib.decompress(data[11:])
+        if not data.startswith(b'raw:'):
+            raise ValueError("unknown payload header")
+        
+        serialized_data = data[4:]
+        try:
+            return json.loads(serialized_data.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return pickle.loads(serialized_data)
+    
+    @staticmethod
+    def _resolve_codec(name: str) -> Codec:
+        """Map a codec name to an installed codec, falling back to pickle"""
+        name = name.lower()
+        if name in ("orjson", "json") and orjson is not None:
+            return Codec.JSON
+        if name == "msgpack" and msgpack is not None:
+            return Codec.MSGPACK
+        if name not in ("orjson", "json", "msgpack", "pickle"):
+            raise ValueError(f"Unknown cache codec: {name}")
+        if name != "pickle":
+            logger.warning(f"Cache codec '{name}' is not installed, using pickle")
+        return Codec.PICKLE
+    
+    @staticmethod
+    def _resolve_compression(name: str) -> Compression:
+        """Map a compression name to an installed compressor, falling back to zlib"""
+        name = name.lower()
+        available = {
+            "none": True,
+            "zlib": True,
+            "zstd": zstd is not None,
+            "lz4": lz4_frame is not None
+        }
+        if name not in available:
+            raise ValueError(f"Unknown cache compression: {name}")
+        if not available[name]:
+            logger.warning(f"Cache compression '{name}' is not installed, using zlib")
+            return Compression.ZLIB
+        return Compression[name.upper()]
 
 
 class CacheKey:
@@ -126,18 +290,55 @@ class CacheKey:
         return f"{prefix}:{pattern}"
 
 
+class CacheTag:
+    """
+    Names for the tag sets that group cache entries for invalidation.
+    
+    Each tagged entry is added to a Redis set per tag, so invalidating a tag
+    costs O(entries with that tag) instead of a scan over the keyspace.
+    """
+    
+    PREFIX = "tag"
+    
+    @staticmethod
+    def project(project_id: int) -> str:
+        return f"project:{project_id}"
+    
+    @staticmethod
+    def text(text_id: int) -> str:
+        return f"text:{text_id}"
+    
+    @staticmethod
+    def user(user_id: int) -> str:
+        return f"user:{user_id}"
+    
+    @staticmethod
+    def principals() -> str:
+        return "principals"
+    
+    @staticmethod
+    def set_key(tag: str) -> str:
+        """Redis key of the set holding a tag's members"""
+        return f"{CacheTag.PREFIX}:{tag}"
+
+
 class CacheService:
     """Redis cache service with advanced features"""
     
     def __init__(self, config: Optional[CacheConfig] = None):
         self.config = config or load_cache_config()
         self.redis_client: Optional[Union[redis.Redis, RedisCluster]] = None
-        self.serializer = Serializer()
+        self.serializer = Serializer.from_config(self.config)
         self.metrics = CacheMetrics()
         self._connection_lock = asyncio.Lock()
         
     async def connect(self) -> bool:
-        """Establish Redis connection"""
+        """
+        Establish the Redis connection.
+        
+        Concurrent first callers share a single connection attempt; once a
+        client exists this returns immediately.
+        """
         if self.redis_client:
             return True
             
@@ -146,46 +347,13 @@ class CacheService:
                 return True
                 
             try:
-                if self.config.mode == CacheMode.CLUSTER:
-                    self.redis_client = RedisCluster(
-                        startup_nodes=self.config.cluster_nodes,
-                        password=self.config.password,
-                        socket_timeout=self.config.socket_timeout,
-                        socket_connect_timeout=self.config.socket_connect_timeout,
-                        decode_responses=False,  # We handle serialization ourselves
-                        skip_full_coverage_check=True
-                    )
-                elif self.config.mode == CacheMode.SENTINEL:
-                    sentinel = Sentinel(self.config.sentinel_hosts)
-                    self.redis_client = sentinel.master_for(
-                        self.config.sentinel_service_name,
-                        password=self.config.password,
-                        socket_timeout=self.config.socket_timeout,
-                        socket_connect_timeout=self.config.socket_connect_timeout,
-                        decode_responses=False
-                    )
-                else:
-                    # Standalone mode
-                    connection_pool = redis.ConnectionPool(
-                        host=self.config.host,
-                        port=self.config.port,
-                        password=self.config.password,
-                        db=self.config.database,
-                        max_connections=self.config.max_connections,
-                        socket_timeout=self.config.socket_timeout,
-                        socket_connect_timeout=self.config.socket_connect_timeout,
-                        socket_keepalive=self.config.socket_keepalive,
-                        socket_keepalive_options=self.config.socket_keepalive_options,
-                        **self.config.connection_pool_kwargs
-                    )
-                    
-                    self.redis_client = redis.Redis(
-                        connection_pool=connection_pool,
-                        decode_responses=False
-                    )
+                client = self._create_redis_client()
                 
                 # Test connection
-                await self._ping()
+                if not await self._ping(client):
+                    raise CacheConnectionError("ping failed")
+                
+                self.redis_client = client
                 logger.info(f"Connected to Redis in {self.config.mode.value} mode")
                 return True
                 
@@ -194,26 +362,78 @@ class CacheService:
                 self.metrics.record_error()
                 raise CacheConnectionError(f"Redis connection failed: {str(e)}")
     
-    async def _ping(self) -> bool:
+    def _create_redis_client(self) -> Union[redis.Redis, RedisCluster]:
+        """Build an asyncio Redis client for the configured deployment mode"""
+        if self.config.mode == CacheMode.CLUSTER:
+            return RedisCluster(
+                startup_nodes=[
+                    ClusterNode(node["host"], int(node["port"]))
+                    for node in self.config.cluster_nodes or []
+                ],
+                password=self.config.password,
+                max_connections=self.config.max_connections,
+                socket_timeout=self.config.socket_timeout,
+                socket_connect_timeout=self.config.socket_connect_timeout,
+                decode_responses=False  # We handle serialization ourselves
+            )
+        
+        if self.config.mode == CacheMode.SENTINEL:
+            sentinel = Sentinel(
+                self.config.sentinel_hosts,
+                socket_timeout=self.config.socket_timeout
+            )
+            return sentinel.master_for(
+                self.config.sentinel_service_name,
+                password=self.config.password,
+                socket_timeout=self.config.socket_timeout,
+                socket_connect_timeout=self.config.socket_connect_timeout,
+                decode_responses=False
+            )
+        
+        # Standalone mode: callers wait up to pool_timeout for a free
+        # connection instead of opening unbounded new ones under load
+        connection_pool = redis.BlockingConnectionPool(
+            host=self.config.host,
+            port=self.config.port,
+            password=self.config.password,
+            db=self.config.database,
+            max_connections=self.config.max_connections,
+            timeout=self.config.pool_timeout,
+            socket_timeout=self.config.socket_timeout,
+            socket_connect_timeout=self.config.socket_connect_timeout,
+            socket_keepalive=self.config.socket_keepalive,
+            socket_keepalive_options=self.config.socket_keepalive_options,
+            health_check_interval=self.config.health_check_interval,
+            **self.config.connection_pool_kwargs
+        )
+        
+        return redis.Redis(
+            connection_pool=connection_pool,
+            decode_responses=False
+        )
+    
+    async def _client(self) -> Union[redis.Redis, RedisCluster]:
+        """Return the connected client, connecting on first use"""
+        if self.redis_client is None:
+            await self.connect()
+        return self.redis_client
+    
+    async def _ping(self, client=None) -> bool:
         """Test Redis connection"""
         try:
-            if asyncio.iscoroutinefunction(self.redis_client.ping):
-                result = await self.redis_client.ping()
-            else:
-                result = self.redis_client.ping()
-            return bool(result)
+            return bool(await (client or self.redis_client).ping())
         except Exception as e:
             logger.error(f"Redis ping failed: {str(e)}")
             return False
     
     async def disconnect(self):
-        """Close Redis connection"""
+        """Close Redis connection and its pool"""
         if self.redis_client:
             try:
-                if hasattr(self.redis_client, 'close'):
+                if hasattr(self.redis_client, 'aclose'):
+                    await self.redis_client.aclose()
+                else:
                     await self.redis_client.close()
-                elif hasattr(self.redis_client, 'connection_pool'):
-                    self.redis_client.connection_pool.disconnect()
                 logger.info("Disconnected from Redis")
             except Exception as e:
                 logger.warning(f"Error during Redis disconnect: {str(e)}")
@@ -225,13 +445,9 @@ class CacheService:
         start_time = time.time()
         
         try:
-            if not await self.connect():
-                return default
+            client = await self._client()
             
-            if asyncio.iscoroutinefunction(self.redis_client.get):
-                data = await self.redis_client.get(key)
-            else:
-                data = self.redis_client.get(key)
+            data = await client.get(key)
             
             response_time = time.time() - start_time
             
@@ -259,20 +475,16 @@ class CacheService:
         value: Any, 
         ttl: Optional[int] = None, 
         nx: bool = False, 
-        xx: bool = False
+        xx: bool = False,
+        tags: Optional[Iterable[str]] = None
     ) -> bool:
-        """Set value in cache"""
+        """Set value in cache, registering the key under any given tags"""
         start_time = time.time()
         
         try:
-            if not await self.connect():
-                return False
+            client = await self._client()
             
-            # Use default TTL if not specified
-            if ttl is None:
-                ttl = self.config.default_ttl
-            elif ttl > self.config.max_ttl:
-                ttl = self.config.max_ttl
+            ttl = self._resolve_ttl(ttl)
             
             # Serialize the data
             try:
@@ -282,15 +494,15 @@ class CacheService:
                 self.metrics.record_error()
                 return False
             
-            # Set with TTL and conditions
-            if asyncio.iscoroutinefunction(self.redis_client.set):
-                result = await self.redis_client.set(
-                    key, data, ex=ttl, nx=nx, xx=xx
-                )
+            if tags:
+                # SET and tag registration share one round trip
+                pipe = client.pipeline(transaction=False)
+                pipe.set(key, data, ex=ttl, nx=nx, xx=xx)
+                self._add_tags(pipe, [key], tags)
+                result = (await pipe.execute())[0]
             else:
-                result = self.redis_client.set(
-                    key, data, ex=ttl, nx=nx, xx=xx
-                )
+                # Set with TTL and conditions
+                result = await client.set(key, data, ex=ttl, nx=nx, xx=xx)
             
             response_time = time.time() - start_time
             self.metrics.record_set(response_time)
@@ -307,13 +519,11 @@ class CacheService:
         start_time = time.time()
         
         try:
-            if not await self.connect() or not keys:
+            if not keys:
                 return 0
+            client = await self._client()
             
-            if asyncio.iscoroutinefunction(self.redis_client.delete):
-                count = await self.redis_client.delete(*keys)
-            else:
-                count = self.redis_client.delete(*keys)
+            count = await client.delete(*keys)
             
             response_time = time.time() - start_time
             self.metrics.record_delete(response_time)
@@ -325,16 +535,136 @@ class CacheService:
             self.metrics.record_error()
             return 0
     
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several values in one MGET round trip per chunk.
+        
+        Args:
+            keys: Cache keys to fetch
+        
+        Returns:
+            Mapping of key to value for the keys that were found
+        """
+        start_time = time.time()
+        keys = list(dict.fromkeys(keys))
+        
+        try:
+            if not keys:
+                return {}
+            client = await self._client()
+            
+            # Cluster MGET must stay within one hash slot
+            mget = client.mget_nonatomic if self.config.mode == CacheMode.CLUSTER else client.mget
+            
+            values = []
+            for chunk in self._chunks(keys):
+                values.extend(await mget(chunk))
+            
+            response_time = (time.time() - start_time) / len(keys)
+            results = {}
+            
+            for key, data in zip(keys, values):
+                if data is None:
+                    self.metrics.record_miss(response_time)
+                    continue
+                try:
+                    results[key] = self.serializer.deserialize(data)
+                    self.metrics.record_hit(response_time)
+                except SerializationError as e:
+                    logger.warning(f"Failed to deserialize cached data for key '{key}': {str(e)}")
+                    self.metrics.record_error()
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Cache get_many error for {len(keys)} keys: {str(e)}")
+            self.metrics.record_error()
+            return {}
+    
+    async def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Optional[Union[int, Dict[str, int]]] = None,
+        tags: Optional[Union[Iterable[str], Dict[str, Iterable[str]]]] = None
+    ) -> int:
+        """
+        Set several values with pipelined SET commands.
+        
+        Args:
+            mapping: Mapping of key to value
+            ttl: TTL for every key, or a mapping of key to TTL. Keys missing
+                from the mapping use the default TTL.
+            tags: Tags every key is registered under, or a mapping of key to tags
+        
+        Returns:
+            Number of keys written
+        """
+        start_time = time.time()
+        
+        try:
+            if not mapping:
+                return 0
+            client = await self._client()
+            
+            entries = []
+            for key, value in mapping.items():
+                key_ttl = ttl.get(key) if isinstance(ttl, dict) else ttl
+                try:
+                    data = self.serializer.serialize(value, self.config.compression_threshold)
+                except SerializationError as e:
+                    logger.error(f"Failed to serialize data for key '{key}': {str(e)}")
+                    self.metrics.record_error()
+                    continue
+                entries.append((key, data, self._resolve_ttl(key_ttl)))
+            
+            written = 0
+            for chunk in self._chunks(entries):
+                pipe = client.pipeline(transaction=False)
+                for key, data, key_ttl in chunk:
+                    pipe.set(key, data, ex=key_ttl)
+                if isinstance(tags, dict):
+                    for key, _, _ in chunk:
+                        self._add_tags(pipe, [key], tags.get(key, ()))
+                elif tags:
+                    self._add_tags(pipe, [key for key, _, _ in chunk], tags)
+                
+                results = await pipe.execute()
+                written += sum(1 for result in results[:len(chunk)] if result)
+            
+            if entries:
+                response_time = (time.time() - start_time) / len(entries)
+                for _ in range(written):
+                    self.metrics.record_set(response_time)
+            
+            return written
+            
+        except Exception as e:
+            logger.error(f"Cache set_many error for {len(mapping)} keys: {str(e)}")
+            self.metrics.record_error()
+            return 0
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete keys in chunked DEL commands.
+        
+        Args:
+            keys: Cache keys to delete
+        
+        Returns:
+            Number of keys removed
+        """
+        keys = list(dict.fromkeys(keys))
+        count = 0
+        for chunk in self._chunks(keys):
+            count += await self.delete(*chunk)
+        return count
+    
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache"""
         try:
-            if not await self.connect():
-                return False
+            client = await self._client()
             
-            if asyncio.iscoroutinefunction(self.redis_client.exists):
-                result = await self.redis_client.exists(key)
-            else:
-                result = self.redis_client.exists(key)
+            result = await client.exists(key)
             
             return bool(result)
             
@@ -345,13 +675,9 @@ class CacheService:
     async def ttl(self, key: str) -> int:
         """Get TTL for key (-1 = no expire, -2 = doesn't exist)"""
         try:
-            if not await self.connect():
-                return -2
+            client = await self._client()
             
-            if asyncio.iscoroutinefunction(self.redis_client.ttl):
-                result = await self.redis_client.ttl(key)
-            else:
-                result = self.redis_client.ttl(key)
+            result = await client.ttl(key)
             
             return int(result)
             
@@ -362,13 +688,9 @@ class CacheService:
     async def expire(self, key: str, ttl: int) -> bool:
         """Set TTL for existing key"""
         try:
-            if not await self.connect():
-                return False
+            client = await self._client()
             
-            if asyncio.iscoroutinefunction(self.redis_client.expire):
-                result = await self.redis_client.expire(key, ttl)
-            else:
-                result = self.redis_client.expire(key, ttl)
+            result = await client.expire(key, ttl)
             
             return bool(result)
             
@@ -377,42 +699,83 @@ class CacheService:
             return False
     
     async def keys(self, pattern: str = "*") -> List[str]:
-        """Get keys matching pattern"""
+        """
+        Get keys matching pattern.
+        
+        Uses cursor-based SCAN so Redis is never blocked for a full keyspace
+        walk. Intended for admin and diagnostics paths; invalidation on write
+        paths goes through invalidate_tags.
+        """
         try:
-            if not await self.connect():
-                return []
+            client = await self._client()
             
-            if asyncio.iscoroutinefunction(self.redis_client.keys):
-                keys = await self.redis_client.keys(pattern)
-            else:
-                keys = self.redis_client.keys(pattern)
+            keys = [
+                key async for key in client.scan_iter(match=pattern, count=self.config.batch_size)
+            ]
             
-            # Decode keys if needed
-            if keys and isinstance(keys[0], bytes):
-                return [key.decode('utf-8') for key in keys]
-            return list(keys)
+            # SCAN may return a key more than once
+            return list(dict.fromkeys(
+                key.decode('utf-8') if isinstance(key, bytes) else key for key in keys
+            ))
             
         except Exception as e:
             logger.error(f"Cache keys error for pattern '{pattern}': {str(e)}")
             return []
     
     async def flush_pattern(self, pattern: str) -> int:
-        """Delete all keys matching pattern"""
+        """Delete all keys matching pattern (SCAN based, for admin use)"""
         keys = await self.keys(pattern)
         if keys:
-            return await self.delete(*keys)
+            return await self.delete_many(keys)
         return 0
     
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Delete every entry registered under the given tags.
+        
+        Each tag set is read and removed in one MULTI/EXEC so entries tagged
+        concurrently land in a fresh set rather than being lost.
+        
+        Args:
+            tags: Tags to invalidate
+        
+        Returns:
+            Number of cache entries deleted
+        """
+        try:
+            if not tags:
+                return 0
+            client = await self._client()
+            
+            # Cluster pipelines cannot run MULTI/EXEC across nodes
+            transaction = self.config.mode != CacheMode.CLUSTER
+            members = set()
+            for tag in dict.fromkeys(tags):
+                pipe = client.pipeline(transaction=transaction)
+                pipe.smembers(CacheTag.set_key(tag))
+                pipe.delete(CacheTag.set_key(tag))
+                tag_members, _ = await pipe.execute()
+                members.update(
+                    member.decode('utf-8') if isinstance(member, bytes) else member
+                    for member in tag_members or ()
+                )
+            
+            count = await self.delete_many(sorted(members))
+            if count:
+                logger.debug(f"Invalidated {count} cache entries for tags {list(tags)}")
+            return count
+            
+        except Exception as e:
+            logger.error(f"Cache tag invalidation error for tags {tags}: {str(e)}")
+            self.metrics.record_error()
+            return 0
+    
     async def flush_all(self) -> bool:
         """Clear entire cache"""
         try:
-            if not await self.connect():
-                return False
+            client = await self._client()
             
-            if asyncio.iscoroutinefunction(self.redis_client.flushall):
-                result = await self.redis_client.flushall()
-            else:
-                result = self.redis_client.flushall()
+            result = await client.flushall()
             
             return bool(result)
             
@@ -423,13 +786,9 @@ class CacheService:
     async def get_info(self) -> Dict[str, Any]:
         """Get Redis server information"""
         try:
-            if not await self.connect():
-                return {}
+            client = await self._client()
             
-            if asyncio.iscoroutinefunction(self.redis_client.info):
-                info = await self.redis_client.info()
-            else:
-                info = self.redis_client.info()
+            info = await client.info()
             
             return dict(info)
             
@@ -437,6 +796,25 @@ class CacheService:
             logger.error(f"Cache info error: {str(e)}")
             return {}
     
+    def _resolve_ttl(self, ttl: Optional[int]) -> int:
+        """Apply the default and maximum TTL to a requested TTL"""
+        if ttl is None:
+            return self.config.default_ttl
+        return min(ttl, self.config.max_ttl)
+    
+    def _add_tags(self, pipe, keys: List[str], tags: Iterable[str]):
+        """Queue SADD/EXPIRE commands registering keys under tags"""
+        for tag in tags:
+            tag_key = CacheTag.set_key(tag)
+            pipe.sadd(tag_key, *keys)
+            # Members may outlive their entries; the set expires with the longest possible entry
+            pipe.expire(tag_key, self.config.max_ttl)
+    
+    def _chunks(self, items: List[Any]) -> List[List[Any]]:
+        """Split items into batches of at most batch_size"""
+        size = max(1, self.config.batch_size)
+        return [items[i:i + size] for i in range(0, len(items), size)]
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get cache performance metrics"""
         return self.metrics.to_dict()
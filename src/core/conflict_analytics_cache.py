@@ -0,0 +1,118 @@
+"""
+Conflict Analytics Cache
+
+Per-project, in-process cache of grouped conflict analytics (patterns,
+problematic pairs, resolution effectiveness, per-annotator conflict
+statistics). Each entry is stamped with the project's conflict version:
+counts and latest update times of its conflicts and their resolutions,
+read with one aggregate query. A cached result is served while the version
+is unchanged, so repeated quality analyses of a large project cost one
+aggregate query per analysis instead of one grouped scan.
+
+Entries are evicted in LRU order and dropped after ``max_age_seconds`` so
+changes the version does not see (renamed users, reassigned annotations)
+are eventually picked up.
+"""
+
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.models.conflict import AnnotationConflict, ConflictResolution
+
+
+ConflictVersion = Tuple[Any, ...]
+
+
+def conflict_version(db: Session, project_id: int) -> ConflictVersion:
+    """Counts and latest update times of a project's conflicts and resolutions."""
+    conflicts = (
+        db.query(func.count(AnnotationConflict.id), func.max(AnnotationConflict.updated_at))
+        .filter(AnnotationConflict.project_id == project_id)
+        .one()
+    )
+    resolutions = (
+        db.query(func.count(ConflictResolution.id), func.max(ConflictResolution.updated_at))
+        .join(AnnotationConflict, ConflictResolution.conflict_id == AnnotationConflict.id)
+        .filter(AnnotationConflict.project_id == project_id)
+        .one()
+    )
+    return tuple(conflicts) + tuple(resolutions)
+
+
+class ProjectConflictAnalytics:
+    """Analytics results of one project at one conflict version."""
+
+    def __init__(self, project_id: int, version: ConflictVersion):
+        self.project_id = project_id
+        self.version = version
+        self.results: Dict[str, Any] = {}
+        self.loaded_at = time.monotonic()
+
+
+class ConflictAnalyticsCache:
+    """Bounded LRU cache of per-project conflict analytics."""
+
+    def __init__(self, max_projects: int = 100, max_age_seconds: float = 300):
+        self.max_projects = max_projects
+        self.max_age_seconds = max_age_seconds
+        self._entries: "OrderedDict[int, ProjectConflictAnalytics]" = OrderedDict()
+        self._lock = RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, db: Session, project_id: int, name: str,
+                       compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result ``name`` for a project, computing it when the
+        project's conflicts changed since it was stored.
+        """
+        version = conflict_version(db, project_id)
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if (entry is None or entry.version != version
+                    or time.monotonic() - entry.loaded_at > self.max_age_seconds):
+                entry = ProjectConflictAnalytics(project_id, version)
+                self._entries[project_id] = entry
+            self._entries.move_to_end(project_id)
+            while len(self._entries) > self.max_projects:
+                self._entries.popitem(last=False)
+
+            if name in entry.results:
+                self.hits += 1
+                return entry.results[name]
+            self.misses += 1
+
+        result = compute()
+        with self._lock:
+            # Only store against the version the result was computed for
+            if self._entries.get(project_id) is entry:
+                entry.results[name] = result
+        return result
+
+    def invalidate(self, project_id: Optional[int] = None) -> None:
+        """Drop one project's analytics, or all of them."""
+        with self._lock:
+            if project_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(project_id, None)
+
+
+_conflict_analytics_cache: Optional[ConflictAnalyticsCache] = None
+
+
+def get_conflict_analytics_cache() -> ConflictAnalyticsCache:
+    """Get the process-wide conflict analytics cache."""
+    global _conflict_analytics_cache
+    if _conflict_analytics_cache is None:
+        _conflict_analytics_cache = ConflictAnalyticsCache(
+            max_projects=settings.CONFLICT_ANALYTICS_CACHE_MAX_PROJECTS,
+            max_age_seconds=settings.CONFLICT_ANALYTICS_CACHE_MAX_AGE_SECONDS
+        )
+    return _conflict_analytics_cache
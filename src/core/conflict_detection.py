@@ -6,23 +6,37 @@ label disagreements, and quality disputes. Integrates with the annotation system
 to provide real-time conflict detection and monitoring.
 """
 
-from typing import List, Dict, Any, Tuple, Optional, Set
+from typing import List, Dict, Any, Iterable, Iterator, Tuple, Optional, Set
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from itertools import groupby
+from operator import attrgetter
 import logging
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from sqlalchemy import or_, func
 
+from src.core.conflict_index import (
+    OPEN_CONFLICT_STATUSES, ConflictIndexRegistry, conflict_key,
+    get_conflict_index_registry
+)
+from src.core.span_index import SpanIndex
 from src.models.annotation import Annotation
 from src.models.conflict import (
     AnnotationConflict, ConflictType, ConflictStatus, 
     ConflictSettings, ResolutionStrategy
 )
 from src.models.project import Project
+from src.models.text import Text
 from src.models.user import User
 
 logger = logging.getLogger(__name__)
 
+# Maximum start/end distance for two annotations to be compared for quality disputes
+QUALITY_PROXIMITY_CHARS = 50
+
+# Default look-back for check_new_only project scans
+DEFAULT_RECENT_WINDOW = timedelta(hours=1)
+
 
 @dataclass
 class OverlapInfo:
@@ -51,15 +65,21 @@ class ConflictCandidate:
 class ConflictDetectionEngine:
     """Main engine for detecting annotation conflicts."""
     
-    def __init__(self, db_session: Session):
+    def __init__(
+        self,
+        db_session: Session,
+        index_registry: Optional[ConflictIndexRegistry] = None
+    ):
         self.db = db_session
+        self.index_registry = index_registry
         self.logger = logging.getLogger(__name__)
     
     def detect_conflicts_for_project(
         self, 
         project_id: int,
         check_new_only: bool = True,
-        batch_size: int = 1000
+        batch_size: int = 1000,
+        recent_window: timedelta = DEFAULT_RECENT_WINDOW
     ) -> List[ConflictCandidate]:
         """
         Detect all conflicts for a project.
@@ -67,7 +87,8 @@ class ConflictDetectionEngine:
         Args:
             project_id: Project to check for conflicts
             check_new_only: Only check recently added/modified annotations
-            batch_size: Number of annotations to process per batch
+            batch_size: Number of annotation rows fetched per round trip
+            recent_window: How far back check_new_only looks for changes
         
         Returns:
             List of detected conflict candidates
@@ -76,17 +97,14 @@ class ConflictDetectionEngine:
         if not settings.enable_conflict_detection:
             return []
         
-        # Get annotations to check
-        annotations = self._get_annotations_for_detection(project_id, check_new_only)
-        self.logger.info(f"Checking {len(annotations)} annotations for conflicts in project {project_id}")
-        
-        conflict_candidates = []
+        # Stream annotations to check from a single bulk query, one text at a time
+        annotations = self._get_annotations_for_detection(
+            project_id, check_new_only, batch_size, recent_window
+        )
+        self.logger.info(f"Checking annotations for conflicts in project {project_id}")
         
-        # Process annotations in batches
-        for i in range(0, len(annotations), batch_size):
-            batch = annotations[i:i + batch_size]
-            batch_conflicts = self._detect_conflicts_in_batch(batch, settings)
-            conflict_candidates.extend(batch_conflicts)
+        # Build one overlap index per text as its annotations arrive
+        conflict_candidates = self._detect_conflicts_in_batch(annotations, settings)
         
         # Filter by confidence threshold
         filtered_conflicts = [
@@ -112,41 +130,91 @@ class ConflictDetectionEngine:
         Returns:
             List of detected conflict candidates
         """
-        annotation = self.db.query(Annotation).filter_by(id=annotation_id).first()
-        if not annotation:
+        return self.detect_conflicts_for_annotations([annotation_id], context_window)
+    
+    def detect_conflicts_for_annotations(
+        self,
+        annotation_ids: List[int],
+        context_window: int = 1000
+    ) -> List[ConflictCandidate]:
+        """
+        Detect conflicts for several annotations at once.
+        
+        All annotations of the affected texts are loaded with one bulk query
+        and indexed per text, so each annotation is matched against the index
+        instead of issuing its own candidate query.
+        
+        Args:
+            annotation_ids: Annotations to check for conflicts
+            context_window: Character window around each annotation to check
+        
+        Returns:
+            List of detected conflict candidates, grouped by annotation
+        """
+        if not annotation_ids:
             return []
         
-        settings = self._get_project_settings(annotation.project_id)
-        if not settings.enable_conflict_detection:
+        targets = {
+            annotation.id: annotation
+            for annotation in (
+                self.db.query(Annotation)
+                .options(selectinload(Annotation.text))
+                .filter(Annotation.id.in_(annotation_ids))
+                .all()
+            )
+        }
+        if not targets:
             return []
         
-        # Get potentially conflicting annotations in the same text
-        candidates = self._get_candidate_annotations(
-            annotation, context_window, settings
-        )
+        indexes = self._build_text_indexes({a.text_id for a in targets.values()})
+        settings_cache: Dict[int, ConflictSettings] = {}
         
         conflict_candidates = []
-        for candidate in candidates:
-            conflicts = self._analyze_annotation_pair(annotation, candidate, settings)
-            conflict_candidates.extend(conflicts)
+        for annotation_id in annotation_ids:
+            annotation = targets.get(annotation_id)
+            if annotation is None:
+                continue
+            
+            project_id = annotation.text.project_id
+            if project_id not in settings_cache:
+                settings_cache[project_id] = self._get_project_settings(project_id)
+            settings = settings_cache[project_id]
+            if not settings.enable_conflict_detection:
+                continue
+            
+            candidates = self._get_candidate_annotations(
+                annotation, indexes[annotation.text_id], context_window
+            )
+            for candidate in candidates:
+                conflict_candidates.extend(
+                    self._analyze_annotation_pair(annotation, candidate, settings)
+                )
         
         return conflict_candidates
     
     def _get_annotations_for_detection(
         self, 
         project_id: int, 
-        check_new_only: bool
-    ) -> List[Annotation]:
-        """Get annotations that need conflict detection."""
+        check_new_only: bool,
+        batch_size: int = 1000,
+        recent_window: timedelta = DEFAULT_RECENT_WINDOW
+    ) -> Iterator[Annotation]:
+        """
+        Stream annotations that need conflict detection, ordered by text.
+        
+        Rows are fetched batch_size at a time, so a text's annotations can be
+        checked and released before the next text's are read.
+        """
         query = (
             self.db.query(Annotation)
             .join(Annotation.text)
-            .filter(Annotation.text.has(project_id=project_id))
+            .options(contains_eager(Annotation.text), selectinload(Annotation.label))
+            .filter(Text.project_id == project_id)
         )
         
         if check_new_only:
-            # Only check annotations created/updated in the last hour
-            cutoff_time = datetime.utcnow() - timedelta(hours=1)
+            # Only check annotations created/updated within the window
+            cutoff_time = datetime.utcnow() - recent_window
             query = query.filter(
                 or_(
                     Annotation.created_at >= cutoff_time,
@@ -154,53 +222,67 @@ class ConflictDetectionEngine:
                 )
             )
         
-        return query.all()
+        return iter(query.order_by(Annotation.text_id).yield_per(batch_size))
+    
+    def _build_text_indexes(self, text_ids: Set[int]) -> Dict[int, SpanIndex]:
+        """Load all annotations of the given texts and index them per text."""
+        indexes = {text_id: SpanIndex() for text_id in text_ids}
+        annotations = (
+            self.db.query(Annotation)
+            .options(selectinload(Annotation.text), selectinload(Annotation.label))
+            .filter(Annotation.text_id.in_(text_ids))
+            .all()
+        )
+        for annotation in annotations:
+            indexes[annotation.text_id].add(annotation)
+        return indexes
     
     def _get_candidate_annotations(
         self, 
         annotation: Annotation, 
-        context_window: int,
-        settings: ConflictSettings
+        index: SpanIndex,
+        context_window: int
     ) -> List[Annotation]:
         """Get annotations that could potentially conflict with the given annotation."""
-        # Calculate search window
+        # Only overlapping or nearby spans can produce conflicts
+        candidates = {
+            candidate.id: candidate
+            for candidate in index.overlapping(
+                annotation.start_char, annotation.end_char, exclude_id=annotation.id
+            ) + index.near(
+                annotation.start_char, annotation.end_char,
+                QUALITY_PROXIMITY_CHARS, exclude_id=annotation.id
+            )
+        }
+        
+        # Restrict to the search window around the annotation
         search_start = max(0, annotation.start_char - context_window)
         search_end = annotation.end_char + context_window
-        
-        # Find overlapping annotations in the same text
-        candidates = (
-            self.db.query(Annotation)
-            .filter(
-                Annotation.text_id == annotation.text_id,
-                Annotation.id != annotation.id,
-                Annotation.start_char < search_end,
-                Annotation.end_char > search_start
-            )
-            .all()
+        return sorted(
+            (
+                candidate for candidate in candidates.values()
+                if candidate.start_char < search_end and candidate.end_char > search_start
+            ),
+            key=lambda candidate: candidate.start_char
         )
-        
-        return candidates
     
     def _detect_conflicts_in_batch(
         self, 
-        annotations: List[Annotation], 
+        annotations: Iterable[Annotation], 
         settings: ConflictSettings
     ) -> List[ConflictCandidate]:
-        """Detect conflicts within a batch of annotations."""
+        """Detect conflicts within a stream of annotations ordered by text."""
         conflicts = []
+        checked = 0
         
-        # Group annotations by text for efficient comparison
-        text_groups = {}
-        for annotation in annotations:
-            if annotation.text_id not in text_groups:
-                text_groups[annotation.text_id] = []
-            text_groups[annotation.text_id].append(annotation)
-        
-        # Check each text group for conflicts
-        for text_id, text_annotations in text_groups.items():
+        # Only one text's annotations are held at a time
+        for text_id, text_annotations in groupby(annotations, key=attrgetter("text_id")):
+            text_annotations = list(text_annotations)
+            checked += len(text_annotations)
             text_conflicts = self._detect_conflicts_in_text(text_annotations, settings)
             conflicts.extend(text_conflicts)
         
+        self.logger.debug(f"Checked {checked} annotations for conflicts")
         return conflicts
     
     def _detect_conflicts_in_text(
@@ -211,18 +293,12 @@ class ConflictDetectionEngine:
         """Detect conflicts between annotations in the same text."""
         conflicts = []
         
-        # Sort annotations by start position for efficient comparison
-        sorted_annotations = sorted(annotations, key=lambda a: a.start_char)
-        
-        # Compare each pair of annotations
-        for i, ann_a in enumerate(sorted_annotations):
-            for ann_b in sorted_annotations[i + 1:]:
-                # Skip if annotations are too far apart
-                if ann_b.start_char > ann_a.end_char + 100:  # Reasonable gap threshold
-                    break
-                
-                pair_conflicts = self._analyze_annotation_pair(ann_a, ann_b, settings)
-                conflicts.extend(pair_conflicts)
+        # Only overlapping pairs and pairs close enough for a quality dispute
+        # can produce conflicts; the index enumerates exactly those
+        index = SpanIndex(annotations)
+        for ann_a, ann_b in index.candidate_pairs(QUALITY_PROXIMITY_CHARS):
+            pair_conflicts = self._analyze_annotation_pair(ann_a, ann_b, settings)
+            conflicts.extend(pair_conflicts)
         
         return conflicts
     
@@ -418,7 +494,7 @@ class ConflictDetectionEngine:
                 abs(ann_a.end_char - ann_b.end_char)
             )
             
-            if distance <= 50:  # Close proximity
+            if distance <= QUALITY_PROXIMITY_CHARS:  # Close proximity
                 severity = "high" if confidence_diff >= 0.7 else "medium"
                 
                 description = (
@@ -494,13 +570,24 @@ class ConflictDetectionEngine:
         conflict_candidates: List[ConflictCandidate]
     ) -> List[AnnotationConflict]:
         """Create database records for detected conflicts."""
-        created_conflicts = []
+        if not conflict_candidates:
+            return []
+        
+        # Resolve duplicate checks for all candidates at once
+        open_keys = self._get_open_conflict_keys(
+            {candidate.annotation_a.text_id for candidate in conflict_candidates}
+        )
         
+        created_conflicts = []
+        created_keys = []
         for candidate in conflict_candidates:
             # Check if conflict already exists
-            existing_conflict = self._find_existing_conflict(candidate)
-            if existing_conflict:
+            key = conflict_key(
+                candidate.annotation_a.id, candidate.annotation_b.id, candidate.conflict_type
+            )
+            if key in open_keys:
                 continue
+            open_keys.add(key)
             
             # Create new conflict record
             conflict = AnnotationConflict(
@@ -526,54 +613,140 @@ class ConflictDetectionEngine:
             
             self.db.add(conflict)
             created_conflicts.append(conflict)
+            created_keys.append(key)
         
         if created_conflicts:
             self.db.commit()
             self.logger.info(f"Created {len(created_conflicts)} new conflict records")
+            self._register_conflicts(created_conflicts, created_keys)
         
         return created_conflicts
     
-    def _find_existing_conflict(self, candidate: ConflictCandidate) -> Optional[AnnotationConflict]:
-        """Check if a conflict already exists for the given candidate."""
-        return (
-            self.db.query(AnnotationConflict)
-            .filter(
-                or_(
-                    and_(
-                        AnnotationConflict.annotation_a_id == candidate.annotation_a.id,
-                        AnnotationConflict.annotation_b_id == candidate.annotation_b.id
-                    ),
-                    and_(
-                        AnnotationConflict.annotation_a_id == candidate.annotation_b.id,
-                        AnnotationConflict.annotation_b_id == candidate.annotation_a.id
-                    )
-                ),
-                AnnotationConflict.conflict_type == candidate.conflict_type,
-                AnnotationConflict.status.in_([
-                    ConflictStatus.DETECTED,
-                    ConflictStatus.ASSIGNED,
-                    ConflictStatus.IN_REVIEW,
-                    ConflictStatus.VOTING,
-                    ConflictStatus.EXPERT_REVIEW
-                ])
+    def _get_open_conflict_keys(self, text_ids: Set[int]) -> Set[Tuple[int, int, ConflictType]]:
+        """
+        Keys of open conflicts on the given texts.
+        
+        Texts with a loaded conflict index are answered from memory; the
+        remaining texts are resolved with a single query.
+        """
+        keys = set()
+        missing_text_ids = set()
+        for text_id in text_ids:
+            index = self.index_registry.peek(text_id) if self.index_registry else None
+            if index is None:
+                missing_text_ids.add(text_id)
+            else:
+                keys.update(index.open_conflicts)
+        
+        if missing_text_ids:
+            rows = (
+                self.db.query(
+                    AnnotationConflict.annotation_a_id,
+                    AnnotationConflict.annotation_b_id,
+                    AnnotationConflict.conflict_type
+                )
+                .filter(
+                    AnnotationConflict.text_id.in_(missing_text_ids),
+                    AnnotationConflict.status.in_(OPEN_CONFLICT_STATUSES)
+                )
+                .all()
             )
-            .first()
-        )
+            keys.update(conflict_key(a_id, b_id, conflict_type) for a_id, b_id, conflict_type in rows)
+        
+        return keys
+    
+    def _register_conflicts(
+        self,
+        conflicts: List[AnnotationConflict],
+        keys: List[Tuple[int, int, ConflictType]]
+    ):
+        """Record newly created conflicts in any loaded conflict indexes."""
+        if not self.index_registry:
+            return
+        
+        with self.index_registry.lock:
+            for conflict, key in zip(conflicts, keys):
+                index = self.index_registry.peek(conflict.text_id)
+                if index is not None:
+                    index.add_conflict(key, conflict.id)
 
 
 class ConflictMonitor:
     """Real-time monitoring of annotation conflicts."""
     
-    def __init__(self, db_session: Session):
+    def __init__(
+        self,
+        db_session: Session,
+        index_registry: Optional[ConflictIndexRegistry] = None
+    ):
         self.db = db_session
-        self.detection_engine = ConflictDetectionEngine(db_session)
+        self.index_registry = index_registry or get_conflict_index_registry()
+        self.detection_engine = ConflictDetectionEngine(db_session, self.index_registry)
         self.logger = logging.getLogger(__name__)
     
     def monitor_annotation_changes(self, annotation_id: int) -> List[AnnotationConflict]:
-        """Monitor for new conflicts when an annotation is created or updated."""
+        """
+        Monitor for new conflicts when an annotation is created or updated.
+        
+        The changed annotation is re-indexed in its text's conflict index and
+        compared only with the annotations whose spans overlap or lie near
+        it. Open conflicts involving it that no longer apply are dismissed.
+        """
+        text_id = None
         try:
-            # Detect conflicts for the specific annotation
-            candidates = self.detection_engine.detect_conflicts_for_annotation(annotation_id)
+            annotation = (
+                self.db.query(Annotation)
+                .options(selectinload(Annotation.text), selectinload(Annotation.label))
+                .filter(Annotation.id == annotation_id)
+                .first()
+            )
+            if annotation is None:
+                return []
+            text_id = annotation.text_id
+            
+            settings = self.detection_engine._get_project_settings(annotation.text.project_id)
+            if not settings.enable_conflict_detection:
+                return []
+            
+            with self.index_registry.lock:
+                index = self.index_registry.get(self.db, annotation.text_id)
+                index.upsert_span(annotation.id, annotation.start_char, annotation.end_char)
+                neighbour_ids = {
+                    span.id
+                    for span in index.spans.overlapping(
+                        annotation.start_char, annotation.end_char, exclude_id=annotation.id
+                    ) + index.spans.near(
+                        annotation.start_char, annotation.end_char,
+                        QUALITY_PROXIMITY_CHARS, exclude_id=annotation.id
+                    )
+                }
+                previous_keys = index.conflicts_for(annotation.id)
+            
+            neighbours = []
+            if neighbour_ids:
+                neighbours = (
+                    self.db.query(Annotation)
+                    .options(selectinload(Annotation.text), selectinload(Annotation.label))
+                    .filter(Annotation.id.in_(neighbour_ids))
+                    .order_by(Annotation.start_char)
+                    .all()
+                )
+            
+            candidates = []
+            for neighbour in neighbours:
+                candidates.extend(
+                    self.detection_engine._analyze_annotation_pair(annotation, neighbour, settings)
+                )
+            
+            # Conflicts that the changed spans no longer produce
+            current_keys = {
+                conflict_key(c.annotation_a.id, c.annotation_b.id, c.conflict_type)
+                for c in candidates
+            }
+            self._dismiss_stale_conflicts(
+                annotation.text_id,
+                {key: conflict_id for key, conflict_id in previous_keys.items() if key not in current_keys}
+            )
             
             # Create conflict records
             conflicts = self.detection_engine.create_conflict_records(candidates)
@@ -585,9 +758,92 @@ class ConflictMonitor:
             return conflicts
         
         except Exception as e:
+            self.db.rollback()
+            if text_id is not None:
+                self.index_registry.invalidate(text_id)
             self.logger.error(f"Error monitoring annotation {annotation_id}: {e}")
             return []
     
+    def handle_annotation_deleted(self, annotation_id: int, text_id: int):
+        """Remove a deleted annotation from its text's index and dismiss its open conflicts."""
+        try:
+            with self.index_registry.lock:
+                index = self.index_registry.peek(text_id)
+                if index is not None:
+                    index.remove_span(annotation_id)
+                    stale = index.conflicts_for(annotation_id)
+                else:
+                    stale = {}
+            
+            if index is None:
+                rows = (
+                    self.db.query(
+                        AnnotationConflict.id,
+                        AnnotationConflict.annotation_a_id,
+                        AnnotationConflict.annotation_b_id,
+                        AnnotationConflict.conflict_type
+                    )
+                    .filter(
+                        AnnotationConflict.text_id == text_id,
+                        or_(
+                            AnnotationConflict.annotation_a_id == annotation_id,
+                            AnnotationConflict.annotation_b_id == annotation_id
+                        ),
+                        AnnotationConflict.status.in_(OPEN_CONFLICT_STATUSES)
+                    )
+                    .all()
+                )
+                stale = {
+                    conflict_key(a_id, b_id, conflict_type): conflict_id
+                    for conflict_id, a_id, b_id, conflict_type in rows
+                }
+            
+            self._dismiss_stale_conflicts(text_id, stale)
+        
+        except Exception as e:
+            self.db.rollback()
+            self.index_registry.invalidate(text_id)
+            self.logger.error(f"Error handling deletion of annotation {annotation_id}: {e}")
+    
+    def _dismiss_stale_conflicts(
+        self,
+        text_id: int,
+        stale: Dict[Tuple[int, int, ConflictType], int]
+    ):
+        """Dismiss detected conflicts that no longer apply and drop them from the index."""
+        if not stale:
+            return
+        
+        # Conflicts already picked up by a resolver are left for them to close
+        dismissed = (
+            self.db.query(AnnotationConflict)
+            .filter(
+                AnnotationConflict.id.in_(stale.values()),
+                AnnotationConflict.status == ConflictStatus.DETECTED
+            )
+            .update(
+                {
+                    AnnotationConflict.status: ConflictStatus.DISMISSED,
+                    AnnotationConflict.resolved_at: datetime.utcnow()
+                },
+                synchronize_session=False
+            )
+        )
+        self.db.commit()
+        
+        if dismissed:
+            self.logger.info(f"Dismissed {dismissed} stale conflicts on text {text_id}")
+        
+        # Reload the text's conflicts on next use unless every stale one was dismissed
+        with self.index_registry.lock:
+            if dismissed == len(stale):
+                index = self.index_registry.peek(text_id)
+                if index is not None:
+                    for key in stale:
+                        index.remove_conflict(key)
+            else:
+                self.index_registry.invalidate(text_id)
+    
     def _trigger_conflict_notifications(self, conflicts: List[AnnotationConflict]):
         """Trigger notifications for newly detected conflicts."""
         # This would integrate with the notification system
@@ -605,7 +861,7 @@ def detect_project_conflicts(
     check_new_only: bool = True
 ) -> List[AnnotationConflict]:
     """Convenience function to detect and create conflicts for a project."""
-    engine = ConflictDetectionEngine(db_session)
+    engine = ConflictDetectionEngine(db_session, get_conflict_index_registry())
     candidates = engine.detect_conflicts_for_project(project_id, check_new_only)
     conflicts = engine.create_conflict_records(candidates)
     return conflicts
@@ -0,0 +1,189 @@
+"""
+Incremental Conflict Index
+
+Per-text, in-process index backing incremental conflict detection. Each
+entry keeps the spans of a text in a SpanIndex together with the open
+conflicts between its annotations, so that after an annotation is created,
+updated or deleted only its neighbours are re-analyzed and duplicate checks
+are answered from memory instead of one query per candidate.
+
+Entries are loaded lazily with two queries per text, evicted in LRU order
+and reloaded after ``max_age_seconds`` so changes made by other worker
+processes are picked up.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import RLock
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.span_index import SpanIndex
+from src.models.annotation import Annotation
+from src.models.conflict import AnnotationConflict, ConflictStatus, ConflictType
+
+
+# Conflicts in these states block re-detection of the same pair
+OPEN_CONFLICT_STATUSES = (
+    ConflictStatus.DETECTED,
+    ConflictStatus.ASSIGNED,
+    ConflictStatus.IN_REVIEW,
+    ConflictStatus.VOTING,
+    ConflictStatus.EXPERT_REVIEW,
+)
+
+ConflictKey = Tuple[int, int, ConflictType]
+
+
+def conflict_key(annotation_a_id: int, annotation_b_id: int,
+                 conflict_type: ConflictType) -> ConflictKey:
+    """Order-independent key for a conflict between two annotations."""
+    low, high = sorted((annotation_a_id, annotation_b_id))
+    return low, high, conflict_type
+
+
+@dataclass(frozen=True)
+class SpanSnapshot:
+    """Immutable span of an annotation as stored in the index."""
+    id: int
+    start_char: int
+    end_char: int
+
+
+class TextConflictIndex:
+    """Spans and open conflicts of a single text."""
+
+    def __init__(self, text_id: int):
+        self.text_id = text_id
+        self.spans = SpanIndex()
+        self.open_conflicts: Dict[ConflictKey, int] = {}
+        self._keys_by_annotation: Dict[int, Set[ConflictKey]] = {}
+        self.loaded_at = time.monotonic()
+
+    def upsert_span(self, annotation_id: int, start_char: int, end_char: int) -> None:
+        self.spans.add(SpanSnapshot(annotation_id, start_char, end_char))
+
+    def remove_span(self, annotation_id: int) -> None:
+        self.spans.remove(annotation_id)
+
+    def has_conflict(self, key: ConflictKey) -> bool:
+        return key in self.open_conflicts
+
+    def add_conflict(self, key: ConflictKey, conflict_id: int) -> None:
+        self.open_conflicts[key] = conflict_id
+        for annotation_id in key[:2]:
+            self._keys_by_annotation.setdefault(annotation_id, set()).add(key)
+
+    def remove_conflict(self, key: ConflictKey) -> None:
+        self.open_conflicts.pop(key, None)
+        for annotation_id in key[:2]:
+            keys = self._keys_by_annotation.get(annotation_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_annotation[annotation_id]
+
+    def conflicts_for(self, annotation_id: int) -> Dict[ConflictKey, int]:
+        """Open conflicts involving the given annotation."""
+        return {
+            key: self.open_conflicts[key]
+            for key in self._keys_by_annotation.get(annotation_id, ())
+        }
+
+
+class ConflictIndexRegistry:
+    """Bounded LRU registry of per-text conflict indexes."""
+
+    def __init__(self, max_texts: int = 1000, max_age_seconds: float = 300):
+        self.max_texts = max_texts
+        self.max_age_seconds = max_age_seconds
+        self._indexes: "OrderedDict[int, TextConflictIndex]" = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, db: Session, text_id: int) -> TextConflictIndex:
+        """Return the index for a text, loading it from the database if needed."""
+        with self._lock:
+            index = self.peek(text_id)
+            if index is not None:
+                self._indexes.move_to_end(text_id)
+                return index
+
+        # Load without the lock so other texts are not blocked on this query
+        loaded = self._load(db, text_id)
+
+        with self._lock:
+            # Keep an index another thread stored meanwhile; it may hold newer changes
+            index = self.peek(text_id)
+            if index is None:
+                index = loaded
+                self._indexes[text_id] = index
+            self._indexes.move_to_end(text_id)
+            while len(self._indexes) > self.max_texts:
+                self._indexes.popitem(last=False)
+            return index
+
+    def peek(self, text_id: int) -> Optional[TextConflictIndex]:
+        """Return the index for a text if it is loaded and fresh, without touching the database."""
+        with self._lock:
+            index = self._indexes.get(text_id)
+            if index is None or time.monotonic() - index.loaded_at > self.max_age_seconds:
+                return None
+            return index
+
+    def invalidate(self, text_id: Optional[int] = None) -> None:
+        """Drop one text's index, or all indexes."""
+        with self._lock:
+            if text_id is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(text_id, None)
+
+    @property
+    def lock(self) -> RLock:
+        return self._lock
+
+    def _load(self, db: Session, text_id: int) -> TextConflictIndex:
+        index = TextConflictIndex(text_id)
+
+        spans = (
+            db.query(Annotation.id, Annotation.start_char, Annotation.end_char)
+            .filter(Annotation.text_id == text_id)
+            .all()
+        )
+        for annotation_id, start_char, end_char in spans:
+            index.upsert_span(annotation_id, start_char, end_char)
+
+        conflicts = (
+            db.query(
+                AnnotationConflict.id,
+                AnnotationConflict.annotation_a_id,
+                AnnotationConflict.annotation_b_id,
+                AnnotationConflict.conflict_type
+            )
+            .filter(
+                AnnotationConflict.text_id == text_id,
+                AnnotationConflict.status.in_(OPEN_CONFLICT_STATUSES)
+            )
+            .all()
+        )
+        for conflict_id, annotation_a_id, annotation_b_id, conflict_type in conflicts:
+            index.add_conflict(conflict_key(annotation_a_id, annotation_b_id, conflict_type), conflict_id)
+
+        return index
+
+
+_conflict_index_registry: Optional[ConflictIndexRegistry] = None
+
+
+def get_conflict_index_registry() -> ConflictIndexRegistry:
+    """Get the process-wide conflict index registry."""
+    global _conflict_index_registry
+    if _conflict_index_registry is None:
+        _conflict_index_registry = ConflictIndexRegistry(
+            max_texts=settings.CONFLICT_INDEX_MAX_TEXTS,
+            max_age_seconds=settings.CONFLICT_INDEX_MAX_AGE_SECONDS
+        )
+    return _conflict_index_registry
@@ -1,22 +1,64 @@
 """
 Database Configuration and Session Management
 
-SQLAlchemy setup for PostgreSQL database with session handling.
+SQLAlchemy setup for PostgreSQL database with session handling. A sync
+engine serves Session-based code and an async engine (asyncpg, or aiosqlite
+in tests) serves AsyncSession endpoints.
 """
 
+from typing import AsyncGenerator, Dict, Any
+
 from sqlalchemy import create_engine, MetaData
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
 from src.core.config import settings
 
+# Async drivers for each sync backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite"
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Swap the driver of a sync database URL for its async counterpart."""
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+def pool_options(database_url: str) -> Dict[str, Any]:
+    """Connection pool sizing from settings; SQLite uses its default pool."""
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE
+    }
+
+
 # Database engine configuration
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.DEBUG
+    echo=settings.DEBUG,
+    **pool_options(settings.DATABASE_URL)
+)
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    echo=settings.DEBUG,
+    **pool_options(ASYNC_DATABASE_URL)
 )
 
 # Session factory
@@ -26,6 +68,14 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async session factory; objects stay readable after commit
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base class for database models
 Base = declarative_base()
 
@@ -47,6 +97,20 @@ def get_db() -> Session:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get an async database session.
+    
+    Relationships are not lazy-loadable on an AsyncSession; queries must
+    eager-load everything the response touches.
+    
+    Yields:
+        AsyncSession: Async database session instance
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
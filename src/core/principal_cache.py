@@ -0,0 +1,209 @@
+"""
+Principal Cache
+
+Short-lived cache of authenticated principals so get_current_user does not
+query the users table on every request. Entries are keyed by token subject
+and token version and hold what authorization checks read: id, active flag,
+admin flag, role, owned project ids and public project ids, so project
+access checks that grant access need no query either.
+
+Lookups hit an in-process LRU first and, when AUTH_PRINCIPAL_CACHE_REDIS is
+set, a Redis entry tagged with the user so CacheManager.invalidate_user
+also drops the shared copy. Invalidation only reaches the local LRU of the
+worker that runs it; other workers keep their entries until they expire
+within AUTH_PRINCIPAL_CACHE_TTL_SECONDS.
+
+Project ids are refreshed by CacheManager.invalidate_project_access: the
+owners' principals when a project is created, deleted or changes owner, and
+every principal when the set of public projects changes.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from src.core.cache_service import CacheKey, CacheTag, get_cache_service
+from src.core.config import settings
+from src.models.project import Project
+from src.models.user import User
+from src.utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+PrincipalKey = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authorization view of a user"""
+    id: int
+    username: str
+    is_active: bool
+    is_admin: bool
+    role: Optional[str]
+    token_version: int
+    owned_project_ids: FrozenSet[int]
+    public_project_ids: FrozenSet[int]
+
+    @classmethod
+    def from_user(cls, db: Session, user: User) -> "Principal":
+        projects = db.query(Project.id, Project.owner_id).filter(
+            or_(Project.owner_id == user.id, Project.is_public == True)
+        ).all()
+        return cls(
+            id=user.id,
+            username=user.username,
+            is_active=bool(user.is_active),
+            is_admin=bool(user.is_admin),
+            role=user.role,
+            token_version=user.token_version or 0,
+            owned_project_ids=frozenset(
+                project_id for project_id, owner_id in projects if owner_id == user.id
+            ),
+            public_project_ids=frozenset(
+                project_id for project_id, owner_id in projects if owner_id != user.id
+            )
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Principal":
+        return cls(**{
+            **data,
+            "owned_project_ids": frozenset(data["owned_project_ids"]),
+            "public_project_ids": frozenset(data["public_project_ids"])
+        })
+
+    def to_dict(self) -> Dict:
+        return {
+            **asdict(self),
+            "owned_project_ids": sorted(self.owned_project_ids),
+            "public_project_ids": sorted(self.public_project_ids)
+        }
+
+    def owns_project(self, project_id: int) -> bool:
+        return project_id in self.owned_project_ids
+
+    def can_read_project(self, project_id: int) -> bool:
+        return project_id in self.owned_project_ids or project_id in self.public_project_ids
+
+    def to_user(self) -> User:
+        """Detached User carrying the cached fields, for dependency consumers."""
+        return User(
+            id=self.id,
+            username=self.username,
+            is_active=self.is_active,
+            is_admin=self.is_admin,
+            role=self.role,
+            token_version=self.token_version
+        )
+
+
+class PrincipalCache:
+    """In-process LRU of principals with an optional shared Redis tier"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int, use_redis: bool = False):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[PrincipalKey, Tuple[float, Principal]]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[PrincipalKey]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _redis_key(subject: str, version: int) -> str:
+        return CacheKey.generate("principal", subject, version)
+
+    def get_local(self, subject: str, version: int) -> Optional[Principal]:
+        key = (subject, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def set_local(self, subject: str, version: int, principal: Principal):
+        key = (subject, version)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: PrincipalKey):
+        _, principal = self._entries.pop(key)
+        keys = self._keys_by_user.get(principal.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[principal.id]
+
+    def invalidate_local(self, user_id: int) -> int:
+        """Drop every local entry for a user."""
+        with self._lock:
+            keys = list(self._keys_by_user.get(user_id, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    async def get(self, subject: str, version: int) -> Optional[Principal]:
+        principal = self.get_local(subject, version)
+        if principal is not None or not self.use_redis:
+            return principal
+
+        data = await get_cache_service().get(self._redis_key(subject, version))
+        if data is None:
+            return None
+        principal = Principal.from_dict(data)
+        self.set_local(subject, version, principal)
+        return principal
+
+    async def set(self, subject: str, version: int, principal: Principal):
+        self.set_local(subject, version, principal)
+        if self.use_redis:
+            await get_cache_service().set(
+                self._redis_key(subject, version), principal.to_dict(),
+                ttl=self.ttl_seconds, tags=[CacheTag.user(principal.id), CacheTag.principals()]
+            )
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._keys_by_user.clear()
+            return count
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "users": len(self._keys_by_user),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+# Global principal cache instance
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get global principal cache instance"""
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache(
+            max_entries=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+            ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+            use_redis=settings.AUTH_PRINCIPAL_CACHE_REDIS
+        )
+    return _principal_cache
@@ -11,9 +11,12 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from src.core.config import settings
 from src.core.database import get_db
+from src.core.principal_cache import Principal, get_principal_cache
+from src.models.project import Project
 from src.models.user import User
 
 # Password hashing context
@@ -55,11 +58,19 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
-    """Get the current authenticated user."""
+    """
+    Get the current authenticated user.
+    
+    Principals are cached by token subject and version, so hot users are
+    resolved without a database query. On a cache hit the returned User is
+    detached and carries only id, username, is_active, is_admin and role;
+    load the row by id when other fields are needed. Project access checks
+    read the cached principal through has_project_access.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -74,21 +85,59 @@ def get_current_user(
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
+        token_version = int(payload.get("ver", 0))
             
-    except JWTError:
+    except (JWTError, TypeError, ValueError):
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
-        raise credentials_exception
+    principal_cache = get_principal_cache()
+    principal = await principal_cache.get(username, token_version)
+    user = None
+    
+    if principal is None:
+        def load_principal():
+            user = db.query(User).filter(User.username == username).first()
+            return user, (Principal.from_user(db, user) if user is not None else None)
+        
+        user, principal = await run_in_threadpool(load_principal)
+        if principal is None:
+            raise credentials_exception
         
-    if not user.is_active:
+        # Tokens issued before the version was bumped are revoked
+        if principal.token_version != token_version:
+            raise credentials_exception
+        await principal_cache.set(username, token_version, principal)
+        
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User account is inactive"
         )
     
-    return user
+    return user if user is not None else principal.to_user()
+
+
+def has_project_access(db: Session, user: User, project_id: int, owner_only: bool = False) -> bool:
+    """
+    Check whether a user can read a project, or owns it with owner_only.
+    
+    Access granted by the principal get_current_user cached needs no query.
+    Otherwise the project row decides, so projects created or shared since
+    the principal was cached are not refused; it comes from the identity map
+    when the caller already loaded it. Takes the session first so async
+    endpoints can call it with AsyncSession.run_sync.
+    """
+    principal = get_principal_cache().get_local(user.username, user.token_version or 0)
+    if principal is not None and principal.id == user.id:
+        if principal.owns_project(project_id):
+            return True
+        if not owner_only and principal.can_read_project(project_id):
+            return True
+    
+    project = db.get(Project, project_id)
+    if project is None:
+        return False
+    return project.owner_id == user.id or (not owner_only and bool(project.is_public))
 
 
 def get_current_active_admin(current_user: User = Depends(get_current_user)) -> User:
@@ -0,0 +1,208 @@
+"""
+Span Overlap Index
+
+Interval index over annotation spans used by conflict detection. Spans are
+kept sorted by start and by end offset, and a max-end segment tree over the
+start order answers stabbing/overlap queries in O(log n + k). Bulk pair
+enumeration uses a sweep over the sorted starts, so all overlapping pairs of
+a text are reported in O(n log n + k) instead of comparing every pair.
+
+Indexed objects only need ``id``, ``start_char`` and ``end_char`` attributes,
+so the index works on ORM annotations as well as lightweight snapshots.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import count
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class SpanIndex:
+    """Dynamic interval index over annotation spans of a single text."""
+
+    def __init__(self, spans: Iterable[Any] = ()):
+        self._seq = count()
+        self._spans: Dict[int, Any] = {}           # seq -> span
+        self._keys: Dict[int, Tuple[int, int]] = {}  # seq -> (start, end)
+        self._seq_by_id: Dict[Any, int] = {}
+        self._by_start: List[Tuple[int, int]] = []  # sorted (start, seq)
+        self._by_end: List[Tuple[int, int]] = []    # sorted (end, seq)
+        self._tree: List[float] = []
+        self._tree_size = 0
+        self._dirty = True
+
+        for span in spans:
+            self.add(span)
+
+    def __len__(self) -> int:
+        return len(self._by_start)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate spans in (start, insertion) order."""
+        return (self._spans[seq] for _, seq in self._by_start)
+
+    def __contains__(self, span_id: Any) -> bool:
+        return span_id in self._seq_by_id
+
+    def get(self, span_id: Any) -> Optional[Any]:
+        """Return the indexed span with the given id."""
+        seq = self._seq_by_id.get(span_id)
+        return self._spans[seq] if seq is not None else None
+
+    def add(self, span: Any) -> None:
+        """Add a span, replacing any indexed span with the same id."""
+        if span.id in self._seq_by_id:
+            self.remove(span.id)
+
+        seq = next(self._seq)
+        start, end = span.start_char, span.end_char
+        self._spans[seq] = span
+        self._keys[seq] = (start, end)
+        self._seq_by_id[span.id] = seq
+        insort(self._by_start, (start, seq))
+        insort(self._by_end, (end, seq))
+        self._dirty = True
+
+    def update(self, span: Any) -> None:
+        """Re-index a span whose offsets may have changed."""
+        self.add(span)
+
+    def remove(self, span_id: Any) -> bool:
+        """Remove a span by id; returns False if it was not indexed."""
+        seq = self._seq_by_id.pop(span_id, None)
+        if seq is None:
+            return False
+
+        start, end = self._keys.pop(seq)
+        del self._spans[seq]
+        del self._by_start[bisect_left(self._by_start, (start, seq))]
+        del self._by_end[bisect_left(self._by_end, (end, seq))]
+        self._dirty = True
+        return True
+
+    def overlapping(self, start: int, end: int,
+                    exclude_id: Any = None) -> List[Any]:
+        """
+        Find spans intersecting ``[start, end)``.
+
+        Args:
+            start: Query start offset
+            end: Query end offset
+            exclude_id: Span id to leave out of the result
+
+        Returns:
+            Spans with ``start_char < end`` and ``end_char > start``, in start order
+        """
+        self._ensure_tree()
+        limit = bisect_left(self._by_start, (end, -1))
+        return [
+            self._spans[self._by_start[pos][1]]
+            for pos in self._positions_ending_after(limit, start)
+            if self._spans[self._by_start[pos][1]].id != exclude_id
+        ]
+
+    def near(self, start: int, end: int, distance: int,
+             exclude_id: Any = None) -> List[Any]:
+        """
+        Find spans whose start or end lies within ``distance`` of the query's.
+
+        Returns:
+            Matching spans in start order
+        """
+        positions = set()
+        lo = bisect_left(self._by_start, (start - distance, -1))
+        hi = bisect_right(self._by_start, (start + distance, float('inf')))
+        seqs = {seq for _, seq in self._by_start[lo:hi]}
+
+        lo = bisect_left(self._by_end, (end - distance, -1))
+        hi = bisect_right(self._by_end, (end + distance, float('inf')))
+        seqs.update(seq for _, seq in self._by_end[lo:hi])
+
+        for seq in seqs:
+            if self._spans[seq].id != exclude_id:
+                positions.add(bisect_left(self._by_start, (self._keys[seq][0], seq)))
+        return [self._spans[self._by_start[pos][1]] for pos in sorted(positions)]
+
+    def overlapping_pairs(self) -> Iterator[Tuple[Any, Any]]:
+        """
+        Sweep all overlapping span pairs.
+
+        Pairs are yielded as ``(a, b)`` with ``a`` before ``b`` in start order,
+        sorted by the position of ``a`` and then ``b``.
+        """
+        entries = self._by_start
+        for i, (start_a, seq_a) in enumerate(entries):
+            end_a = self._keys[seq_a][1]
+            stop = bisect_left(entries, (end_a, -1), lo=i + 1)
+            for j in range(i + 1, stop):
+                seq_b = entries[j][1]
+                if self._keys[seq_b][1] > start_a:
+                    yield self._spans[seq_a], self._spans[seq_b]
+
+    def candidate_pairs(self, proximity: int) -> Iterator[Tuple[Any, Any]]:
+        """
+        All pairs that overlap or whose starts or ends lie within ``proximity``.
+
+        Pairs are yielded in the same order as ``overlapping_pairs``.
+        """
+        entries = self._by_start
+        rank = {seq: pos for pos, (_, seq) in enumerate(entries)}
+
+        for i, (start_a, seq_a) in enumerate(entries):
+            end_a = self._keys[seq_a][1]
+            # Later spans starting before end_a overlap it (or are zero-length
+            # spans at start_a, which fall within start proximity), so together
+            # with start proximity they form one contiguous run in start order
+            stop = max(
+                bisect_left(entries, (end_a, -1), lo=i + 1),
+                bisect_right(entries, (start_a + proximity, float('inf')), lo=i + 1)
+            )
+            span_a = self._spans[seq_a]
+            for j in range(i + 1, stop):
+                yield span_a, self._spans[entries[j][1]]
+
+            # End proximity beyond that run
+            lo = bisect_left(self._by_end, (end_a - proximity, -1))
+            hi = bisect_right(self._by_end, (end_a + proximity, float('inf')))
+            extra = sorted(
+                j for j in (rank[seq_b] for _, seq_b in self._by_end[lo:hi]) if j >= stop
+            )
+            for j in extra:
+                yield span_a, self._spans[entries[j][1]]
+
+    def _ensure_tree(self) -> None:
+        """Rebuild the max-end segment tree after modifications."""
+        if not self._dirty:
+            return
+
+        n = len(self._by_start)
+        size = 1
+        while size < n:
+            size *= 2
+        tree = [float('-inf')] * (2 * size)
+        for pos, (_, seq) in enumerate(self._by_start):
+            tree[size + pos] = self._keys[seq][1]
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+
+        self._tree = tree
+        self._tree_size = size
+        self._dirty = False
+
+    def _positions_ending_after(self, limit: int, threshold: int) -> List[int]:
+        """Positions below ``limit`` in start order whose end exceeds ``threshold``."""
+        if limit <= 0:
+            return []
+
+        positions = []
+        stack = [(1, 0, self._tree_size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= limit or self._tree[node] <= threshold:
+                continue
+            if hi - lo == 1:
+                positions.append(lo)
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+        return positions
@@ -4,14 +4,19 @@ Inter-Annotator Agreement Integration
 Integrates the conflict resolution system with the existing inter-annotator agreement
 analysis system. Provides bi-directional integration for quality metrics and
 conflict resolution insights.
+
+Conflict analytics are grouped SQL aggregates, so memory does not grow with
+the number of conflicts, and are cached per project until its conflicts
+change (see src.core.conflict_analytics_cache).
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+import copy
 import logging
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, and_, or_, case, select, union_all
 
 from src.models.conflict import (
     AnnotationConflict, ConflictResolution, ConflictSettings,
@@ -23,8 +28,10 @@ from src.models.agreement import (
     AnnotatorPerformance
 )
 from src.models.annotation import Annotation
+from src.models.text import Text
 from src.models.user import User
 from src.models.project import Project
+from src.core.conflict_analytics_cache import get_conflict_analytics_cache
 from src.core.conflict_detection import ConflictDetectionEngine
 from src.core.conflict_resolution import ConflictResolutionEngine
 
@@ -144,8 +151,8 @@ class ConflictAgreementAnalyzer:
             )
             
             for result in cohen_results:
-                # Find annotations from these annotators that might conflict
-                potential_conflicts = self._find_annotations_from_pair(
+                # Count annotations from these annotators that might conflict
+                potential_conflicts = self._count_annotations_from_pair(
                     project_id,
                     result.annotator1_name,
                     result.annotator2_name
@@ -156,7 +163,7 @@ class ConflictAgreementAnalyzer:
                         "annotator_pair": (result.annotator1_name, result.annotator2_name),
                         "kappa_score": result.kappa_value,
                         "study_id": study.id,
-                        "potential_annotation_conflicts": len(potential_conflicts),
+                        "potential_annotation_conflicts": potential_conflicts,
                         "recommendation": self._generate_agreement_recommendation(result),
                         "priority": "high" if result.kappa_value < 0.2 else "medium"
                     })
@@ -176,73 +183,38 @@ class ConflictAgreementAnalyzer:
         Returns:
             Summary of performance updates
         """
-        # Get all resolved conflicts for the project
-        resolved_conflicts = (
-            self.db.query(AnnotationConflict)
-            .filter(
-                AnnotationConflict.project_id == project_id,
-                AnnotationConflict.status == ConflictStatus.RESOLVED
-            )
-            .all()
+        # Per-annotator conflict statistics from one grouped query
+        conflict_stats = self._cached(
+            project_id, "annotator_conflict_stats",
+            lambda: self._query_annotator_conflict_stats(project_id)
         )
-        
-        annotator_stats = {}
-        
-        # Analyze each resolved conflict
-        for conflict in resolved_conflicts:
-            # Get annotators involved
-            annotator_a = conflict.annotation_a.annotator
-            annotator_b = conflict.annotation_b.annotator
-            
-            # Update statistics for each annotator
-            for annotator in [annotator_a, annotator_b]:
-                if annotator.username not in annotator_stats:
-                    annotator_stats[annotator.username] = {
-                        "conflicts_involved": 0,
-                        "conflicts_resolved_favorably": 0,
-                        "avg_conflict_score": 0.0,
-                        "resolution_outcomes": []
-                    }
-                
-                stats = annotator_stats[annotator.username]
-                stats["conflicts_involved"] += 1
-                
-                # Check resolution outcome
-                resolutions = conflict.resolutions
-                if resolutions:
-                    latest_resolution = max(resolutions, key=lambda r: r.created_at)
-                    
-                    # Determine if resolution favored this annotator
-                    if self._resolution_favored_annotator(latest_resolution, annotator):
-                        stats["conflicts_resolved_favorably"] += 1
-                    
-                    stats["resolution_outcomes"].append(latest_resolution.outcome.value if latest_resolution.outcome else "unknown")
-                
-                # Update average conflict score
-                total_score = stats["avg_conflict_score"] * (stats["conflicts_involved"] - 1)
-                stats["avg_conflict_score"] = (total_score + conflict.conflict_score) / stats["conflicts_involved"]
+        annotator_stats = conflict_stats["summary"]
         
         # Update AnnotatorPerformance records
-        updates_made = 0
-        for username, stats in annotator_stats.items():
-            performance = (
+        performances = {}
+        if annotator_stats:
+            records = (
                 self.db.query(AnnotatorPerformance)
-                .filter_by(annotator_name=username)
-                .first()
+                .filter(AnnotatorPerformance.annotator_name.in_(list(annotator_stats)))
+                .order_by(AnnotatorPerformance.id)
+                .all()
             )
+            for performance in records:
+                performances.setdefault(performance.annotator_name, performance)
+        
+        updates_made = 0
+        for username, stats in annotator_stats.items():
+            performance = performances.get(username)
             
             if performance:
-                # Update existing record with conflict data
-                if performance.performance_history is None:
-                    performance.performance_history = []
-                
-                performance.performance_history.append({
+                # Update existing record with conflict data; assign a new list so the JSON change is flushed
+                performance.performance_history = (performance.performance_history or []) + [{
                     "timestamp": datetime.utcnow().isoformat(),
                     "conflicts_involved": stats["conflicts_involved"],
                     "conflicts_resolved_favorably": stats["conflicts_resolved_favorably"],
                     "avg_conflict_score": stats["avg_conflict_score"],
                     "favorable_resolution_rate": stats["conflicts_resolved_favorably"] / stats["conflicts_involved"] if stats["conflicts_involved"] > 0 else 0
-                })
+                }]
                 
                 performance.updated_at = datetime.utcnow()
                 updates_made += 1
@@ -252,7 +224,7 @@ class ConflictAgreementAnalyzer:
         return {
             "annotators_analyzed": len(annotator_stats),
             "performance_records_updated": updates_made,
-            "total_conflicts_analyzed": len(resolved_conflicts),
+            "total_conflicts_analyzed": conflict_stats["total_conflicts"],
             "summary": annotator_stats
         }
     
@@ -341,93 +313,87 @@ class ConflictAgreementAnalyzer:
     
     def _estimate_current_agreement(self, project_id: int) -> float:
         """Estimate current agreement based on conflict resolution success."""
-        # Get resolved conflicts
-        resolved_conflicts = (
-            self.db.query(AnnotationConflict)
+        # Best resolution confidence per conflict, 0.0 for conflicts without one
+        best_confidence = (
+            select(
+                ConflictResolution.conflict_id,
+                func.max(ConflictResolution.confidence_score).label("confidence")
+            )
+            .group_by(ConflictResolution.conflict_id)
+            .subquery()
+        )
+        
+        average = (
+            self.db.query(func.avg(func.coalesce(best_confidence.c.confidence, 0.0)))
+            .select_from(AnnotationConflict)
+            .outerjoin(best_confidence, best_confidence.c.conflict_id == AnnotationConflict.id)
             .filter(
                 AnnotationConflict.project_id == project_id,
                 AnnotationConflict.status == ConflictStatus.RESOLVED
             )
-            .all()
+            .scalar()
         )
         
-        if not resolved_conflicts:
-            return 0.0
-        
-        # Calculate success rate based on resolution confidence
-        total_confidence = sum(
-            max([r.confidence_score for r in conflict.resolutions], default=0.0)
-            for conflict in resolved_conflicts
-        )
-        
-        return total_confidence / len(resolved_conflicts) if resolved_conflicts else 0.0
+        return float(average) if average is not None else 0.0
     
     def _calculate_resolution_effectiveness(self, project_id: int, cutoff_date: datetime) -> float:
         """Calculate how effective conflict resolutions have been."""
-        recent_resolutions = (
-            self.db.query(ConflictResolution)
-            .join(ConflictResolution.conflict)
+        total, successful = (
+            self.db.query(
+                func.count(ConflictResolution.id),
+                func.sum(case((ConflictResolution.confidence_score >= 0.7, 1), else_=0))
+            )
+            .join(AnnotationConflict, ConflictResolution.conflict_id == AnnotationConflict.id)
             .filter(
                 AnnotationConflict.project_id == project_id,
                 ConflictResolution.completed_at >= cutoff_date,
                 ConflictResolution.completed_at.isnot(None)
             )
-            .all()
+            .one()
         )
         
-        if not recent_resolutions:
+        if not total:
             return 0.0
         
-        successful_resolutions = [
-            r for r in recent_resolutions 
-            if r.confidence_score and r.confidence_score >= 0.7
-        ]
-        
-        return len(successful_resolutions) / len(recent_resolutions)
+        return (successful or 0) / total
     
     def _calculate_consensus_improvement(self, project_id: int, cutoff_date: datetime) -> float:
         """Calculate improvement in annotator consensus."""
         # This is a placeholder calculation
         # In practice, you'd compare agreement metrics before and after conflict resolution
         
-        resolved_conflicts = (
-            self.db.query(AnnotationConflict)
+        average_score = (
+            self.db.query(func.avg(AnnotationConflict.conflict_score))
             .filter(
                 AnnotationConflict.project_id == project_id,
                 AnnotationConflict.status == ConflictStatus.RESOLVED,
                 AnnotationConflict.resolved_at >= cutoff_date
             )
-            .all()
+            .scalar()
         )
         
-        if not resolved_conflicts:
+        if average_score is None:
             return 0.0
         
-        # Estimate consensus improvement based on conflict scores and resolutions
-        total_improvement = 0.0
-        for conflict in resolved_conflicts:
-            # Higher conflict scores that get resolved indicate better consensus improvement
-            improvement = conflict.conflict_score * 0.5  # Placeholder calculation
-            total_improvement += improvement
-        
-        return total_improvement / len(resolved_conflicts) if resolved_conflicts else 0.0
+        # Higher conflict scores that get resolved indicate better consensus improvement
+        return float(average_score) * 0.5  # Placeholder calculation
     
-    def _find_annotations_from_pair(
+    def _count_annotations_from_pair(
         self, 
         project_id: int, 
         annotator1: str, 
         annotator2: str
-    ) -> List[Annotation]:
-        """Find annotations from a specific pair of annotators."""
+    ) -> int:
+        """Count annotations from a specific pair of annotators."""
         return (
-            self.db.query(Annotation)
-            .join(Annotation.text)
-            .join(Annotation.annotator)
+            self.db.query(func.count(Annotation.id))
+            .join(Text, Annotation.text_id == Text.id)
+            .join(User, Annotation.annotator_id == User.id)
             .filter(
-                Annotation.text.has(project_id=project_id),
+                Text.project_id == project_id,
                 User.username.in_([annotator1, annotator2])
             )
-            .all()
+            .scalar()
         )
     
     def _generate_agreement_recommendation(self, kappa_result: CohenKappaResult) -> str:
@@ -443,93 +409,183 @@ class ConflictAgreementAnalyzer:
         else:
             return "Substantial agreement - maintain current practices"
     
-    def _resolution_favored_annotator(
-        self, 
-        resolution: ConflictResolution, 
-        annotator: User
-    ) -> bool:
-        """Check if a resolution outcome favored a specific annotator."""
-        if not resolution.outcome or not resolution.final_annotation:
-            return False
-        
-        # Check if the final annotation belongs to this annotator
-        return resolution.final_annotation.annotator_id == annotator.id
+    def _cached(self, project_id: int, name: str, compute: Callable[[], Any]) -> Any:
+        """Serve a grouped analysis from the conflict analytics cache."""
+        result = get_conflict_analytics_cache().get_or_compute(self.db, project_id, name, compute)
+        # Callers may modify what they get back
+        return copy.deepcopy(result)
     
     def _analyze_conflict_patterns(self, project_id: int) -> List[Dict[str, Any]]:
         """Analyze common conflict patterns in the project."""
-        # Get all conflicts for the project
-        conflicts = (
-            self.db.query(AnnotationConflict)
-            .filter_by(project_id=project_id)
-            .all()
+        return self._cached(
+            project_id, "conflict_patterns",
+            lambda: self._query_conflict_patterns(project_id)
         )
+    
+    def _query_conflict_patterns(self, project_id: int) -> List[Dict[str, Any]]:
+        """Count conflicts by type and by severity."""
+        grouped = {}
+        for pattern_type, column in (
+            ("conflict_type", AnnotationConflict.conflict_type),
+            ("severity_level", AnnotationConflict.severity_level)
+        ):
+            count = func.count(AnnotationConflict.id)
+            grouped[pattern_type] = (
+                self.db.query(column, count)
+                .filter(AnnotationConflict.project_id == project_id)
+                .group_by(column)
+                .order_by(count.desc(), column)
+                .all()
+            )
         
-        # Analyze patterns
-        type_counts = {}
-        severity_counts = {}
-        
-        for conflict in conflicts:
-            # Count by type
-            conflict_type = conflict.conflict_type.value
-            type_counts[conflict_type] = type_counts.get(conflict_type, 0) + 1
-            
-            # Count by severity
-            severity = conflict.severity_level
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
-        
+        total = sum(count for _, count in grouped["conflict_type"])
         patterns = []
         
-        # Add type patterns
-        for conflict_type, count in type_counts.items():
-            patterns.append({
-                "pattern_type": "conflict_type",
-                "pattern_value": conflict_type,
-                "frequency": count,
-                "percentage": count / len(conflicts) * 100 if conflicts else 0
-            })
-        
-        # Add severity patterns
-        for severity, count in severity_counts.items():
-            patterns.append({
-                "pattern_type": "severity_level",
-                "pattern_value": severity,
-                "frequency": count,
-                "percentage": count / len(conflicts) * 100 if conflicts else 0
-            })
+        for pattern_type, rows in grouped.items():
+            for value, count in rows:
+                if pattern_type == "conflict_type":
+                    value = value.value
+                patterns.append({
+                    "pattern_type": pattern_type,
+                    "pattern_value": value,
+                    "frequency": count,
+                    "percentage": count / total * 100 if total else 0
+                })
         
         return sorted(patterns, key=lambda x: x["frequency"], reverse=True)
     
     def _identify_problematic_pairs(self, project_id: int) -> List[Tuple[str, str, float]]:
         """Identify annotator pairs with frequent conflicts."""
-        conflicts = (
-            self.db.query(AnnotationConflict)
-            .filter_by(project_id=project_id)
+        return self._cached(
+            project_id, "problematic_pairs",
+            lambda: self._query_problematic_pairs(project_id)
+        )
+    
+    def _query_problematic_pairs(self, project_id: int) -> List[Tuple[str, str, float]]:
+        """Group conflicts by the (unordered) pair of annotators involved."""
+        annotation_a, annotation_b = aliased(Annotation), aliased(Annotation)
+        user_a, user_b = aliased(User), aliased(User)
+        
+        # Create consistent pair key
+        a_first = user_a.username <= user_b.username
+        first = case((a_first, user_a.username), else_=user_b.username)
+        second = case((a_first, user_b.username), else_=user_a.username)
+        conflict_count = func.count(AnnotationConflict.id)
+        avg_score = func.avg(AnnotationConflict.conflict_score)
+        
+        rows = (
+            self.db.query(first, second, avg_score)
+            .select_from(AnnotationConflict)
+            .join(annotation_a, AnnotationConflict.annotation_a_id == annotation_a.id)
+            .join(user_a, annotation_a.annotator_id == user_a.id)
+            .join(annotation_b, AnnotationConflict.annotation_b_id == annotation_b.id)
+            .join(user_b, annotation_b.annotator_id == user_b.id)
+            .filter(AnnotationConflict.project_id == project_id)
+            .group_by(first, second)
+            .having(or_(conflict_count >= 3, avg_score >= 0.7))  # Threshold for "problematic"
+            .order_by(avg_score.desc(), first, second)
             .all()
         )
         
-        pair_conflicts = {}
+        return [
+            (annotator_1, annotator_2, float(score) if score else 0.0)
+            for annotator_1, annotator_2, score in rows
+        ]
+    
+    def _query_annotator_conflict_stats(self, project_id: int) -> Dict[str, Any]:
+        """
+        Conflict statistics per annotator over the project's resolved conflicts.
+        
+        Both sides of a conflict count, and only the latest resolution of each
+        conflict decides its outcome and whether it favored the annotator
+        (the final annotation is theirs).
+        """
+        resolved = (
+            AnnotationConflict.project_id == project_id,
+            AnnotationConflict.status == ConflictStatus.RESOLVED
+        )
+        
+        sides = union_all(*(
+            select(
+                AnnotationConflict.id.label("conflict_id"),
+                Annotation.annotator_id.label("annotator_id"),
+                AnnotationConflict.conflict_score.label("conflict_score")
+            )
+            .join(Annotation, annotation_column == Annotation.id)
+            .where(*resolved)
+            for annotation_column in (AnnotationConflict.annotation_a_id, AnnotationConflict.annotation_b_id)
+        )).subquery()
+        
+        latest = (
+            select(
+                ConflictResolution.conflict_id,
+                ConflictResolution.id.label("resolution_id"),
+                ConflictResolution.outcome,
+                ConflictResolution.final_annotation_id,
+                func.row_number().over(
+                    partition_by=ConflictResolution.conflict_id,
+                    order_by=(ConflictResolution.created_at.desc(), ConflictResolution.id.desc())
+                ).label("position")
+            )
+            .join(AnnotationConflict, ConflictResolution.conflict_id == AnnotationConflict.id)
+            .where(*resolved)
+            .subquery()
+        )
+        final_annotation = aliased(Annotation)
         
-        for conflict in conflicts:
-            annotator_a = conflict.annotation_a.annotator.username
-            annotator_b = conflict.annotation_b.annotator.username
-            
-            # Create consistent pair key
-            pair_key = tuple(sorted([annotator_a, annotator_b]))
-            
-            if pair_key not in pair_conflicts:
-                pair_conflicts[pair_key] = {"count": 0, "total_score": 0.0}
+        # No bound literals: grouped expressions must render identically in SELECT and GROUP BY
+        has_resolution = latest.c.resolution_id.isnot(None)
+        favorable = case(
+            (and_(latest.c.outcome.isnot(None), final_annotation.annotator_id == sides.c.annotator_id), 1),
+            else_=0
+        )
+        
+        rows = (
+            self.db.query(
+                User.username,
+                has_resolution,
+                latest.c.outcome,
+                func.count(),
+                func.sum(favorable),
+                func.sum(sides.c.conflict_score)
+            )
+            .select_from(sides)
+            .join(User, User.id == sides.c.annotator_id)
+            .outerjoin(latest, and_(latest.c.conflict_id == sides.c.conflict_id, latest.c.position == 1))
+            .outerjoin(final_annotation, final_annotation.id == latest.c.final_annotation_id)
+            .group_by(User.username, has_resolution, latest.c.outcome)
+            .order_by(User.username)
+            .all()
+        )
+        
+        annotator_stats = {}
+        total_scores = {}
+        for username, resolution_found, outcome, conflicts, favored, total_score in rows:
+            stats = annotator_stats.setdefault(username, {
+                "conflicts_involved": 0,
+                "conflicts_resolved_favorably": 0,
+                "avg_conflict_score": 0.0,
+                "resolution_outcomes": {}
+            })
+            stats["conflicts_involved"] += conflicts
+            stats["conflicts_resolved_favorably"] += favored or 0
+            total_scores[username] = total_scores.get(username, 0.0) + (total_score or 0.0)
             
-            pair_conflicts[pair_key]["count"] += 1
-            pair_conflicts[pair_key]["total_score"] += conflict.conflict_score
+            if resolution_found:
+                outcome_name = outcome.value if outcome else "unknown"
+                outcomes = stats["resolution_outcomes"]
+                outcomes[outcome_name] = outcomes.get(outcome_name, 0) + conflicts
+        
+        for username, stats in annotator_stats.items():
+            stats["avg_conflict_score"] = total_scores[username] / stats["conflicts_involved"]
         
-        # Calculate problematic pairs
-        problematic_pairs = []
-        for pair_key, stats in pair_conflicts.items():
-            avg_score = stats["total_score"] / stats["count"]
-            if stats["count"] >= 3 or avg_score >= 0.7:  # Threshold for "problematic"
-                problematic_pairs.append((pair_key[0], pair_key[1], avg_score))
+        total_conflicts = (
+            self.db.query(func.count(AnnotationConflict.id))
+            .filter(*resolved)
+            .scalar()
+        )
         
-        return sorted(problematic_pairs, key=lambda x: x[2], reverse=True)
+        return {"summary": annotator_stats, "total_conflicts": total_conflicts}
     
     def _generate_improvement_recommendations(
         self, 
@@ -591,35 +647,30 @@ class ConflictAgreementAnalyzer:
     
     def _analyze_resolution_effectiveness(self, project_id: int) -> Dict[str, float]:
         """Analyze effectiveness of different resolution strategies."""
-        resolutions = (
-            self.db.query(ConflictResolution)
-            .join(ConflictResolution.conflict)
+        return self._cached(
+            project_id, "resolution_effectiveness",
+            lambda: self._query_resolution_effectiveness(project_id)
+        )
+    
+    def _query_resolution_effectiveness(self, project_id: int) -> Dict[str, float]:
+        """Share of confident (>= 0.7) resolutions per strategy."""
+        rows = (
+            self.db.query(
+                ConflictResolution.resolution_strategy,
+                func.count(ConflictResolution.id),
+                func.sum(case((ConflictResolution.confidence_score >= 0.7, 1), else_=0))
+            )
+            .join(AnnotationConflict, ConflictResolution.conflict_id == AnnotationConflict.id)
             .filter(AnnotationConflict.project_id == project_id)
+            .group_by(ConflictResolution.resolution_strategy)
             .all()
         )
         
-        strategy_stats = {}
-        
-        for resolution in resolutions:
-            strategy = resolution.resolution_strategy.value if resolution.resolution_strategy else "unknown"
-            
-            if strategy not in strategy_stats:
-                strategy_stats[strategy] = {"total": 0, "successful": 0, "avg_confidence": 0.0}
-            
-            stats = strategy_stats[strategy]
-            stats["total"] += 1
-            
-            if resolution.confidence_score and resolution.confidence_score >= 0.7:
-                stats["successful"] += 1
-            
-            if resolution.confidence_score:
-                current_avg = stats["avg_confidence"]
-                stats["avg_confidence"] = (current_avg * (stats["total"] - 1) + resolution.confidence_score) / stats["total"]
-        
         # Calculate success rates
         effectiveness = {}
-        for strategy, stats in strategy_stats.items():
-            effectiveness[strategy] = stats["successful"] / stats["total"] if stats["total"] > 0 else 0.0
+        for strategy, total, successful in rows:
+            strategy_name = strategy.value if strategy else "unknown"
+            effectiveness[strategy_name] = (successful or 0) / total if total > 0 else 0.0
         
         return effectiveness
 
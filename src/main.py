@@ -12,7 +12,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 
-from src.core.database import engine, get_db
+from src.core.database import engine, async_engine, get_db
 from src.models import Base
 from src.api.auth import router as auth_router
 from src.api.projects import router as projects_router
@@ -28,6 +28,8 @@ from src.api.cache import router as cache_router
 from src.core.config import settings
 from src.utils.logger import setup_logging, get_logger
 from src.utils.monitoring import start_background_monitoring
+from src.services.statistics_service import start_statistics_refresh
+from src.services.agreement_queue import start_agreement_queue
 from src.utils.database_logger import setup_sqlalchemy_logging
 from src.middleware.logging_middleware import LoggingMiddleware
 from src.core.cache_init import init_cache_system, shutdown_cache_system, cache_health_check
@@ -56,6 +58,14 @@ async def lifespan(app: FastAPI):
     await start_background_monitoring()
     logger.info("Background monitoring started")
     
+    # Keep the admin statistics rollup fresh
+    statistics_task = await start_statistics_refresh()
+    logger.info("Statistics rollup refresh started")
+    
+    # Recalculate agreement for texts dirtied by annotation writes
+    agreement_queue = await start_agreement_queue()
+    logger.info("Agreement recalculation queue started")
+    
     # Initialize cache system
     cache_success = await init_cache_system(warm_cache=True)
     if cache_success:
@@ -85,6 +95,15 @@ async def lifespan(app: FastAPI):
         await shutdown_cache_system()
         logger.info("Cache system shut down")
         
+        # Stop the statistics rollup refresh
+        statistics_task.cancel()
+        
+        # Stop the agreement workers after their running jobs finish
+        await agreement_queue.stop()
+        
+        # Close pooled async database connections
+        await async_engine.dispose()
+        
         # Cleanup old operations and metrics
         progress_tracker.cleanup_completed_operations(max_age_hours=1)
         batch_processor.cleanup_old_metrics(max_age_hours=1)
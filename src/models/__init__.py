@@ -10,6 +10,8 @@ from src.models.project import Project
 from src.models.text import Text
 from src.models.annotation import Annotation
 from src.models.label import Label
+from src.models.annotation_counter import AnnotationCounter
+from src.models.statistics_rollup import StatisticsRollup
 from src.models.audit_log import AuditLog, SystemLog, SecurityEvent
 
 # Import additional models if they exist
@@ -36,6 +38,8 @@ __all__ = [
     "Text",
     "Annotation", 
     "Label",
+    "AnnotationCounter",
+    "StatisticsRollup",
     "AuditLog",
     "SystemLog",
     "SecurityEvent"
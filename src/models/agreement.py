@@ -5,7 +5,7 @@ These models support storing agreement metrics, analysis results, and
 historical tracking of annotation quality over time.
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, ForeignKey, Boolean, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -364,6 +364,35 @@ class AnnotatorPerformance(Base):
         }
 
 
+class AgreementResultCache(Base):
+    """
+    Memoized agreement results for a text or project.
+    
+    An entry is valid while its fingerprint matches the current
+    (annotator, label, span) set of its scope. Text entries of span_overlap
+    calculations also keep per-text sufficient statistics, which project
+    results are merged from.
+    """
+    __tablename__ = 'agreement_result_cache'
+    __table_args__ = (
+        UniqueConstraint('scope', 'scope_id', 'parameters_key', name='uq_agreement_result_cache_scope'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    scope = Column(String(20), nullable=False)  # 'text' or 'project'
+    scope_id = Column(Integer, nullable=False)
+    parameters_key = Column(String(64), nullable=False)  # Method, threshold and filters
+    fingerprint = Column(String(64), nullable=False)
+    
+    statistics = Column(JSON, nullable=True)  # TextAgreementStatistics.to_dict()
+    results = Column(JSON, nullable=True)     # Analysis results as returned to callers
+    
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<AgreementResultCache(scope={self.scope}, scope_id={self.scope_id}, fingerprint={self.fingerprint[:12]})>"
+
+
 # Database utility functions
 
 def create_tables(engine):
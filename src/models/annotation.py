@@ -5,7 +5,7 @@ Database model for text annotations with support for spans and labels.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Float, Index
 from sqlalchemy.orm import relationship
 
 from src.core.database import Base
@@ -45,11 +45,26 @@ class Annotation(Base):
     annotator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     label_id = Column(Integer, ForeignKey("labels.id"), nullable=False)
     
+    # Denormalized from texts.project_id so project filters skip the join;
+    # filled from the text on flush when not set
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    
     # Relationships
     text = relationship("Text", back_populates="annotations")
     annotator = relationship("User", back_populates="annotations")
     label = relationship("Label", back_populates="annotations")
     
+    # Indexes for conflict candidate loading, duplicate checks, list filters
+    # and the recent-changes window
+    __table_args__ = (
+        Index("idx_annotation_text_span", "text_id", "start_char", "end_char"),
+        Index("idx_annotation_annotator_created", "annotator_id", "created_at"),
+        Index("idx_annotation_label", "label_id"),
+        Index("idx_annotation_created_at", "created_at"),
+        Index("idx_annotation_updated_at", "updated_at"),
+        Index("idx_annotation_project_created", "project_id", "created_at"),
+    )
+    
     def __repr__(self):
         return f"<Annotation(id={self.id}, text_id={self.text_id}, label_id={self.label_id})>"
     
@@ -70,6 +85,7 @@ class Annotation(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "text_id": self.text_id,
+            "project_id": self.project_id,
             "annotator_id": self.annotator_id,
             "label_id": self.label_id,
             "label_name": self.label.name if self.label else None,
@@ -0,0 +1,282 @@
+"""
+Annotation Counter Model
+
+Denormalized per-project and per-text annotation counters, maintained in the
+same transaction as the annotation writes that change them. Dashboard
+statistics read these rows instead of running COUNT(DISTINCT) scans.
+
+Rows are keyed by (scope, scope_id, dimension, key):
+- ("project", id, "annotations", 0) / ("text", id, "annotations", 0): totals
+- (scope, id, "annotator", user_id): annotations per annotator
+- (scope, id, "label", label_id): annotations per label
+- ("project", id, "text", text_id): annotations per text
+- (scope, id, "annotators", 0) / ("project", id, "texts", 0): distinct counts
+- (scope, id, "length", 0): summed span lengths (end_char - start_char)
+- (scope, id, "created_hour", hour): annotations created in one UTC hour,
+  keyed by hours since the epoch, for recent-activity windows
+"""
+
+import calendar
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import BigInteger, Column, Integer, String, event, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.core.database import Base
+from src.models.annotation import Annotation
+from src.models.text import Text
+
+
+CounterKey = Tuple[str, int, str, int]
+
+# Per-member dimensions whose non-zero rows are tallied into a distinct count
+DISTINCT_DIMENSIONS = {
+    "annotator": "annotators",
+    "text": "texts"
+}
+
+# Columns whose changes move an annotation between counter rows
+TRACKED_COLUMNS = (
+    "project_id", "text_id", "annotator_id", "label_id", "start_char", "end_char", "created_at"
+)
+
+
+class AnnotationCounter(Base):
+    """Counter row for one scope/dimension/key combination."""
+
+    __tablename__ = "annotation_counters"
+
+    scope = Column(String(20), primary_key=True)  # project, text
+    scope_id = Column(Integer, primary_key=True)
+    dimension = Column(String(20), primary_key=True)
+    key = Column(Integer, primary_key=True, default=0)
+    value = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<AnnotationCounter({self.scope}={self.scope_id}, "
+            f"{self.dimension}={self.key}, value={self.value})>"
+        )
+
+
+def annotation_counter_keys(
+    project_id: int,
+    text_id: int,
+    annotator_id: int,
+    label_id: int
+) -> List[CounterKey]:
+    """Counter rows one annotation contributes to."""
+    return [
+        ("project", project_id, "annotations", 0),
+        ("project", project_id, "annotator", annotator_id),
+        ("project", project_id, "label", label_id),
+        ("project", project_id, "text", text_id),
+        ("text", text_id, "annotations", 0),
+        ("text", text_id, "annotator", annotator_id),
+        ("text", text_id, "label", label_id),
+    ]
+
+
+def created_hour(created_at: datetime) -> int:
+    """Hours since the epoch of a naive UTC timestamp; the created_hour key."""
+    return calendar.timegm(created_at.timetuple()) // 3600
+
+
+def add_annotation_deltas(deltas: Counter, values: Dict[str, Any], sign: int):
+    """Add or remove one annotation's contribution to a pending delta set."""
+    for counter_key in annotation_counter_keys(
+        values["project_id"], values["text_id"], values["annotator_id"], values["label_id"]
+    ):
+        deltas[counter_key] += sign
+
+    length = values["end_char"] - values["start_char"]
+    for scope, scope_id in (("project", values["project_id"]), ("text", values["text_id"])):
+        deltas[(scope, scope_id, "length", 0)] += sign * length
+        if values["created_at"] is not None:
+            deltas[(scope, scope_id, "created_hour", created_hour(values["created_at"]))] += sign
+
+
+def _upsert(connection, counter_key: CounterKey, delta: int) -> int:
+    """Add delta to one counter row, creating it if needed; return the new value."""
+    table = AnnotationCounter.__table__
+    scope, scope_id, dimension, key = counter_key
+    dialect = connection.dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = insert(table).values(
+            scope=scope, scope_id=scope_id, dimension=dimension, key=key, value=delta
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.scope, table.c.scope_id, table.c.dimension, table.c.key],
+            set_={"value": table.c.value + statement.excluded.value}
+        ).returning(table.c.value)
+        return connection.execute(statement).scalar_one()
+
+    # Other backends: update, then insert when the row does not exist yet
+    where = (
+        (table.c.scope == scope) & (table.c.scope_id == scope_id) &
+        (table.c.dimension == dimension) & (table.c.key == key)
+    )
+    if connection.execute(update(table).where(where).values(value=table.c.value + delta)).rowcount == 0:
+        connection.execute(table.insert().values(
+            scope=scope, scope_id=scope_id, dimension=dimension, key=key, value=delta
+        ))
+    return connection.execute(select(table.c.value).where(where)).scalar_one()
+
+
+def apply_counter_deltas(connection, deltas: Counter):
+    """
+    Apply counter deltas on a connection inside the caller's transaction.
+
+    Rows are updated in key order so concurrent writers lock them in the same
+    order. Distinct counts move when a member row crosses zero.
+    """
+    distinct_deltas: Counter = Counter()
+    for counter_key in sorted(k for k, delta in deltas.items() if delta):
+        delta = deltas[counter_key]
+        new_value = _upsert(connection, counter_key, delta)
+
+        scope, scope_id, dimension, _ = counter_key
+        distinct_dimension = DISTINCT_DIMENSIONS.get(dimension)
+        if distinct_dimension:
+            old_value = new_value - delta
+            if old_value <= 0 < new_value:
+                distinct_deltas[(scope, scope_id, distinct_dimension, 0)] += 1
+            elif new_value <= 0 < old_value:
+                distinct_deltas[(scope, scope_id, distinct_dimension, 0)] -= 1
+
+    for counter_key in sorted(k for k, delta in distinct_deltas.items() if delta):
+        _upsert(connection, counter_key, distinct_deltas[counter_key])
+
+
+def _load_replaced_value(target, value, oldvalue, initiator):
+    return value
+
+
+# Load the replaced value on assignment even when the attribute was expired
+# (e.g. after a commit), so history.deleted holds the committed value
+for _column in TRACKED_COLUMNS:
+    event.listen(getattr(Annotation, _column), "set", _load_replaced_value, active_history=True)
+
+
+def _committed_values(annotation: Annotation) -> Dict[str, Any]:
+    """Tracked column values as last loaded from the database."""
+    state = inspect(annotation)
+    values = {}
+    for column in TRACKED_COLUMNS:
+        history = state.attrs[column].history
+        values[column] = history.deleted[0] if history.deleted else getattr(annotation, column)
+    return values
+
+
+@event.listens_for(Session, "before_flush")
+def track_annotation_counters(session: Session, flush_context, instances):
+    """Fill project_id on new annotations and keep counters in step with the flush."""
+    deltas: Counter = Counter()
+
+    for obj in session.new:
+        if not isinstance(obj, Annotation):
+            continue
+        if obj.project_id is None:
+            if obj.text is not None:
+                obj.project_id = obj.text.project_id
+            else:
+                obj.project_id = session.connection().execute(
+                    select(Text.project_id).where(Text.id == obj.text_id)
+                ).scalar_one()
+        if obj.created_at is None:
+            # Set here rather than by the column default so the hour bucket matches
+            obj.created_at = datetime.utcnow()
+        add_annotation_deltas(deltas, {column: getattr(obj, column) for column in TRACKED_COLUMNS}, 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Annotation):
+            add_annotation_deltas(deltas, _committed_values(obj), -1)
+
+    for obj in session.dirty:
+        if not isinstance(obj, Annotation) or not session.is_modified(obj):
+            continue
+        old_values = _committed_values(obj)
+        new_values = {column: getattr(obj, column) for column in TRACKED_COLUMNS}
+        if old_values != new_values:
+            add_annotation_deltas(deltas, old_values, -1)
+            add_annotation_deltas(deltas, new_values, 1)
+
+    if any(deltas.values()):
+        apply_counter_deltas(session.connection(), deltas)
+
+
+def count_bulk_insert(connection, rows: Iterable[Dict[str, Any]]):
+    """
+    Update counters for rows written with a Core INSERT, which skips flush events.
+
+    Rows must carry the created_at value that was inserted.
+    """
+    deltas: Counter = Counter()
+    for row in rows:
+        add_annotation_deltas(deltas, row, 1)
+    apply_counter_deltas(connection, deltas)
+
+
+def get_annotation_counters(session: Session, scope: str, scope_id: int) -> Dict[str, Any]:
+    """
+    Read the counters of one project or text.
+
+    Returns annotation_count, annotator_count, label_counts ({label_id: count}),
+    length_sum, recent_count (annotations created in the last 24 hours, counted
+    by whole hours) and, for projects, annotated_text_count.
+    """
+    recent_hour = created_hour(datetime.utcnow() - timedelta(hours=24))
+    rows = session.execute(
+        select(AnnotationCounter.dimension, AnnotationCounter.key, AnnotationCounter.value).where(
+            AnnotationCounter.scope == scope,
+            AnnotationCounter.scope_id == scope_id,
+            AnnotationCounter.dimension.in_(("annotations", "annotators", "texts", "label", "length"))
+            | ((AnnotationCounter.dimension == "created_hour") & (AnnotationCounter.key >= recent_hour))
+        )
+    ).all()
+
+    counters: Dict[str, Any] = {
+        "annotation_count": 0,
+        "annotator_count": 0,
+        "label_counts": {},
+        "length_sum": 0,
+        "recent_count": 0
+    }
+    if scope == "project":
+        counters["annotated_text_count"] = 0
+
+    for dimension, key, value in rows:
+        if dimension == "annotations":
+            counters["annotation_count"] = value
+        elif dimension == "annotators":
+            counters["annotator_count"] = value
+        elif dimension == "texts":
+            counters["annotated_text_count"] = value
+        elif dimension == "length":
+            counters["length_sum"] = value
+        elif dimension == "created_hour":
+            counters["recent_count"] += value
+        elif value > 0:
+            counters["label_counts"][key] = value
+    return counters
+
+
+def get_project_annotation_counts(session: Session, project_ids: List[int]) -> Dict[int, int]:
+    """Annotation totals for several projects in one query."""
+    if not project_ids:
+        return {}
+    rows = session.execute(
+        select(AnnotationCounter.scope_id, AnnotationCounter.value).where(
+            AnnotationCounter.scope == "project",
+            AnnotationCounter.scope_id.in_(project_ids),
+            AnnotationCounter.dimension == "annotations"
+        )
+    ).all()
+    counts = {project_id: 0 for project_id in project_ids}
+    counts.update(dict(rows))
+    return counts
@@ -5,7 +5,7 @@ Database model for annotation labels/categories with hierarchical support.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Boolean, Index
 from sqlalchemy.orm import relationship
 
 from src.core.database import Base
@@ -50,6 +50,11 @@ class Label(Base):
     # Self-referential relationship for hierarchy
     parent = relationship("Label", remote_side=[id], backref="children")
     
+    # Indexes for project label lookups
+    __table_args__ = (
+        Index("idx_label_project_name", "project_id", "name"),
+    )
+    
     def __repr__(self):
         return f"<Label(id={self.id}, name='{self.name}', project_id={self.project_id})>"
     
@@ -6,7 +6,7 @@ Database model for annotation projects and their configuration.
 
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, query_expression
 
 from src.core.database import Base
 
@@ -45,6 +45,10 @@ class Project(Base):
     texts = relationship("Text", back_populates="project", cascade="all, delete-orphan")
     labels = relationship("Label", back_populates="project", cascade="all, delete-orphan")
     
+    # Filled by count subqueries when loaded through a response shape
+    text_count = query_expression()
+    label_count = query_expression()
+    
     def __repr__(self):
         return f"<Project(id={self.id}, name='{self.name}', owner_id={self.owner_id})>"
     
@@ -64,6 +68,12 @@ class Project(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "owner_id": self.owner_id,
-            "text_count": len(self.texts) if self.texts else 0,
-            "label_count": len(self.labels) if self.labels else 0
+            "text_count": (
+                self.text_count if self.text_count is not None
+                else len(self.texts) if self.texts else 0
+            ),
+            "label_count": (
+                self.label_count if self.label_count is not None
+                else len(self.labels) if self.labels else 0
+            )
         }
\ No newline at end of file
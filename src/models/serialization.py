@@ -0,0 +1,96 @@
+"""
+Response Shapes
+
+Declares what each serialized response needs from the database so list and
+detail queries load it up front instead of lazily per row:
+- Many-to-one relationships read by to_dict are joined into the query
+- Collection sizes come from correlated COUNT subqueries, not loaded rows
+- Large columns a shape does not return are deferred
+
+Usage:
+    query = TEXT_SUMMARY.apply(select(Text).where(...))
+    texts = (await db.scalars(query)).all()
+    payload = TEXT_SUMMARY.serialize_all(texts)
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import defer, joinedload, with_expression
+
+from src.models.annotation import Annotation
+from src.models.label import Label
+from src.models.project import Project
+from src.models.text import Text
+
+
+def count_subquery(column, *criteria):
+    """Correlated COUNT(column) subquery for use with with_expression."""
+    return select(func.count(column)).where(*criteria).correlate_except(column.class_).scalar_subquery()
+
+
+class ResponseShape:
+    """Loader options and to_dict arguments for one response shape"""
+
+    def __init__(
+        self,
+        model,
+        joined: Sequence[Any] = (),
+        counts: Optional[Dict[str, Any]] = None,
+        deferred: Sequence[Any] = (),
+        **to_dict_kwargs
+    ):
+        self.model = model
+        self.joined = tuple(joined)
+        self.counts = counts or {}
+        self.deferred = tuple(deferred)
+        self.to_dict_kwargs = to_dict_kwargs
+
+    def options(self) -> List[Any]:
+        """Loader options that make serialize() issue no further SQL."""
+        options = [joinedload(relationship) for relationship in self.joined]
+        options.extend(
+            with_expression(getattr(self.model, name), expression)
+            for name, expression in self.counts.items()
+        )
+        options.extend(defer(column) for column in self.deferred)
+        return options
+
+    def apply(self, query):
+        """Add this shape's loader options to a select() or Query of model."""
+        return query.options(*self.options())
+
+    def serialize(self, instance) -> Dict[str, Any]:
+        return instance.to_dict(**self.to_dict_kwargs)
+
+    def serialize_all(self, instances: Iterable[Any]) -> List[Dict[str, Any]]:
+        return [self.serialize(instance) for instance in instances]
+
+
+ANNOTATION_RESPONSE = ResponseShape(
+    Annotation,
+    joined=[Annotation.label, Annotation.annotator]
+)
+
+TEXT_ANNOTATION_COUNT = count_subquery(Annotation.id, Annotation.text_id == Text.id)
+
+TEXT_SUMMARY = ResponseShape(
+    Text,
+    counts={"annotation_count": TEXT_ANNOTATION_COUNT},
+    deferred=[Text.content],
+    include_content=False
+)
+
+TEXT_DETAIL = ResponseShape(
+    Text,
+    counts={"annotation_count": TEXT_ANNOTATION_COUNT}
+)
+
+PROJECT_COUNTS = {
+    "text_count": count_subquery(Text.id, Text.project_id == Project.id),
+    "label_count": count_subquery(Label.id, Label.project_id == Project.id)
+}
+
+PROJECT_RESPONSE = ResponseShape(Project, counts=PROJECT_COUNTS)
+
+ADMIN_PROJECT_RESPONSE = ResponseShape(Project, joined=[Project.owner], counts=PROJECT_COUNTS)
@@ -0,0 +1,24 @@
+"""
+Statistics Rollup Model
+
+Precomputed admin dashboard aggregates, refreshed by a background job and
+served with a staleness bound.
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, JSON
+
+from src.core.database import Base
+
+
+class StatisticsRollup(Base):
+    """One named snapshot of aggregate statistics."""
+    
+    __tablename__ = "statistics_rollups"
+    
+    name = Column(String(50), primary_key=True)
+    payload = Column(JSON, nullable=False)
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<StatisticsRollup(name='{self.name}', computed_at='{self.computed_at}')>"
@@ -5,8 +5,8 @@ Database model for texts to be annotated.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text as TextColumn, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Text as TextColumn, ForeignKey, JSON, Index
+from sqlalchemy.orm import relationship, query_expression
 
 from src.core.database import Base
 
@@ -46,6 +46,14 @@ class Text(Base):
     project = relationship("Project", back_populates="texts")
     annotations = relationship("Annotation", back_populates="text", cascade="all, delete-orphan")
     
+    # Filled by a count subquery when loaded through a response shape
+    annotation_count = query_expression()
+    
+    # Indexes for project-scoped listing and joins
+    __table_args__ = (
+        Index("idx_text_project_created", "project_id", "created_at"),
+    )
+    
     def __repr__(self):
         return f"<Text(id={self.id}, title='{self.title[:50]}...', project_id={self.project_id})>"
     
@@ -66,7 +74,10 @@ class Text(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "project_id": self.project_id,
-            "annotation_count": len(self.annotations) if self.annotations else 0
+            "annotation_count": (
+                self.annotation_count if self.annotation_count is not None
+                else len(self.annotations) if self.annotations else 0
+            )
         }
         
         if include_content:
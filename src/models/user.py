@@ -32,6 +32,9 @@ class User(Base):
     is_verified = Column(Boolean, default=False)
     is_admin = Column(Boolean, default=False)
     
+    # Bumped to revoke every token issued before the change
+    token_version = Column(Integer, default=0, nullable=False, server_default="0")
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
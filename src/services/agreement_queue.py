@@ -0,0 +1,258 @@
+"""
+Agreement Recalculation Queue
+
+Annotation writes mark their text dirty instead of recalculating agreement
+inside the request. The queue coalesces dirty ids: a text edited 200 times
+in a burst is one pending entry. An entry becomes due once it has been
+quiet for AGREEMENT_QUEUE_DEBOUNCE_SECONDS, or AGREEMENT_QUEUE_MAX_DELAY_SECONDS
+after it was first marked so a continuous session cannot starve it.
+
+Due entries are recalculated by a bounded pool of AGREEMENT_QUEUE_WORKERS
+threads, each on its own session. A recalculated text marks its project
+dirty, even when the text has too few annotators left to be scored, and
+projects are debounced the same way before annotator performance is
+updated once for all of their texts. An entry marked again while it runs
+is picked up once the running job finishes, never concurrently.
+
+Queue depth and lag (time from first mark to the start of the job) are
+available from stats() and recorded as custom metrics.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.text import Text
+from ..utils.logger import get_logger
+from ..utils.monitoring import get_metrics_collector
+from .agreement_service import AgreementService
+
+
+logger = get_logger(__name__)
+
+# ('text' | 'project', id)
+WorkKey = Tuple[str, int]
+
+
+def recalculate_agreement(queue: 'AgreementRecalculationQueue', key: WorkKey) -> None:
+    """Recalculate one dirty text or project on a fresh session; runs in a worker thread."""
+    kind, object_id = key
+    db = SessionLocal()
+    try:
+        service = AgreementService(db)
+        if kind == 'text':
+            service.recalculate_text_agreement(object_id)
+            # Project figures change even when the text itself is skipped, e.g.
+            # a delete that leaves it with fewer than two annotators
+            project_id = db.query(Text.project_id).filter(Text.id == object_id).scalar()
+            if project_id is not None:
+                queue.mark_project_dirty(project_id)
+        else:
+            service.update_annotator_performance(object_id)
+    finally:
+        db.close()
+
+
+class AgreementRecalculationQueue:
+    """Debounced, coalescing queue of texts and projects awaiting agreement recalculation"""
+
+    def __init__(self, debounce_seconds: float, max_delay_seconds: float, max_workers: int,
+                 handler: Callable[['AgreementRecalculationQueue', WorkKey], None] = recalculate_agreement,
+                 clock: Callable[[], float] = time.monotonic):
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max(max_delay_seconds, debounce_seconds)
+        self.max_workers = max(1, max_workers)
+        self.handler = handler
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        # key -> [first marked, last marked]
+        self._pending: Dict[WorkKey, List[float]] = {}
+        self._running: Set[WorkKey] = set()
+        self._marked = 0
+        self._coalesced = 0
+        self._processed = 0
+        self._failed = 0
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._jobs: Set[asyncio.Task] = set()
+
+    def mark_text_dirty(self, text_id: int) -> None:
+        self._mark(('text', text_id))
+
+    def mark_project_dirty(self, project_id: int) -> None:
+        self._mark(('project', project_id))
+
+    def _mark(self, key: WorkKey) -> None:
+        now = self.clock()
+        with self._lock:
+            self._marked += 1
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = [now, now]
+            else:
+                entry[1] = now
+                self._coalesced += 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # Safe from request handlers and worker threads alike
+        if self._loop is not None and self._wakeup is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # Loop already closed during shutdown
+                pass
+
+    def _due_at(self, entry: List[float]) -> float:
+        first, last = entry
+        return min(last + self.debounce_seconds, first + self.max_delay_seconds)
+
+    def take_due(self, now: Optional[float] = None) -> Tuple[List[Tuple[WorkKey, float]], Optional[float]]:
+        """
+        Claim due entries for as many workers as are free.
+
+        Returns:
+            Tuple of ([(key, lag seconds)], seconds until the next entry is due
+            or None when nothing is waiting)
+        """
+        now = self.clock() if now is None else now
+        claimed = []
+        next_due = None
+        with self._lock:
+            free = self.max_workers - len(self._running)
+            for key, entry in sorted(self._pending.items(), key=lambda item: item[1][0]):
+                if key in self._running:
+                    continue
+                due_at = self._due_at(entry)
+                if due_at <= now and free > 0:
+                    claimed.append((key, now - entry[0]))
+                    free -= 1
+                elif due_at > now:
+                    next_due = due_at if next_due is None else min(next_due, due_at)
+            for key, lag in claimed:
+                del self._pending[key]
+                self._running.add(key)
+                self._last_lag = lag
+                self._max_lag = max(self._max_lag, lag)
+        return claimed, None if next_due is None else max(0.0, next_due - now)
+
+    def run_job(self, key: WorkKey) -> None:
+        """Run the handler for a claimed key and release it."""
+        try:
+            self.handler(self, key)
+            with self._lock:
+                self._processed += 1
+        except Exception as e:
+            logger.error(f"Agreement recalculation failed for {key[0]} {key[1]}: {str(e)}")
+            with self._lock:
+                self._failed += 1
+        finally:
+            with self._lock:
+                self._running.discard(key)
+            self._wake()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, lag and throughput counters."""
+        now = self.clock()
+        with self._lock:
+            oldest = min((entry[0] for entry in self._pending.values()), default=None)
+            return {
+                'depth': len(self._pending),
+                'pending_texts': sum(1 for kind, _ in self._pending if kind == 'text'),
+                'pending_projects': sum(1 for kind, _ in self._pending if kind == 'project'),
+                'in_flight': len(self._running),
+                'oldest_pending_seconds': round(now - oldest, 3) if oldest is not None else 0.0,
+                'last_lag_seconds': round(self._last_lag, 3),
+                'max_lag_seconds': round(self._max_lag, 3),
+                'marked': self._marked,
+                'coalesced': self._coalesced,
+                'processed': self._processed,
+                'failed': self._failed,
+                'workers': self.max_workers,
+                'debounce_seconds': self.debounce_seconds,
+                'max_delay_seconds': self.max_delay_seconds,
+                'running': self._dispatcher is not None and not self._dispatcher.done()
+            }
+
+    async def _dispatch(self, key: WorkKey, lag: float) -> None:
+        collector = get_metrics_collector()
+        collector.record_custom_metric('agreement_queue_lag_seconds', lag, {'kind': key[0]})
+        collector.record_custom_metric('agreement_queue_depth', self.stats()['depth'])
+        await self._loop.run_in_executor(self._executor, self.run_job, key)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            claimed, delay = self.take_due()
+            for key, lag in claimed:
+                job = asyncio.create_task(self._dispatch(key, lag))
+                self._jobs.add(job)
+                job.add_done_callback(self._jobs.discard)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        """Start dispatching due entries on the running event loop."""
+        if self._dispatcher is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="agreement-queue")
+        self._dispatcher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop dispatching and wait for running jobs; pending entries are dropped."""
+        if self._dispatcher is None:
+            return
+        self._dispatcher.cancel()
+        try:
+            await self._dispatcher
+        except asyncio.CancelledError:
+            pass
+        if self._jobs:
+            await asyncio.gather(*self._jobs, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+
+        dropped = len(self._pending)
+        if dropped:
+            logger.info(f"Agreement queue stopped with {dropped} pending entries")
+        self._dispatcher = None
+        self._executor = None
+        self._wakeup = None
+        self._loop = None
+
+
+# Global queue instance
+_agreement_queue: Optional[AgreementRecalculationQueue] = None
+
+
+def get_agreement_queue() -> AgreementRecalculationQueue:
+    """Get global agreement recalculation queue instance"""
+    global _agreement_queue
+    if _agreement_queue is None:
+        _agreement_queue = AgreementRecalculationQueue(
+            debounce_seconds=settings.AGREEMENT_QUEUE_DEBOUNCE_SECONDS,
+            max_delay_seconds=settings.AGREEMENT_QUEUE_MAX_DELAY_SECONDS,
+            max_workers=settings.AGREEMENT_QUEUE_WORKERS
+        )
+    return _agreement_queue
+
+
+async def start_agreement_queue() -> AgreementRecalculationQueue:
+    """Start the background workers that recalculate dirty texts and projects."""
+    queue = get_agreement_queue()
+    await queue.start()
+    return queue
@@ -9,22 +9,43 @@ annotations are created or updated.
 from typing import Dict, List, Any, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
+import hashlib
+import json
 import logging
+import math
 from collections import defaultdict
 
+import numpy as np
+
 from ..models.annotation import Annotation
+from ..models.label import Label
 from ..models.text import Text
 from ..models.project import Project
 from ..models.user import User
 from ..models.agreement import (
     AgreementStudy, CohenKappaResult, FleissKappaResult,
-    store_agreement_analysis, AnnotatorPerformance
+    store_agreement_analysis, AnnotatorPerformance, AgreementResultCache
 )
 from ..utils.agreement_metrics import AgreementAnalysis, AgreementMetrics
+from ..utils.agreement_statistics import MergedAgreementStatistics, TextAgreementStatistics
+from ..utils.span_unification import unify_spans
 
 logger = logging.getLogger(__name__)
 
 
+def _json_safe(value: Any) -> Any:
+    """Convert numpy scalars and non-finite floats (stored as null) for a JSON column."""
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    return value
+
+
 class AgreementService:
     """
     Service for managing inter-annotator agreement calculations and tracking.
@@ -58,27 +79,14 @@ class AgreementService:
                 logger.warning(f"Annotation {annotation_id} not found for agreement calculation")
                 return None
             
-            # Check if project has inter-annotator agreement enabled
-            project = annotation.text.project
-            if not project.inter_annotator_agreement:
-                logger.debug(f"Project {project.id} does not have agreement tracking enabled")
-                return None
-            
-            # Check if we have multiple annotators for this text
-            annotator_count = self.db.query(Annotation.annotator_id).filter(
-                Annotation.text_id == annotation.text_id
-            ).distinct().count()
-            
-            if annotator_count < 2:
-                logger.debug(f"Text {annotation.text_id} has only {annotator_count} annotator(s), skipping agreement calculation")
+            results = self.recalculate_text_agreement(annotation.text_id, agreement_method)
+            if results is None:
                 return None
             
-            # Calculate agreement for this text
-            results = self.calculate_text_agreement(
-                annotation.text_id,
-                agreement_method=agreement_method,
-                save_to_database=True
-            )
+            # Unchanged inputs return memoized results: no new study to account for
+            if results['cache_info']['hit']:
+                logger.debug(f"Agreement for text {annotation.text_id} unchanged, using cached results")
+                return results
             
             # Update annotator performance tracking
             self.update_annotator_performance(annotation.text.project_id)
@@ -90,6 +98,44 @@ class AgreementService:
             logger.error(f"Error triggering agreement calculation: {str(e)}")
             return None
     
+    def recalculate_text_agreement(self, text_id: int,
+                                   agreement_method: str = 'span_overlap') -> Optional[Dict[str, Any]]:
+        """
+        Recalculate agreement for a text after its annotations changed.
+        
+        Skips texts whose project does not track agreement or that have
+        fewer than two annotators. Annotator performance is not updated
+        here; callers do that once per project.
+        
+        Returns:
+            Agreement calculation results if performed, None otherwise
+        """
+        text = self.db.query(Text).filter_by(id=text_id).first()
+        if not text:
+            logger.warning(f"Text {text_id} not found for agreement calculation")
+            return None
+        
+        # Check if project has inter-annotator agreement enabled
+        project = text.project
+        if not project.inter_annotator_agreement:
+            logger.debug(f"Project {project.id} does not have agreement tracking enabled")
+            return None
+        
+        # Check if we have multiple annotators for this text
+        annotator_count = self.db.query(Annotation.annotator_id).filter(
+            Annotation.text_id == text_id
+        ).distinct().count()
+        
+        if annotator_count < 2:
+            logger.debug(f"Text {text_id} has only {annotator_count} annotator(s), skipping agreement calculation")
+            return None
+        
+        return self.calculate_text_agreement(
+            text_id,
+            agreement_method=agreement_method,
+            save_to_database=True
+        )
+    
     def calculate_text_agreement(self, text_id: int,
                                annotator_ids: Optional[List[int]] = None,
                                label_ids: Optional[List[int]] = None,
@@ -98,26 +144,41 @@ class AgreementService:
                                save_to_database: bool = True) -> Dict[str, Any]:
         """
         Calculate agreement for annotations on a specific text.
+        
+        Results are memoized by a fingerprint of the text's annotations; if
+        nothing changed since the last calculation the stored results are
+        returned with cache_info.hit set and no new study is saved.
         """
         try:
             text = self.db.query(Text).filter_by(id=text_id).first()
             if not text:
                 raise ValueError(f"Text {text_id} not found")
             
-            # Extract annotations for this text
-            annotations_data = self.extract_text_annotations(
-                text_id,
-                annotator_ids=annotator_ids,
-                label_ids=label_ids,
-                agreement_method=agreement_method,
-                overlap_threshold=overlap_threshold
-            )
+            parameters_key = self._parameters_key(agreement_method, overlap_threshold,
+                                                  annotator_ids, label_ids)
+            rows = self._annotation_rows(Annotation.text_id == text_id,
+                                         annotator_ids=annotator_ids, label_ids=label_ids)
+            fingerprint = self._fingerprint(rows)
             
-            if not annotations_data or len(annotations_data) < 2:
-                raise ValueError("Need at least 2 annotators with annotations for agreement calculation")
+            entry = self._cache_entries('text', [text_id], parameters_key).get(text_id)
+            if entry is not None and entry.fingerprint == fingerprint and entry.results is not None:
+                return self._cached_results(entry)
             
             # Perform agreement analysis
-            results = self.agreement_analysis.analyze_dataset(annotations_data, True)
+            statistics = None
+            if agreement_method == 'span_overlap':
+                if entry is not None and entry.fingerprint == fingerprint and entry.statistics:
+                    statistics = TextAgreementStatistics.from_dict(entry.statistics)
+                else:
+                    statistics = self._text_statistics(rows, overlap_threshold)
+                if statistics is None or len(statistics.annotators) < 2:
+                    raise ValueError("Need at least 2 annotators with annotations for agreement calculation")
+                results = self.agreement_analysis.analyze_statistics(MergedAgreementStatistics([statistics]))
+            else:
+                annotations_data = self._text_sequences(rows, text_id, agreement_method, overlap_threshold)
+                if not annotations_data or len(annotations_data) < 2:
+                    raise ValueError("Need at least 2 annotators with annotations for agreement calculation")
+                results = self.agreement_analysis.analyze_dataset(annotations_data, True)
             
             # Add metadata
             results['text_info'] = {
@@ -138,6 +199,11 @@ class AgreementService:
                 study_id = store_agreement_analysis(self.db, results, study_name, study_description)
                 results['database_info'] = {'saved': True, 'study_id': study_id}
             
+            results['cache_info'] = {'hit': False, 'fingerprint': fingerprint}
+            self._store_cache_entries('text', parameters_key, {
+                text_id: (fingerprint, statistics.to_dict() if statistics else None, results)
+            })
+            
             return results
             
         except Exception as e:
@@ -153,27 +219,49 @@ class AgreementService:
                                   save_to_database: bool = True) -> Dict[str, Any]:
         """
         Calculate agreement for all annotations in a project.
+        
+        Results are memoized by the fingerprints of the project's texts. For
+        span_overlap, metrics are merged from per-text sufficient statistics,
+        so only texts whose annotations changed are unified again.
         """
         try:
             project = self.db.query(Project).filter_by(id=project_id).first()
             if not project:
                 raise ValueError(f"Project {project_id} not found")
             
-            # Extract all project annotations
-            annotations_data = self.extract_project_annotations(
-                project_id,
-                text_ids=text_ids,
-                annotator_ids=annotator_ids,
-                label_ids=label_ids,
-                agreement_method=agreement_method,
-                overlap_threshold=overlap_threshold
-            )
+            parameters_key = self._parameters_key(agreement_method, overlap_threshold,
+                                                  annotator_ids, label_ids, text_ids)
+            criteria = [Annotation.project_id == project_id]
+            if text_ids:
+                criteria.append(Annotation.text_id.in_(text_ids))
+            rows = self._annotation_rows(*criteria, annotator_ids=annotator_ids, label_ids=label_ids)
+            
+            rows_by_text = defaultdict(list)
+            for row in rows:
+                rows_by_text[row.text_id].append(row)
+            text_fingerprints = {text_id: self._fingerprint(text_rows)
+                                 for text_id, text_rows in rows_by_text.items()}
+            fingerprint = self._combine_fingerprints(text_fingerprints)
             
-            if not annotations_data or len(annotations_data) < 2:
-                raise ValueError("Need at least 2 annotators with annotations for agreement calculation")
+            entry = self._cache_entries('project', [project_id], parameters_key).get(project_id)
+            if entry is not None and entry.fingerprint == fingerprint and entry.results is not None:
+                return self._cached_results(entry)
             
             # Perform comprehensive analysis
-            results = self.agreement_analysis.analyze_dataset(annotations_data, True)
+            if agreement_method == 'span_overlap':
+                statistics = self._project_text_statistics(
+                    rows_by_text, text_fingerprints, overlap_threshold,
+                    self._parameters_key(agreement_method, overlap_threshold, annotator_ids, label_ids)
+                )
+                merged = MergedAgreementStatistics(statistics)
+                if len(merged.annotators) < 2:
+                    raise ValueError("Need at least 2 annotators with annotations for agreement calculation")
+                results = self.agreement_analysis.analyze_statistics(merged)
+            else:
+                annotations_data = self._project_sequences(rows, agreement_method, overlap_threshold)
+                if not annotations_data or len(annotations_data) < 2:
+                    raise ValueError("Need at least 2 annotators with annotations for agreement calculation")
+                results = self.agreement_analysis.analyze_dataset(annotations_data, True)
             
             # Add project metadata
             results['project_info'] = {
@@ -192,6 +280,11 @@ class AgreementService:
                 study_id = store_agreement_analysis(self.db, results, study_name, study_description)
                 results['database_info'] = {'saved': True, 'study_id': study_id}
             
+            results['cache_info'] = {'hit': False, 'fingerprint': fingerprint}
+            self._store_cache_entries('project', parameters_key, {
+                project_id: (fingerprint, None, results)
+            })
+            
             return results
             
         except Exception as e:
@@ -207,52 +300,9 @@ class AgreementService:
         Extract annotations for a specific text and convert to agreement analysis format.
         """
         try:
-            # Build query for annotations on this text
-            query = self.db.query(Annotation).filter(Annotation.text_id == text_id)
-            
-            # Apply filters
-            if annotator_ids:
-                query = query.filter(Annotation.annotator_id.in_(annotator_ids))
-            
-            if label_ids:
-                query = query.filter(Annotation.label_id.in_(label_ids))
-            
-            # Get annotations
-            annotations = query.all()
-            
-            if not annotations:
-                return {}
-            
-            # Group by annotator
-            annotator_annotations = defaultdict(list)
-            
-            for ann in annotations:
-                annotator_name = ann.annotator.username
-                
-                # Create annotation representation based on method
-                if agreement_method == 'label_only':
-                    annotation_value = ann.label.name
-                elif agreement_method == 'exact_match':
-                    annotation_value = f"{ann.label.name}:{ann.start_char}-{ann.end_char}"
-                else:  # span_overlap
-                    annotation_value = {
-                        'label': ann.label.name,
-                        'start': ann.start_char,
-                        'end': ann.end_char,
-                        'text': ann.selected_text
-                    }
-                
-                annotator_annotations[annotator_name].append(annotation_value)
-            
-            # Convert to agreement analysis format
-            if agreement_method == 'span_overlap':
-                return self.convert_span_annotations_to_sequences(
-                    {name: {text_id: anns} for name, anns in annotator_annotations.items()},
-                    overlap_threshold
-                )
-            else:
-                # For exact match and label only, return as is
-                return dict(annotator_annotations)
+            rows = self._annotation_rows(Annotation.text_id == text_id,
+                                         annotator_ids=annotator_ids, label_ids=label_ids)
+            return self._text_sequences(rows, text_id, agreement_method, overlap_threshold)
                 
         except Exception as e:
             logger.error(f"Error extracting text annotations: {str(e)}")
@@ -268,145 +318,233 @@ class AgreementService:
         Extract annotations from a project and convert to agreement analysis format.
         """
         try:
-            # Build query for annotations in this project
-            query = self.db.query(Annotation).join(Text).filter(Text.project_id == project_id)
-            
-            # Apply filters
+            criteria = [Annotation.project_id == project_id]
             if text_ids:
-                query = query.filter(Text.id.in_(text_ids))
-            
-            if annotator_ids:
-                query = query.filter(Annotation.annotator_id.in_(annotator_ids))
-            
-            if label_ids:
-                query = query.filter(Annotation.label_id.in_(label_ids))
-            
-            # Get all annotations
-            annotations = query.all()
-            
-            if not annotations:
-                return {}
-            
-            # Group annotations by annotator and text
-            annotator_annotations = defaultdict(lambda: defaultdict(list))
-            
-            for ann in annotations:
-                annotator_name = ann.annotator.username
-                text_id = ann.text_id
-                
-                # Create annotation representation based on method
-                if agreement_method == 'label_only':
-                    annotation_value = ann.label.name
-                elif agreement_method == 'exact_match':
-                    annotation_value = f"{ann.label.name}:{ann.start_char}-{ann.end_char}"
-                else:  # span_overlap
-                    annotation_value = {
-                        'label': ann.label.name,
-                        'start': ann.start_char,
-                        'end': ann.end_char,
-                        'text': ann.selected_text
-                    }
-                
-                annotator_annotations[annotator_name][text_id].append(annotation_value)
-            
-            # Convert to format expected by agreement metrics
-            if agreement_method == 'span_overlap':
-                return self.convert_span_annotations_to_sequences(
-                    annotator_annotations, overlap_threshold
-                )
-            else:
-                # For exact match and label only, create flat sequences
-                result = {}
-                
-                # Get all texts that have annotations
-                all_texts = set()
-                for annotator_data in annotator_annotations.values():
-                    all_texts.update(annotator_data.keys())
-                
-                # Create sequences for each annotator across all texts
-                for annotator_name, text_annotations in annotator_annotations.items():
-                    sequence = []
-                    for text_id in sorted(all_texts):
-                        if text_id in text_annotations:
-                            sequence.extend(text_annotations[text_id])
-                        else:
-                            # Add placeholder for texts this annotator didn't annotate
-                            sequence.append(None)
-                    
-                    result[annotator_name] = sequence
-                
-                return result
+                criteria.append(Annotation.text_id.in_(text_ids))
+            rows = self._annotation_rows(*criteria, annotator_ids=annotator_ids, label_ids=label_ids)
+            return self._project_sequences(rows, agreement_method, overlap_threshold)
                 
         except Exception as e:
             logger.error(f"Error extracting project annotations: {str(e)}")
             raise
     
+    def _annotation_rows(self, *criteria, annotator_ids: Optional[List[int]] = None,
+                         label_ids: Optional[List[int]] = None) -> List[Any]:
+        """
+        Load the fields agreement depends on, in one query without ORM objects.
+        """
+        query = self.db.query(
+            Annotation.text_id,
+            User.username,
+            Label.name.label('label'),
+            Annotation.start_char,
+            Annotation.end_char
+        ).join(User, Annotation.annotator_id == User.id).join(
+            Label, Annotation.label_id == Label.id
+        ).filter(*criteria)
+        
+        # Apply filters
+        if annotator_ids:
+            query = query.filter(Annotation.annotator_id.in_(annotator_ids))
+        
+        if label_ids:
+            query = query.filter(Annotation.label_id.in_(label_ids))
+        
+        return query.order_by(Annotation.text_id, Annotation.id).all()
+    
+    def _group_rows(self, rows: List[Any], agreement_method: str) -> Dict[str, Dict[int, List[Any]]]:
+        """Group annotation rows by annotator and text in the method's representation."""
+        annotator_annotations = defaultdict(lambda: defaultdict(list))
+        
+        for row in rows:
+            # Create annotation representation based on method
+            if agreement_method == 'label_only':
+                annotation_value = row.label
+            elif agreement_method == 'exact_match':
+                annotation_value = f"{row.label}:{row.start_char}-{row.end_char}"
+            else:  # span_overlap
+                annotation_value = {
+                    'label': row.label,
+                    'start': row.start_char,
+                    'end': row.end_char
+                }
+            
+            annotator_annotations[row.username][row.text_id].append(annotation_value)
+        
+        return annotator_annotations
+    
+    def _text_sequences(self, rows: List[Any], text_id: int, agreement_method: str,
+                        overlap_threshold: float) -> Dict[str, List[Any]]:
+        if not rows:
+            return {}
+        
+        annotator_annotations = self._group_rows(rows, agreement_method)
+        
+        # Convert to agreement analysis format
+        if agreement_method == 'span_overlap':
+            return self.convert_span_annotations_to_sequences(annotator_annotations, overlap_threshold)
+        
+        # For exact match and label only, return as is
+        return {name: texts[text_id] for name, texts in annotator_annotations.items()}
+    
+    def _project_sequences(self, rows: List[Any], agreement_method: str,
+                           overlap_threshold: float) -> Dict[str, List[Any]]:
+        if not rows:
+            return {}
+        
+        annotator_annotations = self._group_rows(rows, agreement_method)
+        
+        # Convert to format expected by agreement metrics
+        if agreement_method == 'span_overlap':
+            return self.convert_span_annotations_to_sequences(annotator_annotations, overlap_threshold)
+        
+        # For exact match and label only, create flat sequences
+        result = {}
+        
+        # Get all texts that have annotations
+        all_texts = set()
+        for annotator_data in annotator_annotations.values():
+            all_texts.update(annotator_data.keys())
+        
+        # Create sequences for each annotator across all texts
+        for annotator_name, text_annotations in annotator_annotations.items():
+            sequence = []
+            for text_id in sorted(all_texts):
+                if text_id in text_annotations:
+                    sequence.extend(text_annotations[text_id])
+                else:
+                    # Add placeholder for texts this annotator didn't annotate
+                    sequence.append(None)
+            
+            result[annotator_name] = sequence
+        
+        return result
+    
     def convert_span_annotations_to_sequences(self, annotator_annotations: Dict[str, Dict[int, List[Dict]]],
                                            overlap_threshold: float = 0.5) -> Dict[str, List[str]]:
         """
         Convert span-based annotations to agreement analysis sequences.
+
+        Spans are unified per text with a sweep over sorted intervals; see
+        utils.span_unification.
         """
         try:
-            # Collect all unique annotation spans across all annotators
-            all_spans = []
-            
-            for annotator_name, text_annotations in annotator_annotations.items():
-                for text_id, annotations in text_annotations.items():
-                    for ann in annotations:
-                        all_spans.append({
-                            'text_id': text_id,
-                            'start': ann['start'],
-                            'end': ann['end'],
-                            'label': ann['label'],
-                            'annotator': annotator_name
-                        })
-            
-            # Sort spans by text_id and start position
-            all_spans.sort(key=lambda x: (x['text_id'], x['start']))
-            
-            # Create unified annotation items by merging overlapping spans
-            unified_items = []
-            processed_spans = set()
-            
-            for i, span1 in enumerate(all_spans):
-                if i in processed_spans:
-                    continue
-                
-                # Find all spans that overlap with this one
-                overlapping_spans = [span1]
-                processed_spans.add(i)
-                
-                for j, span2 in enumerate(all_spans[i+1:], i+1):
-                    if j in processed_spans:
-                        continue
-                    
-                    if (span1['text_id'] == span2['text_id'] and
-                        self.calculate_overlap_ratio(span1, span2) >= overlap_threshold):
-                        overlapping_spans.append(span2)
-                        processed_spans.add(j)
-                
-                # Create unified item from overlapping spans
-                item_annotations = {}
-                for span in overlapping_spans:
-                    item_annotations[span['annotator']] = span['label']
-                
-                unified_items.append(item_annotations)
-            
-            # Convert to annotator sequences
-            annotator_names = list(annotator_annotations.keys())
-            result = {name: [] for name in annotator_names}
-            
-            for item in unified_items:
-                for annotator_name in annotator_names:
-                    # Use label if annotator annotated this item, otherwise None
-                    result[annotator_name].append(item.get(annotator_name, None))
-            
-            return result
-            
+            return unify_spans(annotator_annotations, overlap_threshold).to_sequences()
         except Exception as e:
             logger.error(f"Error converting span annotations: {str(e)}")
             raise
     
+    def _text_statistics(self, rows: List[Any],
+                         overlap_threshold: float) -> Optional[TextAgreementStatistics]:
+        """Unify one text's spans and summarize them, or None without annotations."""
+        if not rows:
+            return None
+        unified = unify_spans(self._group_rows(rows, 'span_overlap'), overlap_threshold)
+        return TextAgreementStatistics.from_unified(unified)
+    
+    def _project_text_statistics(self, rows_by_text: Dict[int, List[Any]],
+                                 text_fingerprints: Dict[int, str],
+                                 overlap_threshold: float,
+                                 parameters_key: str) -> List[TextAgreementStatistics]:
+        """
+        Per-text statistics of a project in text order, reusing cached entries.
+        
+        Only texts whose fingerprint changed are unified again; their entries
+        are refreshed with the new statistics.
+        """
+        text_ids = sorted(rows_by_text)
+        entries = self._cache_entries('text', text_ids, parameters_key)
+        statistics, refreshed = [], {}
+        
+        for text_id in text_ids:
+            entry = entries.get(text_id)
+            fingerprint = text_fingerprints[text_id]
+            if entry is not None and entry.fingerprint == fingerprint and entry.statistics:
+                statistics.append(TextAgreementStatistics.from_dict(entry.statistics))
+                continue
+            
+            text_statistics = self._text_statistics(rows_by_text[text_id], overlap_threshold)
+            statistics.append(text_statistics)
+            refreshed[text_id] = (fingerprint, text_statistics.to_dict(), None)
+        
+        if refreshed:
+            self._store_cache_entries('text', parameters_key, refreshed)
+        
+        logger.debug(f"Agreement statistics: {len(refreshed)} of {len(text_ids)} texts recomputed")
+        return statistics
+    
+    @staticmethod
+    def _parameters_key(agreement_method: str, overlap_threshold: float,
+                        annotator_ids: Optional[List[int]], label_ids: Optional[List[int]],
+                        text_ids: Optional[List[int]] = None) -> str:
+        """Hash of everything besides the annotations that results depend on."""
+        parameters = [
+            agreement_method,
+            overlap_threshold if agreement_method == 'span_overlap' else None,
+            sorted(annotator_ids or []),
+            sorted(label_ids or []),
+            sorted(text_ids or [])
+        ]
+        return hashlib.sha256(json.dumps(parameters).encode()).hexdigest()
+    
+    @staticmethod
+    def _fingerprint(rows: List[Any]) -> str:
+        """Content hash of an (annotator, label, span) set."""
+        spans = sorted((row.username, row.label, row.start_char, row.end_char) for row in rows)
+        return hashlib.sha256(json.dumps(spans).encode()).hexdigest()
+    
+    @staticmethod
+    def _combine_fingerprints(text_fingerprints: Dict[int, str]) -> str:
+        combined = hashlib.sha256()
+        for text_id in sorted(text_fingerprints):
+            combined.update(f"{text_id}:{text_fingerprints[text_id]};".encode())
+        return combined.hexdigest()
+    
+    def _cache_entries(self, scope: str, scope_ids: List[int],
+                       parameters_key: str) -> Dict[int, AgreementResultCache]:
+        if not scope_ids:
+            return {}
+        entries = self.db.query(AgreementResultCache).filter(
+            AgreementResultCache.scope == scope,
+            AgreementResultCache.scope_id.in_(scope_ids),
+            AgreementResultCache.parameters_key == parameters_key
+        ).all()
+        return {entry.scope_id: entry for entry in entries}
+    
+    @staticmethod
+    def _cached_results(entry: AgreementResultCache) -> Dict[str, Any]:
+        results = dict(entry.results)
+        results['cache_info'] = {
+            'hit': True,
+            'fingerprint': entry.fingerprint,
+            'computed_at': entry.computed_at.isoformat() if entry.computed_at else None
+        }
+        return results
+    
+    def _store_cache_entries(self, scope: str, parameters_key: str,
+                             values: Dict[int, Any]) -> None:
+        """
+        Upsert cache entries from scope id -> (fingerprint, statistics, results).
+        
+        A failed write is logged and rolled back; the calculation itself
+        already succeeded.
+        """
+        try:
+            entries = self._cache_entries(scope, list(values), parameters_key)
+            for scope_id, (fingerprint, statistics, results) in values.items():
+                entry = entries.get(scope_id)
+                if entry is None:
+                    entry = AgreementResultCache(scope=scope, scope_id=scope_id,
+                                                 parameters_key=parameters_key)
+                    self.db.add(entry)
+                entry.fingerprint = fingerprint
+                entry.statistics = statistics
+                entry.results = _json_safe(results) if results is not None else None
+            self.db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to store agreement results cache: {str(e)}")
+            self.db.rollback()
+    
     def calculate_overlap_ratio(self, span1: Dict, span2: Dict) -> float:
         """
         Calculate overlap ratio between two spans.
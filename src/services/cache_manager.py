@@ -15,8 +15,9 @@ from datetime import datetime, timedelta
 from functools import wraps
 from dataclasses import dataclass, asdict
 
-from ..core.cache_service import get_cache_service, CacheKey, cache_transaction
+from ..core.cache_service import get_cache_service, CacheKey, CacheTag, cache_transaction
 from ..core.cache_config import CacheStrategy
+from ..core.principal_cache import get_principal_cache
 from ..utils.logger import get_logger
 
 
@@ -76,7 +77,7 @@ class CacheManager:
             logger.debug(f"Cache miss for user {user_id}, loading from database")
             user = await loader(user_id)
             if user:
-                await self.cache.set(key, user, ttl=self.default_ttls["user"])
+                await self.cache.set(key, user, ttl=self.default_ttls["user"], tags=[CacheTag.user(user_id)])
                 logger.debug(f"Cached user {user_id}")
             return user
         
@@ -85,40 +86,39 @@ class CacheManager:
     async def set_user(self, user_id: int, user_data: Any, ttl: Optional[int] = None) -> bool:
         """Cache user data"""
         key = CacheKey.generate("user", user_id)
-        return await self.cache.set(key, user_data, ttl=ttl or self.default_ttls["user"])
+        return await self.cache.set(
+            key, user_data, ttl=ttl or self.default_ttls["user"], tags=[CacheTag.user(user_id)]
+        )
     
     async def invalidate_user(self, user_id: int) -> bool:
-        """Invalidate user cache"""
-        key = CacheKey.generate("user", user_id)
-        count = await self.cache.delete(key)
+        """Invalidate user cache, cached principals and every entry tagged with the user"""
+        count = get_principal_cache().invalidate_local(user_id)
+        count += await self.cache.delete(CacheKey.generate("user", user_id))
+        count += await self.cache.invalidate_tags(CacheTag.user(user_id))
         if count > 0:
             logger.info(f"Invalidated cache for user {user_id}")
         return count > 0
     
     async def get_users_batch(self, user_ids: List[int], loader: Optional[Callable] = None) -> Dict[int, Any]:
-        """Get multiple users with batch loading"""
-        results = {}
-        missing_ids = []
-        
-        # Check cache for all users
-        for user_id in user_ids:
-            key = CacheKey.generate("user", user_id)
-            user = await self.cache.get(key)
-            if user is not None:
-                results[user_id] = user
-            else:
-                missing_ids.append(user_id)
+        """Get multiple users with one MGET and one pipelined write for misses"""
+        keys = {user_id: CacheKey.generate("user", user_id) for user_id in user_ids}
+        cached = await self.cache.get_many(list(keys.values()))
+        
+        results = {
+            user_id: cached[key] for user_id, key in keys.items() if key in cached
+        }
+        missing_ids = [user_id for user_id in keys if user_id not in results]
         
         # Load missing users from database
         if missing_ids and loader:
             logger.debug(f"Batch loading {len(missing_ids)} users from database")
-            loaded_users = await loader(missing_ids)
+            loaded_users = await _call_loader(loader, missing_ids)
             
-            # Cache loaded users
-            for user_id, user_data in loaded_users.items():
-                key = CacheKey.generate("user", user_id)
-                await self.cache.set(key, user_data, ttl=self.default_ttls["user"])
-                results[user_id] = user_data
+            await self.cache.set_many(
+                {CacheKey.generate("user", user_id): user_data for user_id, user_data in loaded_users.items()},
+                ttl=self.default_ttls["user"]
+            )
+            results.update(loaded_users)
         
         return results
     
@@ -137,7 +137,9 @@ class CacheManager:
         if loader:
             project = await loader(project_id)
             if project:
-                await self.cache.set(key, project, ttl=self.default_ttls["project"])
+                await self.cache.set(
+                    key, project, ttl=self.default_ttls["project"], tags=[CacheTag.project(project_id)]
+                )
             return project
         
         return None
@@ -145,7 +147,9 @@ class CacheManager:
     async def set_project(self, project_id: int, project_data: Any, ttl: Optional[int] = None) -> bool:
         """Cache project data with write-through pattern"""
         key = CacheKey.generate("project", project_id)
-        success = await self.cache.set(key, project_data, ttl=ttl or self.default_ttls["project"])
+        success = await self.cache.set(
+            key, project_data, ttl=ttl or self.default_ttls["project"], tags=[CacheTag.project(project_id)]
+        )
         
         # Also cache project list entries
         await self._update_project_lists(project_id, project_data)
@@ -154,26 +158,35 @@ class CacheManager:
     
     async def invalidate_project(self, project_id: int, cascade: bool = True) -> bool:
         """Invalidate project cache with optional cascade to related data"""
-        keys_to_delete = [CacheKey.generate("project", project_id)]
+        count = await self.cache.delete(CacheKey.generate("project", project_id))
         
         if cascade:
-            # Invalidate related caches
-            keys_to_delete.extend([
-                CacheKey.generate("project", project_id, "stats"),
-                CacheKey.generate("project", project_id, "users"),
-                CacheKey.generate("project", project_id, "annotations"),
-                CacheKey.pattern("annotation", f"project:{project_id}:*")
-            ])
-            
-            # Clear query caches that might include this project
-            await self.cache.flush_pattern(CacheKey.pattern("query", "projects:*"))
+            # Everything tagged with the project, plus project list queries
+            count += await self.cache.invalidate_tags(
+                CacheTag.project(project_id), CacheKey.generate("query", "projects")
+            )
         
-        count = await self.cache.delete(*keys_to_delete)
         if count > 0:
             logger.info(f"Invalidated cache for project {project_id} (cascade={cascade})")
         
         return count > 0
-    
+
+    async def invalidate_project_access(self, *owner_ids: int, public_changed: bool = False) -> bool:
+        """Invalidate cached principals whose accessible project ids changed
+
+        Owners are invalidated when a project is created, deleted or changes
+        owner; every principal is dropped when the set of public projects changed.
+        """
+        if public_changed:
+            count = get_principal_cache().clear()
+            count += await self.cache.invalidate_tags(CacheTag.principals())
+            if count > 0:
+                logger.info("Invalidated all cached principals after a public project change")
+            return count > 0
+
+        results = [await self.invalidate_user(owner_id) for owner_id in dict.fromkeys(owner_ids)]
+        return any(results)
+
     async def get_user_projects(self, user_id: int, loader: Optional[Callable] = None) -> Optional[List[Any]]:
         """Get user's projects list with caching"""
         key = CacheKey.generate("user", user_id, "projects")
@@ -185,7 +198,7 @@ class CacheManager:
         if loader:
             projects = await loader(user_id)
             if projects is not None:
-                await self.cache.set(key, projects, ttl=self.default_ttls["project"])
+                await self.cache.set(key, projects, ttl=self.default_ttls["project"], tags=[CacheTag.user(user_id)])
             return projects
         
         return None
@@ -236,20 +249,21 @@ class CacheManager:
         if loader:
             annotations = await loader(text_id, user_id)
             if annotations is not None:
-                await self.cache.set(key, annotations, ttl=self.default_ttls["annotation"])
+                await self.cache.set(
+                    key, annotations, ttl=self.default_ttls["annotation"], tags=[CacheTag.text(text_id)]
+                )
             return annotations
         
         return None
     
     async def invalidate_annotation(self, annotation_id: int, text_id: Optional[int] = None) -> bool:
         """Invalidate annotation cache and related caches"""
-        keys_to_delete = [CacheKey.generate("annotation", annotation_id)]
+        count = await self.cache.delete(CacheKey.generate("annotation", annotation_id))
         
         if text_id:
             # Invalidate text annotation lists
-            keys_to_delete.append(CacheKey.pattern("text", text_id, "annotations:*"))
-            
-        count = await self.cache.delete(*keys_to_delete)
+            count += await self.cache.invalidate_tags(CacheTag.text(text_id))
+        
         if count > 0:
             logger.info(f"Invalidated cache for annotation {annotation_id}")
         
@@ -287,19 +301,19 @@ class CacheManager:
         if loader:
             labels = await loader(project_id)
             if labels is not None:
-                await self.cache.set(key, labels, ttl=self.default_ttls["label"])
+                await self.cache.set(
+                    key, labels, ttl=self.default_ttls["label"], tags=[CacheTag.project(project_id)]
+                )
             return labels
         
         return None
     
     async def invalidate_project_labels(self, project_id: int) -> bool:
         """Invalidate label cache for a project"""
-        pattern = CacheKey.pattern("project", project_id, "labels")
-        count = await self.cache.flush_pattern(pattern)
-        
-        # Also invalidate individual labels from this project
-        pattern = CacheKey.pattern("label", f"project:{project_id}:*")
-        count += await self.cache.flush_pattern(pattern)
+        count = await self.cache.delete(
+            CacheKey.generate("project", project_id, "labels"),
+            CacheKey.generate("labels", "project", project_id)
+        )
         
         if count > 0:
             logger.info(f"Invalidated label cache for project {project_id}")
@@ -315,9 +329,10 @@ class CacheManager:
         query_name: str, 
         params: Dict[str, Any],
         loader: Optional[Callable] = None,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None
     ) -> Optional[Any]:
-        """Cache expensive query results"""
+        """Cache expensive query results, tagged by query name and any given tags"""
         # Generate cache key from query name and parameters
         key = CacheKey.generate("query", query_name, **params)
         
@@ -330,13 +345,23 @@ class CacheManager:
             logger.debug(f"Query cache miss for {query_name}, executing query")
             result = await loader(**params)
             if result is not None:
-                await self.cache.set(key, result, ttl=ttl or self.default_ttls["query"])
+                await self.cache.set(
+                    key, result, ttl=ttl or self.default_ttls["query"],
+                    tags=[CacheKey.generate("query", query_name), *(tags or [])]
+                )
             return result
         
         return None
     
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Invalidate every cache entry registered under the given tags"""
+        count = await self.cache.invalidate_tags(*tags)
+        if count > 0:
+            logger.info(f"Invalidated {count} cache entries for tags {list(tags)}")
+        return count
+    
     async def invalidate_query_cache(self, pattern: str) -> int:
-        """Invalidate query cache by pattern"""
+        """Invalidate query cache by pattern (SCAN based, for admin use)"""
         cache_pattern = CacheKey.pattern("query", pattern)
         count = await self.cache.flush_pattern(cache_pattern)
         if count > 0:
@@ -348,7 +373,7 @@ class CacheManager:
     # =============================================================================
     
     async def warm_user_cache(self, user_ids: List[int], loader: Callable) -> int:
-        """Preload user data into cache"""
+        """Preload user data into cache, one pipelined write per loaded batch"""
         warmed_count = 0
         
         logger.info(f"Warming cache for {len(user_ids)} users")
@@ -359,17 +384,12 @@ class CacheManager:
             batch_ids = user_ids[i:i + batch_size]
             
             try:
-                users = await loader(batch_ids)
-                
-                # Cache each user
-                for user_id, user_data in users.items():
-                    key = CacheKey.generate("user", user_id)
-                    success = await self.cache.set(key, user_data, ttl=self.default_ttls["user"])
-                    if success:
-                        warmed_count += 1
+                users = await _call_loader(loader, batch_ids)
                 
-                # Small delay to avoid overwhelming Redis
-                await asyncio.sleep(0.1)
+                warmed_count += await self.cache.set_many(
+                    {CacheKey.generate("user", user_id): user_data for user_id, user_data in users.items()},
+                    ttl=self.default_ttls["user"]
+                )
                 
             except Exception as e:
                 logger.warning(f"Error warming user cache batch {i//batch_size + 1}: {str(e)}")
@@ -378,24 +398,38 @@ class CacheManager:
         return warmed_count
     
     async def warm_project_cache(self, project_ids: List[int], loader: Callable) -> int:
-        """Preload project data into cache"""
+        """
+        Preload project data into cache.
+        
+        Args:
+            project_ids: Projects to warm
+            loader: Batch loader taking a list of ids and returning {id: data}
+        
+        Returns:
+            Number of projects cached
+        """
         warmed_count = 0
         
         logger.info(f"Warming cache for {len(project_ids)} projects")
         
-        for project_id in project_ids:
+        batch_size = 50
+        for i in range(0, len(project_ids), batch_size):
+            batch_ids = project_ids[i:i + batch_size]
+            
             try:
-                project_data = await loader(project_id)
-                if project_data:
-                    success = await self.set_project(project_id, project_data)
-                    if success:
-                        warmed_count += 1
+                projects = await _call_loader(loader, batch_ids)
                 
-                # Small delay between requests
-                await asyncio.sleep(0.05)
+                warmed_count += await self.cache.set_many(
+                    {
+                        CacheKey.generate("project", project_id): project_data
+                        for project_id, project_data in projects.items()
+                        if project_data
+                    },
+                    ttl=self.default_ttls["project"]
+                )
                 
             except Exception as e:
-                logger.warning(f"Error warming cache for project {project_id}: {str(e)}")
+                logger.warning(f"Error warming project cache batch {i//batch_size + 1}: {str(e)}")
         
         logger.info(f"Warmed cache for {warmed_count} projects")
         return warmed_count
@@ -479,6 +513,16 @@ class CacheManager:
             }
 
 
+async def _call_loader(loader: Callable, ids: List[int]) -> Dict[int, Any]:
+    """Call a sync or async batch loader and normalize its result to {id: data}"""
+    result = loader(ids)
+    if asyncio.iscoroutine(result):
+        result = await result
+    if isinstance(result, dict):
+        return result
+    return {item.id: item for item in result or []}
+
+
 # Global cache manager instance
 _cache_manager: Optional[CacheManager] = None
 
@@ -17,9 +17,12 @@ from ..models.annotation import Annotation
 from ..models.text import Text
 from ..models.user import User
 from ..models.label import Label
+from ..models.annotation_counter import get_annotation_counters
 from ..services.cache_manager import get_cache_manager
-from ..utils.cache_decorators import cached, cache_annotations, cache_invalidate, CacheContext
-from ..core.cache_service import CacheKey
+from ..utils.cache_decorators import (
+    cached, cache_annotations, cache_invalidate, CacheContext, text_annotations_key
+)
+from ..core.cache_service import CacheKey, CacheTag
 from ..utils.logger import get_logger
 
 
@@ -92,7 +95,7 @@ class CachedAnnotationService:
             
             # Filter by project if specified
             if project_id:
-                query = query.join(Text).filter(Text.project_id == project_id)
+                query = query.filter(Annotation.project_id == project_id)
             
             # Order by most recent first
             annotations = query.filter(Annotation.is_deleted == False)\
@@ -116,11 +119,15 @@ class CachedAnnotationService:
     ) -> Dict[str, Any]:
         """Get annotation statistics with caching"""
         try:
+            # A single project or text scope is served from maintained counters
+            if (project_id is None) != (text_id is None) and not user_id:
+                return self._annotation_statistics_from_counters(db, project_id, text_id)
+            
             base_query = db.query(Annotation).filter(Annotation.is_deleted == False)
             
             # Apply filters
             if project_id:
-                base_query = base_query.join(Text).filter(Text.project_id == project_id)
+                base_query = base_query.filter(Annotation.project_id == project_id)
             if user_id:
                 base_query = base_query.filter(Annotation.user_id == user_id)
             if text_id:
@@ -136,7 +143,7 @@ class CachedAnnotationService:
             ).join(Annotation).filter(Annotation.is_deleted == False)
             
             if project_id:
-                label_counts = label_counts.join(Text).filter(Text.project_id == project_id)
+                label_counts = label_counts.filter(Annotation.project_id == project_id)
             if user_id:
                 label_counts = label_counts.filter(Annotation.user_id == user_id)
             if text_id:
@@ -183,7 +190,39 @@ class CachedAnnotationService:
                 "error": str(e)
             }
     
-    @cache_invalidate("text:*:annotations*", "user_annotations:*", "annotation_stats:*")
+    def _annotation_statistics_from_counters(
+        self,
+        db: Session,
+        project_id: Optional[int],
+        text_id: Optional[int]
+    ) -> Dict[str, Any]:
+        """Build annotation statistics for one project or text from counter rows."""
+        if project_id:
+            scope, scope_id = "project", project_id
+        else:
+            scope, scope_id = "text", text_id
+        
+        counters = get_annotation_counters(db, scope, scope_id)
+        label_names = dict(
+            db.query(Label.id, Label.name).filter(Label.id.in_(counters["label_counts"])).all()
+        ) if counters["label_counts"] else {}
+        
+        annotation_count = counters["annotation_count"]
+        avg_length = counters["length_sum"] / annotation_count if annotation_count else 0
+        
+        return {
+            "total_annotations": counters["annotation_count"],
+            "unique_annotators": counters["annotator_count"],
+            "average_length": round(float(avg_length or 0), 2),
+            "recent_activity": counters["recent_count"],
+            "label_distribution": {
+                label_names.get(label_id, str(label_id)): count
+                for label_id, count in counters["label_counts"].items()
+            },
+            "generated_at": datetime.utcnow().isoformat()
+        }
+    
+    @cache_invalidate("user_annotations", "annotation_stats")
     async def create_annotation(
         self,
         annotation_data: Dict[str, Any],
@@ -209,6 +248,7 @@ class CachedAnnotationService:
             # Cache the new annotation immediately
             key = CacheKey.generate("annotation", annotation.id)
             await self.cache_manager.cache.set(key, annotation, ttl=900)
+            await self.cache_manager.invalidate_tags(CacheTag.text(annotation.text_id))
             
             logger.info(f"Created annotation {annotation.id} for text {annotation.text_id}")
             return annotation
@@ -218,7 +258,7 @@ class CachedAnnotationService:
             logger.error(f"Error creating annotation: {str(e)}")
             raise
     
-    @cache_invalidate("text:*:annotations*", "user_annotations:*", "annotation_stats:*")
+    @cache_invalidate("user_annotations", "annotation_stats")
     async def update_annotation(
         self,
         annotation_id: int,
@@ -247,10 +287,10 @@ class CachedAnnotationService:
             key = CacheKey.generate("annotation", annotation.id)
             await self.cache_manager.cache.set(key, annotation, ttl=900)
             
-            # Invalidate text annotations cache if text changed
-            if old_text_id != annotation.text_id:
-                old_key = CacheKey.pattern("text", old_text_id, "annotations:*")
-                await self.cache_manager.cache.flush_pattern(old_key)
+            # Invalidate annotation lists of the old and new text
+            await self.cache_manager.invalidate_tags(
+                CacheTag.text(old_text_id), CacheTag.text(annotation.text_id)
+            )
             
             logger.info(f"Updated annotation {annotation.id}")
             return annotation
@@ -260,7 +300,7 @@ class CachedAnnotationService:
             logger.error(f"Error updating annotation {annotation_id}: {str(e)}")
             raise
     
-    @cache_invalidate("text:*:annotations*", "user_annotations:*", "annotation_stats:*")
+    @cache_invalidate("user_annotations", "annotation_stats")
     async def delete_annotation(self, annotation_id: int, db: Session, soft_delete: bool = True) -> bool:
         """Delete annotation with cache invalidation"""
         try:
@@ -268,6 +308,8 @@ class CachedAnnotationService:
             if not annotation:
                 return False
             
+            text_id = annotation.text_id
+            
             if soft_delete:
                 annotation.is_deleted = True
                 annotation.updated_at = datetime.utcnow()
@@ -279,6 +321,7 @@ class CachedAnnotationService:
             # Remove from cache
             key = CacheKey.generate("annotation", annotation_id)
             await self.cache_manager.cache.delete(key)
+            await self.cache_manager.invalidate_tags(CacheTag.text(text_id))
             
             logger.info(f"{'Soft ' if soft_delete else ''}deleted annotation {annotation_id}")
             return True
@@ -288,7 +331,11 @@ class CachedAnnotationService:
             logger.error(f"Error deleting annotation {annotation_id}: {str(e)}")
             raise
     
-    @cached(ttl=1800, key_prefix="annotation_conflicts")
+    @cached(
+        ttl=1800,
+        key_prefix="annotation_conflicts",
+        tags=lambda service, text_id, *args, **kwargs: [CacheTag.text(text_id)]
+    )
     async def get_annotation_conflicts(
         self,
         text_id: int,
@@ -360,6 +407,7 @@ class CachedAnnotationService:
                     )
                     
                     db.add(annotation)
+                    created_annotations.append(annotation)
                     text_ids.add(ann_data["text_id"])
                     
                 except Exception as e:
@@ -374,15 +422,19 @@ class CachedAnnotationService:
                 
                 # Batch cache operations
                 async with CacheContext():
-                    # Cache new annotations
-                    for annotation in created_annotations:
-                        key = CacheKey.generate("annotation", annotation.id)
-                        await self.cache_manager.cache.set(key, annotation, ttl=900)
+                    # Cache new annotations in one pipeline
+                    await self.cache_manager.cache.set_many(
+                        {
+                            CacheKey.generate("annotation", annotation.id): annotation
+                            for annotation in created_annotations
+                        },
+                        ttl=900
+                    )
                     
                     # Invalidate affected text annotation caches
-                    for text_id in text_ids:
-                        pattern = CacheKey.pattern("text", text_id, "annotations:*")
-                        await self.cache_manager.cache.flush_pattern(pattern)
+                    await self.cache_manager.invalidate_tags(
+                        *[CacheTag.text(text_id) for text_id in text_ids]
+                    )
                 
                 logger.info(f"Batch created {len(created_annotations)} annotations")
             
@@ -396,22 +448,50 @@ class CachedAnnotationService:
             return [], errors
     
     async def warm_annotation_cache(self, text_ids: List[int], db: Session) -> Dict[str, int]:
-        """Warm annotation cache for multiple texts"""
+        """
+        Warm annotation cache for multiple texts.
+        
+        Cached texts are found with one MGET; the rest are loaded with a single
+        query and written back in one pipeline.
+        
+        Args:
+            text_ids: Texts whose annotation lists should be cached
+            db: Database session
+        
+        Returns:
+            Counts of texts that are cached ("success") and that failed
+        """
         results = {"success": 0, "failed": 0}
+        keys = {text_id: text_annotations_key(text_id) for text_id in text_ids}
         
-        for text_id in text_ids:
-            try:
-                annotations = await self.get_text_annotations(text_id, db)
-                if annotations is not None:
-                    results["success"] += 1
-                else:
-                    results["failed"] += 1
-                    
-            except Exception as e:
-                logger.warning(f"Failed to warm annotation cache for text {text_id}: {str(e)}")
-                results["failed"] += 1
+        try:
+            cached_keys = await self.cache_manager.cache.get_many(list(keys.values()))
+            missing_ids = [text_id for text_id, key in keys.items() if key not in cached_keys]
+            results["success"] += len(keys) - len(missing_ids)
+            
+            if missing_ids:
+                annotations_by_text = {text_id: [] for text_id in missing_ids}
+                annotations = db.query(Annotation).filter(
+                    Annotation.text_id.in_(missing_ids),
+                    Annotation.is_deleted == False
+                ).order_by(Annotation.text_id, Annotation.start_char).all()
+                
+                for annotation in annotations:
+                    annotations_by_text[annotation.text_id].append(annotation)
+                
+                written = await self.cache_manager.cache.set_many(
+                    {keys[text_id]: items for text_id, items in annotations_by_text.items()},
+                    ttl=900,
+                    tags={keys[text_id]: [CacheTag.text(text_id)] for text_id in missing_ids}
+                )
+                results["success"] += written
+                results["failed"] += len(missing_ids) - written
+                
+        except Exception as e:
+            logger.warning(f"Failed to warm annotation cache for {len(text_ids)} texts: {str(e)}")
+            results["failed"] = len(keys) - results["success"]
         
-        logger.info(f"Warmed annotation cache for {results['success']}/{len(text_ids)} texts")
+        logger.info(f"Warmed annotation cache for {results['success']}/{len(keys)} texts")
         return results
     
     async def get_cache_info(self) -> Dict[str, Any]:
@@ -15,8 +15,8 @@ from sqlalchemy import and_, or_, desc, func
 from ..models.project import Project
 from ..models.user import User
 from ..services.cache_manager import get_cache_manager
-from ..utils.cache_decorators import cached, cache_project, cache_invalidate, CacheContext
-from ..core.cache_service import CacheKey
+from ..utils.cache_decorators import cached, cache_project, cache_invalidate
+from ..core.cache_service import CacheKey, CacheTag
 from ..utils.logger import get_logger
 
 
@@ -82,51 +82,41 @@ class CachedProjectService:
             logger.error(f"Error loading projects for user {user_id}: {str(e)}")
             return []
     
-    @cached(ttl=600, key_prefix="project_stats")
+    @cached(
+        ttl=600,
+        key_prefix="project_stats",
+        tags=lambda service, project_id, *args, **kwargs: [CacheTag.project(project_id)]
+    )
     async def get_project_statistics(self, project_id: int, db: Session) -> Dict[str, Any]:
         """Get cached project statistics"""
         try:
-            # This would be an expensive query in practice
             from ..models.text import Text
-            from ..models.annotation import Annotation
             from ..models.label import Label
+            from ..models.annotation_counter import get_annotation_counters
             
             project = db.query(Project).filter(Project.id == project_id).first()
             if not project:
                 return {}
             
-            # Count texts
+            # Count texts and labels (indexed on project_id)
             text_count = db.query(func.count(Text.id)).filter(Text.project_id == project_id).scalar()
-            
-            # Count annotations
-            annotation_count = db.query(func.count(Annotation.id)).join(Text).filter(
-                Text.project_id == project_id
-            ).scalar()
-            
-            # Count labels
             label_count = db.query(func.count(Label.id)).filter(Label.project_id == project_id).scalar()
             
-            # Count unique annotators
-            annotator_count = db.query(func.count(func.distinct(Annotation.user_id))).join(Text).filter(
-                Text.project_id == project_id
-            ).scalar()
+            # Annotation totals come from the maintained counters
+            counters = get_annotation_counters(db, "project", project_id)
             
             stats = {
                 "project_id": project_id,
                 "text_count": text_count or 0,
-                "annotation_count": annotation_count or 0,
+                "annotation_count": counters["annotation_count"],
                 "label_count": label_count or 0,
-                "annotator_count": annotator_count or 0,
+                "annotator_count": counters["annotator_count"],
                 "completion_rate": 0.0  # Calculate based on your business logic
             }
             
             # Calculate completion rate if we have texts
             if text_count > 0:
-                # This is a simplified calculation - adjust based on your requirements
-                annotated_texts = db.query(func.count(func.distinct(Text.id))).join(Annotation).filter(
-                    Text.project_id == project_id
-                ).scalar()
-                stats["completion_rate"] = (annotated_texts or 0) / text_count * 100
+                stats["completion_rate"] = counters["annotated_text_count"] / text_count * 100
             
             logger.debug(f"Calculated statistics for project {project_id}")
             return stats
@@ -143,7 +133,7 @@ class CachedProjectService:
                 "error": str(e)
             }
     
-    @cache_invalidate("user_projects:*", "project_stats:*")
+    @cache_invalidate("user_projects", "project_stats")
     async def create_project(self, project_data: Dict[str, Any], owner_id: int, db: Session) -> Project:
         """Create new project with cache invalidation"""
         try:
@@ -173,7 +163,7 @@ class CachedProjectService:
             logger.error(f"Error creating project: {str(e)}")
             raise
     
-    @cache_invalidate("user_projects:*", "project_stats:*")
+    @cache_invalidate("user_projects", "project_stats")
     async def update_project(
         self, 
         project_id: int, 
@@ -205,7 +195,7 @@ class CachedProjectService:
             logger.error(f"Error updating project {project_id}: {str(e)}")
             raise
     
-    @cache_invalidate("user_projects:*", "project_stats:*")
+    @cache_invalidate("user_projects", "project_stats")
     async def delete_project(self, project_id: int, db: Session) -> bool:
         """Delete project with comprehensive cache invalidation"""
         try:
@@ -213,15 +203,10 @@ class CachedProjectService:
             if not project:
                 return False
             
-            async with CacheContext([
-                CacheKey.generate("project", project_id),
-                CacheKey.pattern("project", project_id, "*"),
-                CacheKey.pattern("text", f"project:{project_id}:*"),
-                CacheKey.pattern("annotation", f"project:{project_id}:*"),
-                CacheKey.pattern("query", f"*project:{project_id}*")
-            ]):
-                db.delete(project)
-                db.commit()
+            db.delete(project)
+            db.commit()
+            
+            await self.cache_manager.invalidate_project(project_id, cascade=True)
             
             logger.info(f"Deleted project {project_id}")
             return True
@@ -317,25 +302,13 @@ class CachedProjectService:
     
     async def invalidate_project_caches(self, project_id: int, cascade: bool = True) -> int:
         """Invalidate all caches related to a project"""
-        patterns = [
-            f"project:{project_id}",
-            f"project:{project_id}:*",
-            f"user_projects:*",
-            f"project_stats:{project_id}:*"
-        ]
+        tags = ["user_projects"]
         
         if cascade:
-            patterns.extend([
-                f"*project:{project_id}*",
-                f"text:project:{project_id}:*",
-                f"annotation:project:{project_id}:*",
-                f"label:project:{project_id}:*"
-            ])
+            tags.append(CacheTag.project(project_id))
         
-        total_invalidated = 0
-        for pattern in patterns:
-            count = await self.cache_manager.invalidate_query_cache(pattern)
-            total_invalidated += count
+        total_invalidated = await self.cache_manager.cache.delete(CacheKey.generate("project", project_id))
+        total_invalidated += await self.cache_manager.invalidate_tags(*tags)
         
         logger.info(f"Invalidated {total_invalidated} cache entries for project {project_id}")
         return total_invalidated
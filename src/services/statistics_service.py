@@ -0,0 +1,271 @@
+"""
+Statistics Service
+
+Aggregate statistics for the admin dashboards:
+- Totals and recent-activity counts in one grouped statement
+- Top annotators and projects from the annotation counters in one statement
+- Daily timelines for the last year in one statement
+
+Results are stored in a rollup row refreshed by a background job; dashboard
+endpoints read that row and only recompute when it is older than the
+staleness bound.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, desc, func, literal, select, true, union_all
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.annotation import Annotation
+from ..models.annotation_counter import AnnotationCounter
+from ..models.audit_log import SecurityEvent
+from ..models.label import Label
+from ..models.project import Project
+from ..models.statistics_rollup import StatisticsRollup
+from ..models.text import Text
+from ..models.user import User
+from ..utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+# Longest timeline the dashboards can request
+TIMELINE_DAYS = 365
+RANKING_LIMIT = 10
+RECENT_LIMIT = 5
+
+
+def _count_if(condition):
+    """Portable conditional count."""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+class StatisticsService:
+    """Computes, stores and serves admin dashboard aggregates"""
+
+    ROLLUP_NAME = "system"
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def compute(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Compute every dashboard aggregate from the live tables."""
+        now = now or datetime.utcnow()
+        return {
+            **self._compute_totals(now),
+            **self._compute_rankings(),
+            "timeline": self._compute_timeline(now),
+            "recent_activity": self._compute_recent_activity()
+        }
+
+    def _compute_totals(self, now: datetime) -> Dict[str, Any]:
+        today = datetime(now.year, now.month, now.day)
+        week_ago = now - timedelta(days=7)
+        month_ago = now - timedelta(days=30)
+
+        users = select(
+            func.count(User.id).label("total_users"),
+            _count_if(User.is_active == True).label("active_users"),
+            _count_if(User.is_active == False).label("inactive_users"),
+            _count_if(User.created_at >= month_ago).label("new_users_30d"),
+            _count_if(User.created_at >= today).label("new_users_today"),
+            _count_if(User.last_login >= month_ago).label("users_with_recent_login"),
+            _count_if(User.last_login >= week_ago).label("recent_logins")
+        ).subquery()
+        projects = select(
+            func.count(Project.id).label("total_projects"),
+            _count_if(Project.is_active == True).label("active_projects"),
+            _count_if(Project.created_at >= month_ago).label("new_projects_30d"),
+            _count_if(Project.created_at >= week_ago).label("new_projects_week")
+        ).subquery()
+        texts = select(func.count(Text.id).label("total_texts")).subquery()
+        labels = select(func.count(Label.id).label("total_labels")).subquery()
+        # Totals come from the maintained counters; windows use the created_at index
+        annotation_total = select(
+            func.coalesce(func.sum(AnnotationCounter.value), 0).label("total_annotations")
+        ).where(
+            AnnotationCounter.scope == "project",
+            AnnotationCounter.dimension == "annotations"
+        ).subquery()
+        annotations = select(
+            func.count(Annotation.id).label("new_annotations_30d"),
+            _count_if(Annotation.created_at >= week_ago).label("new_annotations_week")
+        ).where(Annotation.created_at >= month_ago).subquery()
+        security = select(
+            func.count(SecurityEvent.id).label("unresolved_security_events")
+        ).where(SecurityEvent.resolved == False).subquery()
+
+        aggregates = [users, projects, texts, labels, annotation_total, annotations, security]
+        source = aggregates[0]
+        for aggregate in aggregates[1:]:
+            source = source.join(aggregate, true())
+        row = self.db.execute(
+            select(*[column for aggregate in aggregates for column in aggregate.c]).select_from(source)
+        ).mappings().one()
+
+        return {
+            "overview": {
+                "total_users": row["total_users"],
+                "active_users": row["active_users"],
+                "total_projects": row["total_projects"],
+                "active_projects": row["active_projects"],
+                "total_texts": row["total_texts"],
+                "total_annotations": row["total_annotations"],
+                "total_labels": row["total_labels"]
+            },
+            "recent": {
+                "new_users_30d": row["new_users_30d"],
+                "new_users_today": row["new_users_today"],
+                "new_projects_30d": row["new_projects_30d"],
+                "new_projects_week": row["new_projects_week"],
+                "new_annotations_30d": row["new_annotations_30d"],
+                "new_annotations_week": row["new_annotations_week"],
+                "users_with_recent_login": row["users_with_recent_login"],
+                "recent_logins": row["recent_logins"]
+            },
+            "alerts": {
+                "inactive_users": row["inactive_users"],
+                "unresolved_security_events": row["unresolved_security_events"]
+            }
+        }
+
+    def _compute_rankings(self) -> Dict[str, List[Dict[str, Any]]]:
+        annotation_count = func.sum(AnnotationCounter.value).label("annotation_count")
+        top_annotators = select(
+            literal("annotator").label("kind"),
+            User.username.label("name"),
+            annotation_count
+        ).join(AnnotationCounter, AnnotationCounter.key == User.id).where(
+            AnnotationCounter.scope == "project",
+            AnnotationCounter.dimension == "annotator"
+        ).group_by(User.id, User.username).order_by(desc(annotation_count)).limit(RANKING_LIMIT).subquery()
+
+        top_projects = select(
+            literal("project").label("kind"),
+            Project.name.label("name"),
+            AnnotationCounter.value.label("annotation_count")
+        ).join(AnnotationCounter, AnnotationCounter.scope_id == Project.id).where(
+            AnnotationCounter.scope == "project",
+            AnnotationCounter.dimension == "annotations",
+            AnnotationCounter.value > 0
+        ).order_by(desc(AnnotationCounter.value)).limit(RANKING_LIMIT).subquery()
+
+        rankings = {"annotator": [], "project": []}
+        rows = self.db.execute(union_all(select(top_annotators), select(top_projects))).all()
+        for kind, name, count in sorted(rows, key=lambda row: -row[2]):
+            rankings[kind].append((name, count))
+
+        return {
+            "top_annotators": [
+                {"username": name, "annotation_count": count} for name, count in rankings["annotator"]
+            ],
+            "most_active_projects": [
+                {"project_name": name, "annotation_count": count} for name, count in rankings["project"]
+            ]
+        }
+
+    def _compute_timeline(self, now: datetime) -> Dict[str, List[Dict[str, Any]]]:
+        start_date = now - timedelta(days=TIMELINE_DAYS)
+
+        def daily(kind: str, column):
+            day = func.date(column)
+            return select(
+                literal(kind).label("kind"), day.label("date"), func.count().label("count")
+            ).where(column >= start_date).group_by(day)
+
+        timeline = {"daily_users": [], "daily_projects": [], "daily_annotations": []}
+        rows = self.db.execute(union_all(
+            daily("daily_users", User.created_at),
+            daily("daily_projects", Project.created_at),
+            daily("daily_annotations", Annotation.created_at)
+        )).all()
+        for kind, date, count in sorted(rows, key=lambda row: str(row[1])):
+            timeline[kind].append({"date": str(date), "count": count})
+        return timeline
+
+    def _compute_recent_activity(self) -> Dict[str, List[Dict[str, Any]]]:
+        recent_users = self.db.query(User.id, User.username, User.created_at).order_by(
+            desc(User.created_at)
+        ).limit(RECENT_LIMIT).all()
+        recent_projects = self.db.query(
+            Project.id, Project.name, User.username, Project.created_at
+        ).outerjoin(User, User.id == Project.owner_id).order_by(
+            desc(Project.created_at)
+        ).limit(RECENT_LIMIT).all()
+
+        return {
+            "users": [
+                {"id": user_id, "username": username, "created_at": created_at.isoformat() if created_at else None}
+                for user_id, username, created_at in recent_users
+            ],
+            "projects": [
+                {"id": project_id, "name": name, "owner": owner,
+                 "created_at": created_at.isoformat() if created_at else None}
+                for project_id, name, owner, created_at in recent_projects
+            ]
+        }
+
+    def refresh(self) -> StatisticsRollup:
+        """Recompute the aggregates and store them in the rollup row."""
+        computed_at = datetime.utcnow()
+        payload = self.compute(computed_at)
+
+        rollup = self.db.get(StatisticsRollup, self.ROLLUP_NAME)
+        if rollup is None:
+            rollup = StatisticsRollup(name=self.ROLLUP_NAME)
+            self.db.add(rollup)
+        rollup.payload = payload
+        rollup.computed_at = computed_at
+        self.db.commit()
+
+        logger.debug(f"Statistics rollup refreshed in {(datetime.utcnow() - computed_at).total_seconds():.3f}s")
+        return rollup
+
+    def get(self, max_staleness_seconds: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Serve the stored aggregates, recomputing only when the rollup is
+        missing or older than max_staleness_seconds.
+        """
+        if max_staleness_seconds is None:
+            max_staleness_seconds = settings.STATISTICS_MAX_STALENESS_SECONDS
+
+        rollup = self.db.get(StatisticsRollup, self.ROLLUP_NAME)
+        now = datetime.utcnow()
+        if rollup is None or (now - rollup.computed_at).total_seconds() > max_staleness_seconds:
+            rollup = self.refresh()
+
+        return {
+            **rollup.payload,
+            "computed_at": rollup.computed_at.isoformat(),
+            "age_seconds": round((now - rollup.computed_at).total_seconds(), 3)
+        }
+
+
+def refresh_statistics_rollup():
+    """Refresh the rollup on a fresh session; runs in a worker thread."""
+    db = SessionLocal()
+    try:
+        StatisticsService(db).refresh()
+    finally:
+        db.close()
+
+
+async def start_statistics_refresh():
+    """Start the background job that keeps the statistics rollup fresh."""
+
+    async def refresh_loop():
+        while True:
+            try:
+                await asyncio.to_thread(refresh_statistics_rollup)
+                await asyncio.sleep(settings.STATISTICS_REFRESH_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Statistics rollup refresh failed: {str(e)}")
+                await asyncio.sleep(settings.STATISTICS_REFRESH_SECONDS * 2)
+
+    return asyncio.create_task(refresh_loop())
@@ -17,17 +17,38 @@ from scipy import stats
 from collections import defaultdict, Counter
 import warnings
 
+from .agreement_statistics import MergedAgreementStatistics
+from .coincidence import CoincidenceData
+from .pairwise_agreement import PairwiseKappa, sort_categories
+from .bootstrap import (
+    AlphaBootstrap, CohenKappaBootstrap, FleissKappaBootstrap,
+    bootstrap_interval, bootstrap_replicates
+)
+
 
 class AgreementMetrics:
     """
     A comprehensive class for calculating inter-annotator agreement metrics.
     """
     
-    def __init__(self):
+    def __init__(self, n_bootstrap: int = 1000, confidence: float = 0.95,
+                 n_jobs: int = 1, random_state: Optional[int] = None):
+        """
+        Args:
+            n_bootstrap: Default number of bootstrap replicates for Alpha
+            confidence: Confidence level for intervals
+            n_jobs: Worker processes used for bootstrap replicates
+            random_state: Seed for reproducible bootstrap intervals
+        """
         self.results_cache = {}
+        self.n_bootstrap = n_bootstrap
+        self.confidence = confidence
+        self.n_jobs = n_jobs
+        self.random_state = random_state
     
     def cohen_kappa(self, annotator1: List[Any], annotator2: List[Any], 
-                   weights: Optional[str] = None) -> Dict[str, float]:
+                   weights: Optional[str] = None,
+                   n_bootstrap: Optional[int] = None) -> Dict[str, float]:
         """
         Calculate Cohen's Kappa for two annotators.
         
@@ -35,29 +56,33 @@ class AgreementMetrics:
             annotator1: Annotations from first annotator
             annotator2: Annotations from second annotator  
             weights: Type of weighting ('linear', 'quadratic', or None)
+            n_bootstrap: Number of bootstrap replicates for SE and confidence
+                intervals (analytic SE when None)
             
         Returns:
             Dictionary with kappa value, standard error, and confidence intervals
         """
         if len(annotator1) != len(annotator2):
             raise ValueError("Annotator arrays must have same length")
+        if len(annotator1) == 0:
+            raise ValueError("Annotator arrays must not be empty")
         
         # Convert to numpy arrays
         ann1 = np.array(annotator1)
         ann2 = np.array(annotator2)
         
         # Get unique categories
-        categories = sorted(list(set(ann1) | set(ann2)))
+        categories = sort_categories(set(ann1) | set(ann2))
         n_cats = len(categories)
         n_items = len(ann1)
         
         # Create confusion matrix
-        confusion_matrix = np.zeros((n_cats, n_cats))
         cat_to_idx = {cat: idx for idx, cat in enumerate(categories)}
-        
-        for a1, a2 in zip(ann1, ann2):
-            i, j = cat_to_idx[a1], cat_to_idx[a2]
-            confusion_matrix[i, j] += 1
+        idx1 = np.array([cat_to_idx[a1] for a1 in ann1], dtype=np.int64)
+        idx2 = np.array([cat_to_idx[a2] for a2 in ann2], dtype=np.int64)
+        confusion_matrix = np.bincount(
+            idx1 * n_cats + idx2, minlength=n_cats * n_cats
+        ).reshape(n_cats, n_cats).astype(np.float64)
         
         # Calculate observed agreement
         p_o = np.trace(confusion_matrix) / n_items
@@ -68,6 +93,7 @@ class AgreementMetrics:
         p_e = np.sum(marginal1 * marginal2)
         
         # Calculate weighted agreement if specified
+        weight_matrix = None
         if weights is not None:
             weight_matrix = self._get_weight_matrix(n_cats, weights)
             
@@ -84,13 +110,17 @@ class AgreementMetrics:
         else:
             kappa = (p_o - p_e) / (1 - p_e) if p_e != 1 else 1.0
         
-        # Calculate standard error
-        se = self._cohen_kappa_se(confusion_matrix, p_o, p_e, n_items)
-        
-        # 95% confidence intervals
-        z_score = 1.96
-        ci_lower = kappa - z_score * se
-        ci_upper = kappa + z_score * se
+        if n_bootstrap:
+            statistic = CohenKappaBootstrap(idx1, idx2, n_cats, weight_matrix)
+            ci_lower, ci_upper, se = self._bootstrap_ci(statistic, n_bootstrap)
+            ci_method = 'bootstrap'
+        else:
+            # Calculate standard error and normal-approximation intervals
+            se = self._cohen_kappa_se(confusion_matrix, p_o, p_e, n_items)
+            z_score = 1.96
+            ci_lower = kappa - z_score * se
+            ci_upper = kappa + z_score * se
+            ci_method = 'analytic'
         
         return {
             'kappa': round(kappa, 4),
@@ -102,15 +132,84 @@ class AgreementMetrics:
             'n_items': n_items,
             'categories': categories,
             'confusion_matrix': confusion_matrix.tolist(),
+            'ci_method': ci_method,
             'interpretation': self._interpret_kappa(kappa)
         }
     
-    def fleiss_kappa(self, annotations: List[List[Any]]) -> Dict[str, float]:
+    def pairwise_cohen_kappa(self, annotations: Dict[str, List[Any]],
+                             n_bootstrap: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Calculate unweighted Cohen's Kappa for every pair of annotators.
+        
+        All confusion matrices are counted in one vectorized pass (see
+        utils.pairwise_agreement). Each pair result matches ``cohen_kappa``.
+        
+        Args:
+            annotations: Dictionary mapping annotator names to annotation lists
+            n_bootstrap: Number of bootstrap replicates for SE and confidence
+                intervals (analytic SE when None); pairs are spread over
+                ``n_jobs`` worker processes
+            
+        Returns:
+            Dictionary with per-pair results keyed "<a>_vs_<b>" and the
+            annotator x annotator kappa matrix
+        """
+        if len(annotations) < 2:
+            raise ValueError("Need at least 2 annotators")
+        
+        return self.pairwise_kappa_results(PairwiseKappa.from_annotations(annotations), n_bootstrap)
+    
+    def pairwise_kappa_results(self, pairwise: PairwiseKappa,
+                               n_bootstrap: Optional[int] = None) -> Dict[str, Any]:
+        """Format per-pair results and the kappa matrix of a PairwiseKappa."""
+        if n_bootstrap:
+            intervals = pairwise.bootstrap_intervals(
+                n_bootstrap, random_state=self.random_state,
+                confidence=self.confidence, n_jobs=self.n_jobs
+            )
+            ci_method = 'bootstrap'
+        else:
+            z_score = 1.96
+            intervals = [
+                (kappa - z_score * se, kappa + z_score * se, se)
+                for kappa, se in zip(pairwise.kappa, pairwise.standard_error)
+            ]
+            ci_method = 'analytic'
+        
+        pairs = {}
+        for pair_idx, (i, j) in enumerate(pairwise.pairs):
+            kappa = float(pairwise.kappa[pair_idx])
+            ci_lower, ci_upper, se = intervals[pair_idx]
+            used = pairwise.pair_categories(pair_idx)
+            pairs[f"{pairwise.annotators[i]}_vs_{pairwise.annotators[j]}"] = {
+                'kappa': round(kappa, 4),
+                'standard_error': round(float(se), 4),
+                'ci_lower': round(float(ci_lower), 4),
+                'ci_upper': round(float(ci_upper), 4),
+                'observed_agreement': round(float(pairwise.observed[pair_idx]), 4),
+                'expected_agreement': round(float(pairwise.expected[pair_idx]), 4),
+                'n_items': pairwise.n_items,
+                'categories': [pairwise.categories[c] for c in used],
+                'confusion_matrix': pairwise.confusion[pair_idx][np.ix_(used, used)].astype(np.float64).tolist(),
+                'ci_method': ci_method,
+                'interpretation': self._interpret_kappa(kappa)
+            }
+        
+        return {
+            'pairs': pairs,
+            'annotators': pairwise.annotators,
+            'kappa_matrix': np.round(pairwise.kappa_matrix(), 4).tolist()
+        }
+    
+    def fleiss_kappa(self, annotations: List[List[Any]],
+                     n_bootstrap: Optional[int] = None) -> Dict[str, float]:
         """
         Calculate Fleiss' Kappa for multiple annotators.
         
         Args:
             annotations: List of annotation lists, one per annotator
+            n_bootstrap: Number of bootstrap replicates for SE and confidence
+                intervals (analytic SE when None)
             
         Returns:
             Dictionary with kappa value and related statistics
@@ -129,7 +228,7 @@ class AgreementMetrics:
         all_categories = set()
         for ann in annotations:
             all_categories.update(ann)
-        categories = sorted(list(all_categories))
+        categories = sort_categories(all_categories)
         n_cats = len(categories)
         cat_to_idx = {cat: idx for idx, cat in enumerate(categories)}
         
@@ -141,6 +240,26 @@ class AgreementMetrics:
                 cat_idx = cat_to_idx[ann[item_idx]]
                 agreement_matrix[item_idx, cat_idx] += 1
         
+        return self.fleiss_kappa_from_counts(agreement_matrix, categories, n_annotators, n_bootstrap)
+    
+    def fleiss_kappa_from_counts(self, agreement_matrix: np.ndarray, categories: List[Any],
+                                 n_annotators: int,
+                                 n_bootstrap: Optional[int] = None) -> Dict[str, float]:
+        """
+        Calculate Fleiss' Kappa from an (items x categories) rating count matrix.
+        
+        Args:
+            agreement_matrix: How many annotators assigned each category to each item
+            categories: Category of each column
+            n_annotators: Ratings per item
+            n_bootstrap: Number of bootstrap replicates for SE and confidence
+                intervals (analytic SE when None)
+            
+        Returns:
+            Dictionary with kappa value and related statistics
+        """
+        n_items, n_cats = agreement_matrix.shape
+        
         # Calculate observed agreement
         p_o = 0
         for i in range(n_items):
@@ -158,13 +277,17 @@ class AgreementMetrics:
         # Calculate Fleiss' Kappa
         kappa = (p_o - p_e) / (1 - p_e) if p_e != 1 else 1.0
         
-        # Calculate standard error
-        se = self._fleiss_kappa_se(agreement_matrix, p_o, p_e, n_items, n_annotators)
-        
-        # 95% confidence intervals
-        z_score = 1.96
-        ci_lower = kappa - z_score * se
-        ci_upper = kappa + z_score * se
+        if n_bootstrap:
+            statistic = FleissKappaBootstrap(agreement_matrix, n_annotators)
+            ci_lower, ci_upper, se = self._bootstrap_ci(statistic, n_bootstrap)
+            ci_method = 'bootstrap'
+        else:
+            # Calculate standard error and normal-approximation intervals
+            se = self._fleiss_kappa_se(agreement_matrix, p_o, p_e, n_items, n_annotators)
+            z_score = 1.96
+            ci_lower = kappa - z_score * se
+            ci_upper = kappa + z_score * se
+            ci_method = 'analytic'
         
         # Calculate per-category statistics
         category_stats = {}
@@ -187,12 +310,14 @@ class AgreementMetrics:
             'n_annotators': n_annotators,
             'categories': categories,
             'category_stats': category_stats,
+            'ci_method': ci_method,
             'interpretation': self._interpret_kappa(kappa)
         }
     
     def krippendorff_alpha(self, annotations: List[List[Any]], 
                           metric: str = 'nominal',
-                          missing_value: Any = None) -> Dict[str, float]:
+                          missing_value: Any = None,
+                          n_bootstrap: Optional[int] = None) -> Dict[str, float]:
         """
         Calculate Krippendorff's Alpha for any number of annotators and data types.
         
@@ -200,6 +325,8 @@ class AgreementMetrics:
             annotations: List of annotation lists, one per annotator
             metric: Distance metric ('nominal', 'ordinal', 'interval', 'ratio')
             missing_value: Value representing missing data
+            n_bootstrap: Number of bootstrap replicates for confidence
+                intervals (defaults to ``self.n_bootstrap``, 0 disables)
             
         Returns:
             Dictionary with alpha value and related statistics
@@ -207,42 +334,37 @@ class AgreementMetrics:
         if len(annotations) < 2:
             raise ValueError("Need at least 2 annotators")
         
-        # Convert to reliability data format (item x annotator matrix)
         n_annotators = len(annotations)
         n_items = len(annotations[0])
         
-        # Create value-annotator pairs, excluding missing values
-        pairs = []
-        for item_idx in range(n_items):
-            item_values = []
-            for ann_idx, ann in enumerate(annotations):
-                if ann[item_idx] != missing_value:
-                    item_values.append((ann[item_idx], ann_idx))
+        # Build per-unit value counts and the distance matrix for the metric
+        data = CoincidenceData.from_annotations(annotations, metric, missing_value)
+        return self.krippendorff_alpha_from_data(data, n_items, n_annotators, n_bootstrap)
+    
+    def krippendorff_alpha_from_data(self, data: CoincidenceData, n_items: int,
+                                     n_annotators: int,
+                                     n_bootstrap: Optional[int] = None) -> Dict[str, float]:
+        """
+        Calculate Krippendorff's Alpha from precomputed coincidence data.
+        
+        Args:
+            data: Per-unit value counts and distances
+            n_items: Number of items, reported as is
+            n_annotators: Number of annotators, reported as is
+            n_bootstrap: Number of bootstrap replicates for confidence
+                intervals (defaults to ``self.n_bootstrap``, 0 disables)
             
-            # Create all pairs within this item
-            for i in range(len(item_values)):
-                for j in range(i + 1, len(item_values)):
-                    pairs.append((item_values[i][0], item_values[j][0]))
+        Returns:
+            Dictionary with alpha value and related statistics
+        """
+        metric = data.metric
+        components = data.alpha_components()
         
-        if not pairs:
+        if components['n_pairs'] == 0:
             raise ValueError("No valid annotation pairs found")
         
-        # Calculate disagreement
-        observed_disagreement = self._calculate_disagreement(pairs, metric)
-        
-        # Calculate expected disagreement (pairable values)
-        all_values = []
-        for ann in annotations:
-            for val in ann:
-                if val != missing_value:
-                    all_values.append(val)
-        
-        expected_pairs = []
-        for i in range(len(all_values)):
-            for j in range(i + 1, len(all_values)):
-                expected_pairs.append((all_values[i], all_values[j]))
-        
-        expected_disagreement = self._calculate_disagreement(expected_pairs, metric)
+        observed_disagreement = components['observed_disagreement']
+        expected_disagreement = components['expected_disagreement']
         
         # Calculate Alpha
         if expected_disagreement == 0:
@@ -250,10 +372,13 @@ class AgreementMetrics:
         else:
             alpha = 1 - (observed_disagreement / expected_disagreement)
         
-        # Bootstrap confidence intervals
-        ci_lower, ci_upper = self._bootstrap_alpha_ci(
-            annotations, metric, missing_value, n_bootstrap=1000
-        )
+        # Bootstrap confidence intervals over units
+        if n_bootstrap is None:
+            n_bootstrap = self.n_bootstrap
+        if n_bootstrap:
+            ci_lower, ci_upper, _ = self._bootstrap_ci(AlphaBootstrap(data), n_bootstrap)
+        else:
+            ci_lower, ci_upper = -1.0, 1.0
         
         return {
             'alpha': round(alpha, 4),
@@ -263,7 +388,7 @@ class AgreementMetrics:
             'expected_disagreement': round(expected_disagreement, 4),
             'n_items': n_items,
             'n_annotators': n_annotators,
-            'n_pairs': len(pairs),
+            'n_pairs': components['n_pairs'],
             'metric': metric,
             'interpretation': self._interpret_alpha(alpha)
         }
@@ -327,41 +452,13 @@ class AgreementMetrics:
         
         return total_disagreement / len(pairs)
     
-    def _bootstrap_alpha_ci(self, annotations: List[List[Any]], metric: str,
-                           missing_value: Any, n_bootstrap: int = 1000,
-                           confidence: float = 0.95) -> Tuple[float, float]:
-        """Calculate bootstrap confidence intervals for Krippendorff's Alpha."""
-        try:
-            bootstrap_alphas = []
-            n_items = len(annotations[0])
-            
-            for _ in range(min(n_bootstrap, 100)):  # Limit for performance
-                # Resample items with replacement
-                indices = np.random.choice(n_items, size=n_items, replace=True)
-                resampled_annotations = []
-                
-                for ann in annotations:
-                    resampled_ann = [ann[i] for i in indices]
-                    resampled_annotations.append(resampled_ann)
-                
-                # Calculate alpha for resampled data
-                try:
-                    alpha_result = self.krippendorff_alpha(
-                        resampled_annotations, metric, missing_value
-                    )
-                    bootstrap_alphas.append(alpha_result['alpha'])
-                except:
-                    continue
-            
-            if bootstrap_alphas:
-                alpha_range = (1 - confidence) / 2
-                ci_lower = np.percentile(bootstrap_alphas, alpha_range * 100)
-                ci_upper = np.percentile(bootstrap_alphas, (1 - alpha_range) * 100)
-                return ci_lower, ci_upper
-            else:
-                return -1.0, 1.0
-        except:
-            return -1.0, 1.0
+    def _bootstrap_ci(self, statistic, n_bootstrap: int) -> Tuple[float, float, float]:
+        """Bootstrap confidence interval and standard error for a statistic."""
+        replicates = bootstrap_replicates(
+            statistic, n_bootstrap,
+            random_state=self.random_state, n_jobs=self.n_jobs
+        )
+        return bootstrap_interval(replicates, self.confidence)
     
     def _interpret_kappa(self, kappa: float) -> str:
         """Interpret Kappa values using Landis & Koch guidelines."""
@@ -413,6 +510,9 @@ class AgreementAnalysis:
         annotator_names = list(annotations.keys())
         annotation_lists = list(annotations.values())
         
+        if len(annotation_lists) < 2:
+            raise ValueError("Need at least 2 annotators")
+        
         results = {
             'dataset_info': {
                 'n_annotators': len(annotator_names),
@@ -422,15 +522,14 @@ class AgreementAnalysis:
             'metrics': {}
         }
         
-        # Cohen's Kappa for all pairs if 2+ annotators
+        # Cohen's Kappa for all pairs if 2+ annotators, in one vectorized pass
         if len(annotation_lists) >= 2:
-            results['metrics']['pairwise_cohen_kappa'] = {}
-            
-            for i in range(len(annotator_names)):
-                for j in range(i + 1, len(annotator_names)):
-                    pair_name = f"{annotator_names[i]}_vs_{annotator_names[j]}"
-                    results['metrics']['pairwise_cohen_kappa'][pair_name] = \
-                        self.metrics.cohen_kappa(annotation_lists[i], annotation_lists[j])
+            pairwise = self.metrics.pairwise_cohen_kappa(annotations)
+            results['metrics']['pairwise_cohen_kappa'] = pairwise['pairs']
+            results['metrics']['cohen_kappa_matrix'] = {
+                'annotators': pairwise['annotators'],
+                'kappa': pairwise['kappa_matrix']
+            }
         
         if include_all_metrics:
             # Fleiss' Kappa for multiple annotators
@@ -448,6 +547,51 @@ class AgreementAnalysis:
         
         return results
     
+    def analyze_statistics(self, statistics: MergedAgreementStatistics,
+                           include_all_metrics: bool = True) -> Dict[str, Any]:
+        """
+        Perform the same analysis as ``analyze_dataset`` from merged per-text counts.
+        
+        Args:
+            statistics: Sufficient statistics of the span_overlap items
+            include_all_metrics: Whether to calculate all available metrics
+            
+        Returns:
+            Complete agreement analysis results
+        """
+        annotator_names = statistics.annotators
+        if len(annotator_names) < 2:
+            raise ValueError("Need at least 2 annotators")
+        
+        results = {
+            'dataset_info': {
+                'n_annotators': len(annotator_names),
+                'n_items': statistics.n_items,
+                'annotators': annotator_names
+            },
+            'metrics': {}
+        }
+        
+        pairwise = self.metrics.pairwise_kappa_results(statistics.pairwise_kappa())
+        results['metrics']['pairwise_cohen_kappa'] = pairwise['pairs']
+        results['metrics']['cohen_kappa_matrix'] = {
+            'annotators': pairwise['annotators'],
+            'kappa': pairwise['kappa_matrix']
+        }
+        
+        if include_all_metrics:
+            rating_matrix, categories = statistics.rating_matrix()
+            results['metrics']['fleiss_kappa'] = self.metrics.fleiss_kappa_from_counts(
+                rating_matrix, categories, len(annotator_names)
+            )
+            results['metrics']['krippendorff_alpha'] = self.metrics.krippendorff_alpha_from_data(
+                statistics.coincidence_data(), statistics.n_items, len(annotator_names)
+            )
+        
+        results['summary'] = self._generate_summary(results['metrics'])
+        
+        return results
+    
     def _generate_summary(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
         """Generate overall assessment summary."""
         summary = {
@@ -0,0 +1,160 @@
+"""
+Per-Text Sufficient Statistics for Span Overlap Agreement
+
+Agreement over a project concatenates the span_overlap items of its texts.
+An annotator who has no span in an item counts as None, and that includes
+annotators who did not work on the text at all. Every metric in
+``AgreementAnalysis`` only needs additive counts over items, so each text
+can be summarized once and the project merged from the summaries:
+
+- unit_counts: how often each label occurs in each item, as used for Fleiss'
+  rating matrix and Krippendorff's coincidences. The None count of an item
+  follows from the number of project annotators.
+- confusion: label-by-label counts of every pair of annotators present in
+  the text, with None as the last category.
+- histograms: label counts of every present annotator. A pair's confusion
+  counts for a text its second annotator skipped are the first annotator's
+  histogram against None.
+
+Summaries are JSON-serializable, so they can be stored with a fingerprint of
+the annotations they came from. Then only texts whose annotations changed
+are recomputed.
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Sequence
+
+from .coincidence import CoincidenceData, distance_matrix, unit_value_counts
+from .pairwise_agreement import PairwiseKappa, pairwise_confusion, sort_categories
+from .span_unification import UnifiedSpans
+
+
+class TextAgreementStatistics:
+    """Additive agreement counts for the span_overlap items of one text"""
+
+    def __init__(self, annotators: List[str], labels: List[Any], unit_counts: np.ndarray,
+                 confusion: np.ndarray, histograms: np.ndarray):
+        self.annotators = annotators
+        self.labels = labels
+        self.unit_counts = unit_counts
+        self.confusion = confusion
+        self.histograms = histograms
+
+    @property
+    def n_items(self) -> int:
+        return self.unit_counts.shape[0]
+
+    @classmethod
+    def from_unified(cls, unified: UnifiedSpans) -> 'TextAgreementStatistics':
+        """Summarize the items of one text produced by ``unify_spans``."""
+        n_labels = len(unified.labels)
+        n_annotators = len(unified.annotators)
+        # None becomes the last category
+        codes = np.where(unified.codes < 0, n_labels, unified.codes)
+        first, second = np.triu_indices(n_annotators, k=1)
+
+        histograms = np.zeros((n_annotators, n_labels + 1), dtype=np.int64)
+        for idx in range(n_annotators):
+            histograms[idx] = np.bincount(codes[:, idx], minlength=n_labels + 1)
+
+        return cls(
+            list(unified.annotators),
+            list(unified.labels),
+            unit_value_counts(unified.codes, n_labels).astype(np.int64),
+            pairwise_confusion(codes, n_labels + 1, first, second),
+            histograms
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'annotators': self.annotators,
+            'labels': self.labels,
+            'unit_counts': self.unit_counts.tolist(),
+            'confusion': self.confusion.tolist(),
+            'histograms': self.histograms.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TextAgreementStatistics':
+        n_labels = len(data['labels'])
+        n_annotators = len(data['annotators'])
+        n_pairs = n_annotators * (n_annotators - 1) // 2
+        return cls(
+            data['annotators'],
+            data['labels'],
+            np.asarray(data['unit_counts'], dtype=np.int64).reshape(-1, n_labels),
+            np.asarray(data['confusion'], dtype=np.int64).reshape(n_pairs, n_labels + 1, n_labels + 1),
+            np.asarray(data['histograms'], dtype=np.int64).reshape(n_annotators, n_labels + 1)
+        )
+
+
+class MergedAgreementStatistics:
+    """
+    Agreement counts over the concatenated items of several texts.
+
+    Categories are the sorted labels followed by None. Annotators are
+    ordered by first appearance across the merged texts.
+    """
+
+    def __init__(self, texts: Sequence[TextAgreementStatistics]):
+        annotators: Dict[str, int] = {}
+        labels = set()
+        for stats in texts:
+            for name in stats.annotators:
+                annotators.setdefault(name, len(annotators))
+            labels.update(stats.labels)
+
+        self.annotators = list(annotators)
+        self.categories = sort_categories(labels) + [None]
+        none = len(self.categories) - 1
+        n_annotators, n_cats = len(self.annotators), len(self.categories)
+        cat_to_idx = {cat: idx for idx, cat in enumerate(self.categories[:-1])}
+
+        # Accumulate both orientations of every pair, read the upper triangle at the end
+        confusion = np.zeros((n_annotators, n_annotators, n_cats, n_cats), dtype=np.int64)
+        unit_counts = []
+
+        for stats in texts:
+            label_map = np.array([cat_to_idx[label] for label in stats.labels] + [none], dtype=np.int64)
+            present = np.array([annotators[name] for name in stats.annotators], dtype=np.int64)
+            absent = np.setdiff1d(np.arange(n_annotators), present)
+
+            counts = np.zeros((stats.n_items, n_cats), dtype=np.int64)
+            counts[:, label_map[:-1]] = stats.unit_counts
+            counts[:, none] = n_annotators - stats.unit_counts.sum(axis=1)
+            unit_counts.append(counts)
+
+            local_first, local_second = np.triu_indices(len(present), k=1)
+            remapped = np.zeros((len(local_first), n_cats, n_cats), dtype=np.int64)
+            remapped[:, label_map[:, None], label_map[None, :]] = stats.confusion
+            confusion[present[local_first], present[local_second]] += remapped
+            confusion[present[local_second], present[local_first]] += remapped.transpose(0, 2, 1)
+
+            histograms = np.zeros((len(present), n_cats), dtype=np.int64)
+            histograms[:, label_map] = stats.histograms
+            confusion[present[:, None], absent[None, :], :, none] += histograms[:, None, :]
+            confusion[absent[:, None], present[None, :], none, :] += histograms[None, :, :]
+            confusion[absent[:, None], absent[None, :], none, none] += stats.n_items
+
+        first, second = np.triu_indices(n_annotators, k=1)
+        self.confusion = confusion[first, second]
+        self.unit_counts = (np.concatenate(unit_counts) if unit_counts
+                            else np.zeros((0, n_cats), dtype=np.int64))
+
+    @property
+    def n_items(self) -> int:
+        return self.unit_counts.shape[0]
+
+    def pairwise_kappa(self) -> PairwiseKappa:
+        return PairwiseKappa(self.confusion, self.categories, self.annotators)
+
+    def rating_matrix(self):
+        """Fleiss' (item x category) rating counts, restricted to used categories."""
+        used = np.flatnonzero(self.unit_counts.sum(axis=0))
+        return self.unit_counts[:, used].astype(np.float64), [self.categories[c] for c in used]
+
+    def coincidence_data(self, metric: str = 'nominal') -> CoincidenceData:
+        """Per-item label counts for Krippendorff's Alpha, None being missing."""
+        labels = self.categories[:-1]
+        counts = self.unit_counts[:, :-1].astype(np.float64)
+        return CoincidenceData(counts, distance_matrix(labels, metric), labels, metric)
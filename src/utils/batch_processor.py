@@ -6,23 +6,28 @@ concurrent processing, memory optimization, and progress tracking.
 """
 
 import asyncio
+import inspect
 import logging
+import pickle
 import time
 import psutil
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any, Callable, Optional, AsyncGenerator, Union
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from enum import Enum
+from functools import partial
+from typing import List, Dict, Any, Callable, Optional, AsyncGenerator, Union, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 from uuid import uuid4
 
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy import text, insert
 
 from src.core.database import engine
 from src.models.batch_models import BatchOperation, BatchProgress, BatchError
 from src.models.annotation import Annotation
+from src.models.annotation_counter import count_bulk_insert
 from src.models.text import Text
 from src.models.label import Label
 from src.models.user import User
@@ -31,6 +36,13 @@ from src.models.project import Project
 logger = logging.getLogger(__name__)
 
 
+class ExecutionBackend(str, Enum):
+    """Where chunk work runs for a batch operation."""
+    THREAD = "thread"      # Dedicated thread pool per operation
+    PROCESS = "process"    # Validation in a process pool, database writes on threads
+    ASYNCIO = "asyncio"    # Event loop's default executor via asyncio.to_thread
+
+
 @dataclass
 class BatchResult:
     """Result of a batch operation."""
@@ -51,9 +63,62 @@ class ProcessingChunk:
     end_index: int
 
 
+def validate_items(validation_func: Callable, items: List[Any]) -> List[Dict[str, Any]]:
+    """Validate a list of items; runs inside process pool workers."""
+    return [validation_func(item) for item in items]
+
+
+def _next_validation_result(results, item: Any) -> Dict[str, Any]:
+    """Replay precomputed validation results in item order."""
+    return next(results)
+
+
+def validate_annotation_create(
+    annotation_data: Dict[str, Any],
+    validate_before_create: bool,
+    valid_text_ids: Set[int],
+    valid_label_ids: Set[int]
+) -> Dict[str, Any]:
+    """Validate an annotation payload against its project's text and label ids."""
+    if not validate_before_create:
+        return {"valid": True}
+    
+    # Basic validation
+    required_fields = ["start_char", "end_char", "selected_text", "text_id", "label_id"]
+    for field in required_fields:
+        if field not in annotation_data:
+            return {"valid": False, "error": f"Missing required field: {field}"}
+    
+    # Validate span
+    if annotation_data["start_char"] >= annotation_data["end_char"]:
+        return {"valid": False, "error": "Invalid text span: start_char >= end_char"}
+    
+    if annotation_data["text_id"] not in valid_text_ids:
+        return {"valid": False, "error": f"Text {annotation_data['text_id']} not found in project"}
+    
+    if annotation_data["label_id"] not in valid_label_ids:
+        return {"valid": False, "error": f"Label {annotation_data['label_id']} not found in project"}
+    
+    return {"valid": True}
+
+
+def validate_annotation_update(update_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate an annotation update payload."""
+    if "annotation_id" not in update_data:
+        return {"valid": False, "error": "Missing annotation_id"}
+    
+    if "updates" not in update_data or not update_data["updates"]:
+        return {"valid": False, "error": "No updates provided"}
+    
+    return {"valid": True}
+
+
 class BatchProcessor:
     """High-performance batch processor for annotation operations."""
     
+    # Chunks scheduled per worker before waiting for one to finish
+    IN_FLIGHT_FACTOR = 2
+    
     def __init__(self, max_workers: int = 4, chunk_size: int = 100):
         self.max_workers = max_workers
         self.chunk_size = chunk_size
@@ -70,20 +135,29 @@ class BatchProcessor:
         progress_callback: Optional[Callable] = None,
         chunk_size: Optional[int] = None,
         max_workers: Optional[int] = None,
-        rollback_on_error: bool = True
+        rollback_on_error: bool = True,
+        bulk: bool = False,
+        backend: Union[ExecutionBackend, str] = ExecutionBackend.THREAD
     ) -> BatchResult:
         """
         Process a batch operation with concurrent processing and progress tracking.
         
+        Chunks run on the selected backend while the event loop stays free. At
+        most max_workers * IN_FLIGHT_FACTOR chunks are scheduled at once, and
+        progress snapshots are queued to a separate task that calls
+        progress_callback.
+        
         Args:
             operation_id: Unique identifier for the operation
             items: List of items to process
             processor_func: Function to process each item
             validation_func: Optional validation function
-            progress_callback: Optional progress callback function
+            progress_callback: Optional progress callback function, sync or async
             chunk_size: Size of processing chunks
             max_workers: Maximum number of concurrent workers
             rollback_on_error: Whether to rollback on error
+            bulk: Call processor_func once per chunk with the list of valid items
+            backend: Execution backend for chunk work (thread, process, asyncio)
             
         Returns:
             BatchResult with processing results
@@ -91,48 +165,80 @@ class BatchProcessor:
         start_time = time.time()
         chunk_size = chunk_size or self.chunk_size
         max_workers = max_workers or self.max_workers
+        backend = ExecutionBackend(backend)
+        if backend is ExecutionBackend.PROCESS and not self._is_picklable(validation_func):
+            # Closures cannot cross the process boundary; validate on threads instead
+            logger.warning(
+                f"Validation function for {operation_id} cannot be pickled; "
+                f"falling back to the thread backend"
+            )
+            backend = ExecutionBackend.THREAD
         
-        logger.info(f"Starting batch operation {operation_id} with {len(items)} items")
+        logger.info(
+            f"Starting batch operation {operation_id} with {len(items)} items "
+            f"on the {backend.value} backend"
+        )
         
         # Initialize operation tracking
-        self._active_operations[operation_id] = {
+        operation = {
             "start_time": start_time,
             "total_items": len(items),
             "processed_items": 0,
             "success_count": 0,
             "failure_count": 0,
-            "status": "running"
+            "status": "running",
+            "backend": backend.value
         }
+        self._active_operations[operation_id] = operation
         
         success_count = 0
         failure_count = 0
         errors = []
         processed_items = []
         
+        progress_queue: asyncio.Queue = asyncio.Queue()
+        progress_task = None
+        if progress_callback:
+            progress_task = asyncio.create_task(
+                self._report_progress(progress_queue, progress_callback)
+            )
+        
+        thread_executor, process_executor = self._create_executors(backend, max_workers)
+        
         try:
             # Create processing chunks
-            chunks = self._create_chunks(items, chunk_size)
+            chunks = iter(self._create_chunks(items, chunk_size))
+            max_in_flight = max_workers * self.IN_FLIGHT_FACTOR
+            in_flight: Dict[asyncio.Future, ProcessingChunk] = {}
             
-            # Process chunks concurrently
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Submit chunk processing tasks
-                future_to_chunk = {}
-                for chunk in chunks:
-                    future = executor.submit(
-                        self._process_chunk,
+            while True:
+                # Top up to the in-flight limit unless the operation was cancelled
+                while len(in_flight) < max_in_flight and operation["status"] == "running":
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    task = asyncio.ensure_future(self._run_chunk(
+                        backend,
+                        thread_executor,
+                        process_executor,
                         operation_id,
                         chunk,
                         processor_func,
                         validation_func,
-                        rollback_on_error
-                    )
-                    future_to_chunk[future] = chunk
+                        rollback_on_error,
+                        bulk
+                    ))
+                    in_flight[task] = chunk
+                
+                if not in_flight:
+                    break
+                
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
                 
-                # Process completed chunks
-                for future in as_completed(future_to_chunk):
-                    chunk = future_to_chunk[future]
+                for task in done:
+                    chunk = in_flight.pop(task)
                     try:
-                        chunk_result = future.result()
+                        chunk_result = task.result()
                         
                         # Update counters
                         success_count += chunk_result["success_count"]
@@ -140,25 +246,6 @@ class BatchProcessor:
                         errors.extend(chunk_result["errors"])
                         processed_items.extend(chunk_result["processed_items"])
                         
-                        # Update operation tracking
-                        self._active_operations[operation_id]["processed_items"] += len(chunk.items)
-                        self._active_operations[operation_id]["success_count"] = success_count
-                        self._active_operations[operation_id]["failure_count"] = failure_count
-                        
-                        # Call progress callback if provided
-                        if progress_callback:
-                            progress_percentage = (
-                                self._active_operations[operation_id]["processed_items"] / 
-                                self._active_operations[operation_id]["total_items"] * 100
-                            )
-                            await progress_callback(
-                                operation_id,
-                                progress_percentage,
-                                self._active_operations[operation_id]["processed_items"],
-                                success_count,
-                                failure_count
-                            )
-                        
                     except Exception as e:
                         logger.error(f"Error processing chunk {chunk.chunk_id}: {str(e)}")
                         failure_count += len(chunk.items)
@@ -167,13 +254,27 @@ class BatchProcessor:
                             "error": str(e),
                             "item_count": len(chunk.items)
                         })
+                    
+                    # Update operation tracking
+                    operation["processed_items"] += len(chunk.items)
+                    operation["success_count"] = success_count
+                    operation["failure_count"] = failure_count
+                    
+                    progress_queue.put_nowait((
+                        operation_id,
+                        operation["processed_items"] / operation["total_items"] * 100,
+                        operation["processed_items"],
+                        success_count,
+                        failure_count
+                    ))
             
             # Calculate execution time
             execution_time = time.time() - start_time
             
             # Update operation status
-            self._active_operations[operation_id]["status"] = "completed"
-            self._active_operations[operation_id]["execution_time"] = execution_time
+            if operation["status"] == "running":
+                operation["status"] = "completed"
+            operation["execution_time"] = execution_time
             
             # Store performance metrics
             self._performance_metrics[operation_id] = {
@@ -181,11 +282,13 @@ class BatchProcessor:
                 "items_per_second": len(items) / execution_time if execution_time > 0 else 0,
                 "memory_usage_mb": psutil.Process().memory_info().rss / 1024 / 1024,
                 "cpu_percent": psutil.cpu_percent(),
-                "success_rate": success_count / len(items) if len(items) > 0 else 0
+                "success_rate": success_count / len(items) if len(items) > 0 else 0,
+                "backend": backend.value,
+                "status": operation["status"]
             }
             
             logger.info(
-                f"Batch operation {operation_id} completed: "
+                f"Batch operation {operation_id} {operation['status']}: "
                 f"{success_count} success, {failure_count} failures, "
                 f"{execution_time:.2f}s"
             )
@@ -201,13 +304,101 @@ class BatchProcessor:
             
         except Exception as e:
             logger.error(f"Batch operation {operation_id} failed: {str(e)}")
-            self._active_operations[operation_id]["status"] = "failed"
+            operation["status"] = "failed"
             raise
         finally:
+            # Flush outstanding progress before returning
+            if progress_task:
+                progress_queue.put_nowait(None)
+                await progress_task
+            
+            if thread_executor:
+                thread_executor.shutdown(wait=False)
+            if process_executor:
+                process_executor.shutdown(wait=False)
+            
             # Cleanup
             if operation_id in self._active_operations:
                 del self._active_operations[operation_id]
     
+    @staticmethod
+    def _is_picklable(func: Optional[Callable]) -> bool:
+        """Check whether a function can be sent to a process pool worker."""
+        if func is None:
+            return True
+        try:
+            pickle.dumps(func)
+            return True
+        except Exception:
+            return False
+    
+    def _create_executors(
+        self,
+        backend: ExecutionBackend,
+        max_workers: int
+    ) -> Tuple[Optional[ThreadPoolExecutor], Optional[ProcessPoolExecutor]]:
+        """Create the executors a backend needs for one operation."""
+        if backend is ExecutionBackend.ASYNCIO:
+            return None, None
+        thread_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch")
+        process_executor = None
+        if backend is ExecutionBackend.PROCESS:
+            process_executor = ProcessPoolExecutor(max_workers=max_workers)
+        return thread_executor, process_executor
+    
+    async def _run_chunk(
+        self,
+        backend: ExecutionBackend,
+        thread_executor: Optional[ThreadPoolExecutor],
+        process_executor: Optional[ProcessPoolExecutor],
+        operation_id: str,
+        chunk: ProcessingChunk,
+        processor_func: Callable,
+        validation_func: Optional[Callable],
+        rollback_on_error: bool,
+        bulk: bool
+    ) -> Dict[str, Any]:
+        """Run one chunk on the selected backend without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        chunk_func = self._process_chunk_bulk if bulk else self._process_chunk
+        
+        if process_executor and validation_func:
+            # CPU-bound validation runs outside the GIL; writes stay on threads
+            validation_results = await loop.run_in_executor(
+                process_executor, validate_items, validation_func, chunk.items
+            )
+            validation_func = partial(_next_validation_result, iter(validation_results))
+        
+        args = (operation_id, chunk, processor_func, validation_func, rollback_on_error)
+        if thread_executor is None:
+            return await asyncio.to_thread(chunk_func, *args)
+        return await loop.run_in_executor(thread_executor, chunk_func, *args)
+    
+    async def _report_progress(self, progress_queue: asyncio.Queue, progress_callback: Callable):
+        """Forward queued progress snapshots to the callback, newest first."""
+        while True:
+            snapshot = await progress_queue.get()
+            done = snapshot is None
+            
+            # Coalesce a backlog into its latest snapshot
+            while not progress_queue.empty():
+                queued = progress_queue.get_nowait()
+                if queued is None:
+                    done = True
+                else:
+                    snapshot = queued
+            
+            if snapshot is not None:
+                try:
+                    result = progress_callback(*snapshot)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.warning(f"Progress callback failed: {str(e)}")
+            
+            if done:
+                return
+    
     def _create_chunks(self, items: List[Any], chunk_size: int) -> List[ProcessingChunk]:
         """Create processing chunks from items list."""
         chunks = []
@@ -230,63 +421,54 @@ class BatchProcessor:
         validation_func: Optional[Callable] = None,
         rollback_on_error: bool = True
     ) -> Dict[str, Any]:
-        """Process a single chunk of items."""
+        """
+        Process a single chunk of items in one transaction.
+        
+        With rollback_on_error each item runs inside its own SAVEPOINT, so a
+        failing item is rolled back on its own and the rest of the chunk still
+        commits. Without it failed items are only reported. Operational
+        errors such as lock timeouts fail the whole chunk rather than
+        rejecting the item that happened to hit them.
+        """
         session = self.session_factory()
-        success_count = 0
-        failure_count = 0
         errors = []
         processed_items = []
         
         try:
-            # Begin database transaction
-            session.begin()
-            
             for i, item in enumerate(chunk.items):
+                # Validate item if validation function provided
+                if validation_func:
+                    validation_result = validation_func(item)
+                    if not validation_result.get("valid", True):
+                        errors.append(self._item_error(
+                            chunk, i, item,
+                            f"Validation failed: {validation_result.get('error', 'Unknown error')}",
+                            "validation_error"
+                        ))
+                        continue
+                
                 try:
-                    # Validate item if validation function provided
-                    if validation_func:
-                        validation_result = validation_func(item)
-                        if not validation_result.get("valid", True):
-                            raise ValueError(f"Validation failed: {validation_result.get('error', 'Unknown error')}")
-                    
-                    # Process item
-                    result = processor_func(item, session)
+                    if rollback_on_error:
+                        with session.begin_nested():
+                            result = processor_func(item, session)
+                    else:
+                        result = processor_func(item, session)
                     processed_items.append(result)
-                    success_count += 1
                     
+                except OperationalError:
+                    # Lock timeouts and lost connections are not the row's fault
+                    raise
                 except Exception as e:
-                    failure_count += 1
-                    error_info = {
-                        "chunk_id": chunk.chunk_id,
-                        "item_index": chunk.start_index + i,
-                        "error": str(e),
-                        "item_data": self._safe_serialize(item),
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                    errors.append(error_info)
-                    
-                    # Store error in database
-                    self._log_batch_error(session, operation_id, error_info)
-                    
-                    # Rollback if configured and there are critical errors
-                    if rollback_on_error and isinstance(e, (SQLAlchemyError, ValueError)):
-                        logger.warning(f"Rolling back chunk {chunk.chunk_id} due to error: {str(e)}")
-                        session.rollback()
-                        session.begin()
-                        # Mark all items in chunk as failed
-                        failure_count = len(chunk.items)
-                        success_count = 0
-                        processed_items = []
-                        break
+                    errors.append(self._item_error(chunk, i, item, str(e), "processing_error"))
             
-            # Commit transaction if successful
-            if success_count > 0:
-                session.commit()
+            # Good rows and the error log commit together
+            self._log_batch_errors(session, operation_id, errors)
+            session.commit()
             
             return {
                 "chunk_id": chunk.chunk_id,
-                "success_count": success_count,
-                "failure_count": failure_count,
+                "success_count": len(processed_items),
+                "failure_count": len(chunk.items) - len(processed_items),
                 "errors": errors,
                 "processed_items": processed_items
             }
@@ -309,23 +491,151 @@ class BatchProcessor:
         finally:
             session.close()
     
-    def _log_batch_error(self, session: Session, operation_id: str, error_info: Dict[str, Any]):
-        """Log an error to the batch_errors table."""
+    def _process_chunk_bulk(
+        self,
+        operation_id: str,
+        chunk: ProcessingChunk,
+        processor_func: Callable,
+        validation_func: Optional[Callable] = None,
+        rollback_on_error: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Process a chunk with a single call to processor_func.
+        
+        Items are validated in memory first; invalid ones are reported
+        individually and the rest are handed to processor_func together inside
+        a SAVEPOINT. If that call fails, the items are bisected until the
+        offending rows are isolated, and the good rows commit in the same
+        transaction. Errors are written to batch_errors in one flush.
+        """
+        session = self.session_factory()
+        errors = []
+        valid_items = []
+        processed_items = []
+        
+        for i, item in enumerate(chunk.items):
+            if validation_func:
+                validation_result = validation_func(item)
+                if not validation_result.get("valid", True):
+                    errors.append(self._item_error(
+                        chunk, i, item,
+                        f"Validation failed: {validation_result.get('error', 'Unknown error')}",
+                        "validation_error"
+                    ))
+                    continue
+            valid_items.append((i, item))
+        
         try:
-            batch_error = BatchError(
-                operation_id=operation_id,
-                error_type=error_info.get("error_type", "processing_error"),
-                error_message=error_info["error"][:1000],  # Limit message length
-                item_index=error_info.get("item_index"),
-                item_data=error_info.get("item_data", {}),
-                step_name=error_info.get("step_name", "chunk_processing"),
-                context_data={"chunk_id": error_info.get("chunk_id")},
-                severity="error"
+            if valid_items:
+                processed_items = self._write_bisecting(session, chunk, processor_func, valid_items, errors)
+            
+            self._log_batch_errors(session, operation_id, errors)
+            session.commit()
+            
+            return {
+                "chunk_id": chunk.chunk_id,
+                "success_count": len(processed_items),
+                "failure_count": len(chunk.items) - len(processed_items),
+                "errors": errors,
+                "processed_items": processed_items
+            }
+            
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Critical error processing chunk {chunk.chunk_id}: {str(e)}")
+            return {
+                "chunk_id": chunk.chunk_id,
+                "success_count": 0,
+                "failure_count": len(chunk.items),
+                "errors": [{
+                    "chunk_id": chunk.chunk_id,
+                    "error": f"Critical chunk error: {str(e)}",
+                    "item_count": len(chunk.items),
+                    "timestamp": datetime.utcnow().isoformat()
+                }],
+                "processed_items": []
+            }
+        finally:
+            session.close()
+    
+    def _write_bisecting(
+        self,
+        session: Session,
+        chunk: ProcessingChunk,
+        processor_func: Callable,
+        indexed_items: List[Tuple[int, Any]],
+        errors: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """
+        Bulk-write items in a SAVEPOINT, halving the batch on failure.
+        
+        A batch with k bad rows costs O(k log n) extra writes instead of
+        failing all n rows. Single rows that still fail are added to errors.
+        """
+        try:
+            with session.begin_nested():
+                return list(processor_func([item for _, item in indexed_items], session))
+        except OperationalError:
+            # Lock timeouts and lost connections fail the chunk, not its rows
+            raise
+        except Exception as e:
+            if len(indexed_items) == 1:
+                i, item = indexed_items[0]
+                errors.append(self._item_error(chunk, i, item, str(e), "processing_error"))
+                return []
+            logger.debug(
+                f"Bulk write of {len(indexed_items)} items failed for chunk "
+                f"{chunk.chunk_id}, bisecting: {str(e)}"
             )
-            session.add(batch_error)
+        
+        mid = len(indexed_items) // 2
+        return (
+            self._write_bisecting(session, chunk, processor_func, indexed_items[:mid], errors) +
+            self._write_bisecting(session, chunk, processor_func, indexed_items[mid:], errors)
+        )
+    
+    def _item_error(
+        self,
+        chunk: ProcessingChunk,
+        offset: int,
+        item: Any,
+        message: str,
+        error_type: str
+    ) -> Dict[str, Any]:
+        """Build the error record for one item of a chunk."""
+        return {
+            "chunk_id": chunk.chunk_id,
+            "item_index": chunk.start_index + offset,
+            "error": message,
+            "error_type": error_type,
+            "item_data": self._safe_serialize(item),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    def _log_batch_errors(self, session: Session, operation_id: str, errors: List[Dict[str, Any]]):
+        """Log several errors to the batch_errors table with one flush."""
+        if not errors:
+            return
+        try:
+            session.add_all([
+                self._batch_error_record(operation_id, error_info) for error_info in errors
+            ])
             session.flush()
         except Exception as e:
-            logger.error(f"Failed to log batch error: {str(e)}")
+            logger.error(f"Failed to log batch errors: {str(e)}")
+    
+    def _batch_error_record(self, operation_id: str, error_info: Dict[str, Any]) -> BatchError:
+        """Build a BatchError row from an error record."""
+        return BatchError(
+            operation_id=operation_id,
+            error_type=error_info.get("error_type", "processing_error"),
+            error_message=error_info["error"][:1000],  # Limit message length
+            item_index=error_info.get("item_index"),
+            item_data=error_info.get("item_data", {}),
+            step_name=error_info.get("step_name", "chunk_processing"),
+            context_data={"chunk_id": error_info.get("chunk_id")},
+            severity="error"
+        )
     
     def _safe_serialize(self, obj: Any) -> Dict[str, Any]:
         """Safely serialize an object to a dictionary."""
@@ -348,84 +658,97 @@ class BatchProcessor:
         user_id: int,
         project_id: int,
         validate_before_create: bool = True,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        bulk_insert: bool = True,
+        backend: Union[ExecutionBackend, str] = ExecutionBackend.THREAD
     ) -> BatchResult:
         """
         Create annotations in batch with validation and progress tracking.
+        
+        Valid text and label ids for the project are loaded once up front, so
+        validation runs in memory. With bulk_insert each chunk is written with a
+        single multi-row INSERT ... RETURNING and processed_items holds the new
+        annotation ids; otherwise rows are added one at a time.
         """
+        valid_text_ids: Set[int] = set()
+        valid_label_ids: Set[int] = set()
+        if validate_before_create:
+            valid_text_ids, valid_label_ids = self._load_project_reference_ids(project_id)
+        # Module-level validator bound with partial so it pickles for the process backend
+        validation_func = partial(
+            validate_annotation_create,
+            validate_before_create=validate_before_create,
+            valid_text_ids=valid_text_ids,
+            valid_label_ids=valid_label_ids
+        )
+        
         def processor_func(annotation_data: Dict[str, Any], session: Session) -> Annotation:
-            # Create annotation object
-            annotation = Annotation(
-                start_char=annotation_data["start_char"],
-                end_char=annotation_data["end_char"],
-                selected_text=annotation_data["selected_text"],
-                notes=annotation_data.get("notes"),
-                confidence_score=annotation_data.get("confidence_score", 1.0),
-                metadata=annotation_data.get("metadata", {}),
-                context_before=annotation_data.get("context_before"),
-                context_after=annotation_data.get("context_after"),
-                text_id=annotation_data["text_id"],
-                annotator_id=user_id,
-                label_id=annotation_data["label_id"]
-            )
-            
+            annotation = Annotation(**self._annotation_values(annotation_data, user_id, project_id))
             session.add(annotation)
             session.flush()  # Get ID without committing
             return annotation
         
-        def validation_func(annotation_data: Dict[str, Any]) -> Dict[str, Any]:
-            if not validate_before_create:
-                return {"valid": True}
-            
-            # Basic validation
-            required_fields = ["start_char", "end_char", "selected_text", "text_id", "label_id"]
-            for field in required_fields:
-                if field not in annotation_data:
-                    return {"valid": False, "error": f"Missing required field: {field}"}
-            
-            # Validate span
-            if annotation_data["start_char"] >= annotation_data["end_char"]:
-                return {"valid": False, "error": "Invalid text span: start_char >= end_char"}
-            
-            # Check if text exists
-            session = self.session_factory()
-            try:
-                text_exists = session.query(Text).filter(
-                    Text.id == annotation_data["text_id"],
-                    Text.project_id == project_id
-                ).first() is not None
-                
-                if not text_exists:
-                    return {"valid": False, "error": f"Text {annotation_data['text_id']} not found in project"}
-                
-                # Check if label exists
-                label_exists = session.query(Label).filter(
-                    Label.id == annotation_data["label_id"],
-                    Label.project_id == project_id
-                ).first() is not None
-                
-                if not label_exists:
-                    return {"valid": False, "error": f"Label {annotation_data['label_id']} not found in project"}
-                
-                return {"valid": True}
-            finally:
-                session.close()
+        def bulk_processor_func(chunk_data: List[Dict[str, Any]], session: Session) -> List[int]:
+            rows = [
+                self._annotation_values(annotation_data, user_id, project_id)
+                for annotation_data in chunk_data
+            ]
+            annotation_ids = list(session.scalars(
+                insert(Annotation).returning(Annotation.id, sort_by_parameter_order=True),
+                rows
+            ))
+            # Core INSERT skips flush events, so counters are updated here
+            count_bulk_insert(session.connection(), rows)
+            return annotation_ids
         
         return await self.process_batch_operation(
             operation_id=operation_id,
             items=annotations_data,
-            processor_func=processor_func,
+            processor_func=bulk_processor_func if bulk_insert else processor_func,
             validation_func=validation_func,
             progress_callback=progress_callback,
-            rollback_on_error=True
+            rollback_on_error=True,
+            bulk=bulk_insert,
+            backend=backend
         )
     
+    def _load_project_reference_ids(self, project_id: int) -> Tuple[Set[int], Set[int]]:
+        """Load the ids of all texts and labels belonging to a project."""
+        session = self.session_factory()
+        try:
+            text_ids = {text_id for text_id, in session.query(Text.id).filter(Text.project_id == project_id)}
+            label_ids = {label_id for label_id, in session.query(Label.id).filter(Label.project_id == project_id)}
+            return text_ids, label_ids
+        finally:
+            session.close()
+    
+    @staticmethod
+    def _annotation_values(annotation_data: Dict[str, Any], user_id: int, project_id: int) -> Dict[str, Any]:
+        """Map an incoming annotation payload onto Annotation column values."""
+        return {
+            "start_char": annotation_data["start_char"],
+            "end_char": annotation_data["end_char"],
+            "selected_text": annotation_data["selected_text"],
+            "notes": annotation_data.get("notes"),
+            "confidence_score": annotation_data.get("confidence_score", 1.0),
+            "metadata": annotation_data.get("metadata", {}),
+            "context_before": annotation_data.get("context_before"),
+            "context_after": annotation_data.get("context_after"),
+            "text_id": annotation_data["text_id"],
+            "project_id": project_id,
+            "annotator_id": user_id,
+            "label_id": annotation_data["label_id"],
+            # Explicit so bulk inserts count the same created_hour they store
+            "created_at": datetime.utcnow()
+        }
+    
     async def update_annotations_batch(
         self,
         operation_id: str,
         updates_data: List[Dict[str, Any]],
         user_id: int,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        backend: Union[ExecutionBackend, str] = ExecutionBackend.THREAD
     ) -> BatchResult:
         """Update annotations in batch."""
         
@@ -449,22 +772,14 @@ class BatchProcessor:
             session.flush()
             return annotation
         
-        def validation_func(update_data: Dict[str, Any]) -> Dict[str, Any]:
-            if "annotation_id" not in update_data:
-                return {"valid": False, "error": "Missing annotation_id"}
-            
-            if "updates" not in update_data or not update_data["updates"]:
-                return {"valid": False, "error": "No updates provided"}
-            
-            return {"valid": True}
-        
         return await self.process_batch_operation(
             operation_id=operation_id,
             items=updates_data,
             processor_func=processor_func,
-            validation_func=validation_func,
+            validation_func=validate_annotation_update,
             progress_callback=progress_callback,
-            rollback_on_error=False  # Allow partial updates
+            rollback_on_error=False,  # Allow partial updates
+            backend=backend
         )
     
     async def delete_annotations_batch(
@@ -472,7 +787,8 @@ class BatchProcessor:
         operation_id: str,
         annotation_ids: List[int],
         user_id: int,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        backend: Union[ExecutionBackend, str] = ExecutionBackend.THREAD
     ) -> BatchResult:
         """Delete annotations in batch."""
         
@@ -501,7 +817,8 @@ class BatchProcessor:
             items=annotation_ids,
             processor_func=processor_func,
             progress_callback=progress_callback,
-            rollback_on_error=False
+            rollback_on_error=False,
+            backend=backend
         )
     
     def get_operation_status(self, operation_id: str) -> Dict[str, Any]:
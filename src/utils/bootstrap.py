@@ -0,0 +1,238 @@
+"""
+Bootstrap Confidence Intervals for Agreement Metrics
+
+Non-recursive bootstrap engine for Krippendorff's Alpha, Cohen's Kappa and
+Fleiss' Kappa. Each statistic precomputes a per-unit tensor of sufficient
+statistics once; a replicate is then a weighted sum of that tensor, where the
+weights are the multiplicities of a resample of unit indices. Replicates are
+generated in fixed-size blocks, each with its own ``SeedSequence`` child, so
+results are reproducible for a given seed regardless of the number of worker
+processes used.
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from .coincidence import CoincidenceData
+
+
+# Upper bound on the size of one (replicates x units) weight block
+MAX_BLOCK_CELLS = 2_000_000
+MAX_BLOCK_REPLICATES = 200
+
+
+class BootstrapStatistic:
+    """
+    Base class for statistics that can be bootstrapped over units.
+
+    Subclasses provide a (unit x feature) tensor of per-unit sufficient
+    statistics and an ``evaluate`` method turning re-weighted feature sums
+    into one statistic value per replicate.
+    """
+
+    unit_stats: np.ndarray
+
+    @property
+    def n_units(self) -> int:
+        return self.unit_stats.shape[0]
+
+    def weighted_sums(self, weights: np.ndarray) -> np.ndarray:
+        """Sum the per-unit statistics for a (replicates x units) weight matrix."""
+        return weights @ self.unit_stats
+
+    def evaluate(self, sums: np.ndarray) -> np.ndarray:
+        """Compute the statistic for each row of summed unit statistics."""
+        raise NotImplementedError
+
+
+class AlphaBootstrap(BootstrapStatistic):
+    """Krippendorff's Alpha from per-unit disagreement, pair and value counts."""
+
+    def __init__(self, data: CoincidenceData):
+        self.distances = data.distances
+        self.unit_stats = np.column_stack([
+            data.unit_disagreements(),
+            data.unit_pair_counts(),
+            data.counts,
+        ])
+
+    def evaluate(self, sums: np.ndarray) -> np.ndarray:
+        observed_sum, pair_counts, totals = sums[:, 0], sums[:, 1], sums[:, 2:]
+        n_values = totals.sum(axis=1)
+        expected_sum = np.einsum('bk,kl,bl->b', totals, self.distances, totals)
+        expected_pairs = n_values * n_values - n_values
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            observed = observed_sum / pair_counts
+            expected = expected_sum / expected_pairs
+            alphas = np.where(expected == 0, 1.0, 1 - observed / expected)
+
+        # Replicates without any pairable unit are undefined
+        return np.where(pair_counts > 0, alphas, np.nan)
+
+
+def _kappa_from_confusion(confusion: np.ndarray,
+                          weight_matrix: Optional[np.ndarray]) -> np.ndarray:
+    """Compute Cohen's Kappa for a stack of (replicates x cats x cats) matrices."""
+    n_items = confusion.sum(axis=(1, 2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        marginal1 = confusion.sum(axis=2) / n_items[:, None]
+        marginal2 = confusion.sum(axis=1) / n_items[:, None]
+
+        if weight_matrix is None:
+            p_o = np.trace(confusion, axis1=1, axis2=2) / n_items
+            p_e = np.einsum('bi,bi->b', marginal1, marginal2)
+        else:
+            p_o = np.einsum('bij,ij->b', confusion, weight_matrix) / n_items
+            p_e = np.einsum('bi,ij,bj->b', marginal1, weight_matrix, marginal2)
+
+        return np.where(p_e != 1, (p_o - p_e) / (1 - p_e), 1.0)
+
+
+class CohenKappaBootstrap(BootstrapStatistic):
+    """Cohen's Kappa from the confusion-matrix cell of every item."""
+
+    def __init__(self, idx1: np.ndarray, idx2: np.ndarray, n_cats: int,
+                 weight_matrix: Optional[np.ndarray] = None):
+        self.n_cats = n_cats
+        self.weight_matrix = weight_matrix
+
+        cells = np.asarray(idx1) * n_cats + np.asarray(idx2)
+        # Group items by cell so per-replicate confusion matrices are
+        # segment sums over contiguous columns of the weight matrix
+        self.order = np.argsort(cells, kind='stable')
+        sorted_cells = cells[self.order]
+        boundaries = np.flatnonzero(np.diff(sorted_cells)) + 1
+        self.segment_starts = np.concatenate([[0], boundaries]).astype(np.int64)
+        self.segment_cells = sorted_cells[self.segment_starts]
+        self._n_items = cells.size
+
+    @property
+    def n_units(self) -> int:
+        return self._n_items
+
+    def weighted_sums(self, weights: np.ndarray) -> np.ndarray:
+        sums = np.zeros((weights.shape[0], self.n_cats * self.n_cats))
+        if self.segment_cells.size:
+            grouped = np.add.reduceat(weights[:, self.order], self.segment_starts, axis=1)
+            sums[:, self.segment_cells] = grouped
+        return sums
+
+    def evaluate(self, sums: np.ndarray) -> np.ndarray:
+        confusion = sums.reshape(-1, self.n_cats, self.n_cats)
+        return _kappa_from_confusion(confusion, self.weight_matrix)
+
+
+class FleissKappaBootstrap(BootstrapStatistic):
+    """Fleiss' Kappa from the (item x category) rating counts."""
+
+    def __init__(self, agreement_matrix: np.ndarray, n_annotators: int):
+        self.n_annotators = n_annotators
+        self.unit_stats = np.column_stack([
+            (agreement_matrix * (agreement_matrix - 1)).sum(axis=1),
+            agreement_matrix,
+        ])
+
+    def evaluate(self, sums: np.ndarray) -> np.ndarray:
+        pair_agreements, category_totals = sums[:, 0], sums[:, 1:]
+        ratings = category_totals.sum(axis=1)
+        n_items = ratings / self.n_annotators
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p_o = pair_agreements / (n_items * self.n_annotators * (self.n_annotators - 1))
+            p_e = ((category_totals / ratings[:, None]) ** 2).sum(axis=1)
+            return np.where(p_e != 1, (p_o - p_e) / (1 - p_e), 1.0)
+
+
+def _resample_weights(rng: np.random.Generator, n_replicates: int,
+                      n_units: int) -> np.ndarray:
+    """Draw unit multiplicities for a block of bootstrap resamples."""
+    sampled = rng.integers(0, n_units, size=(n_replicates, n_units))
+    offsets = np.arange(n_replicates)[:, None] * n_units
+    counts = np.bincount((sampled + offsets).ravel(), minlength=n_replicates * n_units)
+    return counts.reshape(n_replicates, n_units).astype(np.float64)
+
+
+def _run_block(statistic: BootstrapStatistic, seed: np.random.SeedSequence,
+               n_replicates: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    weights = _resample_weights(rng, n_replicates, statistic.n_units)
+    return statistic.evaluate(statistic.weighted_sums(weights))
+
+
+_worker_statistic: Optional[BootstrapStatistic] = None
+
+
+def _init_worker(statistic: BootstrapStatistic) -> None:
+    global _worker_statistic
+    _worker_statistic = statistic
+
+
+def _run_worker_block(seed: np.random.SeedSequence, n_replicates: int) -> np.ndarray:
+    return _run_block(_worker_statistic, seed, n_replicates)
+
+
+def _plan_blocks(n_bootstrap: int, n_units: int) -> List[int]:
+    """Split replicates into blocks bounded by MAX_BLOCK_CELLS weights each."""
+    block_size = max(1, min(MAX_BLOCK_REPLICATES, MAX_BLOCK_CELLS // max(n_units, 1)))
+    full_blocks, remainder = divmod(n_bootstrap, block_size)
+    return [block_size] * full_blocks + ([remainder] if remainder else [])
+
+
+def bootstrap_replicates(statistic: BootstrapStatistic, n_bootstrap: int,
+                         random_state: Optional[int] = None,
+                         n_jobs: int = 1) -> np.ndarray:
+    """
+    Generate bootstrap replicates of a statistic by resampling units.
+
+    Args:
+        statistic: Precomputed per-unit statistic
+        n_bootstrap: Number of bootstrap replicates
+        random_state: Seed for the replicate RNG streams
+        n_jobs: Number of worker processes (1 runs in-process)
+
+    Returns:
+        Array of replicate values (NaN for undefined replicates)
+    """
+    if n_bootstrap < 1:
+        raise ValueError("n_bootstrap must be at least 1")
+    if statistic.n_units == 0:
+        return np.full(n_bootstrap, np.nan)
+
+    blocks = _plan_blocks(n_bootstrap, statistic.n_units)
+    seeds = np.random.SeedSequence(random_state).spawn(len(blocks))
+
+    if n_jobs <= 1 or len(blocks) == 1:
+        results = [_run_block(statistic, seed, size) for seed, size in zip(seeds, blocks)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(blocks)),
+                                 initializer=_init_worker,
+                                 initargs=(statistic,)) as executor:
+            results = list(executor.map(_run_worker_block, seeds, blocks))
+
+    return np.concatenate(results)
+
+
+def bootstrap_interval(replicates: np.ndarray,
+                       confidence: float = 0.95) -> Tuple[float, float, float]:
+    """
+    Percentile confidence interval and standard error from replicates.
+
+    Args:
+        replicates: Bootstrap replicate values
+        confidence: Confidence level of the interval
+
+    Returns:
+        Tuple of (ci_lower, ci_upper, standard_error); (-1.0, 1.0, nan)
+        when no replicate is defined
+    """
+    valid = replicates[~np.isnan(replicates)]
+    if valid.size == 0:
+        return -1.0, 1.0, float('nan')
+
+    tail = (1 - confidence) / 2
+    ci_lower = float(np.percentile(valid, tail * 100))
+    ci_upper = float(np.percentile(valid, (1 - tail) * 100))
+    standard_error = float(valid.std(ddof=1)) if valid.size > 1 else 0.0
+    return ci_lower, ci_upper, standard_error
@@ -16,7 +16,7 @@ import time
 from typing import Any, Optional, Dict, List, Callable, Union
 from datetime import datetime, timedelta
 
-from ..core.cache_service import get_cache_service, CacheKey
+from ..core.cache_service import get_cache_service, CacheKey, CacheTag
 from ..services.cache_manager import get_cache_manager
 from ..utils.logger import get_logger
 
@@ -28,9 +28,10 @@ def cached(
     ttl: Optional[int] = None,
     key_prefix: Optional[str] = None,
     key_func: Optional[Callable] = None,
-    invalidate_patterns: Optional[List[str]] = None,
+    invalidate_tags: Optional[List[str]] = None,
     ignore_errors: bool = True,
-    cache_none: bool = False
+    cache_none: bool = False,
+    tags: Optional[Union[List[str], Callable]] = None
 ):
     """
     Cache decorator for async functions with advanced features
@@ -39,9 +40,12 @@ def cached(
         ttl: Time to live in seconds (uses default if None)
         key_prefix: Prefix for cache key (uses function name if None)
         key_func: Custom function to generate cache key
-        invalidate_patterns: Patterns to invalidate when function is called with write operations
+        invalidate_tags: Tags to invalidate after the function returns a result
         ignore_errors: Continue execution if cache fails
         cache_none: Whether to cache None results
+        tags: Tags for cached results, or a function of the call arguments
+            returning them. Results are also tagged with key_prefix when given,
+            so cache_invalidate(key_prefix) clears them.
     """
     def decorator(func):
         @functools.wraps(func)
@@ -70,19 +74,21 @@ def cached(
                 
                 # Cache the result
                 if result is not None or cache_none:
-                    success = await cache_manager.cache.set(cache_key, result, ttl=ttl)
+                    success = await cache_manager.cache.set(
+                        cache_key, result, ttl=ttl,
+                        tags=_resolve_tags(tags, key_prefix, *args, **kwargs)
+                    )
                     if success:
                         logger.debug(f"Cached result for {cache_key} (execution: {execution_time:.3f}s)")
                     else:
                         logger.warning(f"Failed to cache result for {cache_key}")
                 
-                # Invalidate related patterns if specified
-                if invalidate_patterns and result is not None:
-                    for pattern in invalidate_patterns:
-                        try:
-                            await cache_manager.invalidate_query_cache(pattern)
-                        except Exception as e:
-                            logger.warning(f"Failed to invalidate pattern {pattern}: {str(e)}")
+                # Invalidate related tags if specified
+                if invalidate_tags and result is not None:
+                    try:
+                        await cache_manager.invalidate_tags(*invalidate_tags)
+                    except Exception as e:
+                        logger.warning(f"Failed to invalidate tags {invalidate_tags}: {str(e)}")
                 
                 return result
                 
@@ -95,12 +101,20 @@ def cached(
         
         # Add cache invalidation method to the function
         wrapper.invalidate_cache = lambda *args, **kwargs: _invalidate_cache(func, key_func, key_prefix, *args, **kwargs)
-        wrapper.warm_cache = lambda *args, **kwargs: _warm_cache(func, key_func, key_prefix, *args, **kwargs)
+        wrapper.warm_cache = lambda *args, **kwargs: _warm_cache(func, key_func, key_prefix, *args, tags=tags, **kwargs)
         
         return wrapper
     return decorator
 
 
+def _resolve_tags(tags, key_prefix, *args, **kwargs) -> List[str]:
+    """Build the tag list for a cached call"""
+    resolved = list(tags(*args, **kwargs) if callable(tags) else tags or [])
+    if key_prefix:
+        resolved.append(key_prefix)
+    return resolved
+
+
 async def _invalidate_cache(func, key_func, key_prefix, *args, **kwargs):
     """Invalidate cache for specific function call"""
     cache_manager = get_cache_manager()
@@ -117,7 +131,7 @@ async def _invalidate_cache(func, key_func, key_prefix, *args, **kwargs):
     return success
 
 
-async def _warm_cache(func, key_func, key_prefix, *args, **kwargs):
+async def _warm_cache(func, key_func, key_prefix, *args, tags=None, **kwargs):
     """Pre-warm cache for specific function call"""
     cache_manager = get_cache_manager()
     
@@ -135,7 +149,9 @@ async def _warm_cache(func, key_func, key_prefix, *args, **kwargs):
     # Execute and cache
     result = await func(*args, **kwargs)
     if result is not None:
-        success = await cache_manager.cache.set(cache_key, result)
+        success = await cache_manager.cache.set(
+            cache_key, result, tags=_resolve_tags(tags, key_prefix, *args, **kwargs)
+        )
         if success:
             logger.info(f"Warmed cache for {cache_key}")
         return success
@@ -143,26 +159,25 @@ async def _warm_cache(func, key_func, key_prefix, *args, **kwargs):
     return False
 
 
-def cache_invalidate(*patterns: str):
+def cache_invalidate(*tags: str):
     """
-    Decorator to invalidate cache patterns after function execution
+    Decorator to invalidate cache tags after function execution
     
     Args:
-        patterns: Cache patterns to invalidate
+        tags: Cache tags to invalidate, e.g. a cached() key_prefix
     """
     def decorator(func):
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             result = await func(*args, **kwargs)
             
-            # Invalidate cache patterns
+            # Invalidate cache tags
             cache_manager = get_cache_manager()
-            for pattern in patterns:
-                try:
-                    await cache_manager.invalidate_query_cache(pattern)
-                    logger.debug(f"Invalidated cache pattern: {pattern}")
-                except Exception as e:
-                    logger.warning(f"Failed to invalidate pattern {pattern}: {str(e)}")
+            try:
+                await cache_manager.invalidate_tags(*tags)
+                logger.debug(f"Invalidated cache tags: {tags}")
+            except Exception as e:
+                logger.warning(f"Failed to invalidate tags {tags}: {str(e)}")
             
             return result
         return wrapper
@@ -245,56 +260,64 @@ class CacheContext:
 def cache_user(ttl: int = 3600, include_projects: bool = False):
     """Cache decorator specifically for user-related functions"""
     def key_func(*args, **kwargs):
-        user_id = args[0] if args else kwargs.get('user_id')
+        user_id = _entity_id('user_id', *args, **kwargs)
         suffix = "with_projects" if include_projects else "basic"
         return CacheKey.generate("user", user_id, suffix)
     
-    invalidate_patterns = ["user:*"] if include_projects else []
+    def tags(*args, **kwargs):
+        return [CacheTag.user(_entity_id('user_id', *args, **kwargs))]
     
-    return cached(
-        ttl=ttl,
-        key_func=key_func,
-        invalidate_patterns=invalidate_patterns
-    )
+    return cached(ttl=ttl, key_func=key_func, tags=tags)
 
 
 def cache_project(ttl: int = 1800, include_stats: bool = False):
     """Cache decorator specifically for project-related functions"""
     def key_func(*args, **kwargs):
-        project_id = args[0] if args else kwargs.get('project_id')
+        project_id = _entity_id('project_id', *args, **kwargs)
         suffix = "with_stats" if include_stats else "basic"
         return CacheKey.generate("project", project_id, suffix)
     
-    return cached(ttl=ttl, key_func=key_func)
+    def tags(*args, **kwargs):
+        return [CacheTag.project(_entity_id('project_id', *args, **kwargs))]
+    
+    return cached(ttl=ttl, key_func=key_func, tags=tags)
+
+
+def text_annotations_key(text_id: int, user_id: Optional[int] = None, filters: Optional[Dict] = None) -> str:
+    """Cache key for a text's annotation list, shared by the decorator and warmers"""
+    key_parts = ["annotations", "text", text_id]
+    if user_id:
+        key_parts.extend(["user", user_id])
+    if filters:
+        # Sort filters for consistent keys
+        for k, v in sorted(filters.items()):
+            key_parts.extend([k, str(v)])
+    
+    return CacheKey.generate(*key_parts)
 
 
 def cache_annotations(ttl: int = 900):
     """Cache decorator for annotation queries"""
     def key_func(*args, **kwargs):
-        text_id = kwargs.get('text_id') or (args[0] if args else None)
-        user_id = kwargs.get('user_id')
-        filters = kwargs.get('filters', {})
-        
-        key_parts = ["annotations", "text", text_id]
-        if user_id:
-            key_parts.extend(["user", user_id])
-        if filters:
-            # Sort filters for consistent keys
-            for k, v in sorted(filters.items()):
-                key_parts.extend([k, str(v)])
-        
-        return CacheKey.generate(*key_parts)
+        text_id = _entity_id('text_id', *args, **kwargs)
+        return text_annotations_key(text_id, kwargs.get('user_id'), kwargs.get('filters', {}))
+    
+    def tags(*args, **kwargs):
+        return [CacheTag.text(_entity_id('text_id', *args, **kwargs))]
     
-    return cached(ttl=ttl, key_func=key_func)
+    return cached(ttl=ttl, key_func=key_func, tags=tags)
 
 
 def cache_labels(ttl: int = 7200):
     """Cache decorator for label queries"""
     def key_func(*args, **kwargs):
-        project_id = kwargs.get('project_id') or (args[0] if args else None)
+        project_id = _entity_id('project_id', *args, **kwargs)
         return CacheKey.generate("labels", "project", project_id)
     
-    return cached(ttl=ttl, key_func=key_func)
+    def tags(*args, **kwargs):
+        return [CacheTag.project(_entity_id('project_id', *args, **kwargs))]
+    
+    return cached(ttl=ttl, key_func=key_func, tags=tags)
 
 
 def cache_query_result(query_name: str, ttl: int = 600):
@@ -302,7 +325,14 @@ def cache_query_result(query_name: str, ttl: int = 600):
     def key_func(*args, **kwargs):
         return CacheKey.generate("query", query_name, **kwargs)
     
-    return cached(ttl=ttl, key_func=key_func)
+    return cached(ttl=ttl, key_func=key_func, tags=[CacheKey.generate("query", query_name)])
+
+
+def _entity_id(name: str, *args, **kwargs) -> Optional[int]:
+    """Entity id from a keyword or the first int positional, skipping a bound service instance"""
+    if kwargs.get(name) is not None:
+        return kwargs[name]
+    return next((arg for arg in args if isinstance(arg, int)), None)
 
 
 # Performance monitoring decorator
@@ -394,23 +424,10 @@ class CacheWarmer:
     
     async def warm_annotation_caches(self, text_ids: List[int], db_session) -> Dict[str, int]:
         """Warm annotation caches for multiple texts"""
-        from ..services.annotation_service import get_text_annotations
-        
-        results = {"success": 0, "failed": 0}
+        from ..services.cached_annotation_service import get_cached_annotation_service
         
-        for text_id in text_ids:
-            try:
-                annotations = await get_text_annotations(text_id, db_session)
-                key = CacheKey.generate("text", text_id, "annotations")
-                success = await self.cache_manager.cache.set(key, annotations, ttl=900)
-                
-                if success:
-                    results["success"] += 1
-                else:
-                    results["failed"] += 1
-                    
-            except Exception as e:
-                logger.warning(f"Failed to warm annotations cache for text {text_id}: {str(e)}")
-                results["failed"] += 1
-        
-        return results
\ No newline at end of file
+        try:
+            return await get_cached_annotation_service().warm_annotation_cache(text_ids, db_session)
+        except Exception as e:
+            logger.error(f"Failed to warm annotation caches: {str(e)}")
+            return {"success": 0, "failed": len(text_ids)}
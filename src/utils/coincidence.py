@@ -0,0 +1,183 @@
+"""
+Coincidence Matrix Engine for Krippendorff's Alpha
+
+This module computes Krippendorff's Alpha from value-by-value coincidence
+matrices instead of explicit lists of value pairs. Reliability data is
+encoded once into an integer (unit x annotator) matrix, per-unit value
+counts are built with a single ``np.bincount`` and the coincidences are
+contracted with ``np.einsum``. Memory and time therefore scale with
+``n_units x n_values`` rather than with the square of the number of values.
+
+The disagreement semantics match ``AgreementMetrics._calculate_disagreement``:
+- nominal: 0 for equal values, 1 otherwise (also used for unknown metrics)
+- ordinal: absolute numeric difference, nominal fallback for non-numeric values
+- interval/ratio: squared numeric difference, 0 for non-numeric values
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def encode_reliability_data(annotations: List[List[Any]],
+                            missing_value: Any = None) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Encode annotator lists into an integer (unit x annotator) code matrix.
+
+    Args:
+        annotations: List of annotation lists, one per annotator
+        missing_value: Value representing missing data
+
+    Returns:
+        Tuple of (codes, values) where ``codes[u, a]`` indexes ``values``
+        and missing entries are encoded as -1
+    """
+    n_items = len(annotations[0])
+    if not all(len(ann) == n_items for ann in annotations):
+        raise ValueError("All annotators must annotate same number of items")
+
+    value_to_code: Dict[Any, int] = {}
+    codes = np.full((n_items, len(annotations)), -1, dtype=np.int64)
+
+    for ann_idx, ann in enumerate(annotations):
+        column = codes[:, ann_idx]
+        for item_idx, value in enumerate(ann):
+            if value != missing_value:
+                column[item_idx] = value_to_code.setdefault(value, len(value_to_code))
+
+    return codes, list(value_to_code)
+
+
+def unit_value_counts(codes: np.ndarray, n_values: int) -> np.ndarray:
+    """
+    Count how often each value occurs in each unit.
+
+    Args:
+        codes: Integer (unit x annotator) code matrix with -1 for missing
+        n_values: Number of distinct values
+
+    Returns:
+        (unit x value) count matrix
+    """
+    n_units = codes.shape[0]
+    unit_idx = np.broadcast_to(np.arange(n_units)[:, None], codes.shape)
+    present = codes >= 0
+    flat = unit_idx[present] * n_values + codes[present]
+    counts = np.bincount(flat, minlength=n_units * n_values)
+    return counts.reshape(n_units, n_values).astype(np.float64)
+
+
+def distance_matrix(values: List[Any], metric: str) -> np.ndarray:
+    """
+    Build the value-by-value distance matrix for a metric.
+
+    Args:
+        values: Distinct values, in code order
+        metric: Distance metric ('nominal', 'ordinal', 'interval', 'ratio')
+
+    Returns:
+        Square matrix of pairwise distances with a zero diagonal
+    """
+    n_values = len(values)
+    nominal = 1.0 - np.eye(n_values)
+
+    if metric not in ('ordinal', 'interval', 'ratio'):
+        return nominal
+
+    numeric = np.full(n_values, np.nan)
+    for idx, value in enumerate(values):
+        try:
+            numeric[idx] = float(value)
+        except (ValueError, TypeError):
+            continue
+
+    both_numeric = ~np.isnan(numeric)[:, None] & ~np.isnan(numeric)[None, :]
+    diff = np.subtract.outer(numeric, numeric)
+
+    if metric == 'ordinal':
+        distances = np.where(both_numeric, np.abs(diff), nominal)
+    else:
+        distances = np.where(both_numeric, diff ** 2, 0.0)
+
+    np.fill_diagonal(distances, 0.0)
+    return distances
+
+
+class CoincidenceData:
+    """
+    Sufficient statistics for Krippendorff's Alpha over a reliability dataset.
+
+    Holds the per-unit value counts together with the distance matrix, so the
+    observed and expected disagreement (and any re-weighting of units, e.g.
+    for bootstrapping) can be derived without revisiting the raw annotations.
+    """
+
+    def __init__(self, counts: np.ndarray, distances: np.ndarray,
+                 values: List[Any], metric: str):
+        self.counts = counts
+        self.distances = distances
+        self.values = values
+        self.metric = metric
+
+    @classmethod
+    def from_annotations(cls, annotations: List[List[Any]],
+                         metric: str = 'nominal',
+                         missing_value: Any = None) -> 'CoincidenceData':
+        """Build coincidence data from annotator lists."""
+        codes, values = encode_reliability_data(annotations, missing_value)
+        counts = unit_value_counts(codes, len(values))
+        return cls(counts, distance_matrix(values, metric), values, metric)
+
+    @property
+    def n_units(self) -> int:
+        return self.counts.shape[0]
+
+    def coincidence_matrix(self) -> np.ndarray:
+        """Return the (ordered) value-by-value coincidence matrix of within-unit pairs."""
+        totals = self.counts.sum(axis=0)
+        return np.einsum('uk,ul->kl', self.counts, self.counts) - np.diag(totals)
+
+    def unit_pair_counts(self) -> np.ndarray:
+        """Number of ordered within-unit value pairs for every unit."""
+        m_u = self.counts.sum(axis=1)
+        return m_u * (m_u - 1)
+
+    def unit_disagreements(self) -> np.ndarray:
+        """Summed within-unit pair distances (ordered pairs) for every unit."""
+        return np.einsum('uk,kl,ul->u', self.counts, self.distances, self.counts)
+
+    def alpha_components(self, unit_weights: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """
+        Compute observed and expected disagreement.
+
+        Args:
+            unit_weights: Optional per-unit multiplicities (defaults to 1 each)
+
+        Returns:
+            Dictionary with observed/expected disagreement and pair counts
+        """
+        counts = self.counts
+        if unit_weights is not None:
+            counts = counts * unit_weights[:, None]
+            pair_counts = self.unit_pair_counts() @ unit_weights
+            observed_sum = self.unit_disagreements() @ unit_weights
+        else:
+            pair_counts = self.unit_pair_counts().sum()
+            observed_sum = self.unit_disagreements().sum()
+
+        totals = counts.sum(axis=0)
+        n_values = totals.sum()
+        expected_pairs = n_values * n_values - n_values
+        expected_sum = totals @ self.distances @ totals
+
+        return {
+            'observed_disagreement': float(observed_sum / pair_counts) if pair_counts else 0.0,
+            'expected_disagreement': float(expected_sum / expected_pairs) if expected_pairs else 0.0,
+            'n_pairs': int(round(pair_counts / 2)),
+        }
+
+    def alpha(self, unit_weights: Optional[np.ndarray] = None) -> float:
+        """Compute Krippendorff's Alpha, optionally for re-weighted units."""
+        components = self.alpha_components(unit_weights)
+        if components['expected_disagreement'] == 0:
+            return 1.0
+        return 1 - components['observed_disagreement'] / components['expected_disagreement']
@@ -8,11 +8,93 @@ import json
 import csv
 import xml.etree.ElementTree as ET
 from io import StringIO, BytesIO
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 import pandas as pd
 from datetime import datetime
 
 
+# Target size of the byte chunks emitted by the streaming exporters
+STREAM_CHUNK_SIZE = 64 * 1024
+
+CSV_HEADERS = [
+    "id", "text_id", "text_title", "project_id", "project_name",
+    "start_char", "end_char", "selected_text", "label_id", "label_name",
+    "label_color", "annotator_id", "annotator_username", "confidence_score",
+    "is_validated", "validation_notes", "notes", "created_at", "updated_at"
+]
+
+
+def annotation_to_record(
+    annotation,
+    include_metadata: bool = True,
+    include_context: bool = False
+) -> Dict[str, Any]:
+    """Flatten an annotation and its text, project, label and annotator into a dict."""
+    record = {
+        "id": annotation.id,
+        "text_id": annotation.text_id,
+        "text_title": annotation.text.title,
+        "project_id": annotation.text.project_id,
+        "project_name": annotation.text.project.name,
+        "start_char": annotation.start_char,
+        "end_char": annotation.end_char,
+        "selected_text": annotation.selected_text,
+        "label_id": annotation.label_id,
+        "label_name": annotation.label.name,
+        "label_color": annotation.label.color,
+        "annotator_id": annotation.annotator_id,
+        "annotator_username": annotation.annotator.username,
+        "confidence_score": annotation.confidence_score,
+        "is_validated": annotation.is_validated,
+        "validation_notes": annotation.validation_notes,
+        "notes": annotation.notes,
+        "created_at": annotation.created_at.isoformat() if annotation.created_at else None,
+        "updated_at": annotation.updated_at.isoformat() if annotation.updated_at else None
+    }
+    
+    if include_context:
+        record.update({
+            "context_before": annotation.context_before,
+            "context_after": annotation.context_after
+        })
+    
+    if include_metadata:
+        record["metadata"] = annotation.metadata
+    
+    return record
+
+
+def _csv_headers(include_metadata: bool, include_context: bool) -> List[str]:
+    headers = list(CSV_HEADERS)
+    if include_context:
+        headers.extend(["context_before", "context_after"])
+    if include_metadata:
+        headers.append("metadata")
+    return headers
+
+
+def _csv_row(annotation, include_metadata: bool, include_context: bool) -> Dict[str, Any]:
+    row = annotation_to_record(annotation, include_metadata, include_context)
+    if include_metadata:
+        row["metadata"] = json.dumps(annotation.metadata) if annotation.metadata else None
+    return row
+
+
+def _chunked(pieces: Iterable[str], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Coalesce small string pieces into UTF-8 chunks of roughly chunk_size bytes."""
+    buffer = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= chunk_size:
+            yield "".join(buffer).encode('utf-8')
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield "".join(buffer).encode('utf-8')
+
+
 def export_annotations_to_json(
     annotations: List,
     include_metadata: bool = True,
@@ -32,37 +114,7 @@ def export_annotations_to_json(
     }
     
     for annotation in annotations:
-        ann_data = {
-            "id": annotation.id,
-            "text_id": annotation.text_id,
-            "text_title": annotation.text.title,
-            "project_id": annotation.text.project_id,
-            "project_name": annotation.text.project.name,
-            "start_char": annotation.start_char,
-            "end_char": annotation.end_char,
-            "selected_text": annotation.selected_text,
-            "label_id": annotation.label_id,
-            "label_name": annotation.label.name,
-            "label_color": annotation.label.color,
-            "annotator_id": annotation.annotator_id,
-            "annotator_username": annotation.annotator.username,
-            "confidence_score": annotation.confidence_score,
-            "is_validated": annotation.is_validated,
-            "validation_notes": annotation.validation_notes,
-            "notes": annotation.notes,
-            "created_at": annotation.created_at.isoformat() if annotation.created_at else None,
-            "updated_at": annotation.updated_at.isoformat() if annotation.updated_at else None
-        }
-        
-        if include_context:
-            ann_data.update({
-                "context_before": annotation.context_before,
-                "context_after": annotation.context_after
-            })
-        
-        if include_metadata:
-            ann_data["metadata"] = annotation.metadata
-        
+        ann_data = annotation_to_record(annotation, include_metadata, include_context)
         data["annotations"].append(ann_data)
     
     return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
@@ -77,56 +129,11 @@ def export_annotations_to_csv(
     
     output = StringIO()
     
-    # Define CSV headers
-    headers = [
-        "id", "text_id", "text_title", "project_id", "project_name",
-        "start_char", "end_char", "selected_text", "label_id", "label_name",
-        "label_color", "annotator_id", "annotator_username", "confidence_score",
-        "is_validated", "validation_notes", "notes", "created_at", "updated_at"
-    ]
-    
-    if include_context:
-        headers.extend(["context_before", "context_after"])
-    
-    if include_metadata:
-        headers.append("metadata")
-    
-    writer = csv.DictWriter(output, fieldnames=headers)
+    writer = csv.DictWriter(output, fieldnames=_csv_headers(include_metadata, include_context))
     writer.writeheader()
     
     for annotation in annotations:
-        row = {
-            "id": annotation.id,
-            "text_id": annotation.text_id,
-            "text_title": annotation.text.title,
-            "project_id": annotation.text.project_id,
-            "project_name": annotation.text.project.name,
-            "start_char": annotation.start_char,
-            "end_char": annotation.end_char,
-            "selected_text": annotation.selected_text,
-            "label_id": annotation.label_id,
-            "label_name": annotation.label.name,
-            "label_color": annotation.label.color,
-            "annotator_id": annotation.annotator_id,
-            "annotator_username": annotation.annotator.username,
-            "confidence_score": annotation.confidence_score,
-            "is_validated": annotation.is_validated,
-            "validation_notes": annotation.validation_notes,
-            "notes": annotation.notes,
-            "created_at": annotation.created_at.isoformat() if annotation.created_at else None,
-            "updated_at": annotation.updated_at.isoformat() if annotation.updated_at else None
-        }
-        
-        if include_context:
-            row.update({
-                "context_before": annotation.context_before,
-                "context_after": annotation.context_after
-            })
-        
-        if include_metadata:
-            row["metadata"] = json.dumps(annotation.metadata) if annotation.metadata else None
-        
-        writer.writerow(row)
+        writer.writerow(_csv_row(annotation, include_metadata, include_context))
     
     return output.getvalue().encode('utf-8')
 
@@ -202,6 +209,68 @@ def export_annotations_to_xlsx(
     return output.getvalue()
 
 
+def _annotation_to_xml_element(
+    annotation,
+    include_metadata: bool,
+    include_context: bool
+) -> ET.Element:
+    """Build the <annotation> element for a single annotation."""
+    ann_elem = ET.Element("annotation")
+    ann_elem.set("id", str(annotation.id))
+    
+    # Basic annotation data
+    ET.SubElement(ann_elem, "text_id").text = str(annotation.text_id)
+    ET.SubElement(ann_elem, "text_title").text = annotation.text.title
+    ET.SubElement(ann_elem, "project_id").text = str(annotation.text.project_id)
+    ET.SubElement(ann_elem, "project_name").text = annotation.text.project.name
+    ET.SubElement(ann_elem, "start_char").text = str(annotation.start_char)
+    ET.SubElement(ann_elem, "end_char").text = str(annotation.end_char)
+    ET.SubElement(ann_elem, "selected_text").text = annotation.selected_text
+    
+    # Label information
+    label_elem = ET.SubElement(ann_elem, "label")
+    ET.SubElement(label_elem, "id").text = str(annotation.label_id)
+    ET.SubElement(label_elem, "name").text = annotation.label.name
+    ET.SubElement(label_elem, "color").text = annotation.label.color
+    
+    # Annotator information
+    annotator_elem = ET.SubElement(ann_elem, "annotator")
+    ET.SubElement(annotator_elem, "id").text = str(annotation.annotator_id)
+    ET.SubElement(annotator_elem, "username").text = annotation.annotator.username
+    
+    # Annotation details
+    ET.SubElement(ann_elem, "confidence_score").text = str(annotation.confidence_score)
+    ET.SubElement(ann_elem, "is_validated").text = annotation.is_validated
+    if annotation.validation_notes:
+        ET.SubElement(ann_elem, "validation_notes").text = annotation.validation_notes
+    if annotation.notes:
+        ET.SubElement(ann_elem, "notes").text = annotation.notes
+    
+    # Timestamps
+    if annotation.created_at:
+        ET.SubElement(ann_elem, "created_at").text = annotation.created_at.isoformat()
+    if annotation.updated_at:
+        ET.SubElement(ann_elem, "updated_at").text = annotation.updated_at.isoformat()
+    
+    # Context (if requested)
+    if include_context:
+        context_elem = ET.SubElement(ann_elem, "context")
+        if annotation.context_before:
+            ET.SubElement(context_elem, "before").text = annotation.context_before
+        if annotation.context_after:
+            ET.SubElement(context_elem, "after").text = annotation.context_after
+    
+    # Metadata (if requested)
+    if include_metadata and annotation.metadata:
+        metadata_elem = ET.SubElement(ann_elem, "metadata")
+        for key, value in annotation.metadata.items():
+            meta_item = ET.SubElement(metadata_elem, "item")
+            meta_item.set("key", str(key))
+            meta_item.text = str(value)
+    
+    return ann_elem
+
+
 def export_annotations_to_xml(
     annotations: List,
     include_metadata: bool = True,
@@ -223,58 +292,9 @@ def export_annotations_to_xml(
     annotations_elem = ET.SubElement(root, "annotation_list")
     
     for annotation in annotations:
-        ann_elem = ET.SubElement(annotations_elem, "annotation")
-        ann_elem.set("id", str(annotation.id))
-        
-        # Basic annotation data
-        ET.SubElement(ann_elem, "text_id").text = str(annotation.text_id)
-        ET.SubElement(ann_elem, "text_title").text = annotation.text.title
-        ET.SubElement(ann_elem, "project_id").text = str(annotation.text.project_id)
-        ET.SubElement(ann_elem, "project_name").text = annotation.text.project.name
-        ET.SubElement(ann_elem, "start_char").text = str(annotation.start_char)
-        ET.SubElement(ann_elem, "end_char").text = str(annotation.end_char)
-        ET.SubElement(ann_elem, "selected_text").text = annotation.selected_text
-        
-        # Label information
-        label_elem = ET.SubElement(ann_elem, "label")
-        ET.SubElement(label_elem, "id").text = str(annotation.label_id)
-        ET.SubElement(label_elem, "name").text = annotation.label.name
-        ET.SubElement(label_elem, "color").text = annotation.label.color
-        
-        # Annotator information
-        annotator_elem = ET.SubElement(ann_elem, "annotator")
-        ET.SubElement(annotator_elem, "id").text = str(annotation.annotator_id)
-        ET.SubElement(annotator_elem, "username").text = annotation.annotator.username
-        
-        # Annotation details
-        ET.SubElement(ann_elem, "confidence_score").text = str(annotation.confidence_score)
-        ET.SubElement(ann_elem, "is_validated").text = annotation.is_validated
-        if annotation.validation_notes:
-            ET.SubElement(ann_elem, "validation_notes").text = annotation.validation_notes
-        if annotation.notes:
-            ET.SubElement(ann_elem, "notes").text = annotation.notes
-        
-        # Timestamps
-        if annotation.created_at:
-            ET.SubElement(ann_elem, "created_at").text = annotation.created_at.isoformat()
-        if annotation.updated_at:
-            ET.SubElement(ann_elem, "updated_at").text = annotation.updated_at.isoformat()
-        
-        # Context (if requested)
-        if include_context:
-            context_elem = ET.SubElement(ann_elem, "context")
-            if annotation.context_before:
-                ET.SubElement(context_elem, "before").text = annotation.context_before
-            if annotation.context_after:
-                ET.SubElement(context_elem, "after").text = annotation.context_after
-        
-        # Metadata (if requested)
-        if include_metadata and annotation.metadata:
-            metadata_elem = ET.SubElement(ann_elem, "metadata")
-            for key, value in annotation.metadata.items():
-                meta_item = ET.SubElement(metadata_elem, "item")
-                meta_item.set("key", str(key))
-                meta_item.text = str(value)
+        annotations_elem.append(
+            _annotation_to_xml_element(annotation, include_metadata, include_context)
+        )
     
     # Convert to string and return as bytes
     xml_str = ET.tostring(root, encoding='unicode', method='xml')
@@ -289,4 +309,101 @@ def export_annotations_to_xml(
         return pretty_xml.encode('utf-8')
     except:
         # Fallback to non-pretty XML
-        return xml_str.encode('utf-8')
\ No newline at end of file
+        return xml_str.encode('utf-8')
+
+def _export_info(format_name: str, total: int, include_metadata: bool,
+                 include_context: bool) -> Dict[str, Any]:
+    return {
+        "format": format_name,
+        "exported_at": datetime.utcnow().isoformat(),
+        "total_annotations": total,
+        "include_metadata": include_metadata,
+        "include_context": include_context
+    }
+
+
+def stream_annotations_to_json(
+    annotations: Iterable,
+    include_metadata: bool = True,
+    include_context: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Stream annotations as a JSON document.
+    
+    Annotations are serialized as they are consumed from the iterable, so
+    memory stays bounded by the chunk size. The document has the same keys
+    as export_annotations_to_json, but "export_info" follows the annotation
+    list because the total is only known once the iterable is exhausted.
+    """
+    def pieces():
+        total = 0
+        yield '{\n  "annotations": ['
+        for annotation in annotations:
+            record = json.dumps(
+                annotation_to_record(annotation, include_metadata, include_context),
+                indent=2, ensure_ascii=False
+            )
+            yield ("\n    " if total == 0 else ",\n    ") + record.replace("\n", "\n    ")
+            total += 1
+        export_info = json.dumps(
+            _export_info("json", total, include_metadata, include_context), indent=2
+        )
+        yield '\n  ],\n  "export_info": ' + export_info.replace("\n", "\n  ") + "\n}"
+    
+    return _chunked(pieces(), chunk_size)
+
+
+def stream_annotations_to_csv(
+    annotations: Iterable,
+    include_metadata: bool = True,
+    include_context: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Stream annotations as CSV rows, flushing every chunk_size characters."""
+    output = StringIO()
+    writer = csv.DictWriter(output, fieldnames=_csv_headers(include_metadata, include_context))
+    writer.writeheader()
+    
+    for annotation in annotations:
+        writer.writerow(_csv_row(annotation, include_metadata, include_context))
+        if output.tell() >= chunk_size:
+            yield output.getvalue().encode('utf-8')
+            output.seek(0)
+            output.truncate()
+    
+    if output.tell():
+        yield output.getvalue().encode('utf-8')
+
+
+def stream_annotations_to_xml(
+    annotations: Iterable,
+    include_metadata: bool = True,
+    include_context: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Stream annotations as an XML document.
+    
+    Elements match export_annotations_to_xml; <export_info> is written after
+    <annotation_list> because the total is only known at the end.
+    """
+    def pieces():
+        total = 0
+        yield '<?xml version="1.0" ?>\n<annotations>\n  <annotation_list>\n'
+        for annotation in annotations:
+            ann_elem = _annotation_to_xml_element(annotation, include_metadata, include_context)
+            ET.indent(ann_elem, space="  ", level=2)
+            yield "    " + ET.tostring(ann_elem, encoding='unicode', method='xml') + "\n"
+            total += 1
+        yield "  </annotation_list>\n"
+        
+        export_info = ET.Element("export_info")
+        for key, value in _export_info("xml", total, include_metadata, include_context).items():
+            ET.SubElement(export_info, key).text = (
+                str(value).lower() if isinstance(value, bool) else str(value)
+            )
+        ET.indent(export_info, space="  ", level=1)
+        yield "  " + ET.tostring(export_info, encoding='unicode', method='xml') + "\n</annotations>"
+    
+    return _chunked(pieces(), chunk_size)
@@ -0,0 +1,117 @@
+"""
+Keyset Pagination
+
+Cursor-based pagination for list endpoints. A page is fetched with a
+predicate on the last row's (sort value, id) instead of OFFSET, so every
+page is the same index range scan and rows inserted while a client pages
+through neither shift nor repeat earlier results.
+
+Cursors are opaque URL-safe strings that encode the sort key and the last
+row's position. Rows with a NULL sort value are ordered last.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+
+# Header carrying the next cursor on endpoints that return a bare list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class KeysetPaginator:
+    """
+    Applies keyset pagination to a select() or Query.
+
+    Pages are ordered by sort_column (defaulting to the id column) with the
+    id as tie-breaker, ascending or descending.
+    """
+
+    def __init__(self, id_column, sort_column=None, descending: bool = False):
+        self.id_column = id_column
+        self.sort_column = sort_column if sort_column is not None else id_column
+        self.descending = descending
+        self.keyed_on_id = self.sort_column is id_column
+
+    @property
+    def sort_key(self) -> str:
+        return f"{self.sort_column.key}:{'desc' if self.descending else 'asc'}"
+
+    def encode_cursor(self, row: Any) -> str:
+        """Cursor pointing just past row."""
+        payload = {"k": self.sort_key, "id": getattr(row, self.id_column.key)}
+        if not self.keyed_on_id:
+            payload["v"] = _encode_value(getattr(row, self.sort_column.key))
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> Tuple[Any, int]:
+        """Return the (sort value, id) a cursor points past."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            last_id = int(payload["id"])
+            value = payload.get("v")
+            if value is not None and self.sort_column.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+        except (binascii.Error, ValueError, KeyError, TypeError, NotImplementedError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+
+        if payload.get("k") != self.sort_key:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Pagination cursor does not match the requested sort order"
+            )
+        return value, last_id
+
+    def _after(self, value: Any, last_id: int):
+        """Predicate selecting rows that come after (value, last_id)."""
+        id_after = self.id_column < last_id if self.descending else self.id_column > last_id
+        if self.keyed_on_id:
+            return id_after
+        if value is None:
+            # Already in the NULL tail
+            return and_(self.sort_column.is_(None), id_after)
+
+        value_after = self.sort_column < value if self.descending else self.sort_column > value
+        return or_(
+            value_after,
+            and_(self.sort_column == value, id_after),
+            self.sort_column.is_(None)
+        )
+
+    def apply(self, query, cursor: Optional[str], limit: int):
+        """
+        Order the query, restrict it to rows after cursor and fetch one row
+        more than limit so page() can tell whether another page exists.
+        """
+        if self.descending:
+            order = [self.sort_column.desc(), self.id_column.desc()]
+        else:
+            order = [self.sort_column.asc(), self.id_column.asc()]
+        if not self.keyed_on_id:
+            order[0] = order[0].nulls_last()
+
+        query = query.order_by(*order)
+        if cursor:
+            query = query.where(self._after(*self.decode_cursor(cursor)))
+        return query.limit(limit + 1)
+
+    def page(self, rows: List[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+        """Split fetched rows into the page and the cursor for the next one."""
+        if len(rows) <= limit:
+            return list(rows), None
+        rows = list(rows[:limit])
+        return rows, self.encode_cursor(rows[-1])
@@ -0,0 +1,220 @@
+"""
+Pairwise Agreement Engine for Cohen's Kappa
+
+This module computes Cohen's Kappa for every pair of annotators at once. It
+does not call ``AgreementMetrics.cohen_kappa`` once per pair. Labels are
+encoded into an integer (item x annotator) matrix a single time. The
+confusion matrices of all pairs are then counted with one ``np.bincount``
+over a combined (pair, cell) index. Observed agreement, expected agreement,
+kappa and the analytic standard error follow as array operations over the
+resulting (pair x category x category) stack.
+
+Unused categories contribute nothing to either agreement term, so a shared
+category encoding gives the same kappa as encoding each pair on its own.
+Bootstrap intervals reuse ``CohenKappaBootstrap`` with the same seed for
+every pair, matching ``cohen_kappa(..., n_bootstrap)``. Pairs can be spread
+over worker processes.
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .bootstrap import CohenKappaBootstrap, bootstrap_interval, bootstrap_replicates
+
+
+# Upper bound on the size of one (pairs x items) index block
+MAX_BLOCK_CELLS = 4_000_000
+
+
+def sort_categories(values) -> List[Any]:
+    """Sort category values, with None (no annotation) last."""
+    return sorted(values, key=lambda value: (value is None, value))
+
+
+def encode_categories(annotations: List[List[Any]]) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Encode annotator lists into an integer (item x annotator) code matrix.
+
+    Categories are sorted the way ``cohen_kappa`` sorts them. Every value is
+    a category, including None.
+
+    Args:
+        annotations: List of annotation lists, one per annotator
+
+    Returns:
+        Tuple of (codes, categories) where ``codes[i, a]`` indexes ``categories``
+    """
+    n_items = len(annotations[0])
+    if not all(len(ann) == n_items for ann in annotations):
+        raise ValueError("All annotators must annotate same number of items")
+
+    categories = sort_categories(set().union(*annotations))
+    cat_to_idx = {cat: idx for idx, cat in enumerate(categories)}
+    codes = np.empty((n_items, len(annotations)), dtype=np.int64)
+    for ann_idx, ann in enumerate(annotations):
+        codes[:, ann_idx] = [cat_to_idx[value] for value in ann]
+    return codes, categories
+
+
+def pairwise_confusion(codes: np.ndarray, n_cats: int, first: np.ndarray,
+                       second: np.ndarray) -> np.ndarray:
+    """
+    Count the confusion matrix of every annotator pair.
+
+    Args:
+        codes: Integer (item x annotator) code matrix
+        n_cats: Number of categories
+        first: First annotator column of each pair
+        second: Second annotator column of each pair
+
+    Returns:
+        (pair x category x category) count stack
+    """
+    n_items = codes.shape[0]
+    n_pairs = len(first)
+    cells = n_cats * n_cats
+    confusion = np.empty((n_pairs, cells), dtype=np.int64)
+    block = max(1, MAX_BLOCK_CELLS // max(n_items, 1))
+
+    for lo in range(0, n_pairs, block):
+        hi = min(lo + block, n_pairs)
+        index = codes[:, first[lo:hi]].T * n_cats + codes[:, second[lo:hi]].T
+        index += np.arange(hi - lo)[:, None] * cells
+        confusion[lo:hi] = np.bincount(index.ravel(), minlength=(hi - lo) * cells).reshape(hi - lo, cells)
+
+    return confusion.reshape(n_pairs, n_cats, n_cats)
+
+
+_worker_codes: Optional[np.ndarray] = None
+
+
+def _init_worker(codes: np.ndarray) -> None:
+    global _worker_codes
+    _worker_codes = codes
+
+
+def _pair_interval(codes: np.ndarray, pair: Tuple[int, int], n_cats: int,
+                   n_bootstrap: int, random_state: Optional[int],
+                   confidence: float) -> Tuple[float, float, float]:
+    statistic = CohenKappaBootstrap(codes[:, pair[0]], codes[:, pair[1]], n_cats)
+    replicates = bootstrap_replicates(statistic, n_bootstrap, random_state=random_state)
+    return bootstrap_interval(replicates, confidence)
+
+
+def _worker_pair_interval(pair: Tuple[int, int], n_cats: int, n_bootstrap: int,
+                          random_state: Optional[int], confidence: float) -> Tuple[float, float, float]:
+    return _pair_interval(_worker_codes, pair, n_cats, n_bootstrap, random_state, confidence)
+
+
+class PairwiseKappa:
+    """
+    Unweighted Cohen's Kappa for all annotator pairs of a reliability dataset.
+
+    Pairs are ordered like the nested loop in ``AgreementAnalysis``:
+    (0, 1), (0, 2), ..., (1, 2), ...
+    """
+
+    def __init__(self, confusion: np.ndarray, categories: List[Any],
+                 annotators: List[str], codes: Optional[np.ndarray] = None):
+        """
+        Args:
+            confusion: (pair x category x category) counts, pairs in loop order
+            categories: Category of each confusion row and column
+            annotators: Annotator names
+            codes: The (item x annotator) code matrix the counts came from,
+                required for bootstrap intervals
+        """
+        self.confusion = confusion
+        self.categories = categories
+        self.annotators = annotators
+        self.codes = codes
+        self.first, self.second = np.triu_indices(len(annotators), k=1)
+        self.n_items = int(confusion[0].sum()) if len(confusion) else 0
+        if self.n_items == 0:
+            raise ValueError("Annotator arrays must not be empty")
+
+        n_items = self.n_items
+        marginal1 = confusion.sum(axis=2) / n_items
+        marginal2 = confusion.sum(axis=1) / n_items
+        self.observed = np.trace(confusion, axis1=1, axis2=2) / n_items
+        self.expected = np.einsum('pi,pi->p', marginal1, marginal2)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.kappa = np.where(self.expected != 1,
+                                  (self.observed - self.expected) / (1 - self.expected), 1.0)
+            self.standard_error = np.sqrt(
+                self.observed * (1 - self.observed) / (n_items * (1 - self.expected) ** 2)
+            )
+
+    @classmethod
+    def from_code_matrix(cls, codes: np.ndarray, categories: List[Any],
+                         annotators: List[str]) -> 'PairwiseKappa':
+        """Count every pair's confusion matrix from an (item x annotator) code matrix."""
+        first, second = np.triu_indices(len(annotators), k=1)
+        return cls(pairwise_confusion(codes, len(categories), first, second),
+                   categories, annotators, codes)
+
+    @classmethod
+    def from_annotations(cls, annotations: Dict[str, List[Any]]) -> 'PairwiseKappa':
+        """Build from a mapping of annotator names to annotation lists."""
+        codes, categories = encode_categories(list(annotations.values()))
+        return cls.from_code_matrix(codes, categories, list(annotations.keys()))
+
+    @classmethod
+    def from_codes(cls, codes: np.ndarray, labels: List[Any],
+                   annotators: List[str], missing_value: Any = None) -> 'PairwiseKappa':
+        """
+        Build from a code matrix that marks missing entries with -1.
+
+        This is the encoding ``unify_spans`` produces. Missing entries become
+        one more category, ``missing_value``.
+        """
+        codes = np.where(codes < 0, len(labels), codes)
+        return cls.from_code_matrix(codes, list(labels) + [missing_value], annotators)
+
+    @property
+    def pairs(self) -> List[Tuple[int, int]]:
+        return list(zip(self.first.tolist(), self.second.tolist()))
+
+    def kappa_matrix(self) -> np.ndarray:
+        """Symmetric (annotator x annotator) kappa matrix with a unit diagonal."""
+        matrix = np.eye(len(self.annotators))
+        matrix[self.first, self.second] = self.kappa
+        matrix[self.second, self.first] = self.kappa
+        return matrix
+
+    def pair_categories(self, pair_idx: int) -> np.ndarray:
+        """Indices of the categories either annotator of a pair used."""
+        confusion = self.confusion[pair_idx]
+        return np.flatnonzero(confusion.sum(axis=0) + confusion.sum(axis=1))
+
+    def bootstrap_intervals(self, n_bootstrap: int, random_state: Optional[int] = None,
+                            confidence: float = 0.95,
+                            n_jobs: int = 1) -> List[Tuple[float, float, float]]:
+        """
+        Bootstrap (ci_lower, ci_upper, standard_error) for every pair.
+
+        Args:
+            n_bootstrap: Number of bootstrap replicates per pair
+            random_state: Seed shared by every pair's replicate streams
+            confidence: Confidence level of the intervals
+            n_jobs: Worker processes the pairs are spread over (1 runs in-process)
+        """
+        if self.codes is None:
+            raise ValueError("Bootstrap intervals need the item x annotator code matrix")
+        n_cats = len(self.categories)
+        pairs = self.pairs
+        if n_jobs <= 1 or len(pairs) == 1:
+            return [
+                _pair_interval(self.codes, pair, n_cats, n_bootstrap, random_state, confidence)
+                for pair in pairs
+            ]
+
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(pairs)),
+                                 initializer=_init_worker,
+                                 initargs=(self.codes,)) as executor:
+            return list(executor.map(
+                _worker_pair_interval, pairs,
+                *([value] * len(pairs) for value in (n_cats, n_bootstrap, random_state, confidence))
+            ))
@@ -157,7 +157,7 @@ class TestCacheServiceIntegration:
         with patch.object(project_service, 'cache_manager') as mock_manager:
             mock_manager.cache = mock_cache_service
             mock_manager.set_project = AsyncMock(return_value=True)
-            mock_manager.invalidate_query_cache = AsyncMock(return_value=5)
+            mock_manager.invalidate_tags = AsyncMock(return_value=5)
             
             project_data = {
                 "name": "New Project",
@@ -171,8 +171,8 @@ class TestCacheServiceIntegration:
                 
                 result = await project_service.create_project(project_data, 1, mock_db)
                 
-                # Should invalidate related cache patterns
-                mock_manager.invalidate_query_cache.assert_called()
+                # Should invalidate related cache tags
+                mock_manager.invalidate_tags.assert_called_with("user_projects", "project_stats")
     
     @pytest.mark.asyncio 
     async def test_batch_cache_operations(self, mock_cache_service, mock_db):
@@ -181,6 +181,7 @@ class TestCacheServiceIntegration:
         
         with patch.object(annotation_service, 'cache_manager') as mock_manager:
             mock_manager.cache = mock_cache_service
+            mock_manager.invalidate_tags = AsyncMock(return_value=1)
             
             annotations_data = [
                 {
@@ -207,8 +208,8 @@ class TestCacheServiceIntegration:
                 
                 # Should perform batch cache operations
                 assert len(errors) == 0
-                mock_cache_service.set.assert_called()  # Cache new annotations
-                mock_cache_service.flush_pattern.assert_called()  # Invalidate patterns
+                mock_cache_service.set_many.assert_called_once()  # Cache new annotations
+                mock_manager.invalidate_tags.assert_called_once_with("text:1")  # Invalidate text tag
 
 
 class TestCacheAPIEndpoints:
@@ -7,6 +7,7 @@ detection, resolution strategies, notifications, and API endpoints.
 
 import pytest
 import asyncio
+import threading
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, AsyncMock
 from sqlalchemy import create_engine
@@ -29,6 +30,7 @@ from src.core.conflict_detection import (
     ConflictDetectionEngine, ConflictMonitor, 
     OverlapInfo, ConflictCandidate
 )
+from src.core.conflict_index import ConflictIndexRegistry
 from src.core.conflict_resolution import (
     ConflictResolutionEngine, AutoMergeStrategy, VotingStrategy,
     ExpertReviewStrategy, WeightedVotingStrategy,
@@ -218,6 +220,74 @@ class TestConflictDetection:
         
         # Should detect conflicts with the other annotation
         assert len(conflicts) >= 0  # May be 0 if conflicts already exist
+    
+    def test_conflict_monitor_does_not_duplicate(self, test_db, sample_annotations):
+        """Test repeated monitoring reuses open conflicts from the index."""
+        monitor = ConflictMonitor(test_db, ConflictIndexRegistry())
+        ann_id = sample_annotations[0].id
+        
+        first = monitor.monitor_annotation_changes(ann_id)
+        second = monitor.monitor_annotation_changes(ann_id)
+        
+        assert len(first) >= 1
+        assert second == []
+        assert test_db.query(AnnotationConflict).count() == len(first)
+    
+    def test_conflict_monitor_dismisses_stale_conflicts(self, test_db, sample_annotations):
+        """Test moving an annotation away dismisses the conflicts it no longer causes."""
+        monitor = ConflictMonitor(test_db, ConflictIndexRegistry())
+        ann_a = sample_annotations[0]
+        assert monitor.monitor_annotation_changes(ann_a.id)
+        
+        ann_a.start_char, ann_a.end_char = 500, 520
+        test_db.commit()
+        assert monitor.monitor_annotation_changes(ann_a.id) == []
+        
+        statuses = {c.status for c in test_db.query(AnnotationConflict).all()}
+        assert statuses == {ConflictStatus.DISMISSED}
+    
+    def test_conflict_monitor_handles_deletion(self, test_db, sample_annotations):
+        """Test deleting an annotation removes it from the index and dismisses its conflicts."""
+        registry = ConflictIndexRegistry()
+        monitor = ConflictMonitor(test_db, registry)
+        ann_a, ann_b = sample_annotations
+        assert monitor.monitor_annotation_changes(ann_a.id)
+        
+        monitor.handle_annotation_deleted(ann_b.id, ann_b.text_id)
+        
+        index = registry.peek(ann_b.text_id)
+        assert ann_b.id not in index.spans
+        assert index.open_conflicts == {}
+        assert all(
+            c.status == ConflictStatus.DISMISSED
+            for c in test_db.query(AnnotationConflict).all()
+        )
+
+    def test_index_load_does_not_hold_registry_lock(self, test_db, sample_annotations):
+        """Test other threads can use the registry while a text's index loads."""
+        registry = ConflictIndexRegistry()
+        text_id = sample_annotations[0].text_id
+        load = registry._load
+        lock_free = []
+
+        def try_lock():
+            acquired = registry.lock.acquire(timeout=1)
+            if acquired:
+                registry.lock.release()
+            lock_free.append(acquired)
+
+        def checking_load(db, loading_text_id):
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+            return load(db, loading_text_id)
+
+        registry._load = checking_load
+        index = registry.get(test_db, text_id)
+
+        assert lock_free == [True]
+        assert registry.get(test_db, text_id) is index
+        assert all(a.id in index.spans for a in sample_annotations)
 
 
 # Conflict Resolution Tests
@@ -0,0 +1,109 @@
+"""
+Unit tests for per-text agreement sufficient statistics.
+
+Project metrics merged from per-text statistics are checked against
+AgreementAnalysis.analyze_dataset over the concatenated span_overlap items,
+including annotators missing from some texts and a JSON round trip of the
+stored statistics.
+"""
+
+import unittest
+import json
+import random
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from utils.agreement_metrics import AgreementAnalysis
+from utils.agreement_statistics import MergedAgreementStatistics, TextAgreementStatistics
+from utils.span_unification import unify_spans
+
+
+def random_project(seed: int, n_texts: int = 6) -> dict:
+    """Spans per annotator and text; every annotator works on the first text."""
+    rng = random.Random(seed)
+    corpus = {name: {} for name in ('alice', 'bob', 'carol', 'dave')}
+    for text_id in range(1, n_texts + 1):
+        for name in corpus:
+            if text_id > 1 and rng.random() < 0.3:
+                continue
+            spans = []
+            for _ in range(rng.randrange(1, 8)):
+                start = rng.randrange(0, 80)
+                spans.append({'start': start, 'end': start + rng.randrange(1, 12),
+                              'label': rng.choice(['PER', 'ORG', 'LOC'])})
+            corpus[name][text_id] = spans
+    return corpus
+
+
+def text_statistics(corpus: dict, text_id: int) -> TextAgreementStatistics:
+    text_corpus = {name: {text_id: texts[text_id]} for name, texts in corpus.items() if text_id in texts}
+    return TextAgreementStatistics.from_unified(unify_spans(text_corpus))
+
+
+def analysis(seed: int = 0) -> AgreementAnalysis:
+    analyzer = AgreementAnalysis()
+    analyzer.metrics.random_state = seed
+    return analyzer
+
+
+class TestAgreementStatistics(unittest.TestCase):
+    """Test merging per-text statistics against the full analysis"""
+
+    def test_merged_project_matches_full_analysis(self):
+        for seed in range(10):
+            with self.subTest(seed=seed):
+                corpus = random_project(seed)
+                statistics = [text_statistics(corpus, text_id) for text_id in range(1, 7)]
+
+                expected = analysis().analyze_dataset(unify_spans(corpus).to_sequences())
+                merged = analysis().analyze_statistics(MergedAgreementStatistics(statistics))
+
+                self.assertEqual(merged, expected)
+
+    def test_single_text_matches_full_analysis(self):
+        corpus = random_project(3)
+        statistics = text_statistics(corpus, 1)
+        text_corpus = {name: {1: texts[1]} for name, texts in corpus.items()}
+
+        self.assertEqual(
+            analysis().analyze_statistics(MergedAgreementStatistics([statistics])),
+            analysis().analyze_dataset(unify_spans(text_corpus).to_sequences())
+        )
+
+    def test_json_round_trip(self):
+        statistics = text_statistics(random_project(4), 2)
+        restored = TextAgreementStatistics.from_dict(json.loads(json.dumps(statistics.to_dict())))
+
+        self.assertEqual(restored.to_dict(), statistics.to_dict())
+
+    def test_changed_text_only_changes_its_contribution(self):
+        corpus = random_project(5)
+        statistics = [text_statistics(corpus, text_id) for text_id in range(1, 7)]
+
+        corpus['bob'].setdefault(4, []).append({'start': 90, 'end': 95, 'label': 'ORG'})
+        statistics[3] = text_statistics(corpus, 4)
+
+        self.assertEqual(
+            analysis().analyze_statistics(MergedAgreementStatistics(statistics)),
+            analysis().analyze_dataset(unify_spans(corpus).to_sequences())
+        )
+
+    def test_merged_counts(self):
+        corpus = {
+            'alice': {1: [{'start': 0, 'end': 5, 'label': 'PER'}], 2: [{'start': 0, 'end': 5, 'label': 'ORG'}]},
+            'bob': {1: [{'start': 0, 'end': 5, 'label': 'PER'}]},
+        }
+        merged = MergedAgreementStatistics([text_statistics(corpus, 1), text_statistics(corpus, 2)])
+
+        self.assertEqual(merged.annotators, ['alice', 'bob'])
+        self.assertEqual(merged.categories, ['ORG', 'PER', None])
+        # Item 2 only exists for alice: ORG against bob's None
+        self.assertEqual(merged.confusion[0].tolist(), [[0, 0, 1], [0, 1, 0], [0, 0, 0]])
+        self.assertEqual(merged.unit_counts.tolist(), [[0, 2, 0], [1, 0, 1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
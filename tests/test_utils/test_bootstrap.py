@@ -0,0 +1,139 @@
+"""
+Unit tests for the bootstrap confidence interval engine.
+
+Replicates computed as weighted sums of per-unit statistics are compared
+with full recomputation on explicitly resampled data.
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from utils.agreement_metrics import AgreementMetrics
+from utils.coincidence import CoincidenceData
+from utils.bootstrap import (
+    AlphaBootstrap, CohenKappaBootstrap, FleissKappaBootstrap,
+    bootstrap_interval, bootstrap_replicates, _resample_weights
+)
+
+
+def resample(annotations, weights):
+    """Duplicate items according to integer weights."""
+    indices = np.repeat(np.arange(len(weights)), weights.astype(int))
+    return [[ann[i] for i in indices] for ann in annotations]
+
+
+class TestBootstrapStatistics(unittest.TestCase):
+    """Weighted-sum replicates match recomputation on resampled data."""
+
+    def setUp(self):
+        self.metrics = AgreementMetrics(n_bootstrap=0)
+        rng = np.random.default_rng(7)
+        self.annotations = [
+            rng.choice(['A', 'B', 'C'], size=30).tolist() for _ in range(3)
+        ]
+        self.weights = _resample_weights(np.random.default_rng(1), 5, 30)
+
+    def test_alpha_replicates(self):
+        """Alpha replicates equal alpha of the resampled dataset."""
+        data = CoincidenceData.from_annotations(self.annotations)
+        statistic = AlphaBootstrap(data)
+        replicates = statistic.evaluate(statistic.weighted_sums(self.weights))
+
+        for weights, value in zip(self.weights, replicates):
+            expected = CoincidenceData.from_annotations(
+                resample(self.annotations, weights)
+            ).alpha()
+            self.assertAlmostEqual(value, expected, places=10)
+
+    def test_cohen_kappa_replicates(self):
+        """Cohen's Kappa replicates equal kappa of the resampled pair."""
+        ann1, ann2 = self.annotations[0], self.annotations[1]
+        categories = sorted(set(ann1) | set(ann2))
+        cat_to_idx = {cat: idx for idx, cat in enumerate(categories)}
+        weight_matrix = self.metrics._get_weight_matrix(len(categories), 'linear')
+        statistic = CohenKappaBootstrap(
+            np.array([cat_to_idx[a] for a in ann1]),
+            np.array([cat_to_idx[a] for a in ann2]),
+            len(categories), weight_matrix
+        )
+        replicates = statistic.evaluate(statistic.weighted_sums(self.weights))
+
+        for weights, value in zip(self.weights, replicates):
+            resampled = resample([ann1, ann2], weights)
+            expected = self.metrics.cohen_kappa(resampled[0], resampled[1], weights='linear')
+            self.assertAlmostEqual(value, expected['kappa'], places=4)
+
+    def test_fleiss_kappa_replicates(self):
+        """Fleiss' Kappa replicates equal kappa of the resampled dataset."""
+        categories = sorted({val for ann in self.annotations for val in ann})
+        agreement_matrix = np.array([
+            [sum(ann[i] == cat for ann in self.annotations) for cat in categories]
+            for i in range(30)
+        ], dtype=float)
+        statistic = FleissKappaBootstrap(agreement_matrix, 3)
+        replicates = statistic.evaluate(statistic.weighted_sums(self.weights))
+
+        for weights, value in zip(self.weights, replicates):
+            expected = self.metrics.fleiss_kappa(resample(self.annotations, weights))
+            self.assertAlmostEqual(value, expected['kappa'], places=4)
+
+
+class TestBootstrapReplicates(unittest.TestCase):
+    """Test cases for replicate generation and intervals."""
+
+    def setUp(self):
+        self.annotations = [
+            ['A', 'B', 'A', 'B'] * 10,
+            ['A', 'B', 'B', 'B'] * 10,
+            ['A', 'A', 'A', 'B'] * 10
+        ]
+        self.statistic = AlphaBootstrap(CoincidenceData.from_annotations(self.annotations))
+
+    def test_replicate_count(self):
+        """The requested number of replicates is produced."""
+        replicates = bootstrap_replicates(self.statistic, 450, random_state=3)
+        self.assertEqual(replicates.shape, (450,))
+
+    def test_seeded_streams_independent_of_workers(self):
+        """Seeded replicates are identical in-process and in a process pool."""
+        serial = bootstrap_replicates(self.statistic, 500, random_state=11, n_jobs=1)
+        parallel = bootstrap_replicates(self.statistic, 500, random_state=11, n_jobs=2)
+        np.testing.assert_allclose(serial, parallel)
+
+    def test_invalid_replicate_count(self):
+        """Zero replicates raise ValueError."""
+        with self.assertRaises(ValueError):
+            bootstrap_replicates(self.statistic, 0)
+
+    def test_undefined_replicates(self):
+        """Intervals fall back to the full range when no replicate is defined."""
+        self.assertEqual(bootstrap_interval(np.array([np.nan, np.nan]))[:2], (-1.0, 1.0))
+
+    def test_kappa_bootstrap_results(self):
+        """Kappa methods report bootstrap intervals when replicates are requested."""
+        metrics = AgreementMetrics(random_state=5)
+        cohen = metrics.cohen_kappa(self.annotations[0], self.annotations[1], n_bootstrap=200)
+        fleiss = metrics.fleiss_kappa(self.annotations, n_bootstrap=200)
+
+        for result in (cohen, fleiss):
+            self.assertEqual(result['ci_method'], 'bootstrap')
+            self.assertLessEqual(result['ci_lower'], result['kappa'])
+            self.assertGreaterEqual(result['ci_upper'], result['kappa'])
+            self.assertGreater(result['standard_error'], 0)
+
+    def test_alpha_reproducible_with_seed(self):
+        """Seeded Alpha intervals are reproducible."""
+        first = AgreementMetrics(random_state=9).krippendorff_alpha(self.annotations)
+        second = AgreementMetrics(random_state=9).krippendorff_alpha(self.annotations)
+
+        self.assertEqual(first['ci_lower'], second['ci_lower'])
+        self.assertEqual(first['ci_upper'], second['ci_upper'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,151 @@
+"""
+Unit tests for the coincidence matrix engine.
+
+The engine is checked against the original pair-list formulation of
+Krippendorff's Alpha on a reference corpus covering all four metrics,
+missing values, mixed value types and units with varying numbers of
+annotators.
+"""
+
+import unittest
+import numpy as np
+from typing import List, Any
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from utils.agreement_metrics import AgreementMetrics
+from utils.coincidence import (
+    CoincidenceData, distance_matrix, encode_reliability_data, unit_value_counts
+)
+
+
+def pair_list_alpha(annotations: List[List[Any]], metric: str,
+                    missing_value: Any = None) -> dict:
+    """Reference implementation materializing every value pair."""
+    calculator = AgreementMetrics()
+    pairs = []
+    for item_idx in range(len(annotations[0])):
+        item_values = [ann[item_idx] for ann in annotations
+                       if ann[item_idx] != missing_value]
+        for i in range(len(item_values)):
+            for j in range(i + 1, len(item_values)):
+                pairs.append((item_values[i], item_values[j]))
+
+    all_values = [val for ann in annotations for val in ann if val != missing_value]
+    expected_pairs = [
+        (all_values[i], all_values[j])
+        for i in range(len(all_values)) for j in range(i + 1, len(all_values))
+    ]
+
+    observed = calculator._calculate_disagreement(pairs, metric)
+    expected = calculator._calculate_disagreement(expected_pairs, metric)
+    alpha = 1.0 if expected == 0 else 1 - observed / expected
+    return {
+        'alpha': alpha,
+        'observed_disagreement': observed,
+        'expected_disagreement': expected,
+        'n_pairs': len(pairs),
+    }
+
+
+def reference_corpus() -> List[List[List[Any]]]:
+    """Build a deterministic set of reliability datasets."""
+    rng = np.random.default_rng(42)
+    corpus = [
+        [['A', 'B', 'C', 'A', 'B'], ['A', 'B', 'C', 'A', 'B']],
+        [['A', 'B', None, 'A', 'B'], ['A', None, 'C', 'A', 'B'], [None, 'B', 'C', 'B', 'B']],
+        [[1, 2, 3, 4, 5, 1, 2, 3], [1, 2, 3, 4, 4, 1, 3, 3], [1, 3, 3, 4, 5, 2, 2, 3]],
+        [[1.0, 2.5, 3.2, 4.1, 5.0], [1.1, 2.3, 3.0, 4.2, 4.8], [0.9, 2.6, 3.1, 4.0, 5.1]],
+        [[1, 'x', 3, None], [2, 'x', 'y', 4], ['3', 'z', 3, 4]],
+    ]
+    for n_annotators, n_items, n_values in [(3, 40, 4), (5, 60, 7), (2, 25, 3)]:
+        dataset = []
+        for _ in range(n_annotators):
+            values = rng.integers(0, n_values, size=n_items).tolist()
+            missing = rng.random(n_items) < 0.2
+            dataset.append([None if m else int(v) for v, m in zip(values, missing)])
+        corpus.append(dataset)
+    return corpus
+
+
+class TestCoincidenceEncoding(unittest.TestCase):
+    """Test cases for reliability data encoding."""
+
+    def test_encode_with_missing(self):
+        """Missing values are encoded as -1 and values keep first-seen order."""
+        codes, values = encode_reliability_data([['A', None], ['B', 'A']])
+
+        self.assertEqual(values, ['A', 'B'])
+        np.testing.assert_array_equal(codes, [[0, 1], [-1, 0]])
+
+    def test_unequal_lengths(self):
+        """Annotators with different item counts raise ValueError."""
+        with self.assertRaises(ValueError):
+            encode_reliability_data([['A', 'B'], ['A']])
+
+    def test_unit_value_counts(self):
+        """Per-unit counts are built from the code matrix."""
+        codes = np.array([[0, 0, 1], [1, -1, -1]])
+        counts = unit_value_counts(codes, 2)
+
+        np.testing.assert_array_equal(counts, [[2, 1], [0, 1]])
+
+    def test_distance_matrices(self):
+        """Distance matrices follow the disagreement semantics per metric."""
+        values = [1, 3, 'x']
+
+        np.testing.assert_array_equal(
+            distance_matrix(values, 'nominal'), [[0, 1, 1], [1, 0, 1], [1, 1, 0]]
+        )
+        np.testing.assert_array_equal(
+            distance_matrix(values, 'ordinal'), [[0, 2, 1], [2, 0, 1], [1, 1, 0]]
+        )
+        np.testing.assert_array_equal(
+            distance_matrix(values, 'interval'), [[0, 4, 0], [4, 0, 0], [0, 0, 0]]
+        )
+
+
+class TestCoincidenceAlpha(unittest.TestCase):
+    """Test cases comparing the engine with the pair-list formulation."""
+
+    def test_matches_pair_list_reference(self):
+        """Engine returns the same disagreements and alpha on the reference corpus."""
+        for dataset in reference_corpus():
+            for metric in ['nominal', 'ordinal', 'interval', 'ratio', 'invalid_metric']:
+                with self.subTest(dataset=dataset, metric=metric):
+                    expected = pair_list_alpha(dataset, metric)
+                    data = CoincidenceData.from_annotations(dataset, metric)
+                    components = data.alpha_components()
+
+                    self.assertEqual(components['n_pairs'], expected['n_pairs'])
+                    self.assertAlmostEqual(components['observed_disagreement'],
+                                           expected['observed_disagreement'], places=10)
+                    self.assertAlmostEqual(components['expected_disagreement'],
+                                           expected['expected_disagreement'], places=10)
+                    self.assertAlmostEqual(data.alpha(), expected['alpha'], places=10)
+
+    def test_coincidence_matrix(self):
+        """Coincidence matrix counts ordered within-unit pairs."""
+        data = CoincidenceData.from_annotations([['A', 'A'], ['A', 'B'], ['B', None]])
+        coincidences = data.coincidence_matrix()
+
+        np.testing.assert_array_equal(coincidences, [[2, 3], [3, 0]])
+        self.assertEqual(coincidences.sum(), data.unit_pair_counts().sum())
+
+    def test_unit_weights(self):
+        """Integer unit weights are equivalent to duplicating units."""
+        dataset = [['A', 'B', 'A'], ['A', 'A', 'B'], ['B', 'B', 'A']]
+        weights = np.array([2.0, 0.0, 1.0])
+        duplicated = [[ann[0], ann[0], ann[2]] for ann in dataset]
+
+        weighted = CoincidenceData.from_annotations(dataset).alpha(weights)
+        expected = CoincidenceData.from_annotations(duplicated).alpha()
+
+        self.assertAlmostEqual(weighted, expected, places=10)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
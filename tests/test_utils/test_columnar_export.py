@@ -0,0 +1,101 @@
+"""
+Unit tests for the Parquet / Arrow annotation exporter.
+"""
+
+import io
+import json
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+import sys
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from utils.advanced_exporters import AdvancedExportManager, ColumnarExporter
+
+
+def make_annotations(n):
+    project = SimpleNamespace(name="Project")
+    texts = [SimpleNamespace(title=f"Text {i}", project_id=1, project=project) for i in range(3)]
+    labels = [SimpleNamespace(name=name, color="#00FF00") for name in ("PER", "ORG")]
+    annotators = [SimpleNamespace(username=name) for name in ("alice", "bob")]
+    return [
+        SimpleNamespace(
+            id=i, text_id=i % 3, text=texts[i % 3], start_char=i, end_char=i + 4,
+            selected_text=f"span {i}", label_id=i % 2, label=labels[i % 2],
+            annotator_id=i % 2, annotator=annotators[i % 2], confidence_score=0.5,
+            is_validated="approved", validation_notes=None, notes=None,
+            created_at=datetime(2024, 5, 1, 12, 30), updated_at=None,
+            context_before="", context_after="",
+            metadata={"index": i} if i % 2 else {}
+        )
+        for i in range(n)
+    ]
+
+
+class TestColumnarExporter(unittest.TestCase):
+    """Test cases for columnar exports."""
+
+    def setUp(self):
+        self.exporter = ColumnarExporter()
+        self.annotations = make_annotations(25)
+
+    def test_parquet_row_groups(self):
+        """Each batch becomes one Parquet row group with typed columns."""
+        data = b"".join(self.exporter.stream(iter(self.annotations), "parquet", batch_size=10))
+        parquet_file = pq.ParquetFile(io.BytesIO(data))
+        table = parquet_file.read()
+
+        self.assertEqual(parquet_file.num_row_groups, 3)
+        self.assertEqual(table.column("id").to_pylist(), list(range(25)))
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("label_name").type))
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("annotator_username").type))
+        self.assertEqual(table.schema.field("created_at").type, pa.timestamp("us"))
+        self.assertEqual(json.loads(table.column("metadata")[1].as_py()), {"index": 1})
+        self.assertIsNone(table.column("metadata")[0].as_py())
+
+    def test_arrow_stream(self):
+        """Arrow exports are readable IPC streams with one batch per chunk of rows."""
+        data = AdvancedExportManager().export_annotations(
+            self.annotations, "arrow", include_context=True, batch_size=10
+        )
+        reader = pa.ipc.open_stream(data)
+        batches = list(reader)
+
+        self.assertEqual([batch.num_rows for batch in batches], [10, 10, 5])
+        self.assertIn("context_before", reader.schema.names)
+        self.assertEqual(
+            pa.Table.from_batches(batches).column("label_name").to_pylist()[:3],
+            ["PER", "ORG", "PER"]
+        )
+
+    def test_write_reports_progress(self):
+        """Writing to a file object reports the running row count."""
+        progress = []
+        written = self.exporter.write(
+            iter(self.annotations), io.BytesIO(), "parquet",
+            batch_size=10, progress_callback=progress.append
+        )
+
+        self.assertEqual(written, 25)
+        self.assertEqual(progress, [10, 20, 25])
+
+    def test_unsupported_format(self):
+        """Unknown columnar formats raise ValueError."""
+        with self.assertRaises(ValueError):
+            self.exporter.export_annotations_to_columnar(self.annotations, "orc")
+
+    def test_formats_registered(self):
+        """Parquet and Arrow are listed among the supported formats."""
+        formats = AdvancedExportManager().get_supported_formats()
+        self.assertIn("parquet", formats)
+        self.assertIn("arrow", formats)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
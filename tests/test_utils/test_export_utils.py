@@ -0,0 +1,97 @@
+"""
+Unit tests for the streaming annotation exporters.
+
+Streamed documents are compared with the buffered exporters on the same
+annotations.
+"""
+
+import csv
+import io
+import json
+import unittest
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from types import SimpleNamespace
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from utils.export_utils import (
+    export_annotations_to_csv, export_annotations_to_json, export_annotations_to_xml,
+    stream_annotations_to_csv, stream_annotations_to_json, stream_annotations_to_xml
+)
+
+
+def make_annotations(n):
+    project = SimpleNamespace(name="Project")
+    text = SimpleNamespace(title="Text", project_id=1, project=project)
+    label = SimpleNamespace(name="PER", color="#FF0000")
+    annotator = SimpleNamespace(username="alice")
+    return [
+        SimpleNamespace(
+            id=i, text_id=1, text=text, start_char=i, end_char=i + 5,
+            selected_text=f"span \"{i}\" ünïcode", label_id=1, label=label,
+            annotator_id=1, annotator=annotator, confidence_score=0.9,
+            is_validated="pending", validation_notes=None, notes="note, with comma",
+            created_at=datetime(2024, 1, 1), updated_at=None,
+            context_before="before", context_after="after",
+            metadata={"source": "test", "index": i}
+        )
+        for i in range(n)
+    ]
+
+
+class TestStreamingExport(unittest.TestCase):
+    """Streamed exports carry the same content as buffered exports."""
+
+    def setUp(self):
+        self.annotations = make_annotations(250)
+
+    def test_json_stream_matches_buffered(self):
+        """Streamed JSON parses to the same annotations and export info."""
+        chunks = list(stream_annotations_to_json(
+            iter(self.annotations), include_context=True, chunk_size=1024
+        ))
+        streamed = json.loads(b"".join(chunks))
+        buffered = json.loads(export_annotations_to_json(self.annotations, include_context=True))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(streamed["annotations"], buffered["annotations"])
+        self.assertEqual(streamed["export_info"]["total_annotations"], 250)
+
+    def test_csv_stream_matches_buffered(self):
+        """Streamed CSV is byte-identical to the buffered CSV."""
+        chunks = list(stream_annotations_to_csv(iter(self.annotations), chunk_size=1024))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks), export_annotations_to_csv(self.annotations))
+        rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode('utf-8'))))
+        self.assertEqual(len(rows), 250)
+
+    def test_xml_stream_matches_buffered(self):
+        """Streamed XML contains the same annotation elements."""
+        streamed = ET.fromstring(b"".join(stream_annotations_to_xml(iter(self.annotations))))
+        buffered = ET.fromstring(export_annotations_to_xml(self.annotations))
+
+        def annotation_elements(root):
+            elements = []
+            for elem in root.find("annotation_list"):
+                ET.indent(elem)
+                elements.append(ET.tostring(elem))
+            return elements
+
+        self.assertEqual(annotation_elements(streamed), annotation_elements(buffered))
+        self.assertEqual(streamed.find("export_info/total_annotations").text, "250")
+
+    def test_empty_stream(self):
+        """Empty inputs still produce valid documents."""
+        document = json.loads(b"".join(stream_annotations_to_json(iter([]))))
+        self.assertEqual(document["annotations"], [])
+        root = ET.fromstring(b"".join(stream_annotations_to_xml(iter([]))))
+        self.assertEqual(root.find("export_info/total_annotations").text, "0")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
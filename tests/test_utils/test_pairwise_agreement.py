@@ -0,0 +1,116 @@
+"""
+Unit tests for the pairwise agreement engine.
+
+Every pair result from the batched engine is checked against
+AgreementMetrics.cohen_kappa, with both analytic and bootstrap intervals,
+on random datasets where some annotators leave categories unused.
+"""
+
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from utils.agreement_metrics import AgreementAnalysis, AgreementMetrics
+from utils.pairwise_agreement import PairwiseKappa, encode_categories, pairwise_confusion
+
+
+def random_dataset(seed: int, n_annotators: int = 5, n_items: int = 60) -> dict:
+    rng = np.random.default_rng(seed)
+    truth = rng.choice(['A', 'B', 'C', 'D'], n_items)
+    annotations = {}
+    for a in range(n_annotators):
+        noisy = rng.random(n_items) < 0.1 + 0.1 * a
+        # The first annotator never uses 'D'
+        pool = ['A', 'B', 'C'] if a == 0 else ['A', 'B', 'C', 'D']
+        labels = np.where(noisy, rng.choice(pool, n_items), truth)
+        if a == 0:
+            labels = np.where(labels == 'D', 'A', labels)
+        annotations[f"annotator_{a}"] = labels.tolist()
+    return annotations
+
+
+class TestPairwiseKappa(unittest.TestCase):
+    """Test batched Cohen's Kappa against the per-pair implementation"""
+
+    def test_matches_cohen_kappa_for_every_pair(self):
+        metrics = AgreementMetrics()
+        for seed in range(10):
+            annotations = random_dataset(seed)
+            names = list(annotations)
+            batched = metrics.pairwise_cohen_kappa(annotations)['pairs']
+
+            for i in range(len(names)):
+                for j in range(i + 1, len(names)):
+                    with self.subTest(seed=seed, pair=(i, j)):
+                        expected = metrics.cohen_kappa(annotations[names[i]], annotations[names[j]])
+                        result = batched[f"{names[i]}_vs_{names[j]}"]
+                        for key in ('categories', 'confusion_matrix', 'interpretation', 'n_items', 'ci_method'):
+                            self.assertEqual(result[key], expected[key])
+                        for key in ('kappa', 'standard_error', 'ci_lower', 'ci_upper',
+                                    'observed_agreement', 'expected_agreement'):
+                            self.assertAlmostEqual(result[key], expected[key], places=4)
+
+    def test_bootstrap_matches_cohen_kappa(self):
+        metrics = AgreementMetrics(random_state=7)
+        annotations = random_dataset(3, n_annotators=3)
+        names = list(annotations)
+        batched = metrics.pairwise_cohen_kappa(annotations, n_bootstrap=200)['pairs']
+
+        expected = metrics.cohen_kappa(annotations[names[1]], annotations[names[2]], n_bootstrap=200)
+        result = batched[f"{names[1]}_vs_{names[2]}"]
+        self.assertEqual(result['ci_method'], 'bootstrap')
+        self.assertAlmostEqual(result['ci_lower'], expected['ci_lower'], places=4)
+        self.assertAlmostEqual(result['ci_upper'], expected['ci_upper'], places=4)
+        self.assertAlmostEqual(result['standard_error'], expected['standard_error'], places=4)
+
+    def test_parallel_bootstrap_matches_serial(self):
+        pairwise = PairwiseKappa.from_annotations(random_dataset(4, n_annotators=3))
+        serial = pairwise.bootstrap_intervals(100, random_state=1)
+        parallel = pairwise.bootstrap_intervals(100, random_state=1, n_jobs=2)
+
+        np.testing.assert_allclose(parallel, serial)
+
+    def test_kappa_matrix(self):
+        annotations = random_dataset(5, n_annotators=4)
+        pairwise = PairwiseKappa.from_annotations(annotations)
+        matrix = pairwise.kappa_matrix()
+
+        self.assertEqual(matrix.shape, (4, 4))
+        np.testing.assert_allclose(matrix, matrix.T)
+        np.testing.assert_allclose(np.diag(matrix), 1.0)
+        self.assertAlmostEqual(
+            matrix[1, 3],
+            AgreementMetrics().cohen_kappa(annotations['annotator_1'], annotations['annotator_3'])['kappa'],
+            places=4
+        )
+
+    def test_confusion_blocks_cover_all_pairs(self):
+        codes, categories = encode_categories(list(random_dataset(6, n_annotators=6).values()))
+        first, second = np.triu_indices(6, k=1)
+
+        confusion = pairwise_confusion(codes, len(categories), first, second)
+
+        self.assertEqual(confusion.shape, (15, len(categories), len(categories)))
+        np.testing.assert_array_equal(confusion.sum(axis=(1, 2)), codes.shape[0])
+
+    def test_from_codes_treats_missing_as_category(self):
+        codes = np.array([[0, 0], [1, -1], [-1, 1]])
+        pairwise = PairwiseKappa.from_codes(codes, ['PER', 'ORG'], ['alice', 'bob'])
+
+        self.assertEqual(pairwise.categories, ['PER', 'ORG', None])
+        np.testing.assert_array_equal(pairwise.confusion[0], [[1, 0, 0], [0, 0, 1], [0, 1, 0]])
+
+    def test_analyze_dataset_reports_kappa_matrix(self):
+        annotations = random_dataset(8, n_annotators=3)
+        results = AgreementAnalysis().analyze_dataset(annotations, include_all_metrics=False)
+
+        self.assertEqual(len(results['metrics']['pairwise_cohen_kappa']), 3)
+        self.assertEqual(results['metrics']['cohen_kappa_matrix']['annotators'], list(annotations))
+
+
+if __name__ == '__main__':
+    unittest.main()
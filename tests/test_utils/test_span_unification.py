@@ -0,0 +1,151 @@
+"""
+Unit tests for the span unification engine.
+
+The sweep is checked against the original all-pairs greedy clustering on
+random multi-text corpora, including duplicate spans, nested spans and
+several spans per annotator in one item.
+"""
+
+import importlib.util
+import unittest
+import random
+import numpy as np
+from typing import Any, Dict, List
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from utils.span_unification import unify_span_arrays, unify_spans
+
+
+def overlap_ratio(span1: Dict, span2: Dict) -> float:
+    if span1['text_id'] != span2['text_id']:
+        return 0.0
+    start = max(span1['start'], span2['start'])
+    end = min(span1['end'], span2['end'])
+    if start >= end:
+        return 0.0
+    intersection = end - start
+    union = (span1['end'] - span1['start']) + (span2['end'] - span2['start']) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def all_pairs_sequences(annotator_annotations: Dict[str, Dict[int, List[Dict]]],
+                        overlap_threshold: float) -> Dict[str, List[Any]]:
+    """Reference implementation comparing every span with every later span."""
+    all_spans = [
+        {'text_id': text_id, 'start': ann['start'], 'end': ann['end'],
+         'label': ann['label'], 'annotator': name}
+        for name, text_annotations in annotator_annotations.items()
+        for text_id, annotations in text_annotations.items()
+        for ann in annotations
+    ]
+    all_spans.sort(key=lambda x: (x['text_id'], x['start']))
+
+    unified_items, processed = [], set()
+    for i, span1 in enumerate(all_spans):
+        if i in processed:
+            continue
+        processed.add(i)
+        item = {span1['annotator']: span1['label']}
+        for j in range(i + 1, len(all_spans)):
+            if (j not in processed and span1['text_id'] == all_spans[j]['text_id'] and
+                    overlap_ratio(span1, all_spans[j]) >= overlap_threshold):
+                item[all_spans[j]['annotator']] = all_spans[j]['label']
+                processed.add(j)
+        unified_items.append(item)
+
+    return {
+        name: [item.get(name) for item in unified_items]
+        for name in annotator_annotations
+    }
+
+
+def random_corpus(seed: int, n_annotators: int = 3, n_texts: int = 4,
+                  spans_per_text: int = 12) -> Dict[str, Dict[int, List[Dict]]]:
+    rng = random.Random(seed)
+    corpus = {f"annotator_{a}": {} for a in range(n_annotators)}
+    for text_id in rng.sample(range(1, 100), n_texts):
+        for name in corpus:
+            spans = []
+            for _ in range(rng.randrange(spans_per_text)):
+                start = rng.randrange(0, 60)
+                spans.append({
+                    'start': start,
+                    'end': start + rng.randrange(0, 15),
+                    'label': rng.choice(['PER', 'ORG', 'LOC'])
+                })
+            if spans:
+                corpus[name][text_id] = spans
+    return corpus
+
+
+class TestSpanUnification(unittest.TestCase):
+    """Test sweep-line unification against the all-pairs clustering"""
+
+    def test_matches_all_pairs_clustering(self):
+        for seed in range(50):
+            corpus = random_corpus(seed)
+            for threshold in (0.0, 0.3, 0.5, 1.0):
+                with self.subTest(seed=seed, threshold=threshold):
+                    self.assertEqual(
+                        unify_spans(corpus, threshold).to_sequences(),
+                        all_pairs_sequences(corpus, threshold)
+                    )
+
+    def test_spans_in_different_texts_never_merge(self):
+        corpus = {
+            'alice': {1: [{'start': 0, 'end': 5, 'label': 'PER'}]},
+            'bob': {2: [{'start': 0, 'end': 5, 'label': 'PER'}]},
+        }
+        unified = unify_spans(corpus)
+
+        self.assertEqual(unified.n_items, 2)
+        self.assertEqual(unified.item_text_ids.tolist(), [1, 2])
+        self.assertEqual(unified.to_sequences(), {'alice': ['PER', None], 'bob': [None, 'PER']})
+
+    def test_code_matrix(self):
+        corpus = {
+            'alice': {1: [{'start': 0, 'end': 10, 'label': 'PER'}, {'start': 20, 'end': 30, 'label': 'ORG'}]},
+            'bob': {1: [{'start': 1, 'end': 10, 'label': 'PER'}]},
+        }
+        unified = unify_spans(corpus, 0.5)
+
+        self.assertIsInstance(unified.codes, np.ndarray)
+        self.assertEqual(unified.labels, ['PER', 'ORG'])
+        np.testing.assert_array_equal(unified.codes, [[0, 0], [1, -1]])
+
+    def test_empty_input(self):
+        codes, item_text_ids = unify_span_arrays(
+            *(np.empty(0, dtype=np.int64) for _ in range(5)), n_annotators=2
+        )
+
+        self.assertEqual(codes.shape, (0, 2))
+        self.assertEqual(len(item_text_ids), 0)
+        self.assertEqual(unify_spans({'alice': {}, 'bob': {}}).to_sequences(), {'alice': [], 'bob': []})
+
+
+@unittest.skipUnless(
+    importlib.util.find_spec('flask') and importlib.util.find_spec('flask_sqlalchemy'),
+    'agreement API needs flask and flask_sqlalchemy'
+)
+class TestAgreementApiConversion(unittest.TestCase):
+    """The agreement API converts spans through the unification engine"""
+
+    def test_matches_all_pairs_clustering(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+        from src.api.agreement import convert_span_annotations_to_sequences
+
+        for seed in range(10):
+            corpus = random_corpus(seed)
+            with self.subTest(seed=seed):
+                self.assertEqual(
+                    convert_span_annotations_to_sequences(corpus, 0.5),
+                    all_pairs_sequences(corpus, 0.5)
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
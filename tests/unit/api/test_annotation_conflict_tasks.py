@@ -0,0 +1,77 @@
+"""
+Conflict Detection Scheduling Tests
+
+Annotation writes hand conflict detection to a background task instead of
+running it inside the request; the task opens its own session.
+"""
+
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api import annotations as annotations_api
+from src.core.config import settings
+from src.core.database import Base
+from src.models.annotation import Annotation
+from src.models.label import Label
+from src.models.project import Project
+from src.models.text import Text
+from src.models.user import User
+
+
+class RecordingMonitor:
+    """Stands in for ConflictMonitor and records the calls it receives"""
+
+    calls = []
+
+    def __init__(self, db):
+        self.db = db
+
+    def handle_annotation_deleted(self, annotation_id, text_id):
+        self.calls.append(("deleted", annotation_id, text_id))
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'annotations.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    RecordingMonitor.calls = []
+    monkeypatch.setattr(annotations_api, "ConflictMonitor", RecordingMonitor)
+    monkeypatch.setattr(annotations_api, "SessionLocal", factory)
+    monkeypatch.setattr(settings, "CONFLICT_DETECTION_ON_SAVE", True)
+    yield factory
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_delete_defers_conflict_update(session_factory):
+    db = session_factory()
+    user = User(username="annotator", email="annotator@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    project = Project(name="Tasks", owner_id=user.id)
+    db.add(project)
+    db.flush()
+    text = Text(title="Text", content="Alice met Bob.", project_id=project.id)
+    label = Label(name="PERSON", project_id=project.id)
+    db.add_all([text, label])
+    db.flush()
+    annotation = Annotation(
+        start_char=0, end_char=5, selected_text="Alice",
+        text_id=text.id, label_id=label.id, annotator_id=user.id
+    )
+    db.add(annotation)
+    db.commit()
+    annotation_id, text_id = annotation.id, text.id
+
+    background_tasks = BackgroundTasks()
+    await annotations_api.delete_annotation(annotation_id, background_tasks, current_user=user, db=db)
+    db.close()
+
+    assert RecordingMonitor.calls == []
+    assert [task.func for task in background_tasks.tasks] == [annotations_api._dismiss_annotation_conflicts]
+
+    await background_tasks()
+    assert RecordingMonitor.calls == [("deleted", annotation_id, text_id)]
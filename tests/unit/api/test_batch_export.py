@@ -0,0 +1,102 @@
+"""
+Batch Export Tests
+
+Runs the batch export background task for the columnar formats against a
+file-backed SQLite database and reads the written file back.
+"""
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api import batch as batch_api
+from src.api.batch import BatchExportRequest, process_batch_export
+from src.core.database import Base
+from src.models.annotation import Annotation
+from src.models.batch_models import BatchOperation
+from src.models.label import Label
+from src.models.project import Project
+from src.models.text import Text
+from src.models.user import User
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """Database seeded with one project and 25 annotations, used by the export task"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+
+    def get_test_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(batch_api, "get_db", get_test_db)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "exports").mkdir()
+
+    session = factory()
+    user = User(username="exporter", email="exporter@example.com", hashed_password="x")
+    session.add(user)
+    session.flush()
+    project = Project(name="Export", owner_id=user.id)
+    session.add(project)
+    session.flush()
+    text = Text(title="Text", content="Alice met Bob.", project_id=project.id)
+    label = Label(name="PERSON", project_id=project.id)
+    session.add_all([text, label])
+    session.flush()
+    session.add_all([
+        Annotation(
+            start_char=i % 10, end_char=i % 10 + 3, selected_text="Ali",
+            text_id=text.id, label_id=label.id, annotator_id=user.id
+        )
+        for i in range(25)
+    ])
+    session.commit()
+    ids = {"user": user.id, "project": project.id}
+    session.close()
+    yield factory, ids
+    engine.dispose()
+
+
+def start_operation(factory, operation_id, ids):
+    session = factory()
+    session.add(BatchOperation(
+        id=operation_id, operation_type="data_export", user_id=ids["user"], project_id=ids["project"]
+    ))
+    session.commit()
+    session.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+async def test_columnar_export_writes_file(session_factory, tmp_path, export_format):
+    factory, ids = session_factory
+    operation_id = f"export-{export_format}"
+    start_operation(factory, operation_id, ids)
+
+    await process_batch_export(
+        operation_id,
+        BatchExportRequest(project_id=ids["project"], export_format=export_format, include_metadata=False),
+        user_id=ids["user"]
+    )
+
+    session = factory()
+    operation = session.get(BatchOperation, operation_id)
+    session.close()
+    assert operation.status == "completed", operation.error_message
+    assert operation.result_data["record_count"] == 25
+
+    path = tmp_path / operation.result_data["export_path"]
+    if export_format == "parquet":
+        table = pq.read_table(path)
+    else:
+        table = pa.ipc.open_stream(path.read_bytes()).read_all()
+    assert table.num_rows == 25
+    assert set(table.column("label_name").to_pylist()) == {"PERSON"}
@@ -0,0 +1,153 @@
+"""
+SQL Statement Count Tests
+
+Calls the list and detail endpoints against an aiosqlite database and
+asserts how many SQL statements each one issues. Budgets do not depend on
+page size, so a relationship read lazily per row (an N+1) fails here; under
+AsyncSession it would also raise instead of loading.
+"""
+
+import pytest
+import pytest_asyncio
+from fastapi import Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.api.annotations import get_annotation, list_annotations
+from src.api.projects import get_project, list_projects
+from src.api.texts import get_text, list_texts
+from src.core.database import Base
+from src.models.annotation import Annotation
+from src.models.label import Label
+from src.models.project import Project
+from src.models.text import Text
+from src.models.user import User
+
+
+class StatementCounter:
+    """Records the SQL statements an engine executes inside a with block"""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def __len__(self):
+        return len(self.statements)
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path):
+    """Async engine and session seeded with one project, 3 texts and 30 annotations"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'statements.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        user = User(username="counter", email="counter@example.com", hashed_password="x")
+        session.add(user)
+        await session.flush()
+
+        project = Project(name="Statements", owner_id=user.id)
+        session.add(project)
+        await session.flush()
+
+        texts = [Text(title=f"Text {i}", content="Alice met Bob.", project_id=project.id) for i in range(3)]
+        labels = [Label(name=name, project_id=project.id) for name in ("PERSON", "ORG")]
+        session.add_all(texts + labels)
+        await session.flush()
+
+        session.add_all([
+            Annotation(
+                start_char=i % 10, end_char=i % 10 + 3, selected_text="Ali",
+                text_id=texts[i % 3].id, project_id=project.id,
+                label_id=labels[i % 2].id, annotator_id=user.id
+            )
+            for i in range(30)
+        ])
+        await session.commit()
+        ids = {"user": user, "project": project.id, "text": texts[0].id}
+
+    async with session_factory() as session:
+        yield engine, session, ids
+
+    await engine.dispose()
+
+
+async def count(engine, call):
+    with StatementCounter(engine) as counter:
+        result = await call
+    return len(counter), result
+
+
+@pytest.mark.asyncio
+class TestStatementCounts:
+    """Each endpoint issues a fixed number of statements"""
+
+    async def test_list_annotations(self, database):
+        engine, session, ids = database
+        statements, annotations = await count(engine, list_annotations(
+            response=Response(), text_id=None, project_id=None, label_id=None, annotator_id=None,
+            skip=0, limit=100, cursor=None, current_user=ids["user"], db=session
+        ))
+
+        assert len(annotations) == 30
+        assert statements == 1
+
+    async def test_get_annotation(self, database):
+        engine, session, ids = database
+        statements, annotation = await count(engine, get_annotation(
+            annotation_id=1, current_user=ids["user"], db=session
+        ))
+
+        assert annotation.label_name is not None
+        assert statements == 1
+
+    async def test_list_texts(self, database):
+        engine, session, ids = database
+        statements, texts = await count(engine, list_texts(
+            response=Response(), project_id=None, skip=0, limit=100, cursor=None,
+            search=None, current_user=ids["user"], db=session
+        ))
+
+        assert sorted(text.annotation_count for text in texts) == [10, 10, 10]
+        # Accessible project ids, then the page
+        assert statements == 2
+
+    async def test_get_text(self, database):
+        engine, session, ids = database
+        statements, text = await count(engine, get_text(
+            text_id=ids["text"], current_user=ids["user"], db=session
+        ))
+
+        assert text.annotation_count == 10
+        assert statements == 1
+
+    async def test_list_projects(self, database):
+        engine, session, ids = database
+        statements, projects = await count(engine, list_projects(
+            response=Response(), skip=0, limit=100, cursor=None, search=None,
+            owner_only=False, current_user=ids["user"], db=session
+        ))
+
+        assert (projects[0].text_count, projects[0].label_count) == (3, 2)
+        assert statements == 1
+
+    async def test_get_project(self, database):
+        engine, session, ids = database
+        statements, project = await count(engine, get_project(
+            project_id=ids["project"], current_user=ids["user"], db=session
+        ))
+
+        assert project.text_count == 3
+        assert statements == 1
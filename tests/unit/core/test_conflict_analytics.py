@@ -0,0 +1,248 @@
+"""
+Unit Tests for Grouped Conflict Analytics
+
+Checks the grouped queries behind ConflictAgreementAnalyzer against the
+previous per-conflict loops over a seeded project, and that the conflict
+analytics cache serves results until the project's conflicts change.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.core.conflict_analytics_cache import ConflictAnalyticsCache
+from src.core.database import Base
+from src.integration import agreement_integration
+from src.integration.agreement_integration import ConflictAgreementAnalyzer
+from src.models.agreement import AnnotatorPerformance, create_tables
+from src.models.annotation import Annotation
+from src.models.conflict import (
+    AnnotationConflict, ConflictResolution, ConflictStatus, ConflictType,
+    ResolutionOutcome, ResolutionStrategy
+)
+from src.models.label import Label
+from src.models.project import Project
+from src.models.text import Text
+from src.models.user import User
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'conflicts.db'}")
+    Base.metadata.create_all(bind=engine)
+    create_tables(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture(autouse=True)
+def analytics_cache(monkeypatch):
+    cache = ConflictAnalyticsCache(max_projects=10, max_age_seconds=300)
+    monkeypatch.setattr(agreement_integration, "get_conflict_analytics_cache", lambda: cache)
+    return cache
+
+
+@pytest.fixture
+def seeded(session):
+    """Four annotators, 200 conflicts between their annotations and resolutions for most resolved ones"""
+    rng = random.Random(7)
+    users = [User(username=name, email=f"{name}@example.com", hashed_password="x")
+             for name in ("alice", "bob", "carol", "dave")]
+    session.add_all(users)
+    session.flush()
+
+    project = Project(name="Conflicts", owner_id=users[0].id)
+    session.add(project)
+    session.flush()
+    text = Text(title="Text", content="x" * 500, project_id=project.id)
+    label = Label(name="PERSON", project_id=project.id)
+    session.add_all([text, label])
+    session.flush()
+
+    annotations = []
+    for index in range(40):
+        annotations.append(Annotation(
+            start_char=index, end_char=index + 5, selected_text="xxxxx", text_id=text.id,
+            project_id=project.id, label_id=label.id, annotator_id=users[index % 4].id
+        ))
+    session.add_all(annotations)
+    session.flush()
+
+    base_time = datetime(2024, 1, 1)
+    for index in range(200):
+        annotation_a, annotation_b = rng.sample(annotations, 2)
+        status = rng.choice([ConflictStatus.RESOLVED, ConflictStatus.RESOLVED, ConflictStatus.DETECTED])
+        conflict = AnnotationConflict(
+            conflict_type=rng.choice(list(ConflictType)),
+            conflict_description="overlap",
+            severity_level=rng.choice(["low", "medium", "high", "critical"]),
+            annotation_a_id=annotation_a.id,
+            annotation_b_id=annotation_b.id,
+            conflict_score=round(rng.random(), 3),
+            project_id=project.id,
+            text_id=text.id,
+            status=status,
+            resolved_at=base_time if status == ConflictStatus.RESOLVED else None
+        )
+        session.add(conflict)
+        session.flush()
+
+        for offset in range(rng.randrange(0, 3)):
+            final = rng.choice([annotation_a, annotation_b, None])
+            session.add(ConflictResolution(
+                conflict_id=conflict.id,
+                resolution_strategy=rng.choice(list(ResolutionStrategy)),
+                outcome=rng.choice(list(ResolutionOutcome) + [None]),
+                resolution_description="resolved",
+                final_annotation_id=final.id if final else None,
+                confidence_score=rng.choice([None, round(rng.random(), 3)]),
+                resolver_id=users[0].id,
+                created_at=base_time + timedelta(hours=index, minutes=offset)
+            ))
+
+    session.add_all([AnnotatorPerformance(annotator_name=user.username) for user in users[:2]])
+    session.commit()
+    return project
+
+
+def legacy_problematic_pairs(session, project_id):
+    pair_conflicts = {}
+    for conflict in session.query(AnnotationConflict).filter_by(project_id=project_id):
+        pair_key = tuple(sorted([conflict.annotation_a.annotator.username,
+                                 conflict.annotation_b.annotator.username]))
+        stats = pair_conflicts.setdefault(pair_key, {"count": 0, "total_score": 0.0})
+        stats["count"] += 1
+        stats["total_score"] += conflict.conflict_score
+    pairs = []
+    for pair_key, stats in pair_conflicts.items():
+        avg_score = stats["total_score"] / stats["count"]
+        if stats["count"] >= 3 or avg_score >= 0.7:
+            pairs.append((pair_key[0], pair_key[1], avg_score))
+    return sorted(pairs, key=lambda x: x[2], reverse=True)
+
+
+def legacy_annotator_stats(session, project_id):
+    annotator_stats = {}
+    conflicts = session.query(AnnotationConflict).filter(
+        AnnotationConflict.project_id == project_id,
+        AnnotationConflict.status == ConflictStatus.RESOLVED
+    ).all()
+    for conflict in conflicts:
+        for annotator in (conflict.annotation_a.annotator, conflict.annotation_b.annotator):
+            stats = annotator_stats.setdefault(annotator.username, {
+                "conflicts_involved": 0, "conflicts_resolved_favorably": 0,
+                "total_score": 0.0, "resolution_outcomes": {}
+            })
+            stats["conflicts_involved"] += 1
+            stats["total_score"] += conflict.conflict_score
+            if conflict.resolutions:
+                latest = max(conflict.resolutions, key=lambda r: (r.created_at, r.id))
+                if latest.outcome and latest.final_annotation and latest.final_annotation.annotator_id == annotator.id:
+                    stats["conflicts_resolved_favorably"] += 1
+                outcome = latest.outcome.value if latest.outcome else "unknown"
+                stats["resolution_outcomes"][outcome] = stats["resolution_outcomes"].get(outcome, 0) + 1
+    return annotator_stats, len(conflicts)
+
+
+class TestGroupedAnalytics:
+    """Grouped queries match the per-conflict loops"""
+
+    def test_problematic_pairs(self, session, seeded):
+        pairs = ConflictAgreementAnalyzer(session)._identify_problematic_pairs(seeded.id)
+        expected = legacy_problematic_pairs(session, seeded.id)
+
+        assert [pair[:2] for pair in pairs] == [pair[:2] for pair in expected]
+        assert [pair[2] for pair in pairs] == pytest.approx([pair[2] for pair in expected])
+
+    def test_conflict_patterns(self, session, seeded):
+        patterns = ConflictAgreementAnalyzer(session)._analyze_conflict_patterns(seeded.id)
+        conflicts = session.query(AnnotationConflict).filter_by(project_id=seeded.id).all()
+
+        by_type = {p["pattern_value"]: p["frequency"] for p in patterns if p["pattern_type"] == "conflict_type"}
+        by_severity = {p["pattern_value"]: p["frequency"] for p in patterns if p["pattern_type"] == "severity_level"}
+        assert by_type == {t.value: sum(c.conflict_type == t for c in conflicts)
+                           for t in {c.conflict_type for c in conflicts}}
+        assert by_severity == {s: sum(c.severity_level == s for c in conflicts)
+                               for s in {c.severity_level for c in conflicts}}
+        assert [p["frequency"] for p in patterns] == sorted((p["frequency"] for p in patterns), reverse=True)
+        assert sum(p["percentage"] for p in patterns) == pytest.approx(200)
+
+    def test_annotator_performance_from_conflicts(self, session, seeded):
+        summary = ConflictAgreementAnalyzer(session).update_annotator_performance_from_conflicts(seeded.id)
+        expected, total = legacy_annotator_stats(session, seeded.id)
+
+        assert summary["total_conflicts_analyzed"] == total
+        assert summary["annotators_analyzed"] == len(expected)
+        assert summary["performance_records_updated"] == 2
+        for username, stats in expected.items():
+            actual = summary["summary"][username]
+            assert actual["conflicts_involved"] == stats["conflicts_involved"]
+            assert actual["conflicts_resolved_favorably"] == stats["conflicts_resolved_favorably"]
+            assert actual["avg_conflict_score"] == pytest.approx(stats["total_score"] / stats["conflicts_involved"])
+            assert actual["resolution_outcomes"] == stats["resolution_outcomes"]
+
+        session.expire_all()
+        history = session.query(AnnotatorPerformance).filter_by(annotator_name="alice").one().performance_history
+        assert history[-1]["conflicts_involved"] == expected["alice"]["conflicts_involved"]
+
+    def test_resolution_effectiveness(self, session, seeded):
+        effectiveness = ConflictAgreementAnalyzer(session)._analyze_resolution_effectiveness(seeded.id)
+
+        resolutions = session.query(ConflictResolution).all()
+        expected = {}
+        for strategy in {r.resolution_strategy for r in resolutions}:
+            chosen = [r for r in resolutions if r.resolution_strategy == strategy]
+            confident = [r for r in chosen if r.confidence_score and r.confidence_score >= 0.7]
+            expected[strategy.value] = len(confident) / len(chosen)
+        assert effectiveness == pytest.approx(expected)
+
+    def test_integrated_analysis_query_count_is_independent_of_conflicts(self, session, engine, seeded):
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        analyzer = ConflictAgreementAnalyzer(session)
+        analyzer.update_annotator_performance_from_conflicts(seeded.id)
+        analyzer.generate_quality_insights(seeded.id)
+
+        assert len(statements) < 25
+
+
+class TestAnalyticsCache:
+    """Results are reused until the project's conflicts change"""
+
+    def test_unchanged_project_is_served_from_cache(self, session, seeded, analytics_cache):
+        analyzer = ConflictAgreementAnalyzer(session)
+        first = analyzer._identify_problematic_pairs(seeded.id)
+        second = analyzer._identify_problematic_pairs(seeded.id)
+
+        assert second == first
+        assert (analytics_cache.hits, analytics_cache.misses) == (1, 1)
+
+    def test_changed_conflict_invalidates(self, session, seeded, analytics_cache):
+        analyzer = ConflictAgreementAnalyzer(session)
+        before = analyzer._analyze_conflict_patterns(seeded.id)
+
+        conflict = session.query(AnnotationConflict).filter_by(project_id=seeded.id).first()
+        conflict.severity_level = "extreme"
+        conflict.updated_at = datetime.utcnow() + timedelta(days=1)
+        session.commit()
+        after = analyzer._analyze_conflict_patterns(seeded.id)
+
+        assert after != before
+        assert any(p["pattern_value"] == "extreme" for p in after)
+        assert analytics_cache.misses == 2
+
+    def test_returned_results_are_copies(self, session, seeded):
+        analyzer = ConflictAgreementAnalyzer(session)
+        analyzer._analyze_conflict_patterns(seeded.id).clear()
+
+        assert analyzer._analyze_conflict_patterns(seeded.id)
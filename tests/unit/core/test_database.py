@@ -0,0 +1,61 @@
+"""
+Unit Tests for Database Configuration
+
+Checks async driver URL derivation, pool sizing and the AsyncSession
+dependency against an aiosqlite database.
+"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.config import settings
+from src.core.database import Base, get_async_database_url, pool_options
+from src.models.user import User
+
+
+class TestAsyncDatabaseUrl:
+    """Test async driver selection"""
+
+    def test_postgres_uses_asyncpg(self):
+        url = get_async_database_url("postgresql://user:secret@db:5432/annotations")
+        assert url == "postgresql+asyncpg://user:secret@db:5432/annotations"
+
+    def test_postgres_driver_is_replaced(self):
+        url = get_async_database_url("postgresql+psycopg2://user:secret@db/annotations")
+        assert url.startswith("postgresql+asyncpg://")
+
+    def test_sqlite_uses_aiosqlite(self):
+        assert get_async_database_url("sqlite:///test.db") == "sqlite+aiosqlite:///test.db"
+
+
+class TestPoolOptions:
+    """Test connection pool sizing"""
+
+    def test_server_database_uses_settings(self):
+        options = pool_options("postgresql+asyncpg://db/annotations")
+        assert options["pool_size"] == settings.DATABASE_POOL_SIZE
+        assert options["max_overflow"] == settings.DATABASE_MAX_OVERFLOW
+        assert options["pool_timeout"] == settings.DATABASE_POOL_TIMEOUT
+
+    def test_sqlite_keeps_default_pool(self):
+        assert pool_options("sqlite+aiosqlite:///test.db") == {}
+
+
+@pytest.mark.asyncio
+async def test_async_session_round_trip(tmp_path):
+    """An AsyncSession on aiosqlite reads rows written through it"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add(User(username="async-user", email="async@example.com", hashed_password="x"))
+        await session.commit()
+
+    async with session_factory() as session:
+        user = await session.scalar(select(User).where(User.username == "async-user"))
+        assert user.email == "async@example.com"
+
+    await engine.dispose()
@@ -0,0 +1,207 @@
+"""
+Unit Tests for the Principal Cache
+
+Tests LRU and TTL behaviour, invalidation through CacheManager and that
+get_current_user and project access checks resolve cached principals without
+querying the database.
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.core.database import Base
+from src.core.principal_cache import Principal, PrincipalCache, get_principal_cache
+from src.core.security import create_access_token, get_current_user, has_project_access
+from src.models.project import Project
+from src.models.user import User
+from src.services.cache_manager import CacheManager
+
+
+def make_principal(user_id: int, username: str = "alice", **overrides) -> Principal:
+    values = dict(
+        id=user_id, username=username, is_active=True, is_admin=False,
+        role="researcher", token_version=0,
+        owned_project_ids=frozenset(), public_project_ids=frozenset()
+    )
+    values.update(overrides)
+    return Principal(**values)
+
+
+def bearer(username: str, version: int = 0):
+    credentials = Mock()
+    credentials.credentials = create_access_token({"sub": username, "ver": version})
+    return credentials
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'principals.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine)()
+    user = User(username="alice", email="alice@example.com", hashed_password="x", role="annotator")
+    bob = User(username="bob", email="bob@example.com", hashed_password="x")
+    session.add_all([user, bob])
+    session.flush()
+    session.add_all([
+        Project(name="Owned", owner_id=user.id),
+        Project(name="Shared", owner_id=bob.id, is_public=True),
+        Project(name="Private", owner_id=bob.id)
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    get_principal_cache().clear()
+    yield
+    get_principal_cache().clear()
+
+
+class TestPrincipalCache:
+    """Test the in-process tier"""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+        cache.set_local("alice", 0, make_principal(1, "alice"))
+        cache.set_local("bob", 0, make_principal(2, "bob"))
+        cache.get_local("alice", 0)
+        cache.set_local("carol", 0, make_principal(3, "carol"))
+
+        assert cache.get_local("alice", 0) is not None
+        assert cache.get_local("bob", 0) is None
+        assert cache.stats()["entries"] == 2
+
+    def test_expired_entry_is_a_miss(self):
+        cache = PrincipalCache(max_entries=10, ttl_seconds=-1)
+        cache.set_local("alice", 0, make_principal(1))
+
+        assert cache.get_local("alice", 0) is None
+
+    def test_versions_are_cached_separately(self):
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        cache.set_local("alice", 0, make_principal(1))
+
+        assert cache.get_local("alice", 1) is None
+
+    def test_invalidate_local_drops_every_version(self):
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        cache.set_local("alice", 0, make_principal(1))
+        cache.set_local("alice", 1, make_principal(1, token_version=1))
+        cache.set_local("bob", 0, make_principal(2, "bob"))
+
+        assert cache.invalidate_local(1) == 2
+        assert cache.get_local("bob", 0) is not None
+
+    @pytest.mark.asyncio
+    async def test_cache_manager_invalidate_user_clears_principals(self):
+        get_principal_cache().set_local("alice", 0, make_principal(1))
+        cache_service = Mock(delete=AsyncMock(return_value=0), invalidate_tags=AsyncMock(return_value=0))
+
+        assert await CacheManager(cache_service=cache_service).invalidate_user(1) is True
+        assert get_principal_cache().get_local("alice", 0) is None
+
+    @pytest.mark.asyncio
+    async def test_public_project_change_clears_every_principal(self):
+        get_principal_cache().set_local("alice", 0, make_principal(1))
+        get_principal_cache().set_local("bob", 0, make_principal(2, "bob"))
+        cache_service = Mock(invalidate_tags=AsyncMock(return_value=0))
+
+        manager = CacheManager(cache_service=cache_service)
+        assert await manager.invalidate_project_access(1, public_changed=True) is True
+        assert get_principal_cache().stats()["entries"] == 0
+
+    def test_round_trips_through_redis_payload(self):
+        principal = make_principal(1, owned_project_ids=frozenset({3, 1}), public_project_ids=frozenset({2}))
+
+        assert Principal.from_dict(principal.to_dict()) == principal
+
+
+@pytest.mark.asyncio
+class TestCachedAuthentication:
+    """Test get_current_user with the principal cache"""
+
+    async def test_second_request_skips_the_database(self, engine, session):
+        first = await get_current_user(bearer("alice"), session)
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        second = await get_current_user(bearer("alice"), session)
+
+        assert statements == []
+        assert second.id == first.id
+        assert second.role == "annotator"
+
+    async def test_cache_miss_loads_the_user_and_project_ids(self, engine, session):
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        user = await get_current_user(bearer("alice"), session)
+
+        assert len(statements) == 2
+        assert "FROM users" in statements[0]
+        assert "FROM projects" in statements[1]
+
+        principal = get_principal_cache().get_local("alice", 0)
+        owned = session.query(Project).filter(Project.name == "Owned").one()
+        shared = session.query(Project).filter(Project.name == "Shared").one()
+        assert principal.owned_project_ids == {owned.id}
+        assert principal.public_project_ids == {shared.id}
+        assert principal.id == user.id
+
+    async def test_granted_project_access_skips_the_database(self, engine, session):
+        owned, shared, private = (
+            session.query(Project).filter(Project.name == name).one().id
+            for name in ("Owned", "Shared", "Private")
+        )
+        session.expunge_all()
+        user = await get_current_user(bearer("alice"), session)
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        assert has_project_access(session, user, owned, owner_only=True)
+        assert has_project_access(session, user, shared)
+        assert statements == []
+
+        assert not has_project_access(session, user, shared, owner_only=True)
+        assert not has_project_access(session, user, private)
+
+    async def test_project_created_after_caching_is_not_refused(self, session):
+        user = await get_current_user(bearer("alice"), session)
+        project = Project(name="New", owner_id=user.id)
+        session.add(project)
+        session.commit()
+
+        assert has_project_access(session, user, project.id, owner_only=True)
+
+    async def test_outdated_token_version_is_rejected(self, session):
+        user = session.query(User).filter(User.username == "alice").one()
+        user.token_version = 1
+        session.commit()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(bearer("alice", version=0), session)
+        assert exc_info.value.status_code == 401
+
+        assert (await get_current_user(bearer("alice", version=1), session)).id == user.id
+
+    async def test_invalidation_picks_up_deactivation(self, session):
+        await get_current_user(bearer("alice"), session)
+        user = session.query(User).filter(User.username == "alice").one()
+        user.is_active = False
+        session.commit()
+        get_principal_cache().invalidate_local(user.id)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(bearer("alice"), session)
+        assert "inactive" in exc_info.value.detail
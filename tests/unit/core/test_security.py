@@ -13,6 +13,7 @@ from src.core.security import (
     verify_password, get_password_hash, create_access_token, verify_token,
     get_current_user, get_current_active_admin
 )
+from src.core.principal_cache import get_principal_cache
 
 
 class TestPasswordHandling:
@@ -161,9 +162,17 @@ class TestJWTTokens:
 class TestAuthenticationDependencies:
     """Test cases for FastAPI authentication dependencies."""
 
+    @pytest.fixture(autouse=True)
+    def clear_principal_cache(self):
+        """Start each test with an empty principal cache."""
+        get_principal_cache().clear()
+        yield
+        get_principal_cache().clear()
+
+    @pytest.mark.asyncio
     @pytest.mark.unit
     @pytest.mark.security
-    def test_get_current_user_valid_token(self, test_db, test_user):
+    async def test_get_current_user_valid_token(self, test_db, test_user):
         """Test getting current user with valid token."""
         # Create token for test user
         token_data = {"sub": test_user.username}
@@ -173,26 +182,28 @@ class TestAuthenticationDependencies:
         mock_credentials = Mock()
         mock_credentials.credentials = token
         
-        user = get_current_user(mock_credentials, test_db)
+        user = await get_current_user(mock_credentials, test_db)
         assert user.id == test_user.id
         assert user.username == test_user.username
 
+    @pytest.mark.asyncio
     @pytest.mark.unit
     @pytest.mark.security
-    def test_get_current_user_invalid_token(self, test_db):
+    async def test_get_current_user_invalid_token(self, test_db):
         """Test getting current user with invalid token."""
         mock_credentials = Mock()
         mock_credentials.credentials = "invalid-token"
         
         with pytest.raises(HTTPException) as exc_info:
-            get_current_user(mock_credentials, test_db)
+            await get_current_user(mock_credentials, test_db)
         
         assert exc_info.value.status_code == 401
         assert "Could not validate credentials" in exc_info.value.detail
 
+    @pytest.mark.asyncio
     @pytest.mark.unit
     @pytest.mark.security
-    def test_get_current_user_nonexistent_user(self, test_db):
+    async def test_get_current_user_nonexistent_user(self, test_db):
         """Test getting current user for non-existent user."""
         # Create token for non-existent user
         token_data = {"sub": "nonexistent_user"}
@@ -202,13 +213,14 @@ class TestAuthenticationDependencies:
         mock_credentials.credentials = token
         
         with pytest.raises(HTTPException) as exc_info:
-            get_current_user(mock_credentials, test_db)
+            await get_current_user(mock_credentials, test_db)
         
         assert exc_info.value.status_code == 401
 
+    @pytest.mark.asyncio
     @pytest.mark.unit
     @pytest.mark.security
-    def test_get_current_user_inactive_user(self, test_db, test_user):
+    async def test_get_current_user_inactive_user(self, test_db, test_user):
         """Test getting current user when user is inactive."""
         # Deactivate user
         test_user.is_active = False
@@ -222,14 +234,15 @@ class TestAuthenticationDependencies:
         mock_credentials.credentials = token
         
         with pytest.raises(HTTPException) as exc_info:
-            get_current_user(mock_credentials, test_db)
+            await get_current_user(mock_credentials, test_db)
         
         assert exc_info.value.status_code == 401
         assert "User account is inactive" in exc_info.value.detail
 
+    @pytest.mark.asyncio
     @pytest.mark.unit
     @pytest.mark.security
-    def test_get_current_user_token_without_subject(self, test_db):
+    async def test_get_current_user_token_without_subject(self, test_db):
         """Test getting current user with token missing subject."""
         # Create token without subject
         token_data = {"role": "user"}  # No 'sub' field
@@ -239,7 +252,7 @@ class TestAuthenticationDependencies:
         mock_credentials.credentials = token
         
         with pytest.raises(HTTPException) as exc_info:
-            get_current_user(mock_credentials, test_db)
+            await get_current_user(mock_credentials, test_db)
         
         assert exc_info.value.status_code == 401
 
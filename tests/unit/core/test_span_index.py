@@ -0,0 +1,135 @@
+"""
+Unit Tests for Span Overlap Index
+
+Checks the interval index used by conflict detection against brute-force
+pair enumeration and the previous nested-loop candidate selection.
+"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.span_index import SpanIndex
+
+
+PROXIMITY = 50
+
+
+def make_spans(n, text_length=2000, max_length=120, seed=0):
+    rng = random.Random(seed)
+    spans = []
+    for span_id in range(1, n + 1):
+        start = rng.randrange(0, text_length)
+        spans.append(SimpleNamespace(
+            id=span_id, start_char=start, end_char=start + rng.randrange(0, max_length)
+        ))
+    return spans
+
+
+def overlaps(a, b):
+    return a.start_char < b.end_char and b.start_char < a.end_char
+
+
+def is_near(a, b):
+    return min(abs(a.start_char - b.start_char), abs(a.end_char - b.end_char)) <= PROXIMITY
+
+
+def legacy_pairs(spans):
+    """Pairs visited by the previous sorted nested loop with a 100-char gap."""
+    ordered = sorted(spans, key=lambda s: s.start_char)
+    pairs = []
+    for i, a in enumerate(ordered):
+        for b in ordered[i + 1:]:
+            if b.start_char > a.end_char + 100:
+                break
+            pairs.append((a.id, b.id))
+    return pairs
+
+
+class TestSpanIndexQueries:
+    """Test cases for single-span queries."""
+
+    @pytest.mark.unit
+    def test_overlapping_matches_brute_force(self):
+        spans = make_spans(300)
+        index = SpanIndex(spans)
+
+        for query in spans[:50]:
+            expected = {s.id for s in spans if s.id != query.id and overlaps(s, query)}
+            found = index.overlapping(query.start_char, query.end_char, exclude_id=query.id)
+            assert {s.id for s in found} == expected
+            assert [s.start_char for s in found] == sorted(s.start_char for s in found)
+
+    @pytest.mark.unit
+    def test_near_matches_brute_force(self):
+        spans = make_spans(300)
+        index = SpanIndex(spans)
+
+        for query in spans[:50]:
+            expected = {s.id for s in spans if s.id != query.id and is_near(s, query)}
+            found = index.near(query.start_char, query.end_char, PROXIMITY, exclude_id=query.id)
+            assert {s.id for s in found} == expected
+
+    @pytest.mark.unit
+    def test_add_update_remove(self):
+        spans = make_spans(100)
+        index = SpanIndex(spans)
+
+        moved = SimpleNamespace(id=spans[0].id, start_char=5000, end_char=5010)
+        index.update(moved)
+        assert index.remove(spans[1].id) is True
+        assert index.remove(spans[1].id) is False
+
+        assert len(index) == 99
+        assert index.get(spans[0].id) is moved
+        assert [s.id for s in index.overlapping(5005, 5006)] == [moved.id]
+        assert spans[1].id not in index
+
+    @pytest.mark.unit
+    def test_empty_index(self):
+        index = SpanIndex()
+
+        assert index.overlapping(0, 10) == []
+        assert index.near(0, 10, PROXIMITY) == []
+        assert list(index.candidate_pairs(PROXIMITY)) == []
+
+
+class TestSpanIndexPairs:
+    """Test cases for bulk pair enumeration."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_overlapping_pairs_match_brute_force(self, seed):
+        spans = make_spans(250, seed=seed)
+        ordered = sorted(spans, key=lambda s: s.start_char)
+        expected = [
+            (a.id, b.id)
+            for i, a in enumerate(ordered) for b in ordered[i + 1:] if overlaps(a, b)
+        ]
+
+        pairs = [(a.id, b.id) for a, b in SpanIndex(spans).overlapping_pairs()]
+        assert pairs == expected
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_candidate_pairs_match_legacy_selection(self, seed):
+        """Candidate pairs equal the legacy pairs that could yield a conflict, in order."""
+        spans = make_spans(250, seed=seed)
+        by_id = {s.id: s for s in spans}
+        expected = [
+            (a, b) for a, b in legacy_pairs(spans)
+            if overlaps(by_id[a], by_id[b]) or is_near(by_id[a], by_id[b])
+        ]
+
+        pairs = [(a.id, b.id) for a, b in SpanIndex(spans).candidate_pairs(PROXIMITY)]
+        assert pairs == expected
+
+    @pytest.mark.unit
+    def test_zero_length_spans(self):
+        spans = [
+            SimpleNamespace(id=1, start_char=10, end_char=10),
+            SimpleNamespace(id=2, start_char=10, end_char=20),
+        ]
+
+        assert list(SpanIndex(spans).overlapping_pairs()) == []
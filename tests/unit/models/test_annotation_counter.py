@@ -0,0 +1,175 @@
+"""
+Unit Tests for Annotation Counters
+
+Tests that the denormalized project_id is filled on insert and that
+per-project and per-text counters follow inserts, updates and deletes in
+the same transaction.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.core.database import Base
+from src.models.user import User
+from src.models.project import Project
+from src.models.text import Text
+from src.models.label import Label
+from src.models.annotation import Annotation
+from src.models.annotation_counter import get_annotation_counters, get_project_annotation_counts
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'counters.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def seeded(session):
+    """Two annotators, one project with two texts and two labels"""
+    alice = User(username="alice", email="alice@example.com", hashed_password="x")
+    bob = User(username="bob", email="bob@example.com", hashed_password="x")
+    session.add_all([alice, bob])
+    session.flush()
+
+    project = Project(name="Counters", owner_id=alice.id)
+    session.add(project)
+    session.flush()
+
+    texts = [Text(title=f"Text {i}", content="Alice met Bob.", project_id=project.id) for i in range(2)]
+    labels = [Label(name=name, project_id=project.id) for name in ("PERSON", "ORG")]
+    session.add_all(texts + labels)
+    session.commit()
+    return {"users": [alice, bob], "project": project, "texts": texts, "labels": labels}
+
+
+def annotate(text, label, user):
+    return Annotation(
+        start_char=0, end_char=5, selected_text="Alice",
+        text_id=text.id, label_id=label.id, annotator_id=user.id
+    )
+
+
+class TestAnnotationCounters:
+    """Test counter maintenance"""
+
+    def test_project_id_filled_from_text(self, session, seeded):
+        annotation = annotate(seeded["texts"][0], seeded["labels"][0], seeded["users"][0])
+        session.add(annotation)
+        session.commit()
+
+        assert annotation.project_id == seeded["project"].id
+
+    def test_inserts_update_project_and_text_counters(self, session, seeded):
+        alice, bob = seeded["users"]
+        first_text, second_text = seeded["texts"]
+        person, org = seeded["labels"]
+        session.add_all([
+            annotate(first_text, person, alice),
+            annotate(first_text, org, bob),
+            annotate(second_text, person, alice),
+        ])
+        session.commit()
+
+        project_counters = get_annotation_counters(session, "project", seeded["project"].id)
+        assert project_counters["annotation_count"] == 3
+        assert project_counters["annotator_count"] == 2
+        assert project_counters["annotated_text_count"] == 2
+        assert project_counters["label_counts"] == {person.id: 2, org.id: 1}
+
+        text_counters = get_annotation_counters(session, "text", second_text.id)
+        assert text_counters["annotation_count"] == 1
+        assert text_counters["annotator_count"] == 1
+
+    def test_delete_decrements_distinct_counts(self, session, seeded):
+        alice, bob = seeded["users"]
+        text = seeded["texts"][0]
+        person = seeded["labels"][0]
+        kept = annotate(text, person, alice)
+        removed = annotate(text, person, bob)
+        session.add_all([kept, removed])
+        session.commit()
+
+        session.delete(removed)
+        session.commit()
+
+        counters = get_annotation_counters(session, "project", seeded["project"].id)
+        assert counters["annotation_count"] == 1
+        assert counters["annotator_count"] == 1
+        assert counters["annotated_text_count"] == 1
+
+    def test_label_change_moves_counts(self, session, seeded):
+        person, org = seeded["labels"]
+        annotation = annotate(seeded["texts"][0], person, seeded["users"][0])
+        session.add(annotation)
+        session.commit()
+
+        annotation.label_id = org.id
+        session.commit()
+
+        counters = get_annotation_counters(session, "project", seeded["project"].id)
+        assert counters["annotation_count"] == 1
+        assert counters["label_counts"] == {org.id: 1}
+
+    def test_text_and_annotator_change_after_commit(self, session, seeded):
+        alice, bob = seeded["users"]
+        first_text, second_text = seeded["texts"]
+        annotation = annotate(first_text, seeded["labels"][0], alice)
+        session.add(annotation)
+        session.commit()
+
+        annotation.text_id = second_text.id
+        annotation.annotator_id = bob.id
+        session.commit()
+
+        assert get_annotation_counters(session, "text", first_text.id)["annotation_count"] == 0
+        second = get_annotation_counters(session, "text", second_text.id)
+        assert second["annotation_count"] == 1
+        assert second["annotator_count"] == 1
+        assert get_annotation_counters(session, "project", seeded["project"].id)["annotated_text_count"] == 1
+
+    def test_length_sum_and_recent_count(self, session, seeded):
+        text = seeded["texts"][0]
+        person = seeded["labels"][0]
+        alice, bob = seeded["users"]
+        recent = annotate(text, person, alice)
+        old = annotate(text, person, bob)
+        old.end_char = 9
+        old.created_at = datetime.utcnow() - timedelta(days=3)
+        session.add_all([recent, old])
+        session.commit()
+
+        counters = get_annotation_counters(session, "project", seeded["project"].id)
+        assert counters["length_sum"] == 14
+        assert counters["recent_count"] == 1
+
+        recent.start_char = 2
+        session.commit()
+        session.delete(old)
+        session.commit()
+
+        counters = get_annotation_counters(session, "text", text.id)
+        assert counters["length_sum"] == 3
+        assert counters["recent_count"] == 1
+
+    def test_rollback_discards_counter_changes(self, session, seeded):
+        session.add(annotate(seeded["texts"][0], seeded["labels"][0], seeded["users"][0]))
+        session.flush()
+        session.rollback()
+
+        counters = get_annotation_counters(session, "project", seeded["project"].id)
+        assert counters["annotation_count"] == 0
+
+    def test_project_counts_for_many_projects(self, session, seeded):
+        session.add(annotate(seeded["texts"][0], seeded["labels"][0], seeded["users"][0]))
+        session.commit()
+
+        counts = get_project_annotation_counts(session, [seeded["project"].id, 999])
+        assert counts == {seeded["project"].id: 1, 999: 0}
@@ -0,0 +1,121 @@
+"""
+Query Plan Regression Tests
+
+Runs EXPLAIN on the hot annotation, text and label queries and fails if any
+of them falls back to a full table scan:
+- Conflict candidate loading by text
+- Duplicate span detection
+- List/export filters by annotator, label and project
+- The check_new_only recent-changes window
+
+SQLite always runs; Postgres runs when TEST_POSTGRES_URL is set.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, or_, select, text
+
+from src.core.database import Base
+from src.models.annotation import Annotation
+from src.models.label import Label
+from src.models.text import Text
+
+
+CUTOFF = datetime(2026, 1, 1) - timedelta(hours=24)
+
+HOT_QUERIES = {
+    "conflict_candidates": select(Annotation).where(Annotation.text_id.in_([1, 2, 3])),
+    "duplicate_span": select(func.count()).select_from(Annotation).where(
+        Annotation.text_id == 1,
+        Annotation.start_char == 0,
+        Annotation.end_char == 5,
+        Annotation.id != 7
+    ),
+    "annotator_filter": select(Annotation).where(Annotation.annotator_id == 1),
+    "label_filter": select(Annotation).where(Annotation.label_id == 1),
+    "recent_window": select(Annotation).where(
+        or_(Annotation.created_at >= CUTOFF, Annotation.updated_at >= CUTOFF)
+    ),
+    "project_annotations": select(Annotation).join(Text).where(Text.project_id == 1),
+    "project_filter": select(Annotation).where(Annotation.project_id == 1),
+    "project_texts": select(Text).where(Text.project_id == 1),
+    "project_labels": select(Label).where(Label.project_id == 1),
+}
+
+
+def compile_positional(statement, engine):
+    """Compile a statement to driver SQL and its positional parameters."""
+    compiled = statement.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.params
+    return str(compiled), tuple(params[name] for name in compiled.positiontup)
+
+
+def sqlite_plan(connection, statement):
+    sql, params = compile_positional(statement, connection.engine)
+    return [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def postgres_plan_nodes(connection, statement):
+    """Collect the node types of a Postgres JSON plan."""
+    compiled = statement.compile(dialect=connection.engine.dialect, compile_kwargs={"render_postcompile": True})
+    plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"), compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    nodes, stack = [], [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        nodes.append(f"{node['Node Type']} {node.get('Relation Name', '')}".strip())
+        stack.extend(node.get("Plans", []))
+    return nodes
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+class TestSqliteQueryPlans:
+    """Hot queries must be index searches on SQLite"""
+
+    @pytest.mark.parametrize("name", list(HOT_QUERIES))
+    def test_no_table_scan(self, sqlite_engine, name):
+        with sqlite_engine.connect() as connection:
+            plan = sqlite_plan(connection, HOT_QUERIES[name])
+
+        scans = [step for step in plan if step.startswith("SCAN ")]
+        assert not scans, f"{name} scans instead of searching an index: {plan}"
+
+    def test_duplicate_check_uses_span_index(self, sqlite_engine):
+        with sqlite_engine.connect() as connection:
+            plan = sqlite_plan(connection, HOT_QUERIES["duplicate_span"])
+
+        assert any("idx_annotation_text_span" in step for step in plan)
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set")
+class TestPostgresQueryPlans:
+    """Hot queries must be able to use an index on Postgres"""
+
+    @pytest.fixture
+    def postgres_connection(self):
+        engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+        Base.metadata.create_all(bind=engine)
+        with engine.connect() as connection:
+            # Small test tables would otherwise make a seq scan the cheapest plan
+            connection.execute(text("SET enable_seqscan = off"))
+            yield connection
+        engine.dispose()
+
+    @pytest.mark.parametrize("name", list(HOT_QUERIES))
+    def test_no_seq_scan(self, postgres_connection, name):
+        nodes = postgres_plan_nodes(postgres_connection, HOT_QUERIES[name])
+
+        seq_scans = [node for node in nodes if node.startswith("Seq Scan")]
+        assert not seq_scans, f"{name} falls back to a sequential scan: {nodes}"
@@ -0,0 +1,212 @@
+"""
+Unit Tests for the Agreement Recalculation Queue
+
+Checks that bursts of dirty marks coalesce into one recalculation, that the
+debounce window and the maximum delay decide when an entry is due, that no
+more entries run than there are workers and that the running queue
+recalculates texts and then their projects once, and that a recalculated
+text marks its project dirty even when it is no longer scored.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.core.database import Base
+from src.models.project import Project
+from src.models.text import Text
+from src.models.user import User
+from src.services import agreement_queue
+from src.services.agreement_queue import AgreementRecalculationQueue, recalculate_agreement
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_queue(clock, debounce=2.0, max_delay=10.0, workers=2, handler=None):
+    return AgreementRecalculationQueue(
+        debounce_seconds=debounce, max_delay_seconds=max_delay, max_workers=workers,
+        handler=handler or (lambda queue, key: None), clock=clock
+    )
+
+
+def claimed_keys(queue):
+    claimed, _ = queue.take_due()
+    return [key for key, _ in claimed]
+
+
+class TestCoalescing:
+    """Dirty marks and debouncing"""
+
+    def test_burst_on_one_text_is_one_entry(self):
+        clock = FakeClock()
+        queue = make_queue(clock)
+        for _ in range(200):
+            queue.mark_text_dirty(7)
+            clock.now += 0.001
+
+        stats = queue.stats()
+        assert stats["depth"] == 1
+        assert stats["coalesced"] == 199
+
+    def test_entry_is_due_after_quiet_window(self):
+        clock = FakeClock()
+        queue = make_queue(clock)
+        queue.mark_text_dirty(7)
+
+        clock.now = 1.5
+        claimed, delay = queue.take_due()
+        assert claimed == []
+        assert delay == pytest.approx(0.5)
+
+        clock.now = 2.0
+        assert claimed_keys(queue) == [("text", 7)]
+        assert queue.stats()["depth"] == 0
+
+    def test_continuous_marks_are_due_after_max_delay(self):
+        clock = FakeClock()
+        queue = make_queue(clock, max_delay=5.0)
+        while clock.now < 5.0:
+            queue.mark_text_dirty(7)
+            assert claimed_keys(queue) == []
+            clock.now += 1.0
+
+        claimed, _ = queue.take_due()
+        assert claimed == [(("text", 7), 5.0)]
+        assert queue.stats()["last_lag_seconds"] == 5.0
+
+
+class TestWorkers:
+    """Claims are bounded by the worker count"""
+
+    def test_no_more_claims_than_workers(self):
+        clock = FakeClock()
+        queue = make_queue(clock, workers=2)
+        for text_id in range(5):
+            queue.mark_text_dirty(text_id)
+        clock.now = 2.0
+
+        first = claimed_keys(queue)
+        assert first == [("text", 0), ("text", 1)]
+        assert claimed_keys(queue) == []
+
+        queue.run_job(first[0])
+        assert claimed_keys(queue) == [("text", 2)]
+        assert queue.stats()["in_flight"] == 2
+
+    def test_entry_marked_while_running_waits_for_the_job(self):
+        clock = FakeClock()
+        queue = make_queue(clock)
+        queue.mark_text_dirty(7)
+        clock.now = 2.0
+        (key,) = claimed_keys(queue)
+
+        queue.mark_text_dirty(7)
+        clock.now = 5.0
+        assert claimed_keys(queue) == []
+
+        queue.run_job(key)
+        assert claimed_keys(queue) == [key]
+
+    def test_failures_are_counted(self):
+        def fail(queue, key):
+            raise RuntimeError("boom")
+
+        clock = FakeClock()
+        queue = make_queue(clock, handler=fail)
+        queue.mark_text_dirty(7)
+        clock.now = 2.0
+        (key,) = claimed_keys(queue)
+        queue.run_job(key)
+
+        stats = queue.stats()
+        assert stats["failed"] == 1
+        assert stats["in_flight"] == 0
+
+
+class TestRunningQueue:
+    """Background dispatch on the event loop"""
+
+    def test_burst_recalculates_text_and_project_once(self):
+        calls = []
+        lock = threading.Lock()
+
+        def handler(queue, key):
+            with lock:
+                calls.append(key)
+            if key[0] == "text":
+                queue.mark_project_dirty(1)
+
+        async def scenario():
+            queue = AgreementRecalculationQueue(
+                debounce_seconds=0.05, max_delay_seconds=1.0, max_workers=2, handler=handler
+            )
+            await queue.start()
+            for _ in range(200):
+                queue.mark_text_dirty(7)
+                queue.mark_text_dirty(8)
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if queue.stats()["processed"] == 3:
+                    break
+            stats = queue.stats()
+            await queue.stop()
+            return stats
+
+        stats = asyncio.run(scenario())
+
+        assert sorted(calls) == [("project", 1), ("text", 7), ("text", 8)]
+        assert stats["depth"] == 0
+        assert stats["processed"] == 3
+
+
+class TestRecalculateAgreement:
+    """The default handler"""
+
+    @pytest.fixture
+    def text_ids(self, tmp_path, monkeypatch):
+        engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}")
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine)
+        monkeypatch.setattr(agreement_queue, "SessionLocal", factory)
+
+        session = factory()
+        user = User(username="owner", email="owner@example.com", hashed_password="x")
+        session.add(user)
+        session.flush()
+        project = Project(name="Queue", owner_id=user.id)
+        session.add(project)
+        session.flush()
+        text = Text(title="Text", content="Alice met Bob.", project_id=project.id)
+        session.add(text)
+        session.commit()
+        ids = {"project": project.id, "text": text.id}
+        session.close()
+        yield ids
+        engine.dispose()
+
+    def test_unscored_text_still_marks_its_project(self, text_ids, monkeypatch):
+        class UnscoredService:
+            def __init__(self, db):
+                pass
+
+            def recalculate_text_agreement(self, text_id):
+                # Fewer than two annotators left
+                return None
+
+        monkeypatch.setattr(agreement_queue, "AgreementService", UnscoredService)
+        queue = make_queue(FakeClock(), debounce=0.0)
+
+        recalculate_agreement(queue, ("text", text_ids["text"]))
+        assert claimed_keys(queue) == [("project", text_ids["project"])]
+
+        recalculate_agreement(queue, ("text", 999))
+        assert queue.stats()["depth"] == 0
@@ -0,0 +1,146 @@
+"""
+Unit Tests for Agreement Result Memoization
+
+Checks that unchanged annotations return cached agreement results without
+saving a new study, that a changed text is the only one unified again for
+project agreement and that merged project results match a full analysis.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.core.database import Base
+from src.models.agreement import AgreementStudy, create_tables
+from src.models.annotation import Annotation
+from src.models.label import Label
+from src.models.project import Project
+from src.models.text import Text
+from src.models.user import User
+from src.services.agreement_service import AgreementService
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'agreement.db'}")
+    Base.metadata.create_all(bind=engine)
+    create_tables(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def seeded(session):
+    """Two annotators labelling the same mentions in two texts"""
+    alice = User(username="alice", email="alice@example.com", hashed_password="x")
+    bob = User(username="bob", email="bob@example.com", hashed_password="x")
+    session.add_all([alice, bob])
+    session.flush()
+
+    project = Project(name="Agreement", owner_id=alice.id, inter_annotator_agreement=True)
+    session.add(project)
+    session.flush()
+
+    texts = [Text(title=f"Text {i}", content="Alice met Bob at Acme.", project_id=project.id) for i in range(2)]
+    person = Label(name="PERSON", project_id=project.id)
+    org = Label(name="ORG", project_id=project.id)
+    session.add_all(texts + [person, org])
+    session.flush()
+
+    spans = [(0, 5, person), (10, 13, person), (17, 21, org)]
+    for text in texts:
+        for annotator in (alice, bob):
+            for start, end, label in spans:
+                if annotator is bob and start == 17:
+                    label = person
+                session.add(Annotation(
+                    start_char=start, end_char=end, selected_text="x", text_id=text.id,
+                    project_id=project.id, label_id=label.id, annotator_id=annotator.id
+                ))
+    session.commit()
+    return {"project": project, "texts": texts, "bob": bob, "org": org}
+
+
+def service(session) -> AgreementService:
+    agreement_service = AgreementService(session)
+    agreement_service.agreement_analysis.metrics.random_state = 0
+    return agreement_service
+
+
+def study_count(session) -> int:
+    return session.query(AgreementStudy).count()
+
+
+class TestTextAgreementMemoization:
+    """Text results keyed on the annotation fingerprint"""
+
+    def test_unchanged_text_returns_cached_results(self, session, seeded):
+        text_id = seeded["texts"][0].id
+        first = service(session).calculate_text_agreement(text_id)
+        second = service(session).calculate_text_agreement(text_id)
+
+        assert first["cache_info"]["hit"] is False
+        assert second["cache_info"]["hit"] is True
+        assert second["metrics"] == first["metrics"]
+        assert study_count(session) == 1
+
+    def test_changed_text_is_recomputed(self, session, seeded):
+        text = seeded["texts"][0]
+        service(session).calculate_text_agreement(text.id)
+
+        session.add(Annotation(
+            start_char=14, end_char=16, selected_text="at", text_id=text.id,
+            project_id=seeded["project"].id, label_id=seeded["org"].id, annotator_id=seeded["bob"].id
+        ))
+        session.commit()
+        results = service(session).calculate_text_agreement(text.id)
+
+        assert results["cache_info"]["hit"] is False
+        assert results["dataset_info"]["n_items"] == 4
+        assert study_count(session) == 2
+
+    def test_parameters_are_part_of_the_key(self, session, seeded):
+        text_id = seeded["texts"][0].id
+        service(session).calculate_text_agreement(text_id, overlap_threshold=0.5)
+        results = service(session).calculate_text_agreement(text_id, overlap_threshold=0.9)
+
+        assert results["cache_info"]["hit"] is False
+
+
+class TestProjectAgreementMemoization:
+    """Project results merged from per-text statistics"""
+
+    def test_matches_full_analysis(self, session, seeded):
+        agreement_service = service(session)
+        results = agreement_service.calculate_project_agreement(seeded["project"].id, save_to_database=False)
+
+        sequences = agreement_service.extract_project_annotations(seeded["project"].id)
+        expected = agreement_service.agreement_analysis.analyze_dataset(sequences)
+        assert results["metrics"] == expected["metrics"]
+
+    def test_only_changed_texts_are_unified_again(self, session, seeded):
+        service(session).calculate_project_agreement(seeded["project"].id)
+
+        changed = seeded["texts"][1]
+        session.query(Annotation).filter(
+            Annotation.text_id == changed.id, Annotation.start_char == 0
+        ).first().end_char = 4
+        session.commit()
+
+        agreement_service = service(session)
+        with patch.object(agreement_service, "_text_statistics", wraps=agreement_service._text_statistics) as unify:
+            results = agreement_service.calculate_project_agreement(seeded["project"].id)
+
+        assert results["cache_info"]["hit"] is False
+        assert unify.call_count == 1
+
+    def test_unchanged_project_returns_cached_results(self, session, seeded):
+        service(session).calculate_project_agreement(seeded["project"].id)
+        results = service(session).calculate_project_agreement(seeded["project"].id)
+
+        assert results["cache_info"]["hit"] is True
+        assert study_count(session) == 1
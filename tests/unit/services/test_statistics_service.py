@@ -0,0 +1,137 @@
+"""
+Unit Tests for the Statistics Service
+
+Checks the grouped aggregates against per-table counts, the number of
+statements a refresh issues and that dashboard reads are served from the
+rollup until it goes stale.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.core.database import Base
+from src.models.user import User
+from src.models.project import Project
+from src.models.text import Text
+from src.models.label import Label
+from src.models.annotation import Annotation
+from src.models.statistics_rollup import StatisticsRollup
+from src.services.statistics_service import StatisticsService
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'statistics.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def seeded(session):
+    """Two users (one inactive), two projects and three annotations"""
+    now = datetime.utcnow()
+    alice = User(username="alice", email="alice@example.com", hashed_password="x", last_login=now)
+    bob = User(username="bob", email="bob@example.com", hashed_password="x", is_active=False)
+    session.add_all([alice, bob])
+    session.flush()
+
+    busy = Project(name="Busy", owner_id=alice.id)
+    quiet = Project(name="Quiet", owner_id=bob.id, is_active=False)
+    session.add_all([busy, quiet])
+    session.flush()
+
+    text = Text(title="Text", content="Alice met Bob.", project_id=busy.id)
+    label = Label(name="PERSON", project_id=busy.id)
+    session.add_all([text, label])
+    session.flush()
+
+    session.add_all([
+        Annotation(start_char=0, end_char=5, selected_text="Alice", text_id=text.id,
+                   label_id=label.id, annotator_id=alice.id),
+        Annotation(start_char=10, end_char=13, selected_text="Bob", text_id=text.id,
+                   label_id=label.id, annotator_id=alice.id),
+        Annotation(start_char=0, end_char=5, selected_text="Alice", text_id=text.id,
+                   label_id=label.id, annotator_id=bob.id),
+    ])
+    session.commit()
+    return {"users": [alice, bob], "projects": [busy, quiet]}
+
+
+def count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+class TestStatisticsService:
+    """Test aggregate computation and rollup serving"""
+
+    def test_compute_matches_table_counts(self, session, seeded):
+        statistics = StatisticsService(session).compute()
+
+        assert statistics["overview"] == {
+            "total_users": 2,
+            "active_users": 1,
+            "total_projects": 2,
+            "active_projects": 1,
+            "total_texts": 1,
+            "total_annotations": 3,
+            "total_labels": 1
+        }
+        assert statistics["recent"]["new_annotations_week"] == 3
+        assert statistics["recent"]["recent_logins"] == 1
+        assert statistics["alerts"] == {"inactive_users": 1, "unresolved_security_events": 0}
+
+    def test_rankings_come_from_counters(self, session, seeded):
+        statistics = StatisticsService(session).compute()
+
+        assert statistics["top_annotators"] == [
+            {"username": "alice", "annotation_count": 2},
+            {"username": "bob", "annotation_count": 1}
+        ]
+        assert statistics["most_active_projects"] == [{"project_name": "Busy", "annotation_count": 3}]
+
+    def test_timeline_groups_by_day(self, session, seeded):
+        timeline = StatisticsService(session).compute()["timeline"]
+
+        assert sum(point["count"] for point in timeline["daily_annotations"]) == 3
+        assert sum(point["count"] for point in timeline["daily_users"]) == 2
+
+    def test_refresh_issues_a_bounded_number_of_statements(self, engine, session, seeded):
+        statements = count_statements(engine)
+        StatisticsService(session).compute()
+
+        # Totals, rankings, timeline and the two recent-activity lists
+        assert len(statements) == 5
+
+    def test_fresh_rollup_is_served_without_recomputing(self, engine, session, seeded):
+        service = StatisticsService(session)
+        service.refresh()
+
+        statements = count_statements(engine)
+        statistics = service.get(max_staleness_seconds=300)
+
+        assert len(statements) <= 1
+        assert statistics["overview"]["total_annotations"] == 3
+
+    def test_stale_rollup_is_recomputed(self, session, seeded):
+        service = StatisticsService(session)
+        rollup = service.refresh()
+        rollup.computed_at = datetime.utcnow() - timedelta(minutes=10)
+        session.commit()
+
+        statistics = service.get(max_staleness_seconds=60)
+
+        assert statistics["age_seconds"] < 60
+        assert session.get(StatisticsRollup, StatisticsService.ROLLUP_NAME).computed_at > rollup.computed_at - timedelta(seconds=1)
@@ -30,7 +30,6 @@ from src.models.text import Text
 from src.models.label import Label
 from src.models.project import Project
 from src.models.user import User
-from src.services.agreement_service import AgreementService
 
 
 class TestAnnotationCreation:
@@ -197,10 +196,10 @@ class TestAnnotationCreation:
         
         with patch('src.api.annotations.Annotation') as mock_annotation_class:
             mock_annotation_class.return_value = mock_created_annotation
-            with patch('src.api.annotations.AgreementService') as mock_agreement_service_class:
-                mock_service = Mock()
-                mock_service.trigger_agreement_calculation = Mock()
-                mock_agreement_service_class.return_value = mock_service
+            with patch('src.api.annotations.get_agreement_queue') as mock_get_queue:
+                mock_queue = Mock()
+                mock_queue.mark_text_dirty = Mock()
+                mock_get_queue.return_value = mock_queue
                 
                 result = await create_annotation(valid_annotation_data, mock_current_user, mock_db)
         
@@ -231,8 +230,8 @@ class TestAnnotationCreation:
         # Verify label usage count was incremented
         assert mock_label.usage_count == 1
         
-        # Verify agreement calculation was triggered
-        mock_service.trigger_agreement_calculation.assert_called_once_with(1)
+        # Verify agreement recalculation was queued for the text
+        mock_queue.mark_text_dirty.assert_called_once_with(1)
     
     @pytest.mark.unit
     async def test_create_annotation_minimal_data(self, mock_db, mock_current_user, mock_text, mock_label, minimal_annotation_data):
@@ -269,7 +268,7 @@ class TestAnnotationCreation:
         
         with patch('src.api.annotations.Annotation') as mock_annotation_class:
             mock_annotation_class.return_value = mock_created_annotation
-            with patch('src.api.annotations.AgreementService'):
+            with patch('src.api.annotations.get_agreement_queue'):
                 
                 result = await create_annotation(minimal_annotation_data, mock_current_user, mock_db)
         
@@ -350,7 +349,7 @@ class TestAnnotationCreation:
         
         with patch('src.api.annotations.Annotation') as mock_annotation_class:
             mock_annotation_class.return_value = mock_created_annotation
-            with patch('src.api.annotations.AgreementService'):
+            with patch('src.api.annotations.get_agreement_queue'):
                 
                 result = await create_annotation(valid_annotation_data, mock_current_user, mock_db)
         
@@ -459,7 +458,7 @@ class TestAnnotationCreation:
         
         with patch('src.api.annotations.Annotation') as mock_annotation_class:
             mock_annotation_class.return_value = mock_created_annotation
-            with patch('src.api.annotations.AgreementService'):
+            with patch('src.api.annotations.get_agreement_queue'):
                 
                 await create_annotation(valid_annotation_data, mock_current_user, mock_db)
         
@@ -485,10 +484,10 @@ class TestAnnotationCreation:
         
         with patch('src.api.annotations.Annotation') as mock_annotation_class:
             mock_annotation_class.return_value = mock_created_annotation
-            with patch('src.api.annotations.AgreementService') as mock_agreement_service_class:
-                mock_service = Mock()
-                mock_service.trigger_agreement_calculation.side_effect = Exception("Agreement service error")
-                mock_agreement_service_class.return_value = mock_service
+            with patch('src.api.annotations.get_agreement_queue') as mock_get_queue:
+                mock_queue = Mock()
+                mock_queue.mark_text_dirty.side_effect = Exception("Agreement queue error")
+                mock_get_queue.return_value = mock_queue
                 
                 # Should not raise exception
                 result = await create_annotation(valid_annotation_data, mock_current_user, mock_db)
@@ -1183,10 +1182,10 @@ class TestAnnotationUpdate:
         mock_query.filter.return_value = mock_filter
         mock_db.query.return_value = mock_query
         
-        with patch('src.api.annotations.AgreementService') as mock_agreement_service_class:
-            mock_service = Mock()
-            mock_service.trigger_agreement_calculation = Mock()
-            mock_agreement_service_class.return_value = mock_service
+        with patch('src.api.annotations.get_agreement_queue') as mock_get_queue:
+            mock_queue = Mock()
+            mock_queue.mark_text_dirty = Mock()
+            mock_get_queue.return_value = mock_queue
             
             result = await update_annotation(1, full_update_data, mock_current_user, mock_db)
         
@@ -1203,8 +1202,8 @@ class TestAnnotationUpdate:
         mock_db.commit.assert_called_once()
         mock_db.refresh.assert_called_once_with(mock_annotation)
         
-        # Verify agreement calculation was triggered (content changed)
-        mock_service.trigger_agreement_calculation.assert_called_once_with(1)
+        # Verify agreement recalculation was queued (content changed)
+        mock_queue.mark_text_dirty.assert_called_once_with(1)
         
         # Verify response
         assert isinstance(result, AnnotationResponse) or isinstance(result, dict)
@@ -1224,7 +1223,7 @@ class TestAnnotationUpdate:
         mock_query.filter.return_value = mock_filter
         mock_db.query.return_value = mock_query
         
-        with patch('src.api.annotations.AgreementService'):
+        with patch('src.api.annotations.get_agreement_queue'):
             result = await update_annotation(1, partial_update_data, mock_current_user, mock_db)
         
         # Verify only notes was updated
@@ -1285,7 +1284,7 @@ class TestAnnotationUpdate:
         # Update only notes (no label change)
         notes_update = AnnotationUpdate(notes="Project owner update")
         
-        with patch('src.api.annotations.AgreementService'):
+        with patch('src.api.annotations.get_agreement_queue'):
             result = await update_annotation(2, notes_update, mock_current_user, mock_db)
         
         # Should succeed without exception
@@ -1373,7 +1372,7 @@ class TestAnnotationUpdate:
     
     @pytest.mark.unit
     async def test_update_annotation_no_agreement_trigger_for_minor_changes(self, mock_db, mock_current_user, mock_annotation):
-        """Test that agreement calculation is not triggered for minor changes."""
+        """Test that agreement recalculation is not queued for minor changes."""
         # Update only notes (no content change)
         minor_update = AnnotationUpdate(notes="Minor update")
         
@@ -1384,19 +1383,19 @@ class TestAnnotationUpdate:
         mock_query.filter.return_value = mock_filter
         mock_db.query.return_value = mock_query
         
-        with patch('src.api.annotations.AgreementService') as mock_agreement_service_class:
-            mock_service = Mock()
-            mock_service.trigger_agreement_calculation = Mock()
-            mock_agreement_service_class.return_value = mock_service
+        with patch('src.api.annotations.get_agreement_queue') as mock_get_queue:
+            mock_queue = Mock()
+            mock_queue.mark_text_dirty = Mock()
+            mock_get_queue.return_value = mock_queue
             
             await update_annotation(1, minor_update, mock_current_user, mock_db)
         
-        # Agreement calculation should NOT be triggered for notes-only update
-        mock_service.trigger_agreement_calculation.assert_not_called()
+        # Agreement recalculation should NOT be queued for notes-only update
+        mock_queue.mark_text_dirty.assert_not_called()
     
     @pytest.mark.unit
     async def test_update_annotation_agreement_trigger_for_content_changes(self, mock_db, mock_current_user, mock_annotation, mock_label):
-        """Test that agreement calculation is triggered for content changes."""
+        """Test that agreement recalculation is queued for content changes."""
         # Update label (content change)
         content_update = AnnotationUpdate(label_id=2)
         
@@ -1407,26 +1406,27 @@ class TestAnnotationUpdate:
         mock_query.filter.return_value = mock_filter
         mock_db.query.return_value = mock_query
         
-        with patch('src.api.annotations.AgreementService') as mock_agreement_service_class:
-            mock_service = Mock()
-            mock_service.trigger_agreement_calculation = Mock()
-            mock_agreement_service_class.return_value = mock_service
+        with patch('src.api.annotations.get_agreement_queue') as mock_get_queue:
+            mock_queue = Mock()
+            mock_queue.mark_text_dirty = Mock()
+            mock_get_queue.return_value = mock_queue
             
             await update_annotation(1, content_update, mock_current_user, mock_db)
         
-        # Agreement calculation SHOULD be triggered for label change
-        mock_service.trigger_agreement_calculation.assert_called_once_with(1)
+        # Agreement recalculation SHOULD be queued for label change
+        mock_queue.mark_text_dirty.assert_called_once_with(1)
 
 
 class TestAnnotationValidation:
     """Unit tests for annotation validation functionality."""
     
     @pytest.fixture
-    def mock_db(self):
+    def mock_db(self, mock_project):
         """Mock database session."""
         db = Mock(spec=Session)
         db.commit = Mock()
         db.refresh = Mock()
+        db.get.return_value = mock_project
         return db
     
     @pytest.fixture
@@ -1468,6 +1468,7 @@ class TestAnnotationValidation:
         annotation = Mock(spec=Annotation)
         annotation.id = 1
         annotation.annotator_id = 2
+        annotation.project_id = mock_text.project.id
         annotation.text = mock_text
         annotation.is_validated = "pending"
         annotation.validation_notes = None
@@ -1954,7 +1955,7 @@ class TestAnnotationEdgeCases:
         
         with patch('src.api.annotations.Annotation') as mock_annotation_class:
             mock_annotation_class.return_value = mock_created_annotation
-            with patch('src.api.annotations.AgreementService'):
+            with patch('src.api.annotations.get_agreement_queue'):
                 
                 result = await create_annotation(overlapping_data, mock_current_user, mock_db)
         
@@ -2017,7 +2018,7 @@ class TestAnnotationEdgeCases:
         
         with patch('src.api.annotations.Annotation') as mock_annotation_class:
             mock_annotation_class.return_value = mock_created_annotation
-            with patch('src.api.annotations.AgreementService'):
+            with patch('src.api.annotations.get_agreement_queue'):
                 
                 result = await create_annotation(min_confidence_data, mock_current_user, mock_db)
         
@@ -2080,7 +2081,7 @@ class TestAnnotationEdgeCases:
         
         with patch('src.api.annotations.Annotation') as mock_annotation_class:
             mock_annotation_class.return_value = mock_created_annotation
-            with patch('src.api.annotations.AgreementService'):
+            with patch('src.api.annotations.get_agreement_queue'):
                 
                 result = await create_annotation(boundary_data, mock_current_user, mock_db)
         
@@ -2156,7 +2157,7 @@ class TestAnnotationEdgeCases:
         
         with patch('src.api.annotations.Annotation') as mock_annotation_class:
             mock_annotation_class.return_value = mock_created_annotation
-            with patch('src.api.annotations.AgreementService'):
+            with patch('src.api.annotations.get_agreement_queue'):
                 
                 result = await create_annotation(complex_data, mock_current_user, mock_db)
         
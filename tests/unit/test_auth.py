@@ -32,6 +32,7 @@ from src.core.security import (
     get_current_user,
     verify_token
 )
+from src.core.principal_cache import get_principal_cache
 from src.models.user import User
 
 
@@ -338,7 +339,10 @@ class TestUserProfile:
     @pytest.mark.unit
     async def test_get_current_user_profile_success(self, mock_user):
         """Test getting current user profile."""
-        result = await get_current_user_profile(mock_user)
+        mock_db = Mock(spec=Session)
+        mock_db.get.return_value = mock_user
+        
+        result = await get_current_user_profile(mock_user, mock_db)
         
         assert isinstance(result, UserResponse) or isinstance(result, dict)
         if isinstance(result, dict):
@@ -351,6 +355,7 @@ class TestUserProfile:
     async def test_update_user_profile_full_update(self, mock_user):
         """Test updating user profile with all fields."""
         mock_db = Mock(spec=Session)
+        mock_db.get.return_value = mock_user
         mock_db.commit = Mock()
         mock_db.refresh = Mock()
         
@@ -396,6 +401,7 @@ class TestUserProfile:
     async def test_update_user_profile_partial_update(self, mock_user):
         """Test partial user profile update."""
         mock_db = Mock(spec=Session)
+        mock_db.get.return_value = mock_user
         mock_db.commit = Mock()
         mock_db.refresh = Mock()
         
@@ -422,6 +428,7 @@ class TestUserProfile:
     async def test_update_user_profile_empty_update(self, mock_user):
         """Test updating profile with no changes."""
         mock_db = Mock(spec=Session)
+        mock_db.get.return_value = mock_user
         mock_db.commit = Mock()
         mock_db.refresh = Mock()
         
@@ -564,10 +571,19 @@ class TestSecurityFunctions:
 class TestGetCurrentUser:
     """Unit tests for current user authentication dependency."""
     
+    @pytest.fixture(autouse=True)
+    def clear_principal_cache(self):
+        """Start each test with an empty principal cache."""
+        get_principal_cache().clear()
+        yield
+        get_principal_cache().clear()
+    
     @pytest.fixture
     def mock_db(self):
         """Mock database session."""
-        return Mock(spec=Session)
+        db = Mock(spec=Session)
+        db.query.return_value.filter.return_value.all.return_value = []  # No owned projects
+        return db
     
     @pytest.fixture
     def mock_credentials(self):
@@ -583,10 +599,14 @@ class TestGetCurrentUser:
         user.id = 1
         user.username = "testuser"
         user.is_active = True
+        user.is_admin = False
+        user.role = "researcher"
+        user.token_version = 0
         return user
     
+    @pytest.mark.asyncio
     @pytest.mark.unit
-    def test_get_current_user_success(self, mock_db, mock_credentials, mock_user):
+    async def test_get_current_user_success(self, mock_db, mock_credentials, mock_user):
         """Test successful user authentication."""
         # Mock database query
         mock_db.query.return_value.filter.return_value.first.return_value = mock_user
@@ -594,36 +614,39 @@ class TestGetCurrentUser:
         with patch('src.core.security.verify_token') as mock_verify:
             mock_verify.return_value = {"sub": "testuser", "exp": 9999999999}
             
-            result = get_current_user(mock_credentials, mock_db)
+            result = await get_current_user(mock_credentials, mock_db)
         
         assert result == mock_user
         mock_verify.assert_called_once_with("valid_token")
     
+    @pytest.mark.asyncio
     @pytest.mark.unit
-    def test_get_current_user_invalid_token(self, mock_db, mock_credentials):
+    async def test_get_current_user_invalid_token(self, mock_db, mock_credentials):
         """Test authentication with invalid token."""
         with patch('src.core.security.verify_token') as mock_verify:
             mock_verify.return_value = None  # Invalid token
             
             with pytest.raises(HTTPException) as exc_info:
-                get_current_user(mock_credentials, mock_db)
+                await get_current_user(mock_credentials, mock_db)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
         assert "Could not validate credentials" in str(exc_info.value.detail)
     
+    @pytest.mark.asyncio
     @pytest.mark.unit
-    def test_get_current_user_no_subject(self, mock_db, mock_credentials):
+    async def test_get_current_user_no_subject(self, mock_db, mock_credentials):
         """Test authentication with token missing subject."""
         with patch('src.core.security.verify_token') as mock_verify:
             mock_verify.return_value = {"exp": 9999999999}  # Missing 'sub'
             
             with pytest.raises(HTTPException) as exc_info:
-                get_current_user(mock_credentials, mock_db)
+                await get_current_user(mock_credentials, mock_db)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
     
+    @pytest.mark.asyncio
     @pytest.mark.unit
-    def test_get_current_user_user_not_found(self, mock_db, mock_credentials):
+    async def test_get_current_user_user_not_found(self, mock_db, mock_credentials):
         """Test authentication when user doesn't exist in database."""
         # Mock database query returning None
         mock_db.query.return_value.filter.return_value.first.return_value = None
@@ -632,12 +655,13 @@ class TestGetCurrentUser:
             mock_verify.return_value = {"sub": "nonexistent", "exp": 9999999999}
             
             with pytest.raises(HTTPException) as exc_info:
-                get_current_user(mock_credentials, mock_db)
+                await get_current_user(mock_credentials, mock_db)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
     
+    @pytest.mark.asyncio
     @pytest.mark.unit
-    def test_get_current_user_inactive_user(self, mock_db, mock_credentials, mock_user):
+    async def test_get_current_user_inactive_user(self, mock_db, mock_credentials, mock_user):
         """Test authentication with inactive user."""
         mock_user.is_active = False
         mock_db.query.return_value.filter.return_value.first.return_value = mock_user
@@ -646,7 +670,7 @@ class TestGetCurrentUser:
             mock_verify.return_value = {"sub": "testuser", "exp": 9999999999}
             
             with pytest.raises(HTTPException) as exc_info:
-                get_current_user(mock_credentials, mock_db)
+                await get_current_user(mock_credentials, mock_db)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
         assert "User account is inactive" in str(exc_info.value.detail)
@@ -726,8 +750,9 @@ class TestEdgeCases:
         tampered_payload = verify_token(tampered_token)
         assert tampered_payload is None
     
+    @pytest.mark.asyncio
     @pytest.mark.unit
-    def test_username_case_sensitivity(self):
+    async def test_username_case_sensitivity(self):
         """Test username case sensitivity in authentication."""
         # This test verifies the system behavior for username case sensitivity
         # The actual behavior depends on database collation settings
@@ -735,10 +760,16 @@ class TestEdgeCases:
         
         # Mock user with lowercase username
         user = Mock(spec=User)
+        user.id = 1
         user.username = "testuser"
         user.is_active = True
+        user.is_admin = False
+        user.role = "researcher"
+        user.token_version = 0
         
         mock_db.query.return_value.filter.return_value.first.return_value = user
+        mock_db.query.return_value.filter.return_value.all.return_value = []
+        get_principal_cache().clear()
         
         credentials = Mock()
         credentials.credentials = "valid_token"
@@ -746,14 +777,14 @@ class TestEdgeCases:
         with patch('src.core.security.verify_token') as mock_verify:
             # Test with exact case match
             mock_verify.return_value = {"sub": "testuser", "exp": 9999999999}
-            result = get_current_user(credentials, mock_db)
+            result = await get_current_user(credentials, mock_db)
             assert result == user
             
             # Test with different case - should depend on database settings
             mock_verify.return_value = {"sub": "TestUser", "exp": 9999999999}
             # This might raise an exception or return user depending on DB settings
             try:
-                result = get_current_user(credentials, mock_db)
+                result = await get_current_user(credentials, mock_db)
                 # If no exception, case-insensitive matching is enabled
             except HTTPException:
                 # If exception, case-sensitive matching is enforced
@@ -0,0 +1,350 @@
+"""
+Unit Tests for Batch Processor
+
+Tests batch annotation creation against a file-backed SQLite database:
+- In-memory validation against prefetched project ids
+- Bulk INSERT ... RETURNING ingest
+- Per-row error reporting into batch_errors
+- Thread, process and asyncio execution backends
+- SAVEPOINT and bisection partial rollback of failing rows
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.core.database import Base
+from src.models.user import User
+from src.models.project import Project
+from src.models.text import Text
+from src.models.label import Label
+from src.models.annotation import Annotation
+from src.models.annotation_counter import get_annotation_counters
+from src.models.batch_models import BatchError
+from src.utils.batch_processor import BatchProcessor, ExecutionBackend
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory bound to a fresh SQLite file shared by worker threads"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'batch.db'}",
+        connect_args={"check_same_thread": False}
+    )
+
+    # pysqlite needs explicit BEGIN for SAVEPOINT to behave
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def project_data(session_factory):
+    """Seed a user, a project with two texts and one label, and a foreign label"""
+    session = session_factory()
+    user = User(username="annotator", email="annotator@example.com", hashed_password="x")
+    session.add(user)
+    session.flush()
+
+    project = Project(name="Batch Project", owner_id=user.id)
+    other_project = Project(name="Other Project", owner_id=user.id)
+    session.add_all([project, other_project])
+    session.flush()
+
+    texts = [Text(title=f"Text {i}", content="Alice met Bob.", project_id=project.id) for i in range(2)]
+    label = Label(name="PERSON", project_id=project.id)
+    foreign_label = Label(name="ORG", project_id=other_project.id)
+    session.add_all(texts + [label, foreign_label])
+    session.commit()
+
+    data = {
+        "user_id": user.id,
+        "project_id": project.id,
+        "text_ids": [text.id for text in texts],
+        "label_id": label.id,
+        "foreign_label_id": foreign_label.id
+    }
+    session.close()
+    return data
+
+
+@pytest.fixture
+def processor(session_factory):
+    """Batch processor using the test database, with one worker since SQLite
+    has a single writer lock that concurrent chunk transactions contend for"""
+    processor = BatchProcessor(max_workers=1, chunk_size=10)
+    processor.session_factory = session_factory
+    return processor
+
+
+def make_annotations(project_data, count, bad_every=None, null_every=None):
+    """Build annotation payloads, pointing every bad_every-th row at a foreign label
+    and giving every null_every-th row a NULL selected_text the database rejects"""
+    annotations = []
+    for i in range(count):
+        bad = bad_every is not None and i % bad_every == 0
+        null = null_every is not None and i % null_every == 0
+        annotations.append({
+            "start_char": 0,
+            "end_char": 5,
+            "selected_text": None if null else "Alice",
+            "text_id": project_data["text_ids"][i % 2],
+            "label_id": project_data["foreign_label_id"] if bad else project_data["label_id"]
+        })
+    return annotations
+
+
+def reject_odd(item):
+    """Module-level validation so it can run in a process pool"""
+    return {"valid": item % 2 == 0, "error": "odd item"}
+
+
+def echo_item(item, session):
+    """Processor that writes nothing and returns the item"""
+    return item
+
+
+class TestCreateAnnotationsBatch:
+    """Test batch annotation creation"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_returns_ids(self, processor, session_factory, project_data):
+        """Bulk ingest writes every valid row and returns the new ids"""
+        annotations = make_annotations(project_data, 25)
+
+        result = await processor.create_annotations_batch(
+            "bulk-op", annotations, project_data["user_id"], project_data["project_id"]
+        )
+
+        assert result.success_count == 25
+        assert result.failure_count == 0
+
+        session = session_factory()
+        try:
+            stored_ids = {annotation_id for annotation_id, in session.query(Annotation.id)}
+            assert set(result.processed_items) == stored_ids
+            assert len(stored_ids) == 25
+
+            # Core INSERT rows still reach the project counters
+            counters = get_annotation_counters(session, "project", project_data["project_id"])
+            assert counters["annotation_count"] == 25
+            assert counters["annotated_text_count"] == 2
+        finally:
+            session.close()
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_reports_invalid_rows(self, processor, session_factory, project_data):
+        """Invalid rows are reported individually while the rest of the chunk is written"""
+        annotations = make_annotations(project_data, 20, bad_every=5)
+        annotations.append({"start_char": 3, "end_char": 1, "selected_text": "x",
+                            "text_id": project_data["text_ids"][0], "label_id": project_data["label_id"]})
+
+        result = await processor.create_annotations_batch(
+            "invalid-op", annotations, project_data["user_id"], project_data["project_id"]
+        )
+
+        assert result.success_count == 16
+        assert result.failure_count == 5
+        assert sorted(error["item_index"] for error in result.errors) == [0, 5, 10, 15, 20]
+        assert all(error["error_type"] == "validation_error" for error in result.errors)
+
+        session = session_factory()
+        try:
+            assert session.query(Annotation).count() == 16
+            logged = session.query(BatchError).filter(BatchError.operation_id == "invalid-op").all()
+            assert sorted(error.item_index for error in logged) == [0, 5, 10, 15, 20]
+        finally:
+            session.close()
+
+    @pytest.mark.asyncio
+    async def test_reference_ids_loaded_once(self, processor, project_data):
+        """Project text and label ids are fetched once per batch, not per row"""
+        calls = []
+        load_ids = processor._load_project_reference_ids
+
+        def counting_load(project_id):
+            calls.append(project_id)
+            return load_ids(project_id)
+
+        processor._load_project_reference_ids = counting_load
+        await processor.create_annotations_batch(
+            "prefetch-op", make_annotations(project_data, 30),
+            project_data["user_id"], project_data["project_id"]
+        )
+
+        assert calls == [project_data["project_id"]]
+
+
+class TestExecutionBackends:
+    """Test pluggable execution backends"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend", list(ExecutionBackend))
+    async def test_backends_agree(self, processor, backend):
+        """Every backend validates and processes the same items"""
+        result = await processor.process_batch_operation(
+            f"{backend.value}-op", list(range(50)), echo_item,
+            validation_func=reject_odd, backend=backend
+        )
+
+        assert result.success_count == 25
+        assert result.failure_count == 25
+        assert sorted(result.processed_items) == list(range(0, 50, 2))
+        assert result.metadata["backend"] == backend.value
+
+    @pytest.mark.asyncio
+    async def test_unpicklable_validation_falls_back_to_threads(self, processor):
+        """Closures cannot be sent to a process pool, so the thread backend is used"""
+        result = await processor.process_batch_operation(
+            "closure-op", list(range(10)), echo_item,
+            validation_func=lambda item: {"valid": True}, backend="process"
+        )
+
+        assert result.success_count == 10
+        assert result.metadata["backend"] == ExecutionBackend.THREAD.value
+
+    @pytest.mark.asyncio
+    async def test_create_annotations_runs_on_process_backend(self, processor, session_factory, project_data, caplog):
+        """Annotation validators pickle, so create batches keep the process backend"""
+        annotations = make_annotations(project_data, 20, bad_every=5)
+
+        with caplog.at_level("WARNING", logger="src.utils.batch_processor"):
+            result = await processor.create_annotations_batch(
+                "process-create-op", annotations, project_data["user_id"], project_data["project_id"],
+                backend="process"
+            )
+
+        assert result.metadata["backend"] == ExecutionBackend.PROCESS.value
+        assert not [record for record in caplog.records if "falling back" in record.getMessage()]
+        assert result.success_count == 16
+        assert result.failure_count == 4
+
+        session = session_factory()
+        try:
+            assert session.query(Annotation).count() == 16
+        finally:
+            session.close()
+
+    @pytest.mark.asyncio
+    async def test_async_progress_callback_sees_completion(self, processor):
+        """Progress flows through the queue to async callbacks and ends at 100%"""
+        reports = []
+
+        async def progress_callback(operation_id, progress, processed, success, failure):
+            reports.append((progress, processed))
+
+        await processor.process_batch_operation(
+            "progress-op", list(range(35)), echo_item,
+            progress_callback=progress_callback, backend="asyncio"
+        )
+
+        assert reports
+        assert reports[-1] == (100.0, 35)
+        assert [processed for _, processed in reports] == sorted(processed for _, processed in reports)
+
+
+class TestPartialRollback:
+    """Test that only offending rows are rejected when writes fail"""
+
+    @staticmethod
+    def legacy_goodput(count, chunk_size, null_every):
+        """Rows committed when any failing row rolls back its whole chunk"""
+        return sum(
+            min(chunk_size, count - start)
+            for start in range(0, count, chunk_size)
+            if not any(i % null_every == 0 for i in range(start, min(start + chunk_size, count)))
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("bulk_insert", [True, False])
+    async def test_one_percent_bad_rows(self, processor, session_factory, project_data, bulk_insert):
+        """With 1% of rows failing in the database, the other 99% commit"""
+        annotations = make_annotations(project_data, 1000, null_every=100)
+        processor.chunk_size = 50
+
+        result = await processor.create_annotations_batch(
+            f"goodput-{bulk_insert}", annotations, project_data["user_id"], project_data["project_id"],
+            validate_before_create=False, bulk_insert=bulk_insert
+        )
+
+        assert result.success_count == 990
+        assert result.failure_count == 10
+        assert sorted(error["item_index"] for error in result.errors) == list(range(0, 1000, 100))
+        assert all(error["error_type"] == "processing_error" for error in result.errors)
+
+        # Whole-chunk rollback would have kept only the chunks with no bad row
+        assert self.legacy_goodput(1000, 50, 100) == 500
+        assert result.success_count > 1.9 * self.legacy_goodput(1000, 50, 100)
+
+        session = session_factory()
+        try:
+            assert session.query(Annotation).count() == 990
+            logged = session.query(BatchError).filter(BatchError.operation_id == f"goodput-{bulk_insert}").count()
+            assert logged == 10
+        finally:
+            session.close()
+
+    @pytest.mark.asyncio
+    async def test_failing_row_changes_are_undone(self, processor, session_factory, project_data):
+        """A row that fails after writing has its own writes rolled back"""
+        def processor_func(item, session):
+            session.add(Annotation(
+                start_char=0, end_char=5, selected_text="Alice",
+                text_id=project_data["text_ids"][0], annotator_id=project_data["user_id"],
+                label_id=project_data["label_id"]
+            ))
+            session.flush()
+            if item == 3:
+                raise ValueError("rejected after flush")
+            return item
+
+        result = await processor.process_batch_operation(
+            "undo-op", list(range(10)), processor_func, rollback_on_error=True
+        )
+
+        assert result.success_count == 9
+        assert [error["item_index"] for error in result.errors] == [3]
+
+        session = session_factory()
+        try:
+            assert session.query(Annotation).count() == 9
+        finally:
+            session.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("rollback_on_error", [True, False])
+    async def test_lock_error_fails_the_chunk(self, processor, session_factory, project_data, rollback_on_error):
+        """An operational error is not blamed on the row that hit it"""
+        def processor_func(item, session):
+            session.add(Annotation(
+                start_char=0, end_char=5, selected_text="Alice",
+                text_id=project_data["text_ids"][0], annotator_id=project_data["user_id"],
+                label_id=project_data["label_id"]
+            ))
+            session.flush()
+            if item == 3:
+                raise OperationalError("UPDATE annotation_counters", {}, Exception("database is locked"))
+            return item
+
+        result = await processor.process_batch_operation(
+            "lock-op", list(range(10)), processor_func, rollback_on_error=rollback_on_error
+        )
+
+        assert result.success_count == 0
+        assert result.failure_count == 10
+        assert "Critical chunk error" in result.errors[0]["error"]
+
+        session = session_factory()
+        try:
+            assert session.query(Annotation).count() == 0
+        finally:
+            session.close()
@@ -0,0 +1,114 @@
+"""
+Unit Tests for Keyset Pagination
+
+Walks a SQLite table page by page and checks that every row is returned
+exactly once, in order, including rows with NULL sort values and rows
+inserted while paging.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.core.database import Base
+from src.models.user import User
+from src.utils.pagination import KeysetPaginator
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pagination.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    start = datetime(2026, 1, 1)
+    session.add_all([
+        User(
+            username=f"user{i:02d}",
+            email=f"user{i:02d}@example.com",
+            hashed_password="x",
+            # Duplicate and missing sort values exercise the id tie-breaker
+            last_login=None if i % 4 == 0 else start + timedelta(days=i // 3)
+        )
+        for i in range(23)
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def walk(session, paginator, limit):
+    """Collect ids page by page, returning them with the page count."""
+    ids, cursor, pages = [], None, 0
+    while True:
+        rows = session.scalars(paginator.apply(select(User), cursor, limit)).all()
+        page, cursor = paginator.page(rows, limit)
+        ids.extend(user.id for user in page)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+class TestKeysetPaginator:
+    """Test keyset pagination"""
+
+    def test_id_pages_cover_all_rows_in_order(self, session):
+        ids, pages = walk(session, KeysetPaginator(User.id), limit=5)
+
+        assert ids == sorted(user.id for user in session.scalars(select(User)))
+        assert pages == 5
+
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_nullable_sort_column(self, session, descending):
+        paginator = KeysetPaginator(User.id, User.last_login, descending=descending)
+        ids, _ = walk(session, paginator, limit=4)
+
+        users = session.scalars(select(User)).all()
+        with_login = sorted(
+            (user for user in users if user.last_login is not None),
+            key=lambda user: (user.last_login, user.id),
+            reverse=descending
+        )
+        without_login = sorted(
+            (user for user in users if user.last_login is None),
+            key=lambda user: user.id,
+            reverse=descending
+        )
+        assert ids == [user.id for user in with_login + without_login]
+
+    def test_rows_inserted_while_paging_do_not_repeat(self, session):
+        paginator = KeysetPaginator(User.id)
+        first_page, cursor = paginator.page(
+            session.scalars(paginator.apply(select(User), None, 10)).all(), 10
+        )
+
+        session.add(User(username="late", email="late@example.com", hashed_password="x"))
+        session.commit()
+
+        second_page, _ = paginator.page(
+            session.scalars(paginator.apply(select(User), cursor, 10)).all(), 10
+        )
+        assert not {user.id for user in first_page} & {user.id for user in second_page}
+
+    def test_last_page_has_no_cursor(self, session):
+        paginator = KeysetPaginator(User.id)
+        page, cursor = paginator.page(session.scalars(paginator.apply(select(User), None, 50)).all(), 50)
+
+        assert len(page) == 23
+        assert cursor is None
+
+    def test_invalid_cursor_is_rejected(self):
+        with pytest.raises(HTTPException) as exc_info:
+            KeysetPaginator(User.id).decode_cursor("not-a-cursor")
+        assert exc_info.value.status_code == 400
+
+    def test_cursor_from_another_sort_order_is_rejected(self, session):
+        ascending = KeysetPaginator(User.id, User.created_at)
+        _, cursor = ascending.page(session.scalars(ascending.apply(select(User), None, 5)).all(), 5)
+
+        with pytest.raises(HTTPException):
+            KeysetPaginator(User.id, User.created_at, descending=True).decode_cursor(cursor)